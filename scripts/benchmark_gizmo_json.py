@@ -0,0 +1,90 @@
+"""
+********************************************************************************
+* Name: benchmark_gizmo_json.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+Compare the time to encode a large time series plot with the gizmo JSON encoder and with the encoding previously used
+by the jsonify template filter (json.dumps with a default() call per datetime).
+
+Usage:
+    python scripts/benchmark_gizmo_json.py [--points 1000000] [--repeat 3]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+# Use UTC, like the Tethys Portal (TIME_ZONE setting)
+os.environ['TZ'] = 'UTC'
+time.tzset()
+
+from django.conf import settings  # noqa: E402
+
+settings.configure()
+
+from tethys_gizmos.json_encoder import gizmo_json_dumps  # noqa: E402
+
+
+def legacy_date_handler(obj):
+    if isinstance(obj, datetime.datetime):
+        return time.mktime(obj.timetuple()) * 1000
+    else:
+        return obj
+
+
+def legacy_dumps(data):
+    return json.dumps(data, default=legacy_date_handler)
+
+
+def best_time(func, data, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--points', type=int, default=1000000, help='Number of points of the series.')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of times each encoding is timed.')
+    args = parser.parse_args()
+
+    start = datetime.datetime(1980, 1, 1)
+    times = np.datetime64(start) + np.arange(args.points).astype('timedelta64[h]')
+    values = np.random.RandomState(0).gamma(2.0, 10.0, args.points)
+    points = [[t, v] for t, v in zip(times.astype(datetime.datetime).tolist(), values.tolist())]
+
+    cases = [
+        ('legacy, list of [datetime, value]', legacy_dumps, points),
+        ('gizmo encoder, list of [datetime, value]', gizmo_json_dumps, points),
+        ('gizmo encoder, numpy array', gizmo_json_dumps, np.column_stack((times.astype('datetime64[ms]').astype(float),
+                                                                          values))),
+    ]
+
+    try:
+        import pandas as pd
+        cases.append(('gizmo encoder, pandas Series', gizmo_json_dumps, pd.Series(values, index=times)))
+    except ImportError:
+        pass
+
+    print('Encoding a time series with {:,} points (best of {}):'.format(args.points, args.repeat))
+    baseline = None
+    for name, func, data in cases:
+        elapsed = best_time(func, {'series': [{'name': 'Flow', 'data': data}]}, args.repeat)
+        baseline = baseline or elapsed
+        print('  {:<45} {:8.3f} s  ({:.1f}x)'.format(name, elapsed, baseline / elapsed))
+
+
+if __name__ == '__main__':
+    main()
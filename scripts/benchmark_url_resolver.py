@@ -0,0 +1,88 @@
+"""
+********************************************************************************
+* Name: benchmark_url_resolver.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+Compare the time to resolve the urls of apps with the apps url resolver and with the stock Django resolver, which
+matches the root url of each app in turn, for an increasing number of installed apps.
+
+Usage:
+    python scripts/benchmark_url_resolver.py [--apps 10 50 100] [--urls 10] [--resolves 10000] [--repeat 3]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+from django.conf import settings  # noqa: E402
+
+settings.configure()
+
+from django.conf.urls import include, url  # noqa: E402
+from django.urls.resolvers import RegexPattern, URLResolver  # noqa: E402
+
+from tethys_apps.base.url_map import django_url_preprocessor  # noqa: E402
+from tethys_apps.url_resolvers import AppsURLResolver  # noqa: E402
+
+
+def controller(request, *args, **kwargs):
+    pass
+
+
+def make_app_urls(num_apps, num_urls):
+    """
+    Make the url patterns of apps like those generated by the url maps of apps, included under the root url of each app.
+    """
+    app_urls = []
+    paths = []
+
+    for i in range(num_apps):
+        root_url = 'app-{}'.format(i)
+        urls = []
+        for j in range(num_urls):
+            regex = django_url_preprocessor('page-{}/{{item_id}}'.format(j), root_url, 'http')
+            urls.append(url(regex, controller, name='page_{}'.format(j)))
+            paths.append('{}/page-{}/{}/'.format(root_url, j, i))
+        namespace = root_url.replace('-', '_')
+        app_urls.append(url(r'^{0}/'.format(root_url), include((urls, namespace), namespace=namespace)))
+
+    return app_urls, paths
+
+
+def best_time(resolver, paths, resolves, repeat):
+    paths = (paths * (resolves // len(paths) + 1))[:resolves]
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            resolver.resolve(path)
+        times.append(time.perf_counter() - start)
+    return min(times) / resolves
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--apps', type=int, nargs='+', default=[1, 10, 40, 100], help='Numbers of apps.')
+    parser.add_argument('--urls', type=int, default=10, help='Number of urls of each app.')
+    parser.add_argument('--resolves', type=int, default=10000, help='Number of urls resolved.')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of times the urls are resolved.')
+    args = parser.parse_args()
+
+    print('Resolving the urls of apps with {} urls each (best of {}, per url):'.format(args.urls, args.repeat))
+    print('  {:>6} {:>12} {:>12} {:>8}'.format('apps', 'stock', 'apps', 'speedup'))
+
+    for num_apps in args.apps:
+        app_urls, paths = make_app_urls(num_apps, args.urls)
+        stock = best_time(URLResolver(RegexPattern(r'^'), app_urls), paths, args.resolves, args.repeat)
+        indexed = best_time(AppsURLResolver(app_urls), paths, args.resolves, args.repeat)
+        print('  {:>6} {:>9.1f} us {:>9.1f} us {:>7.1f}x'.format(num_apps, stock * 1e6, indexed * 1e6,
+                                                                 stock / indexed))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 import unittest
 from unittest import mock
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 from django.shortcuts import reverse
 from django.contrib.auth.models import User
 
@@ -161,39 +162,74 @@ class TestTethysAppAdmin(unittest.TestCase):
         ret = TethysAppAdmin(mock.MagicMock(), mock.MagicMock())
         self.assertFalse(ret.has_add_permission(mock.MagicMock()))
 
+    def _manage_app_storage_html(self, current_use, quota, app_id):
+        url = reverse('admin:clear_workspace', kwargs={'app_id': app_id})
+        usage_url = reverse('admin:workspace_usage', kwargs={'app_id': app_id})
+        return format_html("""
+                <span id="workspace-usage">{}</span><span> of {}</span>
+                <a id="clear-workspace" class="btn btn-danger btn-sm"
+                href="{url}">
+                Clear Workspace</a>
+                <script>
+                fetch("{usage_url}", {{credentials: "same-origin"}})
+                    .then(function(response) {{ return response.json(); }})
+                    .then(function(json) {{
+                        if (json.success) {{
+                            document.getElementById("workspace-usage").textContent = json.current_use;
+                        }}
+                    }});
+                </script>
+                """, current_use, mark_safe(quota), url=url, usage_url=usage_url)
+
+    @mock.patch('tethys_apps.admin._get_app_workspace')
+    @mock.patch('tethys_apps.admin.get_app_class')
     @mock.patch('tethys_apps.admin.get_quota')
     @mock.patch('tethys_apps.admin._convert_storage_units')
-    def test_TethysAppAdmin_manage_app_storage(self, mock_convert, mock_get_quota):
+    def test_TethysAppAdmin_manage_app_storage(self, mock_convert, mock_get_quota, mock_get_app_class, mock_gaw):
         ret = TethysAppAdmin(mock.MagicMock(), mock.MagicMock())
         app = mock.MagicMock()
         app.id = 1
         mock_convert.return_value = '0 bytes'
         mock_get_quota.return_value = {'quota': None}
-        url = reverse('admin:clear_workspace', kwargs={'app_id': app.id})
+        mock_gaw().get_cached_size.return_value = 0.0
 
-        expected_html = format_html("""
-                <span>{} of {}</span>
-                <a id="clear-workspace" class="btn btn-danger btn-sm"
-                href="{url}">
-                Clear Workspace</a>
-                """.format('0 bytes', "&#8734;", url=url))
+        expected_html = self._manage_app_storage_html('0 bytes', "&#8734;", app.id)
         actual_html = ret.manage_app_storage(app)
 
         self.assertEquals(expected_html.replace(" ", ""), actual_html.replace(" ", ""))
+        mock_get_app_class.assert_called_with(app)
+        mock_gaw().get_cached_size.assert_called_with('gb')
 
         mock_convert.return_value = '0 bytes'
         mock_get_quota.return_value = {'quota': 5, 'units': 'gb'}
-        url = reverse('admin:clear_workspace', kwargs={'app_id': app.id})
-
-        expected_html = format_html("""
-                        <span>{} of {}</span>
-                        <a id="clear-workspace" class="btn btn-danger btn-sm"
-                        href="{url}">
-                        Clear Workspace</a>
-                        """.format('0 bytes', "0 bytes", url=url))
+
+        expected_html = self._manage_app_storage_html('0 bytes', "0 bytes", app.id)
+        actual_html = ret.manage_app_storage(app)
+
+        self.assertEquals(expected_html.replace(" ", ""), actual_html.replace(" ", ""))
+
+    @mock.patch('tethys_apps.admin._get_app_workspace')
+    @mock.patch('tethys_apps.admin.get_app_class')
+    @mock.patch('tethys_apps.admin.get_quota')
+    def test_TethysAppAdmin_manage_app_storage_not_cached(self, mock_get_quota, mock_get_app_class, mock_gaw):
+        ret = TethysAppAdmin(mock.MagicMock(), mock.MagicMock())
+        app = mock.MagicMock()
+        app.id = 1
+        mock_get_quota.return_value = {'quota': None}
+        mock_gaw().get_cached_size.return_value = None
+
+        expected_html = self._manage_app_storage_html('Calculating...', "&#8734;", app.id)
+        actual_html = ret.manage_app_storage(app)
+
+        self.assertEquals(expected_html.replace(" ", ""), actual_html.replace(" ", ""))
+
+        mock_get_app_class.return_value = None
+        mock_gaw.reset_mock()
+
         actual_html = ret.manage_app_storage(app)
 
         self.assertEquals(expected_html.replace(" ", ""), actual_html.replace(" ", ""))
+        mock_gaw.assert_not_called()
 
     def test_TethysExtensionAdmin(self):
         expected_readonly_fields = ('package', 'name', 'description')
@@ -2,6 +2,7 @@ import unittest
 from unittest import mock
 import tethys_apps
 from tethys_apps.apps import TethysAppsConfig
+from tethys_apps.base.function_extractor import clear_function_cache
 
 
 class TestApps(unittest.TestCase):
@@ -15,8 +16,11 @@ class TestApps(unittest.TestCase):
         self.assertEqual('tethys_apps', TethysAppsConfig.name)
         self.assertEqual('Tethys Apps', TethysAppsConfig.verbose_name)
 
+    @mock.patch('tethys_apps.apps.file_changed')
     @mock.patch('tethys_apps.apps.SingletonHarvester')
-    def test_ready(self, mock_singleton_harvester):
+    def test_ready(self, mock_singleton_harvester, mock_file_changed):
         tethys_app_config_obj = TethysAppsConfig('tethys_apps', tethys_apps)
         tethys_app_config_obj.ready()
         mock_singleton_harvester().harvest.assert_called()
+        mock_file_changed.connect.assert_called_once_with(clear_function_cache,
+                                                          dispatch_uid='tethys_apps_clear_function_cache')
@@ -87,6 +87,27 @@ class TestTethysBase(unittest.TestCase):
         self.assertEqual('home', rts_call_args[0][1]['name'])
         self.assertIs(rts_call_args[0][0][1], test_func)
 
+    @mock.patch('tethys_apps.base.app_base.url')
+    @mock.patch('tethys_apps.base.app_base.TethysBaseMixin')
+    def test_url_patterns_async(self, mock_tbm, mock_url):
+        app = tethys_app_base.TethysBase()
+
+        async def test_func(request):
+            return request
+
+        url_map = mock.MagicMock(controller=test_func, url='test-app', protocol='http')
+        url_map.name = 'home'
+        app.url_maps = mock.MagicMock(return_value=[url_map])
+        mock_tbm.return_value = mock.MagicMock(url_maps='test-app')
+
+        # Execute
+        app.url_patterns
+
+        # The async controller is wrapped in a sync view
+        view = mock_url.call_args_list[0][0][1]
+        self.assertIs(test_func, view.__wrapped__)
+        self.assertEqual('request', view('request'))
+
     @mock.patch('tethys_apps.base.app_base.tethys_log')
     @mock.patch('tethys_apps.base.app_base.TethysBaseMixin')
     def test_url_patterns_import_error(self, mock_tbm, mock_log):
@@ -184,6 +205,27 @@ class TestTethysBase(unittest.TestCase):
         self.assertEqual('home_bokeh_ws', rts_call_args[1][1]['name'])
         self.assertIs(rts_call_args[0][1]['kwargs']['app_context']._application._handlers[0]._func, test_func)
 
+    @mock.patch('tethys_apps.base.app_base.url')
+    @mock.patch('tethys_apps.base.app_base.TethysBaseMixin')
+    def test_handler_patterns_document_pool_not_prewarmed(self, mock_tbm, mock_url):
+        app = tethys_app_base.TethysBase()
+        app._namespace = 'foo'
+        app.root_url = 'test-url'
+
+        def test_func(mock_doc):
+            return ''
+
+        test_func.document_pool = mock.MagicMock()
+        url_map = mock.MagicMock(controller='test_app.controllers.home',
+                                 handler=test_func, handler_type='bokeh', url='')
+        url_map.name = 'home'
+        app.url_maps = mock.MagicMock(return_value=[url_map, ])
+        mock_tbm.return_value = mock.MagicMock(url_maps=['test-app', ])
+
+        app.handler_patterns
+
+        test_func.document_pool.prewarm.assert_not_called()
+
     @mock.patch('tethys_apps.base.app_base.url')
     @mock.patch('tethys_apps.base.app_base.TethysBaseMixin')
     def test_handler_patterns_url_basename(self, mock_tbm, mock_url):
@@ -530,10 +572,11 @@ class TestTethysAppBase(unittest.TestCase):
         self.assertIn(':delete_test', check_list)
         self.assertIn('test_get', check_list)
 
-    @mock.patch('tethys_apps.base.app_base.HandoffManager')
-    def test_get_handoff_manager(self, mock_hom):
-        mock_hom.return_value = 'test_handoff'
+    @mock.patch('tethys_apps.base.app_base.get_app_handoff_manager')
+    def test_get_handoff_manager(self, mock_gahm):
+        mock_gahm.return_value = 'test_handoff'
         self.assertEqual('test_handoff', self.app.get_handoff_manager())
+        mock_gahm.assert_called_with(type(self.app))
 
     @mock.patch('tethys_compute.job_manager.JobManager')
     def test_get_job_manager(self, mock_jm):
@@ -3,10 +3,13 @@ from unittest import mock
 
 import bokeh.application.application as baa
 from bokeh.document import Document
+from bokeh.models import Div
 
 from django.contrib.auth.models import User
 from django.http import HttpRequest
-from tethys_apps.base.bokeh_handler import with_request, with_workspaces
+from django.test import override_settings
+from tethys_apps.base.bokeh_handler import with_request, with_workspaces, with_document_pool, cache_handler_data, \
+    DocumentPool
 
 
 @with_request
@@ -52,3 +55,109 @@ class TestBokehHandler(unittest.TestCase):
         ret = add_workspaces_to_document_handler(doc)
         self.assertIn('_get_user_workspace', ret[0].__repr__())
         self.assertIn('app_workspace', ret[1].__repr__())
+
+
+def pooled_handler(doc: Document):
+    doc.title = 'Pooled'
+    doc.template_variables['foo'] = 'bar'
+    doc.add_root(Div(text='pooled'))
+
+
+class TestDocumentPool(unittest.TestCase):
+    def setUp(self):
+        executor_patcher = mock.patch('tethys_apps.base.bokeh_handler._get_executor')
+        self.mock_get_executor = executor_patcher.start()
+        self.addCleanup(executor_patcher.stop)
+        # Run the prewarming synchronously
+        self.mock_get_executor().submit.side_effect = lambda func: func()
+
+    def test_prewarm(self):
+        pool = DocumentPool(pooled_handler, size=3)
+
+        pool.prewarm()
+        pool.prewarm()
+
+        self.assertEqual(3, len(pool))
+        self.assertEqual(3, self.mock_get_executor().submit.call_count)
+
+    def test_populate(self):
+        pool = DocumentPool(pooled_handler, size=2)
+        pool.prewarm()
+        pooled = pool._documents[0]
+        root = pooled.roots[0]
+
+        doc = Document()
+        pool.populate(doc)
+
+        self.assertEqual([root], doc.roots)
+        self.assertIs(doc, root.document)
+        self.assertEqual([], pooled.roots)
+        self.assertEqual('Pooled', doc.title)
+        self.assertEqual('bar', doc.template_variables['foo'])
+        # The pool is refilled
+        self.assertEqual(2, len(pool))
+
+    def test_get_document_empty(self):
+        self.mock_get_executor().submit.side_effect = None
+        mock_handler = mock.MagicMock()
+        pool = DocumentPool(mock_handler, size=1)
+
+        doc = pool.get_document()
+
+        mock_handler.assert_called_once_with(doc)
+        self.mock_get_executor().submit.assert_called_once_with(pool._add_document)
+
+    @mock.patch('tethys_apps.base.bokeh_handler.log')
+    def test_prewarm_exception(self, mock_log):
+        pool = DocumentPool(mock.MagicMock(side_effect=Exception('foo'), __name__='handler'), size=1)
+
+        pool.prewarm()
+
+        self.assertEqual(0, len(pool))
+        self.assertEqual(0, pool._pending)
+        mock_log.exception.assert_called_once()
+
+    @override_settings(BOKEH_DOCUMENT_POOL_SIZE=5)
+    def test_with_document_pool(self):
+        handler = with_document_pool(pooled_handler)
+        doc = Document()
+
+        # The pool is filled from the first session on
+        self.assertEqual(0, len(handler.document_pool))
+        handler(doc)
+
+        self.assertEqual(5, handler.document_pool.size)
+        self.assertEqual(5, len(handler.document_pool))
+        self.assertEqual('Pooled', doc.title)
+        self.assertEqual(1, len(doc.roots))
+        self.assertEqual(2, with_document_pool(size=2)(pooled_handler).document_pool.size)
+
+
+class TestCacheHandlerData(unittest.TestCase):
+    def test_cache_handler_data(self):
+        mock_func = mock.MagicMock(side_effect=lambda station, units='cfs': [station, units], __name__='load')
+        load = cache_handler_data(mock_func)
+
+        self.assertEqual(['a', 'cfs'], load('a'))
+        self.assertEqual(['a', 'cfs'], load('a'))
+        self.assertEqual(['a', 'cms'], load('a', units='cms'))
+        self.assertEqual(2, mock_func.call_count)
+
+        load.cache_clear()
+        load('a')
+        self.assertEqual(3, mock_func.call_count)
+
+    @mock.patch('tethys_apps.base.bokeh_handler.time.monotonic')
+    def test_cache_handler_data_expired(self, mock_monotonic):
+        mock_monotonic.return_value = 0
+        mock_func = mock.MagicMock(return_value='data', __name__='load')
+        load = cache_handler_data(ttl=10)(mock_func)
+
+        load('a')
+        mock_monotonic.return_value = 5
+        load('a')
+        mock_func.assert_called_once_with('a')
+
+        mock_monotonic.return_value = 11
+        load('a')
+        self.assertEqual(2, mock_func.call_count)
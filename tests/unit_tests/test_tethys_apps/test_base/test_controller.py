@@ -15,3 +15,19 @@ class TestController(unittest.TestCase):
         kwargs = {'foo': 'bar'}
         tethys_controller.TethysController.as_controller(**kwargs)
         mock_as_view.assert_called_with(**kwargs)
+
+    def test_async_controller(self):
+        async def home(request, item_id):
+            return request, item_id
+
+        view = tethys_controller.async_controller(home)
+
+        self.assertEqual(('request', '42'), view('request', item_id='42'))
+        self.assertEqual('home', view.__name__)
+        self.assertIs(home, view.__wrapped__)
+
+    def test_async_controller_sync(self):
+        def home(request):
+            return request
+
+        self.assertIs(home, tethys_controller.async_controller(home))
@@ -1,5 +1,6 @@
 import unittest
 import types
+from unittest import mock
 import tethys_apps.base.function_extractor as tethys_function_extractor
 
 
@@ -9,10 +10,10 @@ def test_func():
 
 class TestTethysFunctionExtractor(unittest.TestCase):
     def setUp(self):
-        pass
+        tethys_function_extractor.clear_function_cache()
 
     def tearDown(self):
-        pass
+        tethys_function_extractor.clear_function_cache()
 
     def test_init(self):
         path = 'tethysapp-test_app.tethysapp.test_app.controller.home'
@@ -51,3 +52,48 @@ class TestTethysFunctionExtractor(unittest.TestCase):
             return app.function
 
         self.assertRaises(ImportError, test_function_import)
+
+    def test_function_invalid_path(self):
+        app = tethys_function_extractor.TethysFunctionExtractor(path='foo', throw=True)
+
+        def test_function_path():
+            return app.function
+
+        self.assertRaises(ValueError, test_function_path)
+        self.assertFalse(tethys_function_extractor.TethysFunctionExtractor(path='foo').valid)
+
+    @mock.patch('tethys_apps.base.function_extractor.TethysFunctionExtractor._import_function')
+    def test_function_cached(self, mock_import_function):
+        mock_import_function.side_effect = lambda module_path, function_name: test_func
+        path = 'test_app.model.test_initializer'
+
+        result1 = tethys_function_extractor.TethysFunctionExtractor(path=path).function
+        result2 = tethys_function_extractor.TethysFunctionExtractor(path=path).function
+        result3 = tethys_function_extractor.TethysFunctionExtractor(path=path, prefix='').function
+
+        self.assertIs(test_func, result1)
+        self.assertIs(test_func, result2)
+        self.assertIs(test_func, result3)
+        mock_import_function.assert_has_calls([
+            mock.call('tethysapp.test_app.model', 'test_initializer'),
+            mock.call('test_app.model', 'test_initializer'),
+        ])
+        self.assertEqual(2, mock_import_function.call_count)
+
+        tethys_function_extractor.clear_function_cache()
+        tethys_function_extractor.TethysFunctionExtractor(path=path).function
+        self.assertEqual(3, mock_import_function.call_count)
+
+    @mock.patch('tethys_apps.base.function_extractor.__import__', create=True)
+    def test_function_error_cached(self, mock_import):
+        mock_import.side_effect = ImportError('No module named test_app1')
+        path = 'test_app1.foo'
+
+        self.assertFalse(tethys_function_extractor.TethysFunctionExtractor(path=path).valid)
+        self.assertIsNone(tethys_function_extractor.TethysFunctionExtractor(path=path).function)
+
+        app = tethys_function_extractor.TethysFunctionExtractor(path=path, throw=True)
+        with self.assertRaises(ImportError):
+            app.function
+
+        mock_import.assert_called_once_with('tethysapp.test_app1', fromlist=['foo'])
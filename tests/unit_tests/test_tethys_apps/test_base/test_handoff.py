@@ -1,3 +1,4 @@
+import json
 import unittest
 import tethys_apps.base.handoff as tethys_handoff
 from types import FunctionType
@@ -87,22 +88,39 @@ class TestHandoffManager(unittest.TestCase):
         # Check Result
         self.assertEqual([handler1], result)
 
-    @mock.patch('tethys_apps.base.handoff.json')
-    def test_get_capabilities_json(self, mock_json):
+    def test_get_capabilities_json(self):
         # Mock app
         app = mock.MagicMock()
 
-        # Mock HandoffHandler.__json
-
-        handler1 = mock.MagicMock(name='test_name')
-        manager = mock.MagicMock(valid_handlers=[handler1])
+        manager = mock.MagicMock()
+        manager._get_capabilities_json.return_value = '[]'
         self.hm._get_handoff_manager_for_app = mock.MagicMock(return_value=manager)
 
-        tethys_handoff.HandoffManager(app=app).get_capabilities(app_name='test_app', jsonify=True)
+        result = tethys_handoff.HandoffManager(app=app).get_capabilities(app_name='test_app', external_only=True,
+                                                                         jsonify=True)
 
         # Check Result
-        rts_call_args = mock_json.dumps.call_args_list
-        self.assertEqual('test_name', rts_call_args[0][0][0][0]['_mock_name'])
+        self.assertEqual('[]', result)
+        manager._get_capabilities_json.assert_called_with(True)
+
+    def test__get_capabilities_json(self):
+        # Mock app
+        app = mock.MagicMock()
+        app.handoff_handlers.return_value = [
+            tethys_handoff.HandoffHandler(name='external', handler=test_function),
+            tethys_handoff.HandoffHandler(name='internal', handler=test_function, internal=True),
+        ]
+        manager = tethys_handoff.HandoffManager(app=app)
+
+        with mock.patch('tethys_apps.base.handoff.json.dumps', wraps=json.dumps) as mock_dumps:
+            result = manager._get_capabilities_json(external_only=True)
+
+            # Encoded once
+            self.assertIs(result, manager._get_capabilities_json(external_only=True))
+            mock_dumps.assert_called_once()
+
+        self.assertEqual(['external'], [h['name'] for h in json.loads(result)])
+        self.assertEqual(['external', 'internal'], [h['name'] for h in json.loads(manager._get_capabilities_json())])
 
     def test_get_handler(self):
         app = mock.MagicMock()
@@ -168,6 +186,19 @@ class TestHandoffManager(unittest.TestCase):
             format('test manager name', 'test_handler')
         self.assertIn(check_message, rts_call_args[0][0][0])
 
+    @mock.patch('tethys_apps.base.handoff.tethys_log')
+    def test_get_valid_handlers_invalid(self, mock_log):
+        app = mock.MagicMock(package='test_app')
+        handler1 = mock.MagicMock(handler='controllers.missing', valid=False)
+        handler1.name = 'missing'
+        app.handoff_handlers.return_value = [handler1]
+
+        result = tethys_handoff.HandoffManager(app=app)._get_valid_handlers()
+
+        self.assertEqual([], result)
+        mock_log.warning.assert_called_with(
+            'Handoff handler "missing" of app "test_app" is not valid: unable to import "controllers.missing".')
+
     def test_get_valid_handlers(self):
         app = mock.MagicMock(package='test_app')
 
@@ -236,6 +267,7 @@ class TestGetHandoffManagerFroApp(unittest.TestCase):
 
         self.assertEqual(app, result.app)
 
+    @mock.patch('tethys_apps.base.handoff._handoff_managers', {})
     @mock.patch('tethys_apps.base.handoff.tethys_apps')
     def test_with_app(self, mock_ta):
         app = mock.MagicMock(package='test_app')
@@ -246,6 +278,45 @@ class TestGetHandoffManagerFroApp(unittest.TestCase):
         # Check result
         self.assertEqual('test_manager', result)
 
+    @mock.patch('tethys_apps.base.handoff._handoff_managers', {'test_app': 'test_manager'})
+    @mock.patch('tethys_apps.base.handoff.tethys_apps')
+    def test_with_app_registered(self, mock_ta):
+        app = mock.MagicMock()
+        result = tethys_handoff.HandoffManager(app=app)._get_handoff_manager_for_app(app_name='test_app')
+
+        # Check result
+        self.assertEqual('test_manager', result)
+        mock_ta.harvester.SingletonHarvester.assert_not_called()
+
+
+class TestGetAppHandoffManager(unittest.TestCase):
+    def setUp(self):
+        tethys_handoff.clear_handoff_managers()
+
+    def tearDown(self):
+        tethys_handoff.clear_handoff_managers()
+
+    @mock.patch('tethys_apps.base.handoff.HandoffManager')
+    def test_get_app_handoff_manager(self, mock_hm):
+        app_class = mock.MagicMock(package='test_app')
+
+        result = tethys_handoff.get_app_handoff_manager(app_class)
+
+        # Created once
+        self.assertIs(mock_hm.return_value, result)
+        self.assertIs(result, tethys_handoff.get_app_handoff_manager(app_class))
+        mock_hm.assert_called_once_with(app_class.return_value)
+
+    @mock.patch('tethys_apps.base.handoff.HandoffManager')
+    def test_clear_handoff_managers(self, mock_hm):
+        app_class = mock.MagicMock(package='test_app')
+        tethys_handoff.get_app_handoff_manager(app_class)
+
+        tethys_handoff.clear_handoff_managers()
+        tethys_handoff.get_app_handoff_manager(app_class)
+
+        self.assertEqual(2, mock_hm.call_count)
+
 
 class TestTestAppHandoff(TethysTestCase):
     def set_up(self):
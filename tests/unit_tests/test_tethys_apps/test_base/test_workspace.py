@@ -1,14 +1,18 @@
 import unittest
+from asgiref.sync import async_to_sync
 import tethys_apps.base.workspace as base_workspace
 import os
+import sys
 import shutil
 from unittest import mock
 from ... import UserFactory
 from django.http import HttpRequest
+from django.core.cache import cache
 from django.contrib.auth.models import User
 from django.core.exceptions import PermissionDenied
 import tethys_apps.base.app_base as tethys_app_base
-from tethys_apps.base.workspace import user_workspace, app_workspace, _get_app_workspace, _get_user_workspace
+from tethys_apps.base.workspace import user_workspace, app_workspace, _get_app_workspace, _get_user_workspace, \
+    _get_user_workspaces
 from tethys_quotas.models import ResourceQuota
 
 
@@ -22,6 +26,16 @@ def app_dec_controller(request, app_workspace):
     return app_workspace
 
 
+@user_workspace
+async def user_dec_async_controller(request, user_workspace):
+    return user_workspace
+
+
+@app_workspace
+async def app_dec_async_controller(request, app_workspace):
+    return app_workspace
+
+
 class TestUrlMap(unittest.TestCase):
     def setUp(self):
         self.root = os.path.abspath(os.path.dirname(__file__))
@@ -30,8 +44,12 @@ class TestUrlMap(unittest.TestCase):
         self.test_root2 = os.path.join(self.root, 'test_workspace2')
         self.app = tethys_app_base.TethysAppBase()
         self.user = UserFactory()
+        base_workspace.clear_workspace_cache()
+        cache.clear()
 
     def tearDown(self):
+        base_workspace.clear_workspace_cache()
+        cache.clear()
         if os.path.isdir(self.test_root):
             shutil.rmtree(self.test_root)
         if os.path.isdir(self.test_root2):
@@ -122,6 +140,125 @@ class TestUrlMap(unittest.TestCase):
         workspace.path = 'foo'
         self.assertEqual(self.test_root, workspace.path)
 
+    def _create_entries(self):
+        workspace = base_workspace.TethysWorkspace(path=self.test_root)
+        os.makedirs(os.path.join(self.test_root, 'sub', 'nested'))
+        contents = {
+            'a.nc': 'aaa',
+            'b.txt': 'b',
+            'c.nc': 'cccccc',
+            os.path.join('sub', 'd.nc'): 'dd',
+            os.path.join('sub', 'nested', 'e.txt'): 'eeee',
+        }
+        for relative_path, content in contents.items():
+            with open(os.path.join(self.test_root, relative_path), 'w') as f:
+                f.write(content)
+        return workspace
+
+    def test_iter_entries(self):
+        workspace = self._create_entries()
+
+        result = sorted(e.relative_path for e in workspace.iter_entries())
+        self.assertListEqual(['a.nc', 'b.txt', 'c.nc', 'sub'], result)
+
+        result = sorted(e.relative_path for e in workspace.iter_entries(recursive=True))
+        expected = ['a.nc', 'b.txt', 'c.nc', 'sub', os.path.join('sub', 'd.nc'), os.path.join('sub', 'nested'),
+                    os.path.join('sub', 'nested', 'e.txt')]
+        self.assertListEqual(expected, result)
+
+        result = [e.name for e in workspace.iter_entries(include_files=False, recursive=True, sort_by='name')]
+        self.assertListEqual(['sub', 'nested'], result)
+
+        result = [e.relative_path for e in workspace.iter_entries(pattern='*.nc', recursive=True, sort_by='name')]
+        self.assertListEqual(['a.nc', 'c.nc', os.path.join('sub', 'd.nc')], result)
+
+        result = [e.name for e in workspace.iter_entries(predicate=lambda e: e.is_file() and e.size > 2,
+                                                         recursive=True, sort_by='size', reverse=True)]
+        self.assertListEqual(['c.nc', 'e.txt', 'a.nc'], result)
+
+        entry = next(workspace.iter_entries(pattern='a.nc'))
+        self.assertEqual(os.path.join(self.test_root, 'a.nc'), entry.path)
+        self.assertEqual(3, entry.size)
+        self.assertEqual(os.path.getmtime(entry.path), entry.modified)
+        self.assertTrue(entry.is_file())
+        self.assertFalse(entry.is_dir())
+        self.assertEqual('<WorkspaceEntry path="a.nc">', repr(entry))
+
+    def test_iter_entries_invalid_sort_by(self):
+        workspace = base_workspace.TethysWorkspace(path=self.test_root)
+        with self.assertRaises(ValueError) as context:
+            workspace.iter_entries(sort_by='foo')
+        self.assertEqual('Invalid value for argument "sort_by": must be one of modified, name, size.',
+                         str(context.exception))
+
+    def test_paginate(self):
+        workspace = self._create_entries()
+
+        entries, cursor = workspace.paginate(limit=2, recursive=True, include_directories=False)
+        self.assertListEqual(['a.nc', 'b.txt'], [e.name for e in entries])
+        self.assertIsNotNone(cursor)
+
+        entries, cursor = workspace.paginate(limit=2, cursor=cursor, recursive=True, include_directories=False)
+        self.assertListEqual(['c.nc', 'd.nc'], [e.name for e in entries])
+
+        entries, cursor = workspace.paginate(limit=2, cursor=cursor, recursive=True, include_directories=False)
+        self.assertListEqual(['e.txt'], [e.name for e in entries])
+        self.assertIsNone(cursor)
+
+    def test_paginate_sort_reverse(self):
+        workspace = self._create_entries()
+        names = []
+        entries, cursor = workspace.paginate(limit=1, sort_by='size', reverse=True, pattern='*.nc')
+        names.extend(e.name for e in entries)
+
+        while cursor:
+            entries, cursor = workspace.paginate(limit=1, cursor=cursor, sort_by='size', reverse=True,
+                                                 pattern='*.nc')
+            names.extend(e.name for e in entries)
+
+        self.assertListEqual(['c.nc', 'a.nc'], names)
+
+    def test_paginate_invalid(self):
+        workspace = base_workspace.TethysWorkspace(path=self.test_root)
+        self.assertRaises(ValueError, workspace.paginate, limit=0)
+        self.assertRaises(ValueError, workspace.paginate, cursor='not-a-cursor')
+
+    def test_get_cached_size(self):
+        workspace = self._create_entries()
+        self.assertIsNone(workspace.get_cached_size())
+
+        self.assertEqual(10, workspace.get_size())
+        self.assertEqual(10, workspace.get_cached_size())
+        self.assertEqual(10 / 1024, workspace.get_cached_size('kb'))
+
+        workspace.remove('a.nc')
+        self.assertIsNone(workspace.get_cached_size())
+
+        self.assertEqual(7, workspace.get_size())
+        workspace.clear()
+        self.assertIsNone(workspace.get_cached_size())
+
+    def test_size_cache_key(self):
+        workspace = base_workspace.TethysWorkspace(os.path.join(self.test_root, 'a' * 200, 'with spaces'))
+
+        key = workspace._size_cache_key
+
+        self.assertTrue(key.startswith(base_workspace.WORKSPACE_SIZE_CACHE_PREFIX))
+        self.assertLessEqual(len(key), 250)
+        self.assertNotIn(' ', key)
+        self.assertNotEqual(key, base_workspace.TethysWorkspace(self.test_root2)._size_cache_key)
+
+    def test_get_workspace_sizes(self):
+        workspace = self._create_entries()
+        workspace2 = base_workspace.TethysWorkspace(path=self.test_root2)
+
+        result = base_workspace._get_workspace_sizes({'a': workspace, 'b': workspace2}, 'kb')
+
+        self.assertDictEqual({'a': 10 / 1024, 'b': 0.0}, result)
+        self.assertEqual(10, workspace.get_cached_size())
+        self.assertEqual(0, workspace2.get_cached_size())
+        self.assertDictEqual({}, base_workspace._get_workspace_sizes({}))
+
     @mock.patch('tethys_apps.base.workspace.TethysWorkspace')
     def test_get_user_workspace(self, mock_tws):
         user = self.user
@@ -173,6 +310,60 @@ class TestUrlMap(unittest.TestCase):
         self.assertIn('app_workspace', rts_call_args[0][0][0])
         self.assertNotIn('user_workspaces', rts_call_args[0][0][0])
 
+    @mock.patch('tethys_apps.base.workspace.TethysWorkspace')
+    def test_get_workspace_cached(self, mock_tws):
+        _get_user_workspace(self.app, self.user)
+        _get_user_workspace(self.app, self.user)
+        _get_app_workspace(self.app)
+        _get_app_workspace(self.app)
+
+        self.assertEqual(2, mock_tws.call_count)
+        self.assertEqual(2, base_workspace._get_workspace.cache_info().currsize)
+
+        base_workspace.clear_workspace_cache()
+        self.assertEqual(0, base_workspace._get_workspace.cache_info().currsize)
+
+    def test_get_workspace_deleted(self):
+        app_module = mock.MagicMock(__file__=os.path.join(self.test_root, 'app.py'))
+
+        with mock.patch.dict(sys.modules, {'test_workspace_app': app_module}):
+            workspace = base_workspace._get_workspace('test_workspace_app', self.user.username)
+            shutil.rmtree(workspace._path)
+            result = base_workspace._get_workspace('test_workspace_app', self.user.username)
+
+        # Recreated when listed
+        self.assertIs(workspace, result)
+        self.assertEqual([], result.files())
+        self.assertEqual(os.path.join(self.test_root, 'workspaces', 'user_workspaces', self.user.username), result.path)
+        self.assertTrue(os.path.isdir(result.path))
+
+        # Recreated when the path is accessed after the check interval
+        shutil.rmtree(result._path)
+        self.assertFalse(os.path.isdir(result.path))
+
+        with mock.patch('tethys_apps.base.workspace.WORKSPACE_CHECK_INTERVAL', -1):
+            self.assertTrue(os.path.isdir(result.path))
+
+    @mock.patch('tethys_apps.base.workspace.TethysWorkspace')
+    def test_get_user_workspaces(self, mock_tws):
+        app2 = mock.MagicMock(__module__='tethys_apps.base.workspace')
+        ret = _get_user_workspaces(self.user, apps=[self.app, app2])
+
+        self.assertListEqual([self.app, app2], list(ret.keys()))
+        self.assertIs(ret[self.app], mock_tws.return_value)
+        self.assertEqual(2, mock_tws.call_count)
+        for call_args in mock_tws.call_args_list:
+            self.assertIn(os.path.join('user_workspaces', self.user.username), call_args[0][0])
+
+    @mock.patch('tethys_apps.harvester.SingletonHarvester')
+    @mock.patch('tethys_apps.base.workspace.TethysWorkspace')
+    def test_get_user_workspaces_installed_apps(self, _, mock_harvester):
+        mock_harvester().apps = [self.app]
+
+        ret = _get_user_workspaces(self.user)
+
+        self.assertListEqual([self.app], list(ret.keys()))
+
     @mock.patch('tethys_apps.base.workspace.log')
     @mock.patch('tethys_quotas.models.ResourceQuota')
     @mock.patch('tethys_apps.utilities.get_active_app')
@@ -200,6 +391,21 @@ class TestUrlMap(unittest.TestCase):
         user_dec_controller(mock_request)
         mock_log.warning.assert_called_with('ResourceQuota with codename user_workspace_quota does not exist.')
 
+    @mock.patch('tethys_quotas.models.ResourceQuota')
+    @mock.patch('tethys_apps.utilities.get_active_app')
+    @mock.patch('tethys_apps.base.workspace._get_user_workspace')
+    def test_user_workspace_async(self, mock_guw, mock_app, mock_rq):
+        mock_rq.DoesNotExist = ResourceQuota.DoesNotExist
+        mock_request = mock.MagicMock(spec=HttpRequest, user=mock.MagicMock(spec=User))
+
+        ret = async_to_sync(user_dec_async_controller)(mock_request)
+
+        self.assertEqual(mock_guw.return_value, ret)
+        mock_guw.assert_called_with(mock_app.return_value, mock_request.user)
+
+    def test_user_workspace_async_no_HttpRequest(self):
+        self.assertRaises(ValueError, async_to_sync(user_dec_async_controller), mock.MagicMock())
+
     def test_user_workspace_no_HttpRequest(self):
         mock_request = mock.MagicMock()
         ret = None
@@ -253,6 +459,19 @@ class TestUrlMap(unittest.TestCase):
         app_dec_controller(mock_request)
         mock_log.warning.assert_called_with('ResourceQuota with codename app_workspace_quota does not exist.')
 
+    @mock.patch('tethys_apps.base.workspace.passes_quota')
+    @mock.patch('tethys_quotas.models.ResourceQuota')
+    @mock.patch('tethys_apps.utilities.get_active_app')
+    @mock.patch('tethys_apps.base.workspace._get_app_workspace')
+    def test_app_workspace_async(self, mock_gaw, mock_app, mock_rq, _):
+        mock_rq.DoesNotExist = ResourceQuota.DoesNotExist
+        mock_request = mock.MagicMock(spec=HttpRequest, user=mock.MagicMock(spec=User))
+
+        ret = async_to_sync(app_dec_async_controller)(mock_request)
+
+        self.assertEqual(mock_gaw.return_value, ret)
+        mock_gaw.assert_called_with(mock_app.return_value)
+
     def test_app_workspace_no_HttpRequest(self):
         mock_request = mock.MagicMock()
         ret = None
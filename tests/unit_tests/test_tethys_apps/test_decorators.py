@@ -1,6 +1,7 @@
 import unittest
 from unittest import mock
 
+from asgiref.sync import async_to_sync
 from django.contrib.auth.models import AnonymousUser
 from django.test import RequestFactory
 from django.test.utils import override_settings
@@ -189,3 +190,69 @@ class DecoratorsTest(unittest.TestCase):
         f = Foo()
 
         self.assertEqual(f.method(request), "expected_result")
+
+    @override_settings(ENABLE_OPEN_PORTAL=False)
+    def test_login_required_async(self):
+        request = self.request_factory.get('/apps/test-app')
+        request.user = self.user
+
+        @login_required()
+        async def create_projects(request, *args, **kwargs):
+            return "expected_result"
+
+        self.assertEqual('expected_result', async_to_sync(create_projects)(request))
+
+    @override_settings(ENABLE_OPEN_PORTAL=False)
+    def test_login_required_async_fail(self):
+        request = self.request_factory.get('/apps/test-app')
+        request.user = AnonymousUser()
+
+        @login_required()
+        async def create_projects(request, *args, **kwargs):
+            return "expected_result"
+
+        ret = async_to_sync(create_projects)(request)
+
+        self.assertIsInstance(ret, HttpResponseRedirect)
+        self.assertIn('/accounts/login/', ret.url)
+
+    @override_settings(ENABLE_OPEN_PORTAL=True)
+    def test_login_required_async_open_portal(self):
+        request = self.request_factory.get('/apps/test-app')
+        request.user = AnonymousUser()
+
+        @login_required()
+        async def create_projects(request, *args, **kwargs):
+            return "expected_result"
+
+        self.assertEqual('expected_result', async_to_sync(create_projects)(request))
+
+    @mock.patch('tethys_apps.decorators.has_permission', return_value=True)
+    def test_permission_required_async(self, mock_has_permission):
+        request = self.request_factory.get('/apps/test-app')
+        request.user = self.user
+
+        class Foo:
+            @permission_required('create_projects')
+            async def method(self, request, *args, **kwargs):
+                return "expected_result", args, kwargs
+
+        ret = async_to_sync(Foo().method)(request, 'foo', bar='baz')
+
+        self.assertEqual(("expected_result", ('foo',), {'bar': 'baz'}), ret)
+        mock_has_permission.assert_called_with(request, 'create_projects')
+
+    @mock.patch('tethys_apps.decorators.messages')
+    @mock.patch('tethys_apps.decorators.has_permission', return_value=False)
+    def test_permission_required_async_denied(self, _, __):
+        request = self.request_factory.get('/apps/test-app')
+        request.user = self.user
+
+        @permission_required('create_projects')
+        async def create_projects(request, *args, **kwargs):
+            return "expected_result"
+
+        ret = async_to_sync(create_projects)(request)
+
+        self.assertIsInstance(ret, HttpResponseRedirect)
+        self.assertEqual('/apps/', ret.url)
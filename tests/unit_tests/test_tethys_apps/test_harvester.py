@@ -242,6 +242,25 @@ class HarvesterTest(unittest.TestCase):
         mock_url_maps.assert_called()
         self.assertIn('Tethys Apps Loaded:', mock_stdout.getvalue())
 
+    @mock.patch('tethys_apps.base.handoff._handoff_managers', {})
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    @mock.patch('tethys_apps.harvester.tethys_log.exception')
+    @mock.patch('tethysapp.test_app.app.TestApp.handoff_handlers')
+    def test_harvest_app_instances_load_handoff_handlers_exception(self, mock_handoff_handlers, mock_logexception,
+                                                                   mock_stdout):
+        """
+        Test for SingletonHarvester._harvest_app_instances
+        For the app handoff handlers exception, which does not prevent the app from loading
+        """
+        list_apps = {'test_app': 'tethysapp.test_app'}
+        mock_handoff_handlers.side_effect = ImportError
+
+        shv = SingletonHarvester()
+        shv._harvest_app_instances(list_apps)
+
+        mock_logexception.assert_called_with('Unable to load the handoff handlers of app tethysapp.test_app:')
+        self.assertIn('test_app', shv.app_modules)
+
     @mock.patch('sys.stdout', new_callable=io.StringIO)
     @mock.patch('tethys_apps.harvester.tethys_log.exception')
     @mock.patch('tethysapp.test_app.app.TestApp.url_maps')
@@ -0,0 +1,91 @@
+import unittest
+from unittest import mock
+
+from requests import RequestException
+
+from tethys_apps.management.commands import bundle_gizmo_assets
+
+
+class ManagementCommandsBundleGizmoAssetsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dependencies = {
+            'global_js': ['https://cdnjs.cloudflare.com/ajax/libs/d3/4.12.2/d3.min.js', 'https://js.arcgis.com/4.2/'],
+            'global_css': [],
+            'js': ['tethys_gizmos/js/a.js', 'tethys_gizmos/js/tethys_gizmos.js'],
+            'css': [],
+        }
+        get_dependencies_patcher = mock.patch(
+            'tethys_gizmos.templatetags.tethys_gizmos.TethysGizmoDependenciesNode.get_dependencies',
+            return_value=self.dependencies
+        )
+        self.mock_get_dependencies = get_dependencies_patcher.start()
+        self.addCleanup(get_dependencies_patcher.stop)
+
+        gizmo_name_map_patcher = mock.patch.dict(
+            'tethys_gizmos.templatetags.tethys_gizmos.GIZMO_NAME_MAP', {'foo': mock.MagicMock()}, clear=True
+        )
+        gizmo_name_map_patcher.start()
+        self.addCleanup(gizmo_name_map_patcher.stop)
+
+        settings_patcher = mock.patch('tethys_apps.management.commands.bundle_gizmo_assets.settings')
+        self.mock_settings = settings_patcher.start()
+        self.mock_settings.STATIC_ROOT = '/foo/static'
+        self.addCleanup(settings_patcher.stop)
+
+    def tearDown(self):
+        pass
+
+    @mock.patch('tethys_apps.management.commands.bundle_gizmo_assets.print')
+    @mock.patch('tethys_apps.management.commands.bundle_gizmo_assets.bundle_dependencies')
+    @mock.patch('tethys_apps.management.commands.bundle_gizmo_assets.vendor_cdn_asset')
+    def test_handle(self, mock_vendor, mock_bundle, mock_print):
+        cmd = bundle_gizmo_assets.Command()
+        cmd.handle(no_vendor=False)
+
+        self.mock_get_dependencies.assert_called_once_with(['foo'])
+        mock_vendor.assert_called_once_with('https://cdnjs.cloudflare.com/ajax/libs/d3/4.12.2/d3.min.js')
+        mock_bundle.assert_any_call(self.dependencies['js'])
+        self.assertEqual(4, mock_bundle.call_count)
+        mock_print.assert_called_with('INFO: Successfully bundled the dependencies of 1 gizmos.')
+
+    @mock.patch('tethys_apps.management.commands.bundle_gizmo_assets.print')
+    @mock.patch('tethys_apps.management.commands.bundle_gizmo_assets.bundle_dependencies')
+    @mock.patch('tethys_apps.management.commands.bundle_gizmo_assets.vendor_cdn_asset')
+    def test_handle_vendor_error(self, mock_vendor, mock_bundle, mock_print):
+        mock_vendor.side_effect = RequestException('Not found')
+
+        cmd = bundle_gizmo_assets.Command()
+        cmd.handle(no_vendor=False)
+
+        mock_print.assert_any_call('WARNING: Unable to vendor '
+                                   '"https://cdnjs.cloudflare.com/ajax/libs/d3/4.12.2/d3.min.js", '
+                                   'it will be loaded from its CDN: Not found')
+        self.assertEqual(4, mock_bundle.call_count)
+
+    @mock.patch('tethys_apps.management.commands.bundle_gizmo_assets.print')
+    @mock.patch('tethys_apps.management.commands.bundle_gizmo_assets.bundle_dependencies')
+    @mock.patch('tethys_apps.management.commands.bundle_gizmo_assets.vendor_cdn_asset')
+    def test_handle_no_vendor(self, mock_vendor, mock_bundle, _):
+        cmd = bundle_gizmo_assets.Command()
+        cmd.handle(no_vendor=True)
+
+        mock_vendor.assert_not_called()
+        self.assertEqual(4, mock_bundle.call_count)
+
+    @mock.patch('tethys_apps.management.commands.bundle_gizmo_assets.print')
+    @mock.patch('tethys_apps.management.commands.bundle_gizmo_assets.exit')
+    @mock.patch('tethys_apps.management.commands.bundle_gizmo_assets.bundle_dependencies')
+    @mock.patch('tethys_apps.management.commands.bundle_gizmo_assets.vendor_cdn_asset')
+    def test_handle_no_static_root(self, mock_vendor, mock_bundle, mock_exit, mock_print):
+        self.mock_settings.STATIC_ROOT = None
+        mock_exit.side_effect = SystemExit
+
+        cmd = bundle_gizmo_assets.Command()
+        self.assertRaises(SystemExit, cmd.handle, no_vendor=False)
+
+        mock_print.assert_called_once_with('WARNING: Cannot find the STATIC_ROOT setting. Please provide the path to '
+                                           'the static directory using the STATIC_ROOT setting in the '
+                                           'portal_config.yml file and try again.')
+        mock_vendor.assert_not_called()
+        mock_bundle.assert_not_called()
@@ -7,7 +7,15 @@ from tethys_apps.management.commands import pre_collectstatic
 class ManagementCommandsPreCollectStaticTests(unittest.TestCase):
 
     def setUp(self):
-        pass
+        get_plotlyjs_static_path_patcher = mock.patch(
+            'tethys_apps.management.commands.pre_collectstatic.get_plotlyjs_static_path'
+        )
+        self.mock_get_plotlyjs_static_path = get_plotlyjs_static_path_patcher.start()
+        self.addCleanup(get_plotlyjs_static_path_patcher.stop)
+
+        call_command_patcher = mock.patch('tethys_apps.management.commands.pre_collectstatic.call_command')
+        self.mock_call_command = call_command_patcher.start()
+        self.addCleanup(call_command_patcher.stop)
 
     def tearDown(self):
         pass
@@ -247,3 +255,49 @@ class ManagementCommandsPreCollectStaticTests(unittest.TestCase):
             self.assertNotEqual(info_not_in_second, print_args[i][0][0])
             self.assertNotEqual(info_not_in_third, print_args[i][0][0])
             self.assertNotEqual(info_not_in_fourth, print_args[i][0][0])
+
+    @mock.patch('tethys_apps.management.commands.pre_collectstatic.print')
+    @mock.patch('tethys_apps.management.commands.pre_collectstatic.get_installed_tethys_extensions')
+    @mock.patch('tethys_apps.management.commands.pre_collectstatic.get_installed_tethys_apps')
+    @mock.patch('tethys_apps.management.commands.pre_collectstatic.settings')
+    def test_handle_plotlyjs(self, mock_settings, mock_get_apps, mock_get_extensions, mock_print):
+        mock_settings.STATIC_ROOT = '/foo/testing/tests'
+        mock_get_apps.return_value = {}
+        mock_get_extensions.return_value = {}
+        self.mock_get_plotlyjs_static_path.return_value = 'tethys_gizmos/vendor/plotly/plotly.min.js'
+
+        cmd = pre_collectstatic.Command()
+        cmd.handle(options='foo')
+
+        self.mock_get_plotlyjs_static_path.assert_called_once()
+        mock_print.assert_called_with('INFO: Successfully wrote plotly.js to STATIC_ROOT.')
+
+    @mock.patch('tethys_apps.management.commands.pre_collectstatic.print')
+    @mock.patch('tethys_apps.management.commands.pre_collectstatic.get_installed_tethys_extensions')
+    @mock.patch('tethys_apps.management.commands.pre_collectstatic.get_installed_tethys_apps')
+    @mock.patch('tethys_apps.management.commands.pre_collectstatic.settings')
+    def test_handle_bundle_gizmo_assets(self, mock_settings, mock_get_apps, mock_get_extensions, _):
+        mock_settings.STATIC_ROOT = '/foo/testing/tests'
+        mock_settings.GIZMO_BUNDLE_ASSETS = True
+        mock_get_apps.return_value = {}
+        mock_get_extensions.return_value = {}
+
+        cmd = pre_collectstatic.Command()
+        cmd.handle(options='foo')
+
+        self.mock_call_command.assert_called_once_with('bundle_gizmo_assets')
+
+    @mock.patch('tethys_apps.management.commands.pre_collectstatic.print')
+    @mock.patch('tethys_apps.management.commands.pre_collectstatic.get_installed_tethys_extensions')
+    @mock.patch('tethys_apps.management.commands.pre_collectstatic.get_installed_tethys_apps')
+    @mock.patch('tethys_apps.management.commands.pre_collectstatic.settings')
+    def test_handle_no_bundle_gizmo_assets(self, mock_settings, mock_get_apps, mock_get_extensions, _):
+        mock_settings.STATIC_ROOT = '/foo/testing/tests'
+        mock_settings.GIZMO_BUNDLE_ASSETS = False
+        mock_get_apps.return_value = {}
+        mock_get_extensions.return_value = {}
+
+        cmd = pre_collectstatic.Command()
+        cmd.handle(options='foo')
+
+        self.mock_call_command.assert_not_called()
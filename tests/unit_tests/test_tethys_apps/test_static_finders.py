@@ -1,6 +1,7 @@
 import os
 import unittest
-from tethys_apps.static_finders import TethysStaticFinder
+from bokeh.util.paths import bokehjsdir
+from tethys_apps.static_finders import BokehStaticFinder, TethysStaticFinder
 
 
 class TestTethysStaticFinder(unittest.TestCase):
@@ -65,3 +66,23 @@ class TestTethysStaticFinder(unittest.TestCase):
         self.assertIn('js/main.js', expected_app_paths)
         self.assertIn('images/icon.gif', expected_app_paths)
         self.assertIn('css/main.css', expected_app_paths)
+
+
+class TestBokehStaticFinder(unittest.TestCase):
+
+    def test_find(self):
+        ret = BokehStaticFinder().find('bokeh/static/js/bokeh.min.js')
+        self.assertEqual(os.path.join(bokehjsdir(), 'js', 'bokeh.min.js'), ret)
+
+    def test_find_not_bokeh(self):
+        self.assertEqual([], BokehStaticFinder().find('test_app/css/main.css', all=True))
+
+    def test_list(self):
+        paths = {path: storage for path, storage in BokehStaticFinder().list(['*.legacy.*'])}
+
+        self.assertIn('js/bokeh.min.js', paths)
+        self.assertIn('js/bokeh-widgets.min.js', paths)
+        self.assertNotIn('js/bokeh.legacy.min.js', paths)
+        self.assertNotIn('js/bokeh.json', paths)
+        self.assertFalse(any(path.startswith('js/lib') for path in paths))
+        self.assertEqual('bokeh/static', paths['js/bokeh.min.js'].prefix)
@@ -0,0 +1,81 @@
+import unittest
+
+from django.conf.urls import include, url
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve, reverse
+from django.urls.resolvers import URLResolver
+
+from tethys_apps.url_resolvers import AppsURLResolver
+
+
+def home(request):
+    return HttpResponse()
+
+
+def detail(request, item_id):
+    return HttpResponse()
+
+
+def get_app_urls(namespace):
+    urls = [
+        url(r'^$', home, name='home'),
+        url(r'^items/(?P<item_id>[\w-]+)/$', detail, name='detail'),
+    ]
+    return url(r'^{0}/'.format(namespace.replace('_', '-')), include((urls, namespace), namespace=namespace))
+
+
+urlpatterns = [
+    url(r'^apps/', include([AppsURLResolver([get_app_urls('app_{}'.format(i)) for i in range(3)])])),
+]
+
+
+class TestAppsURLResolver(unittest.TestCase):
+
+    def setUp(self):
+        self.app_urls = [get_app_urls('app_{}'.format(i)) for i in range(3)]
+        self.resolver = AppsURLResolver(self.app_urls)
+        self.stock_resolver = URLResolver(self.resolver.pattern, self.app_urls)
+
+    def test_app_resolvers(self):
+        self.assertEqual({'app-0', 'app-1', 'app-2'}, set(self.resolver.app_resolvers))
+        self.assertEqual([self.app_urls[1]], self.resolver.app_resolvers['app-1'].url_patterns)
+
+    def test_app_resolvers_other_patterns(self):
+        other = url(r'^(?P<name>[a-z]+)-app/', include(([url(r'^$', home, name='home')], 'other'), namespace='other'))
+        resolver = AppsURLResolver(self.app_urls + [other])
+
+        self.assertEqual([self.app_urls[1], other], resolver.app_resolvers['app-1'].url_patterns)
+        match = resolver.resolve('foo-app/')
+        self.assertEqual('other:home', match.view_name)
+        self.assertEqual({'name': 'foo'}, match.kwargs)
+
+    def test_resolve(self):
+        for path in ('app-0/', 'app-2/', 'app-1/items/42/'):
+            match = self.resolver.resolve(path)
+            expected = self.stock_resolver.resolve(path)
+            self.assertIs(expected.func, match.func)
+            self.assertEqual(expected.view_name, match.view_name)
+            self.assertEqual(expected.kwargs, match.kwargs)
+            self.assertEqual(expected.namespaces, match.namespaces)
+            self.assertEqual(expected.route, match.route)
+
+    def test_resolve_not_found(self):
+        with self.assertRaises(Resolver404) as context:
+            self.resolver.resolve('app-1/missing/')
+
+        tried = context.exception.args[0]['tried']
+        self.assertEqual(2, len(tried))
+        self.assertTrue(all(t[0] is self.app_urls[1] for t in tried))
+
+    def test_resolve_unknown_app(self):
+        self.assertRaises(Resolver404, self.resolver.resolve, 'unknown-app/')
+        self.assertRaises(Resolver404, self.resolver.resolve, '')
+
+    def test_reverse_and_resolve(self):
+        path = reverse('app_1:detail', kwargs={'item_id': '42'}, urlconf=__name__)
+        match = resolve(path, urlconf=__name__)
+
+        self.assertEqual('/apps/app-1/items/42/', path)
+        self.assertEqual('app_1:detail', match.view_name)
+        self.assertEqual({'item_id': '42'}, match.kwargs)
+        self.assertEqual('/apps/app-0/', reverse('app_0:home', urlconf=__name__))
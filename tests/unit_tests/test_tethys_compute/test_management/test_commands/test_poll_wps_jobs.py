@@ -0,0 +1,37 @@
+import unittest
+from argparse import ArgumentParser
+from unittest import mock
+
+from tethys_compute.management.commands import poll_wps_jobs
+
+
+class ManagementCommandsPollWpsJobsTests(unittest.TestCase):
+
+    def test_add_arguments(self):
+        parser = ArgumentParser()
+        cmd = poll_wps_jobs.Command()
+        cmd.add_arguments(parser)
+        self.assertIn('--interval INTERVAL', parser.format_help())
+        self.assertIn('--batch-size BATCH_SIZE', parser.format_help())
+
+    @mock.patch('tethys_compute.management.commands.poll_wps_jobs.time.sleep')
+    @mock.patch('tethys_compute.management.commands.poll_wps_jobs.poll_wps_jobs', return_value=2)
+    def test_handle_once(self, mock_poll, mock_sleep):
+        cmd = poll_wps_jobs.Command()
+        cmd.handle(interval=0, batch_size=10)
+
+        mock_poll.assert_called_once_with(batch_size=10)
+        mock_sleep.assert_not_called()
+
+    @mock.patch('tethys_compute.management.commands.poll_wps_jobs.time.sleep')
+    @mock.patch('tethys_compute.management.commands.poll_wps_jobs.poll_wps_jobs', return_value=2)
+    def test_handle_interval(self, mock_poll, mock_sleep):
+        mock_sleep.side_effect = [None, KeyboardInterrupt]
+        cmd = poll_wps_jobs.Command()
+        cmd.stdout = mock.MagicMock()
+
+        self.assertRaises(KeyboardInterrupt, cmd.handle, interval=30, batch_size=None, verbosity=2)
+
+        self.assertEqual(2, mock_poll.call_count)
+        mock_sleep.assert_called_with(30)
+        cmd.stdout.write.assert_called_with('Polled 2 WPS jobs.')
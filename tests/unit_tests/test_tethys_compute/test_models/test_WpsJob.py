@@ -0,0 +1,295 @@
+import datetime
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+import requests
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.utils import timezone
+
+from tethys_sdk.testing import TethysTestCase
+from tethys_compute.models import WpsJob
+from tethys_compute.models.wps_job import poll_wps_jobs
+from tethys_services.models import WebProcessingService
+
+
+def process_results_function(results):
+    results['processed'] = True
+    return results
+
+
+class WpsJobTest(TethysTestCase):
+    def set_up(self):
+        self.user = User.objects.create_user('tethys_super', 'user@example.com', 'pass')
+        self.wps_service = WebProcessingService.objects.create(
+            name='test_wps',
+            endpoint='http://localhost/wps/WebProcessingService',
+            username='foo',
+            password='bar',
+        )
+        self.workspace = tempfile.mkdtemp()
+        self.wps_job = WpsJob(
+            name='test_wpsjob',
+            description='test_description',
+            user=self.user,
+            label='test_label',
+            workspace=self.workspace,
+            wps_service=self.wps_service,
+            process_identifier='buffer',
+            inputs=[['distance', 10], ['geometry', {'href': 'http://localhost/data.json',
+                                                    'mime_type': 'application/json'}]],
+            outputs=['buffered'],
+        )
+        self.wps_job.save()
+
+        session_patcher = mock.patch('tethys_compute.models.wps_job._get_session')
+        self.mock_get_session = session_patcher.start()
+        self.addCleanup(session_patcher.stop)
+        self.mock_session = self.mock_get_session()
+
+    def tear_down(self):
+        self.wps_job.delete()
+        self.wps_service.delete()
+        shutil.rmtree(self.workspace, ignore_errors=True)
+
+    def mock_status(self, status, outputs=(), errors=()):
+        mock_execution = mock.MagicMock(status=status, processOutputs=list(outputs), errors=list(errors))
+        patcher = mock.patch('tethys_compute.models.wps_job.WPSExecution', return_value=mock_execution)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return mock_execution
+
+    def test_type(self):
+        self.assertEqual('WpsJob', self.wps_job.type)
+
+    @override_settings(WPS_JOB_POLL_INTERVAL=5, WPS_JOB_MAX_POLL_INTERVAL=60)
+    def test_get_poll_delay(self):
+        self.assertEqual(datetime.timedelta(seconds=5), WpsJob.get_poll_delay(0))
+        self.assertEqual(datetime.timedelta(seconds=20), WpsJob.get_poll_delay(2))
+        self.assertEqual(datetime.timedelta(seconds=60), WpsJob.get_poll_delay(4))
+        self.assertEqual(datetime.timedelta(seconds=60), WpsJob.get_poll_delay(1000))
+
+    @mock.patch('tethys_compute.models.wps_job.ComplexDataInput')
+    @mock.patch('tethys_services.models.WebProcessingService.get_engine')
+    def test_execute(self, mock_get_engine, mock_complex_input):
+        mock_wps = mock_get_engine.return_value
+        mock_wps.execute.return_value = mock.MagicMock(statusLocation='http://localhost/wps/status/1.xml')
+
+        self.wps_job.execute()
+
+        mock_complex_input.assert_called_with('http://localhost/data.json', mimeType='application/json')
+        mock_wps.execute.assert_called_with(
+            'buffer', [('distance', '10'), ('geometry', mock_complex_input())], output=[('buffered', True)]
+        )
+        job = WpsJob.objects.get(pk=self.wps_job.pk)
+        self.assertEqual('SUB', job._status)
+        self.assertEqual('http://localhost/wps/status/1.xml', job.status_location)
+        self.assertEqual(0, job.poll_count)
+        self.assertGreater(job.next_poll_time, timezone.now())
+
+    @mock.patch('tethys_services.models.WebProcessingService.get_engine')
+    def test_execute_not_accepted(self, mock_get_engine):
+        mock_get_engine.return_value.execute.return_value = mock.MagicMock(
+            statusLocation=None, errors=[mock.MagicMock(text='Unknown process')]
+        )
+
+        self.assertRaises(RuntimeError, self.wps_job.execute)
+        self.assertEqual('PEN', WpsJob.objects.get(pk=self.wps_job.pk)._status)
+
+    @mock.patch('tethys_services.models.WebProcessingService.get_engine', return_value=None)
+    def test_execute_unreachable(self, _):
+        self.assertRaises(RuntimeError, self.wps_job.execute)
+
+    def test_execute_no_service(self):
+        self.wps_job.wps_service = None
+        self.assertRaises(ValueError, self.wps_job.execute)
+
+    def test_status_does_not_poll(self):
+        self.wps_job._status = 'RUN'
+        self.wps_job.save()
+
+        self.assertEqual('Running', self.wps_job.status)
+        self.mock_session.get.assert_not_called()
+
+    def test_update_status_running(self):
+        self.mock_status('ProcessStarted')
+        self.wps_job._status = 'SUB'
+        self.wps_job.status_location = 'http://localhost/wps/status/1.xml'
+        self.wps_job.poll_count = 3
+
+        self.wps_job.update_status(poll=True)
+
+        self.mock_session.get.assert_called_with('http://localhost/wps/status/1.xml')
+        self.assertEqual('RUN', self.wps_job._status)
+        self.assertIsNotNone(self.wps_job.start_time)
+        # The backoff is reset when the status changes
+        self.assertEqual(0, self.wps_job.poll_count)
+        self.assertIsNotNone(self.wps_job.next_poll_time)
+
+    def test_update_status_backoff(self):
+        self.mock_status('ProcessStarted')
+        self.wps_job._status = 'RUN'
+        self.wps_job.poll_count = 2
+
+        self.wps_job.update_status(poll=True)
+
+        self.assertEqual('RUN', self.wps_job._status)
+        self.assertEqual(3, self.wps_job.poll_count)
+        self.assertGreater(self.wps_job.next_poll_time, timezone.now() + WpsJob.get_poll_delay(2))
+
+    def test_update_status_not_due(self):
+        self.wps_job._status = 'RUN'
+        self.wps_job.next_poll_time = timezone.now() + datetime.timedelta(minutes=1)
+
+        self.wps_job.update_status(poll=True)
+
+        self.mock_session.get.assert_not_called()
+
+    def test_update_status_request_error(self):
+        self.mock_session.get.side_effect = requests.ConnectionError('refused')
+        self.wps_job._status = 'RUN'
+
+        self.wps_job.update_status(poll=True)
+
+        self.assertEqual('RUN', self.wps_job._status)
+        self.assertEqual(1, self.wps_job.poll_count)
+        self.assertIsNotNone(self.wps_job.next_poll_time)
+
+    def test_update_status_failed(self):
+        self.mock_status('ProcessFailed', errors=[mock.MagicMock(code='NoApplicableCode', locator=None,
+                                                                 text='Out of memory')])
+        self.wps_job._status = 'RUN'
+
+        self.wps_job.update_status(poll=True)
+
+        self.assertEqual('ERR', self.wps_job._status)
+        self.assertEqual([{'code': 'NoApplicableCode', 'locator': None, 'text': 'Out of memory'}],
+                         self.wps_job.errors)
+        self.assertIsNone(self.wps_job.next_poll_time)
+        self.assertIsNotNone(self.wps_job.completion_time)
+
+    def test_update_status_succeeded(self):
+        buffered = mock.MagicMock(identifier='buffered', reference='http://localhost/wps/output/1',
+                                  mimeType='application/json')
+        area = mock.MagicMock(identifier='area', reference=None, data=['42.0'])
+        self.mock_status('ProcessSucceeded', outputs=[buffered, area])
+        mock_response = self.mock_session.get.return_value.__enter__.return_value
+        mock_response.iter_content.return_value = [b'{"type": ', b'"Polygon"}']
+        self.wps_job._status = 'RUN'
+        self.wps_job.process_results_function = process_results_function
+
+        self.wps_job.update_status(poll=True)
+
+        path = os.path.join(self.workspace, 'buffered.json')
+        self.assertEqual('COM', self.wps_job._status)
+        self.mock_session.get.assert_called_with('http://localhost/wps/output/1', stream=True)
+        with open(path, 'rb') as f:
+            self.assertEqual(b'{"type": "Polygon"}', f.read())
+        self.assertEqual(
+            {
+                'buffered': {'reference': 'http://localhost/wps/output/1', 'mime_type': 'application/json',
+                             'path': path},
+                'area': {'data': ['42.0']},
+                'processed': True,
+            },
+            WpsJob.objects.get(pk=self.wps_job.pk).results
+        )
+        self.assertEqual(['buffered.json'], os.listdir(self.workspace))
+
+    def test_update_status_download_failed(self):
+        buffered = mock.MagicMock(identifier='buffered', reference='http://localhost/wps/output/1',
+                                  mimeType='application/json')
+        self.mock_status('ProcessSucceeded', outputs=[buffered])
+        mock_response = self.mock_session.get.return_value.__enter__.return_value
+        mock_response.raise_for_status.side_effect = requests.HTTPError('404')
+        self.wps_job._status = 'RUN'
+
+        self.wps_job.update_status(poll=True)
+
+        self.assertEqual('ERR', self.wps_job._status)
+        self.assertEqual('DownloadFailed', self.wps_job.errors[0]['code'])
+        self.assertEqual([], os.listdir(self.workspace))
+
+    def test_update_status_output_outside_workspace(self):
+        outputs = [
+            mock.MagicMock(identifier='../../etc/cron.d/evil', reference='http://localhost/wps/output/1',
+                           mimeType=None),
+            mock.MagicMock(identifier='..', reference='http://localhost/wps/output/2', mimeType=None),
+        ]
+        self.mock_status('ProcessSucceeded', outputs=outputs)
+        mock_response = self.mock_session.get.return_value.__enter__.return_value
+        mock_response.iter_content.return_value = [b'data']
+        self.wps_job._status = 'RUN'
+
+        self.wps_job.update_status(poll=True)
+
+        # The name of the first output is sanitized, the second is rejected
+        path = os.path.join(self.workspace, 'etccron.devil')
+        self.assertEqual(path, self.wps_job.results['../../etc/cron.d/evil']['path'])
+        self.assertEqual(['etccron.devil'], os.listdir(self.workspace))
+        self.assertEqual('ERR', self.wps_job._status)
+        self.assertEqual('..', self.wps_job.errors[0]['locator'])
+
+    def test_stop(self):
+        self.wps_job._status = 'RUN'
+        self.wps_job.next_poll_time = timezone.now()
+
+        self.wps_job.stop()
+
+        job = WpsJob.objects.get(pk=self.wps_job.pk)
+        self.assertEqual('ABT', job._status)
+        self.assertIsNone(job.next_poll_time)
+
+    def test_pause_resume(self):
+        self.assertRaises(NotImplementedError, self.wps_job.pause)
+        self.assertRaises(NotImplementedError, self.wps_job.resume)
+
+    @mock.patch('tethys_compute.models.wps_job.WpsJob.update_status')
+    def test_poll_wps_jobs(self, mock_update_status):
+        self.wps_job._status = 'RUN'
+        self.wps_job.next_poll_time = timezone.now()
+        self.wps_job.save()
+        not_due = WpsJob.objects.create(name='not_due', user=self.user, label='test_label', _status='RUN',
+                                        next_poll_time=timezone.now() + datetime.timedelta(minutes=1))
+        complete = WpsJob.objects.create(name='complete', user=self.user, label='test_label', _status='COM')
+
+        self.assertEqual(1, poll_wps_jobs())
+        mock_update_status.assert_called_once_with(poll=True)
+
+        not_due.delete()
+        complete.delete()
+
+    @mock.patch('tethys_compute.models.wps_job.WpsJob.update_status', side_effect=Exception('bad status'))
+    def test_poll_wps_jobs_error(self, _):
+        self.wps_job._status = 'SUB'
+        self.wps_job.next_poll_time = timezone.now()
+        self.wps_job.save()
+
+        self.assertEqual(1, poll_wps_jobs(batch_size=10))
+
+        # Polled again when the lease expires
+        next_poll_time = WpsJob.objects.get(pk=self.wps_job.pk).next_poll_time
+        self.assertGreater(next_poll_time, timezone.now() + datetime.timedelta(minutes=9))
+
+    @override_settings(WPS_JOB_POLL_LEASE=60)
+    @mock.patch('tethys_compute.models.wps_job.WpsJob.update_status')
+    def test_poll_wps_jobs_claims_jobs(self, mock_update_status):
+        self.wps_job._status = 'RUN'
+        self.wps_job.next_poll_time = timezone.now()
+        self.wps_job.save()
+        other = WpsJob.objects.create(name='other', user=self.user, label='test_label', _status='RUN',
+                                      next_poll_time=timezone.now())
+        mock_update_status.side_effect = [Exception('bad status'), None]
+
+        self.assertEqual(2, poll_wps_jobs())
+
+        # Both jobs are polled, outside of the transaction that claimed them
+        self.assertEqual(2, mock_update_status.call_count)
+        for job in WpsJob.objects.filter(pk__in=[self.wps_job.pk, other.pk]):
+            self.assertGreater(job.next_poll_time, timezone.now())
+        # Claimed jobs are not due until their lease expires
+        self.assertEqual(0, poll_wps_jobs())
+
+        other.delete()
@@ -0,0 +1,201 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from django.test import override_settings
+
+from tethys_gizmos import assets
+
+
+class TestAssets(unittest.TestCase):
+    def setUp(self):
+        self.static_dir = tempfile.mkdtemp()
+        assets.get_plotlyjs_static_path.cache_clear()
+
+    def tearDown(self):
+        assets.get_plotlyjs_static_path.cache_clear()
+        shutil.rmtree(self.static_dir)
+
+    @mock.patch('tethys_gizmos.assets.plotly')
+    @mock.patch('tethys_gizmos.assets.get_plotlyjs')
+    def test_get_plotlyjs_static_path(self, mock_get_plotlyjs, mock_plotly):
+        mock_get_plotlyjs.return_value = 'var plotly;'
+        mock_plotly.__version__ = '1.0.0'
+
+        with override_settings(STATIC_ROOT=self.static_dir):
+            ret = assets.get_plotlyjs_static_path()
+            ret_cached = assets.get_plotlyjs_static_path()
+
+        self.assertRegex(ret, r'^tethys_gizmos/vendor/plotly/plotly-1\.0\.0\.[0-9a-f]{12}\.min\.js$')
+        self.assertEqual(ret, ret_cached)
+        mock_get_plotlyjs.assert_called_once()
+
+        file_path = os.path.join(self.static_dir, *ret.split('/'))
+        with open(file_path) as f:
+            self.assertEqual('var plotly;', f.read())
+
+        # No temporary files left behind
+        self.assertEqual([os.path.basename(file_path)], os.listdir(os.path.dirname(file_path)))
+
+    @mock.patch('tethys_gizmos.assets.plotly')
+    @mock.patch('tethys_gizmos.assets.get_plotlyjs')
+    def test_get_plotlyjs_static_path_changed(self, mock_get_plotlyjs, mock_plotly):
+        mock_plotly.__version__ = '1.0.0'
+
+        mock_get_plotlyjs.return_value = 'var plotly;'
+        ret1 = assets.get_plotlyjs_static_path(self.static_dir)
+        assets.get_plotlyjs_static_path.cache_clear()
+        mock_get_plotlyjs.return_value = 'var plotly2;'
+        ret2 = assets.get_plotlyjs_static_path(self.static_dir)
+
+        self.assertNotEqual(ret1, ret2)
+
+    @mock.patch('tethys_gizmos.assets.log')
+    @mock.patch('tethys_gizmos.assets.os.replace')
+    @mock.patch('tethys_gizmos.assets.get_plotlyjs')
+    def test_get_plotlyjs_static_path_not_writable(self, mock_get_plotlyjs, mock_replace, mock_log):
+        mock_get_plotlyjs.return_value = 'var plotly;'
+        mock_replace.side_effect = PermissionError
+
+        ret = assets.get_plotlyjs_static_path(self.static_dir)
+
+        self.assertIsNone(ret)
+        mock_log.exception.assert_called_once()
+        self.assertEqual([], os.listdir(os.path.join(self.static_dir, 'tethys_gizmos', 'vendor', 'plotly')))
+
+    @override_settings(STATIC_ROOT=None)
+    @mock.patch('tethys_gizmos.assets.log')
+    @mock.patch('tethys_gizmos.assets.get_plotlyjs')
+    def test_get_plotlyjs_static_path_no_static_root(self, mock_get_plotlyjs, mock_log):
+        mock_get_plotlyjs.return_value = 'var plotly;'
+
+        self.assertIsNone(assets.get_plotlyjs_static_path())
+        mock_log.warning.assert_called_once()
+        mock_get_plotlyjs.assert_not_called()
+
+
+class TestBundles(unittest.TestCase):
+    def setUp(self):
+        self.source_dir = tempfile.mkdtemp()
+        self.static_dir = tempfile.mkdtemp()
+        self.write_source('foo/js/a.js', 'var a = 1;\n//# sourceMappingURL=a.js.map\n')
+        self.write_source('foo/js/b.min.js', 'var b=2;')
+        self.write_source('foo/css/a.css', '/* comment */\n.a {\n  background: url("../img/a.png");\n}\n')
+        self.write_source('foo/css/b.css', '/*! license */ .b { background: url(data:image/png;base64,AA==); }')
+
+        find_patcher = mock.patch('tethys_gizmos.assets.finders.find', side_effect=self.find)
+        find_patcher.start()
+        self.addCleanup(find_patcher.stop)
+
+        assets.find_static_file.cache_clear()
+        assets.get_bundle_static_path.cache_clear()
+
+    def tearDown(self):
+        assets.find_static_file.cache_clear()
+        assets.get_bundle_static_path.cache_clear()
+        shutil.rmtree(self.source_dir)
+        shutil.rmtree(self.static_dir)
+
+    def write_source(self, static_path, content):
+        file_path = os.path.join(self.source_dir, *static_path.split('/'))
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'w') as f:
+            f.write(content)
+
+    def find(self, static_path):
+        file_path = os.path.join(self.source_dir, *static_path.split('/'))
+        return file_path if os.path.isfile(file_path) else None
+
+    def read_bundle(self, static_path):
+        with open(os.path.join(self.static_dir, *static_path.split('/'))) as f:
+            return f.read()
+
+    def test_get_cdn_static_path(self):
+        self.assertEqual(
+            'tethys_gizmos/vendor/cdn/cdnjs.cloudflare.com/ajax/libs/d3/4.12.2/d3.min.js',
+            assets.get_cdn_static_path('https://cdnjs.cloudflare.com/ajax/libs/d3/4.12.2/d3.min.js')
+        )
+        self.assertIsNone(assets.get_cdn_static_path('https://cesium.com/downloads/Cesium.js'))
+        self.assertIsNone(assets.get_cdn_static_path('https://cdn.jsdelivr.net/npm/foo'))
+        self.assertIsNone(assets.get_cdn_static_path('://plotly-load_from_python.js'))
+
+    @mock.patch('tethys_gizmos.assets.requests.get')
+    def test_vendor_cdn_asset(self, mock_get):
+        mock_get.return_value.text = '.dt { background: url("../images/sort.png"); }'
+
+        with override_settings(STATIC_ROOT=self.static_dir):
+            ret = assets.vendor_cdn_asset('https://cdn.datatables.net/1.10.12/css/jquery.dataTables.min.css')
+            ret_existing = assets.vendor_cdn_asset('https://cdn.datatables.net/1.10.12/css/jquery.dataTables.min.css')
+
+        self.assertEqual('tethys_gizmos/vendor/cdn/cdn.datatables.net/1.10.12/css/jquery.dataTables.min.css', ret)
+        self.assertEqual(ret, ret_existing)
+        mock_get.assert_called_once()
+        mock_get.return_value.raise_for_status.assert_called_once()
+        self.assertEqual('.dt { background: url("https://cdn.datatables.net/1.10.12/images/sort.png"); }',
+                         self.read_bundle(ret))
+
+    @override_settings(STATIC_ROOT=None)
+    @mock.patch('tethys_gizmos.assets.requests.get')
+    def test_vendor_cdn_asset_no_static_root(self, mock_get):
+        self.assertIsNone(assets.vendor_cdn_asset('https://cdnjs.cloudflare.com/ajax/libs/d3/4.12.2/d3.min.js'))
+        mock_get.assert_not_called()
+
+    @mock.patch('tethys_gizmos.assets.requests.get')
+    def test_vendor_cdn_asset_not_vendored(self, mock_get):
+        self.assertIsNone(assets.vendor_cdn_asset('https://js.arcgis.com/4.2/'))
+        mock_get.assert_not_called()
+
+    def test_bundle_dependencies_js(self):
+        ret = assets.bundle_dependencies(
+            ['foo/js/a.js', 'foo/js/b.min.js', 'https://js.arcgis.com/4.2/', 'foo/js/b.min.js'], self.static_dir
+        )
+
+        self.assertEqual(3, len(ret))
+        self.assertRegex(ret[0], r'^tethys_gizmos/bundles/gizmos\.[0-9a-f]{12}\.js$')
+        self.assertEqual(['https://js.arcgis.com/4.2/', 'foo/js/b.min.js'], ret[1:])
+        self.assertEqual('var a = 1;\n;\nvar b=2;', self.read_bundle(ret[0]))
+
+    def test_bundle_dependencies_css(self):
+        ret = assets.bundle_dependencies(['foo/css/a.css', 'foo/css/b.css'], self.static_dir)
+
+        self.assertEqual(1, len(ret))
+        self.assertRegex(ret[0], r'^tethys_gizmos/bundles/gizmos\.[0-9a-f]{12}\.css$')
+        self.assertEqual('.a {\nbackground: url("/static/foo/img/a.png");\n}\n'
+                         '/*! license */ .b { background: url(data:image/png;base64,AA==); }',
+                         self.read_bundle(ret[0]))
+
+    def test_bundle_dependencies_vendored(self):
+        self.write_source('tethys_gizmos/vendor/cdn/cdnjs.cloudflare.com/d3.min.js', 'var d3;')
+
+        ret = assets.bundle_dependencies(['https://cdnjs.cloudflare.com/d3.min.js', 'foo/js/a.js'], self.static_dir)
+
+        self.assertEqual(1, len(ret))
+        self.assertEqual('var d3;\n;\nvar a = 1;', self.read_bundle(ret[0]))
+
+    @mock.patch('tethys_gizmos.assets.requests.get')
+    def test_bundle_dependencies_vendored_static_root(self, mock_get):
+        mock_get.return_value.text = 'var d3;'
+
+        with override_settings(STATIC_ROOT=self.static_dir):
+            assets.vendor_cdn_asset('https://cdnjs.cloudflare.com/d3.min.js')
+            ret = assets.bundle_dependencies(['https://cdnjs.cloudflare.com/d3.min.js', 'foo/js/a.js'])
+
+        self.assertEqual(1, len(ret))
+        self.assertEqual('var d3;\n;\nvar a = 1;', self.read_bundle(ret[0]))
+
+    @mock.patch('tethys_gizmos.assets.log')
+    def test_bundle_dependencies_not_writable(self, mock_log):
+        with mock.patch('tethys_gizmos.assets.os.replace', side_effect=PermissionError):
+            ret = assets.bundle_dependencies(['foo/js/a.js', 'foo/js/b.min.js'], self.static_dir)
+
+        self.assertEqual(['foo/js/a.js', 'foo/js/b.min.js'], ret)
+        mock_log.exception.assert_called_once()
+
+    def test_get_bundle_static_path_content_hash(self):
+        ret1 = assets.get_bundle_static_path(('foo/js/a.js', 'foo/js/b.min.js'), self.static_dir)
+        ret2 = assets.get_bundle_static_path(('foo/js/b.min.js', 'foo/js/a.js'), self.static_dir)
+
+        self.assertNotEqual(ret1, ret2)
+        self.assertEqual(ret1, assets.get_bundle_static_path(('foo/js/a.js', 'foo/js/b.min.js'), self.static_dir))
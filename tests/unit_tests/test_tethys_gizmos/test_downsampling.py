@@ -0,0 +1,178 @@
+import datetime
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from tethys_gizmos import downsampling
+
+
+class TestDownsampling(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_get_series_columns_points(self):
+        result = downsampling.get_series_columns([[0, 1], [1, None], [2, 3]])
+
+        self.assertEqual(2, len(result))
+        np.testing.assert_array_equal([0, 1, 2], result[0])
+        np.testing.assert_array_equal([1, np.nan, 3], result[1])
+
+    def test_get_series_columns_dict_datetimes(self):
+        series = {'name': 'Flow', 'data': [[datetime.datetime(1970, 1, 1, 0, 0, 1), 5],
+                                           [datetime.datetime(1970, 1, 1, 0, 0, 2), 6]]}
+        result = downsampling.get_series_columns(series)
+
+        np.testing.assert_array_equal([1000, 2000], result[0])
+        np.testing.assert_array_equal([5, 6], result[1])
+
+    def test_get_series_columns_aware_datetimes(self):
+        tz = datetime.timezone(datetime.timedelta(hours=1))
+        result = downsampling.get_series_columns([[datetime.datetime(1970, 1, 1, 1, tzinfo=tz), 5]])
+        np.testing.assert_array_equal([0], result[0])
+
+    def test_column_to_float_datetime64(self):
+        result = downsampling._column_to_float(np.array(['1970-01-01T00:00:01', 'NaT'], dtype='datetime64[s]'))
+        np.testing.assert_array_equal([1000, np.nan], result)
+
+    def test_get_series_columns_values(self):
+        result = downsampling.get_series_columns(np.array([5, 6, 7]))
+
+        np.testing.assert_array_equal([0, 1, 2], result[0])
+        np.testing.assert_array_equal([5, 6, 7], result[1])
+
+    def test_get_series_columns_empty(self):
+        result = downsampling.get_series_columns([])
+        self.assertEqual(2, len(result))
+        self.assertEqual(0, len(result[0]))
+
+    def test_get_series_columns_pandas_series(self):
+        data = pd.Series([1.0, None, 3.0], index=pd.date_range('1970-01-01', periods=3, freq='S'))
+
+        result = downsampling.get_series_columns(data)
+
+        np.testing.assert_array_equal([0, 1000, 2000], result[0])
+        np.testing.assert_array_equal([1, np.nan, 3], result[1])
+
+    def test_get_series_columns_pandas_dataframe(self):
+        data = pd.DataFrame({'low': [1, 2], 'high': [3, 4]}, index=[10, 20], columns=['low', 'high'])
+
+        result = downsampling.get_series_columns(data)
+
+        self.assertEqual(3, len(result))
+        np.testing.assert_array_equal([10, 20], result[0])
+        np.testing.assert_array_equal([1, 2], result[1])
+        np.testing.assert_array_equal([3, 4], result[2])
+
+    def test_columns_to_points(self):
+        result = downsampling.columns_to_points([np.array([0., 1.]), np.array([2., np.nan])])
+        self.assertEqual([[0.0, 2.0], [1.0, None]], result)
+
+    def test_columns_to_points_no_missing(self):
+        result = downsampling.columns_to_points([np.array([0., 1.]), np.array([2., 3.])])
+        self.assertEqual([[0.0, 2.0], [1.0, 3.0]], result)
+
+    def test_lttb(self):
+        x = np.arange(1000, dtype=float)
+        y = np.sin(x / 50)
+
+        result = downsampling.lttb(x, y, 100)
+
+        self.assertEqual(100, len(result))
+        self.assertEqual(0, result[0])
+        self.assertEqual(999, result[-1])
+        self.assertTrue(np.all(np.diff(result) > 0))
+
+    def test_lttb_keeps_peaks(self):
+        x = np.arange(1000, dtype=float)
+        y = np.zeros(1000)
+        y[123] = 10
+        y[789] = -10
+
+        result = downsampling.lttb(x, y, 20)
+
+        self.assertIn(123, result)
+        self.assertIn(789, result)
+
+    def test_lttb_below_threshold(self):
+        result = downsampling.lttb([0, 1, 2], [1, 2, 3], 10)
+        np.testing.assert_array_equal([0, 1, 2], result)
+
+    def test_lttb_invalid_threshold(self):
+        result = downsampling.lttb(range(10), range(10), 2)
+        np.testing.assert_array_equal(np.arange(10), result)
+
+    def test_lttb_nan(self):
+        x = np.arange(100, dtype=float)
+        y = np.ones(100)
+        y[10:30] = np.nan
+
+        result = downsampling.lttb(x, y, 10)
+
+        self.assertEqual(10, len(result))
+        self.assertTrue(np.all(np.diff(result) > 0))
+
+    def test_min_max(self):
+        x = np.arange(1000, dtype=float)
+        y = np.random.RandomState(0).randn(1000)
+        y[123] = 10
+        y[789] = -10
+
+        result = downsampling.min_max(x, y, 20)
+
+        self.assertLessEqual(len(result), 20)
+        self.assertEqual(0, result[0])
+        self.assertEqual(999, result[-1])
+        self.assertIn(123, result)
+        self.assertIn(789, result)
+        self.assertTrue(np.all(np.diff(result) > 0))
+
+    def test_min_max_uneven_buckets_nan(self):
+        y = np.arange(103, dtype=float)
+        y[0:20] = np.nan
+
+        result = downsampling.min_max(np.arange(103), y, 10)
+
+        self.assertLessEqual(len(result), 10)
+        self.assertTrue(np.all(result < 103))
+        self.assertIn(102, result)
+
+    def test_min_max_below_threshold(self):
+        np.testing.assert_array_equal([0, 1, 2], downsampling.min_max([0, 1, 2], [1, 2, 3], 10))
+
+    def test_downsample(self):
+        x = np.arange(1000, dtype=float)
+        columns = [x, np.sin(x)]
+
+        result = downsampling.downsample(columns, 100)
+        self.assertEqual(100, len(result[0]))
+        self.assertEqual(100, len(result[1]))
+
+        result = downsampling.downsample(columns, 100, method='min_max')
+        self.assertLessEqual(len(result[0]), 100)
+
+    def test_downsample_unsorted(self):
+        x = np.random.RandomState(0).permutation(1000).astype(float)
+        y = x * 2
+        y[x == 500] = 10000
+
+        result = downsampling.downsample([x, y], 100)
+
+        self.assertEqual(100, len(result[0]))
+        self.assertTrue(np.all(np.diff(result[0]) > 0))
+        np.testing.assert_array_equal(result[0] * 2 + (result[0] == 500) * 9000, result[1])
+        self.assertEqual([0, 999], [result[0][0], result[0][-1]])
+        self.assertIn(500, result[0])
+
+    def test_downsample_not_needed(self):
+        x = np.arange(10, dtype=float)
+
+        self.assertIs(downsampling.downsample([x, x], 100)[0], x)
+        self.assertIs(downsampling.downsample([x, x], None)[0], x)
+        self.assertIs(downsampling.downsample([x, x, x], 5)[0], x)
+
+    def test_downsample_invalid_method(self):
+        self.assertRaises(ValueError, downsampling.downsample, [[], []], 10, method='mean')
@@ -7,7 +7,13 @@
 ********************************************************************************
 """
 import unittest
+from unittest import mock
+
+from django.test import override_settings
+
 import tethys_gizmos.gizmo_options.base as basetest
+from tethys_gizmos.gizmo_options.text_input import TextInput
+from tethys_gizmos.profiling import profile_gizmos
 
 
 class TestTethysGizmosBase(unittest.TestCase):
@@ -57,3 +63,61 @@ class TestTethysGizmosBase(unittest.TestCase):
     def test_SecondaryGizmoOptions(self):
         result = basetest.SecondaryGizmoOptions()
         self.assertFalse(result)
+
+    def test_TethysGizmoOptions_lazy(self):
+        result = TextInput.lazy(name='input', display_text='Input')
+
+        self.assertIsInstance(result, basetest.LazyGizmoOptions)
+        self.assertEqual('text_input', result.gizmo_name)
+        self.assertFalse(result.is_resolved)
+
+        options = result.resolve()
+
+        self.assertIsInstance(options, TextInput)
+        self.assertEqual('input', options.name)
+        self.assertIs(options, result.resolve())
+
+    @override_settings(GIZMO_PROFILING=True)
+    def test_TethysGizmoOptions_profiled(self):
+        class ProfiledOptions(TextInput):
+            def __init__(self, name):
+                super().__init__(name=name)
+
+        with profile_gizmos() as profile:
+            ProfiledOptions(name='input')
+
+        # The constructors of the parent classes are not recorded separately
+        self.assertEqual(1, len(profile.records))
+        self.assertEqual('ProfiledOptions', profile.records[0].gizmo_class)
+        self.assertGreater(profile.records[0].construction_time, 0)
+        self.assertFalse(profile.records[0].rendered)
+
+    def test_TethysGizmoOptions_not_profiled(self):
+        class NotProfiledOptions(TextInput):
+            def __init__(self, name):
+                super().__init__(name=name)
+
+        with profile_gizmos() as profile:
+            NotProfiledOptions(name='input')
+
+        # Constructors are not wrapped when profiling is disabled
+        self.assertFalse(hasattr(NotProfiledOptions.__init__, '__wrapped__'))
+        self.assertEqual([], profile.records)
+
+    def test_LazyGizmoOptions(self):
+        factory = mock.MagicMock(return_value={'name': 'input', 'gizmo_name': 'text_input'})
+
+        result = basetest.LazyGizmoOptions(factory, 'text_input')
+
+        self.assertEqual('text_input', result.gizmo_name)
+        factory.assert_not_called()
+        self.assertIn('not constructed', repr(result))
+        self.assertEqual('input', result['name'])
+        self.assertEqual(factory.return_value.items(), result.items())
+        factory.assert_called_once()
+        self.assertNotIn('not constructed', repr(result))
+
+    def test_LazyGizmoOptions_private_attributes(self):
+        result = basetest.LazyGizmoOptions(mock.MagicMock(), 'text_input')
+
+        self.assertRaises(AttributeError, getattr, result, '_private')
@@ -39,3 +39,17 @@ class TestDatatableView(unittest.TestCase):
         # Check Result
         self.assertIn('.js', result[0])
         self.assertNotIn('.css', result[0])
+
+    def test_DataTableView_data_url(self):
+        result = gizmo_datatable_view.DataTableView(column_names=['Name', 'Age'], data_url='/apps/test/people/',
+                                                    pageLength=25)
+
+        self.assertEqual([], result['rows'])
+        self.assertEqual('/apps/test/people/', result['data_url'])
+        self.assertEqual('true', result['datatable_options']['server-side'])
+        self.assertEqual('true', result['datatable_options']['processing'])
+        self.assertEqual('{"url": "/apps/test/people/"}', result['datatable_options']['ajax'])
+        self.assertEqual('25', result['datatable_options']['page-length'])
+
+    def test_DataTableView_no_rows(self):
+        self.assertRaises(ValueError, gizmo_datatable_view.DataTableView, column_names=['Name', 'Age'])
@@ -117,6 +117,32 @@ class TestMapView(unittest.TestCase):
         self.assertEqual(legend_title, result['legend_title'])
         self.assertEqual(options, result['options'])
 
+    def test_MVLayer_cluster(self):
+        options = {'url': '/apps/test-app/gauges/{z}/{x}/{y}/'}
+
+        result = gizmo_map_view.MVLayer(source='VectorTile', legend_title='Gauges', options=options, cluster=True)
+
+        self.assertEqual('VectorTile', result['source'])
+        self.assertTrue(result['cluster'])
+        self.assertFalse(gizmo_map_view.MVLayer(source='KML', legend_title='Gauges', options=options)['cluster'])
+
+    @mock.patch('tethys_gizmos.gizmo_options.map_view.get_tile_proxy_url')
+    def test_MVLayer_proxy(self, mock_proxy_url):
+        mock_proxy_url.side_effect = lambda url: '/proxy/' + url
+        options = {'url': 'http://localhost/wms', 'urls': ['http://a/wms', 'http://b/wms'], 'params': {'LAYERS': 'a'}}
+
+        result = gizmo_map_view.MVLayer(source='TileWMS', legend_title='Layer', options=options, proxy=True)
+
+        self.assertEqual('/proxy/http://localhost/wms', result['options']['url'])
+        self.assertEqual(['/proxy/http://a/wms', '/proxy/http://b/wms'], result['options']['urls'])
+        self.assertEqual({'LAYERS': 'a'}, result['options']['params'])
+        # The given options are not modified
+        self.assertEqual('http://localhost/wms', options['url'])
+
+    def test_MVLayer_proxy_not_supported(self):
+        self.assertRaises(ValueError, gizmo_map_view.MVLayer, source='KML', legend_title='Layer',
+                          options={'url': '/static/model.kml'}, proxy=True)
+
     @mock.patch('tethys_gizmos.gizmo_options.map_view.log.warning')
     def test_MVLayer_warning(self, mock_log):
         source = 'KML'
@@ -230,3 +256,13 @@ class TestMapView(unittest.TestCase):
         # Check Result
         self.assertEqual(value, result['value'])
         self.assertEqual(image_url, result['image_url'])
+
+    @mock.patch('tethys_gizmos.gizmo_options.map_view.get_tile_proxy_url')
+    def test_MVLegendGeoServerImageClass_proxy(self, mock_proxy_url):
+        mock_proxy_url.return_value = '/proxy/wms?REQUEST=GetLegendGraphic'
+
+        result = gizmo_map_view.MVLegendGeoServerImageClass(value='Cities', geoserver_url='http://localhost/geoserver',
+                                                            style='green', layer='rivers', proxy=True)
+
+        self.assertEqual('/proxy/wms?REQUEST=GetLegendGraphic', result['image_url'])
+        self.assertTrue(mock_proxy_url.call_args[0][0].startswith('http://localhost/geoserver/wms?REQUEST='))
@@ -1,7 +1,15 @@
+import os
+import json
+import time
 import unittest
+from unittest import mock
 import tethys_gizmos.gizmo_options.plot_view as gizmo_plot_view
+from tethys_gizmos.json_encoder import gizmo_json_dumps
 import datetime
 
+import numpy as np
+import pandas as pd
+
 
 class TestPlotView(unittest.TestCase):
     def setUp(self):
@@ -20,6 +28,12 @@ class TestPlotView(unittest.TestCase):
         # Engine is not d3 or hightcharts
         self.assertRaises(ValueError, gizmo_plot_view.PlotViewBase, engine='d2')
 
+        # Data format is not json or binary
+        self.assertRaises(ValueError, gizmo_plot_view.PlotViewBase, data_format='csv')
+
+        # Invalid downsampling method
+        self.assertRaises(ValueError, gizmo_plot_view.PlotViewBase, downsample_method='mean')
+
         # Check Get Method
         self.assertIn('.js', gizmo_plot_view.PlotViewBase.get_vendor_js()[0])
         self.assertNotIn('.css', gizmo_plot_view.PlotViewBase.get_vendor_js()[0])
@@ -30,6 +44,67 @@ class TestPlotView(unittest.TestCase):
         self.assertIn('.css', gizmo_plot_view.PlotViewBase.get_gizmo_css()[0])
         self.assertNotIn('.js', gizmo_plot_view.PlotViewBase.get_gizmo_css()[0])
 
+    def test_PlotViewBase_data_url(self):
+        result = gizmo_plot_view.TimeSeries(series=[{'name': 'Flow'}], data_url='/apps/test/data/',
+                                            data_format='binary', points_per_pixel=2)
+
+        self.assertEqual('/apps/test/data/', result['data_url'])
+        self.assertEqual('binary', result['data_format'])
+        self.assertEqual(2, result['points_per_pixel'])
+        self.assertEqual([{'name': 'Flow'}], result['plot_object']['series'])
+        self.assertNotIn('data_url', result['plot_object'])
+
+    def test_PlotViewBase_prepare_series(self):
+        x = np.arange(1000)
+        y = np.sin(x / 10.0)
+        index = pd.date_range('2019-01-01', periods=3, freq='H')
+        series = [
+            {'name': 'list', 'data': [[0, 1], [1, 2]]},
+            {'name': 'numpy', 'data': np.column_stack((x, y))},
+            {'name': 'pandas', 'data': pd.Series([1, 2, 3], index=index)},
+            {'name': 'categories', 'data': [['a', 1], ['b', 2], ['c', 3], ['d', 4], ['e', 5], ['f', 6]]},
+            {'name': 'no data'},
+        ]
+
+        result = gizmo_plot_view.TimeSeries(series=series, downsample_threshold=5)
+        result_series = result['plot_object']['series']
+
+        self.assertIs(series[0], result_series[0])
+        self.assertEqual(5, len(result_series[1]['data']))
+        self.assertEqual([0.0, 0.0], result_series[1]['data'][0])
+        self.assertEqual('numpy', result_series[1]['name'])
+        self.assertEqual([[1546300800000.0, 1.0], [1546304400000.0, 2.0], [1546308000000.0, 3.0]],
+                         result_series[2]['data'])
+        self.assertIs(series[3], result_series[3])
+        self.assertIs(series[4], result_series[4])
+
+    @mock.patch.dict(os.environ, {'TZ': 'America/Denver'})
+    def test_PlotViewBase_prepare_series_local_time_zone(self):
+        time.tzset()
+        self.addCleanup(time.tzset)
+        dates = [datetime.datetime(2019, 1, 1) + datetime.timedelta(hours=i) for i in range(10)]
+        series = [{'name': 'dates', 'data': [[date, i] for i, date in enumerate(dates)]}]
+
+        below = gizmo_plot_view.TimeSeries(series=series, downsample_threshold=10)
+        above = gizmo_plot_view.TimeSeries(series=series, downsample_threshold=4)
+
+        # Dates are encoded as UTC whether or not the series is downsampled
+        expected = [[1546300800000 + i * 3600000, i] for i in range(10)]
+        below_data = json.loads(gizmo_json_dumps(below['plot_object']['series'][0]['data']))
+        above_data = json.loads(gizmo_json_dumps(above['plot_object']['series'][0]['data']))
+        self.assertEqual(expected, below_data)
+        self.assertEqual(4, len(above_data))
+        self.assertEqual([expected[0], expected[-1]], [above_data[0], above_data[-1]])
+
+    def test_PlotViewBase_prepare_series_no_threshold(self):
+        x = np.arange(1000)
+        series = [{'name': 'numpy', 'data': np.column_stack((x, x))}]
+
+        result = gizmo_plot_view.LinePlot(series=series, downsample_method='min_max')
+
+        self.assertEqual(1000, len(result['plot_object']['series'][0]['data']))
+        self.assertIsInstance(result['plot_object']['series'][0]['data'], list)
+
     def test_PlotObject(self):
         chart = 'test chart'
         xAxis = 'Distance'
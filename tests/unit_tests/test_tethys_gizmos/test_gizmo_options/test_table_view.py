@@ -19,3 +19,18 @@ class TestTableView(unittest.TestCase):
 
         self.assertEqual(rows, result['rows'])
         self.assertEqual(column_names, result['column_names'])
+
+    def test_TableView_data_url(self):
+        result = gizmo_table_view.TableView(column_names=['Name', 'Age'], data_url='/apps/test/people/', page_length=20)
+
+        self.assertEqual([], result['rows'])
+        self.assertEqual('/apps/test/people/', result['data_url'])
+        self.assertEqual(20, result['page_length'])
+        self.assertIn('tethys_gizmos/js/table_view.js', gizmo_table_view.TableView.get_gizmo_js())
+
+    def test_TableView_data_url_editable(self):
+        self.assertRaises(ValueError, gizmo_table_view.TableView, column_names=['Name', 'Age'],
+                          data_url='/apps/test/people/', editable_columns=(False, 'ageInput'))
+
+    def test_TableView_no_rows(self):
+        self.assertRaises(ValueError, gizmo_table_view.TableView, column_names=['Name', 'Age'])
@@ -0,0 +1,128 @@
+import os
+import json
+import time
+import datetime
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from django.test import override_settings
+
+from tethys_gizmos import json_encoder
+from tethys_gizmos.downsampling import columns_to_points, get_series_columns
+
+
+class CustomEncoder(json.JSONEncoder):
+    def encode(self, o):
+        return 'custom'
+
+
+class TestGizmoJSONEncoder(unittest.TestCase):
+    def setUp(self):
+        json_encoder.get_gizmo_json_encoder.cache_clear()
+
+    def tearDown(self):
+        json_encoder.get_gizmo_json_encoder.cache_clear()
+
+    def encode(self, data):
+        return json.loads(json.dumps(data, cls=json_encoder.GizmoJSONEncoder))
+
+    def test_values(self):
+        data = ['foo', {'bar': ('baz', None, 1.0, 2)}, [], datetime.date(2019, 1, 2)]
+        self.assertEqual(['foo', {'bar': ['baz', None, 1.0, 2]}, [], '2019-01-02'], self.encode(data))
+
+    def test_datetime(self):
+        value = datetime.datetime(1970, 1, 1, 0, 0, 1)
+        aware = datetime.datetime(1970, 1, 1, 1, 0, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=1)))
+
+        self.assertEqual({'x': 1000, 'y': 1000}, self.encode({'x': value, 'y': aware}))
+
+    def test_datetime_points(self):
+        data = {'series': [{'data': [[datetime.datetime(1970, 1, 1, 0, 0, 1), 1.5],
+                                     [datetime.datetime(1970, 1, 1, 0, 0, 2), None]]}]}
+
+        result = json_encoder._prepare(data)
+
+        self.assertEqual([(1000, 1.5), (2000, None)], result['series'][0]['data'])
+        self.assertEqual({'series': [{'data': [[1000, 1.5], [2000, None]]}]}, self.encode(data))
+
+    @mock.patch.dict(os.environ, {'TZ': 'America/Denver'})
+    def test_datetime_local_time_zone(self):
+        time.tzset()
+        self.addCleanup(time.tzset)
+        dates = [datetime.datetime(2019, 1, 2, 3) + datetime.timedelta(minutes=i) for i in range(5)]
+        expected = [(date - datetime.datetime(1970, 1, 1)) // datetime.timedelta(milliseconds=1) for date in dates]
+
+        # Lists of points, single dates, numpy arrays and downsampled series all encode dates as UTC
+        self.assertEqual([[x, 1] for x in expected], self.encode([[date, 1] for date in dates]))
+        self.assertEqual(expected[0], self.encode(dates[0]))
+        self.assertEqual(expected, self.encode(np.array(dates, dtype='datetime64[ms]')))
+        self.assertEqual([[x, 1] for x in expected], self.encode(pd.Series([1] * 5, index=dates)))
+        self.assertEqual([[x, 1] for x in expected], self.encode(columns_to_points(get_series_columns(
+            [[date, 1] for date in dates]
+        ))))
+
+    def test_datetime_points_not_converted(self):
+        aware = [[datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc), 1]]
+        ragged = [[datetime.datetime(1970, 1, 1), 1], [datetime.datetime(1970, 1, 1)]]
+        missing = [[datetime.datetime(1970, 1, 1), 1], [None, 1]]
+
+        self.assertIs(aware, json_encoder._prepare(aware))
+        self.assertIs(ragged, json_encoder._prepare(ragged))
+        self.assertIs(missing, json_encoder._prepare(missing))
+
+    def test_prepare_points_not_copied(self):
+        points = [[0, 1], [1, 2]]
+        values = [1, 2, 3]
+        nested = [[[0, 1]], [[1, 2]]]
+
+        self.assertIs(points, json_encoder._prepare(points))
+        self.assertIs(values, json_encoder._prepare(values))
+        self.assertEqual(nested, json_encoder._prepare(nested))
+
+    def test_numpy(self):
+        data = {
+            'array': np.array([1.5, np.nan]),
+            'points': np.array([[1000.0, 1.5], [2000.0, np.nan]]),
+            'ints': np.array([1, 2]),
+            'dates': np.array(['1970-01-01T00:00:01', 'NaT'], dtype='datetime64[s]'),
+            'date': np.datetime64('1970-01-01T00:00:02'),
+            'float': np.float32(1.5),
+            'int': np.int64(3),
+        }
+
+        result = self.encode(data)
+
+        self.assertEqual([1.5, None], result['array'])
+        self.assertEqual([[1000, 1.5], [2000, None]], result['points'])
+        self.assertEqual([1, 2], result['ints'])
+        self.assertEqual([1000, None], result['dates'])
+        self.assertEqual(2000, result['date'])
+        self.assertEqual(1.5, result['float'])
+        self.assertEqual(3, result['int'])
+
+    def test_pandas(self):
+        index = pd.date_range('1970-01-01', periods=2, freq='S')
+        data = {
+            'series': pd.Series([1.5, None], index=index),
+            'frame': pd.DataFrame({'low': [1, 2], 'high': [3, 4]}, index=[10, 20], columns=['low', 'high']),
+            'index': index,
+        }
+
+        result = self.encode(data)
+
+        self.assertEqual([[0, 1.5], [1000, None]], result['series'])
+        self.assertEqual([[10, 1, 3], [20, 2, 4]], result['frame'])
+        self.assertEqual([0, 1000], result['index'])
+
+    def test_unsupported(self):
+        self.assertRaises(TypeError, json.dumps, object(), cls=json_encoder.GizmoJSONEncoder)
+
+    def test_gizmo_json_dumps(self):
+        self.assertEqual('{"x": [1.5, null]}', json_encoder.gizmo_json_dumps({'x': np.array([1.5, np.nan])}))
+
+    @override_settings(GIZMO_JSON_ENCODER='unit_tests.test_tethys_gizmos.test_json_encoder.CustomEncoder')
+    def test_gizmo_json_dumps_setting(self):
+        self.assertIs(CustomEncoder, json_encoder.get_gizmo_json_encoder())
+        self.assertEqual('custom', json_encoder.gizmo_json_dumps({}))
@@ -0,0 +1,71 @@
+import unittest
+from unittest import mock
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, JsonResponse
+from django.template import engines
+from django.template.response import SimpleTemplateResponse
+from django.test import RequestFactory, override_settings
+
+from tethys_gizmos.middleware import GizmoProfilingMiddleware
+from tethys_gizmos.gizmo_options.text_input import TextInput
+from tethys_gizmos.profiling import profile_construction
+
+
+class TestGizmoProfilingMiddleware(unittest.TestCase):
+    def setUp(self):
+        self.request = RequestFactory().get('/apps/test-app/')
+
+    def test_not_used(self):
+        self.assertRaises(MiddlewareNotUsed, GizmoProfilingMiddleware, mock.MagicMock())
+
+    @override_settings(GIZMO_PROFILING=True)
+    @mock.patch.object(TextInput, '__init__', profile_construction(TextInput.__init__))
+    def test_html(self):
+        def view(request):
+            TextInput(name='not_rendered')
+            return HttpResponse('<html><body><p>Page</p></body></html>')
+
+        middleware = GizmoProfilingMiddleware(view)
+
+        response = middleware(self.request)
+
+        content = response.content.decode()
+        self.assertTrue(content.startswith('<html><body><p>Page</p><details id="tethys-gizmo-profile"'))
+        self.assertTrue(content.endswith('</details></body></html>') or content.endswith('</details>\n</body></html>'))
+        self.assertIn('TextInput', content)
+        self.assertIn('not rendered', content)
+        self.assertIn('gizmo-construction;dur=', response['Server-Timing'])
+
+    @override_settings(GIZMO_PROFILING=True)
+    def test_template_response(self):
+        template = engines['django'].from_string('{% load tethys_gizmos %}<body>{% gizmo text %}</body>')
+
+        def view(request):
+            return SimpleTemplateResponse(template, {'text': TextInput(name='rendered')})
+
+        response = GizmoProfilingMiddleware(view)(self.request)
+
+        content = response.content.decode()
+        self.assertIn('name="rendered"', content)
+        self.assertIn('<td>text</td>', content)
+        self.assertNotIn('not rendered', content)
+
+    @override_settings(GIZMO_PROFILING=True)
+    def test_no_gizmos(self):
+        response = GizmoProfilingMiddleware(lambda request: HttpResponse('<body></body>'))(self.request)
+
+        self.assertEqual(b'<body></body>', response.content)
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    @override_settings(GIZMO_PROFILING=True)
+    @mock.patch.object(TextInput, '__init__', profile_construction(TextInput.__init__))
+    def test_not_html(self):
+        def view(request):
+            TextInput(name='input')
+            return JsonResponse({'body': '</body>'})
+
+        response = GizmoProfilingMiddleware(view)(self.request)
+
+        self.assertEqual(b'{"body": "</body>"}', response.content)
+        self.assertTrue(response.has_header('Server-Timing'))
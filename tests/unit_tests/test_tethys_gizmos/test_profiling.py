@@ -0,0 +1,80 @@
+import unittest
+
+from tethys_gizmos import profiling
+
+
+class Options(dict):
+
+    @profiling.profile_construction
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
+
+
+class ChildOptions(Options):
+
+    @profiling.profile_construction
+    def __init__(self, value):
+        super().__init__(value)
+
+
+class TestProfiling(unittest.TestCase):
+
+    def test_not_profiled(self):
+        options = ChildOptions(1)
+
+        self.assertEqual(1, options.value)
+        self.assertIsNone(profiling.get_profile())
+
+    def test_profile_gizmos(self):
+        with profiling.profile_gizmos() as profile:
+            self.assertIs(profile, profiling.get_profile())
+            ChildOptions(1)
+            Options(2)
+
+        self.assertIsNone(profiling.get_profile())
+        self.assertEqual(['ChildOptions', 'Options'], [r.gizmo_class for r in profile.records])
+
+    def test_construction_error(self):
+        with profiling.profile_gizmos() as profile:
+            self.assertRaises(TypeError, Options)
+
+        self.assertEqual([], profile.records)
+
+    def test_rendering(self):
+        with profiling.profile_gizmos() as profile:
+            options = Options(1)
+            with profile.rendering('plot', options) as record:
+                profile.add_payload(10)
+                profile.add_payload(5)
+                record.html_size = 100
+            profile.add_payload(1000)
+
+        self.assertEqual(1, len(profile.records))
+        self.assertEqual('plot', record.name)
+        self.assertTrue(record.rendered)
+        self.assertEqual(15, record.payload_size)
+        self.assertEqual(100, record.html_size)
+
+    def test_rendering_twice(self):
+        with profiling.profile_gizmos() as profile:
+            options = Options(1)
+            with profile.rendering('plot', options):
+                pass
+            with profile.rendering('plot', options):
+                pass
+
+        # The construction is recorded with the first rendering only
+        self.assertEqual(2, len(profile.records))
+        self.assertIsNotNone(profile.records[0].construction_time)
+        self.assertIsNone(profile.records[1].construction_time)
+
+    def test_get_totals(self):
+        profile = profiling.GizmoProfile()
+        profile.records = [profiling.GizmoRecord('A', 0.5), profiling.GizmoRecord('B')]
+        profile.records[1].render_time = 0.25
+        profile.records[1].payload_size = 10
+        profile.records[1].html_size = 20
+
+        self.assertEqual({'construction_time': 0.5, 'render_time': 0.25, 'payload_size': 10, 'html_size': 20},
+                         profile.get_totals())
@@ -0,0 +1,264 @@
+import datetime
+import unittest
+
+import numpy as np
+import pandas as pd
+import sqlalchemy as sa
+from django.contrib.auth.models import User
+from django.http import QueryDict
+from django.test import TestCase
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from tethys_compute.models import TethysJob
+from tethys_gizmos import table_data
+
+Base = declarative_base()
+
+
+class Gauge(Base):
+    __tablename__ = 'gauges'
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String)
+    river = sa.Column(sa.String)
+    elevation = sa.Column(sa.Float)
+
+
+ROWS = [
+    [1, 'Provo 100%', 'Provo', 1500.0],
+    [2, 'Jordan', 'Jordan', None],
+    [3, 'Provo Canyon', 'Provo', 1700.0],
+    [4, 'Weber', 'Weber', 1400.0],
+]
+
+
+def table_request(**params):
+    query = QueryDict(mutable=True)
+    query.update(params)
+    return table_data.parse_table_request(query)
+
+
+class TestParseTableRequest(unittest.TestCase):
+
+    def test_parse_table_request(self):
+        params = QueryDict(
+            'draw=3&start=10&length=25&search[value]=provo+canyon&search[regex]=false'
+            '&order[1][column]=0&order[1][dir]=asc&order[0][column]=2&order[0][dir]=desc'
+            '&columns[0][searchable]=false&columns[1][searchable]=true&columns[1][search][value]=jordan'
+            '&columns[2][search][value]='
+        )
+
+        result = table_data.parse_table_request(params)
+
+        self.assertEqual(3, result.draw)
+        self.assertEqual(10, result.start)
+        self.assertEqual(25, result.length)
+        self.assertEqual(['provo', 'canyon'], result.search)
+        self.assertEqual([(2, True), (0, False)], result.order)
+        self.assertEqual({1: ['jordan']}, result.column_search)
+        self.assertEqual({0}, result.not_searchable)
+
+    def test_parse_table_request_defaults(self):
+        result = table_data.parse_table_request(QueryDict())
+
+        self.assertEqual(table_data.TableRequest(0, 0, -1, [], [], {}, set()), result)
+
+    def test_parse_table_request_invalid(self):
+        self.assertRaises(ValueError, table_data.parse_table_request, QueryDict('start=a'))
+
+
+class TableDataTests:
+    """
+    Tests shared by the providers, which must implement get_table_data.
+    """
+
+    def process(self, **params):
+        return self.get_table_data().process(table_request(**params))
+
+    def test_page(self):
+        result = self.process(draw='2', start='1', length='2')
+
+        self.assertEqual(2, result['draw'])
+        self.assertEqual(4, result['recordsTotal'])
+        self.assertEqual(4, result['recordsFiltered'])
+        self.assertEqual([ROWS[1][1:], ROWS[2][1:]], result['data'])
+
+    def test_all_rows(self):
+        result = self.process(length='-1')
+
+        self.assertEqual([row[1:] for row in ROWS], result['data'])
+
+    def test_max_length(self):
+        result = self.get_table_data().process(table_request(length='-1'), max_length=3)
+
+        self.assertEqual(3, len(result['data']))
+
+    def test_search(self):
+        result = self.process(**{'search[value]': 'PROVO can'})
+
+        self.assertEqual(4, result['recordsTotal'])
+        self.assertEqual(1, result['recordsFiltered'])
+        self.assertEqual([ROWS[2][1:]], result['data'])
+
+    def test_search_wildcards_escaped(self):
+        result = self.process(**{'search[value]': '100%'})
+
+        self.assertEqual([ROWS[0][1:]], result['data'])
+
+    def test_search_not_searchable(self):
+        result = self.process(**{'search[value]': 'jordan', 'columns[0][searchable]': 'false'})
+
+        self.assertEqual([ROWS[1][1:]], result['data'])
+
+        result = self.process(**{'search[value]': 'jordan', 'columns[0][searchable]': 'false',
+                                 'columns[1][searchable]': 'false'})
+
+        self.assertEqual(0, result['recordsFiltered'])
+
+    def test_column_search(self):
+        result = self.process(**{'columns[1][search][value]': 'provo'})
+
+        self.assertEqual(2, result['recordsFiltered'])
+        self.assertEqual([ROWS[0][1:], ROWS[2][1:]], result['data'])
+
+    def test_order(self):
+        result = self.process(**{'order[0][column]': '1', 'order[0][dir]': 'desc',
+                                 'order[1][column]': '2', 'order[1][dir]': 'asc'})
+
+        self.assertEqual(['Weber', 'Provo', 'Provo', 'Jordan'], [row[1] for row in result['data']])
+        self.assertEqual([1400.0, 1500.0, 1700.0, None], [row[2] for row in result['data']])
+
+    def test_order_invalid_column(self):
+        result = self.process(**{'order[0][column]': '5'})
+
+        self.assertEqual([row[1:] for row in ROWS], result['data'])
+
+
+class TestSequenceTableData(TableDataTests, unittest.TestCase):
+
+    def get_table_data(self):
+        return table_data.get_table_data(ROWS, columns=[1, 2, 3])
+
+    def test_default_columns(self):
+        self.assertEqual([0, 1, 2, 3], table_data.get_table_data(ROWS).columns)
+        self.assertEqual([], table_data.get_table_data([]).columns)
+
+
+class TestDataFrameTableData(TableDataTests, unittest.TestCase):
+
+    def get_table_data(self):
+        df = pd.DataFrame(ROWS, columns=['id', 'name', 'river', 'elevation']).set_index('id')
+        return table_data.get_table_data(df)
+
+    def test_get_table_data(self):
+        self.assertIsInstance(self.get_table_data(), table_data.DataFrameTableData)
+
+    def test_page_types(self):
+        df = pd.DataFrame({
+            'time': pd.to_datetime(['2020-01-01', None]),
+            'value': np.array([1, 2], dtype=np.int64),
+        })
+
+        result = table_data.get_table_data(df).process(table_request())
+
+        self.assertEqual([[pd.Timestamp('2020-01-01'), 1], [None, 2]], result['data'])
+        self.assertIsInstance(result['data'][0][1], int)
+
+
+class TestSQLAlchemyTableData(TableDataTests, unittest.TestCase):
+
+    def setUp(self):
+        engine = sa.create_engine('sqlite://')
+        Base.metadata.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+        self.session.add_all([Gauge(id=r[0], name=r[1], river=r[2], elevation=r[3]) for r in ROWS])
+        self.session.commit()
+        self.addCleanup(self.session.close)
+
+    def get_table_data(self):
+        return table_data.get_table_data(self.session.query(Gauge).order_by(Gauge.id),
+                                         columns=['name', Gauge.river, 'elevation'])
+
+    def test_default_columns(self):
+        result = table_data.get_table_data(self.session.query(Gauge.name, Gauge.river))
+
+        self.assertIsInstance(result, table_data.SQLAlchemyTableData)
+        self.assertEqual(['name', 'river'], [column.key for column in result.columns])
+
+
+class TestQuerySetTableData(TableDataTests, TestCase):
+
+    def setUp(self):
+        self.users = User.objects.exclude(username='AnonymousUser').order_by('id')
+        for _, name, river, elevation in ROWS:
+            User.objects.create(username=name, first_name=river,
+                                last_name='' if elevation is None else str(int(elevation)))
+
+    def get_table_data(self):
+        return table_data.get_table_data(self.users, columns=['username', 'first_name', 'last_name'])
+
+    def process(self, **params):
+        # Elevations are stored as text
+        result = super().process(**params)
+        result['data'] = [[r[0], r[1], float(r[2]) if r[2] else None] for r in result['data']]
+        return result
+
+    def test_order(self):
+        result = self.process(**{'order[0][column]': '1', 'order[0][dir]': 'desc',
+                                 'order[1][column]': '2', 'order[1][dir]': 'asc'})
+
+        # Missing values are stored as empty strings, which are ordered first
+        self.assertEqual(['Weber', 'Provo', 'Provo', 'Jordan'], [row[1] for row in result['data']])
+
+    def test_default_columns(self):
+        self.assertIn('username', table_data.get_table_data(self.users).columns)
+
+    def test_relations(self):
+        users = list(self.users)
+        for i, user in enumerate(users):
+            TethysJob.objects.create(name='job {}'.format(i), user=user, label='provo' if i % 2 else 'weber')
+        jobs = TethysJob.objects.filter(user__in=users).order_by('id')
+
+        data = table_data.get_table_data(jobs)
+        result = data.process(table_request(**{'search[value]': 'abc'}))
+
+        self.assertIn('user_id', data.columns)
+        self.assertNotIn('user', data.columns)
+        self.assertEqual(0, result['recordsFiltered'])
+
+        # Foreign keys are serialized and searched by id, other fields as text
+        result = data.process(table_request(length='-1', **{'search[value]': str(users[1].pk)}))
+        user_index = data.columns.index('user_id')
+        self.assertIn(users[1].pk, [row[user_index] for row in result['data']])
+
+        result = data.process(table_request(**{'search[value]': 'weber'}))
+        self.assertEqual(2, result['recordsFiltered'])
+
+        data = table_data.get_table_data(jobs, columns=['name', 'user', 'user__username', 'label'])
+        result = data.process(table_request(**{'search[value]': users[0].username}))
+        self.assertEqual([['job 0', users[0].pk, users[0].username, 'weber']], result['data'])
+
+
+class TestGetTableData(unittest.TestCase):
+
+    def test_table_data(self):
+        data = table_data.SequenceTableData(ROWS)
+
+        self.assertIs(data, table_data.get_table_data(data))
+
+    def test_unsupported(self):
+        self.assertRaises(TypeError, table_data.get_table_data, {'a': 1})
+
+    def test_not_implemented(self):
+        data = table_data.TableData([], [])
+
+        self.assertRaises(NotImplementedError, data.count)
+        self.assertRaises(NotImplementedError, data.search, ['a'], [0])
+        self.assertRaises(NotImplementedError, data.order, [(0, False)])
+        self.assertRaises(NotImplementedError, data.page, 0, 10)
+
+    def test_dates(self):
+        rows = [[datetime.date(2020, 1, 2)], [datetime.date(2019, 1, 2)]]
+
+        result = table_data.get_table_data(rows).process(table_request(**{'order[0][column]': '0'}))
+
+        self.assertEqual([[datetime.date(2019, 1, 2)], [datetime.date(2020, 1, 2)]], result['data'])
@@ -1,11 +1,13 @@
 from unittest import mock
 import unittest
 import tethys_gizmos.templatetags.tethys_gizmos as gizmos_templatetags
-from tethys_gizmos.gizmo_options.base import TethysGizmoOptions
+from tethys_gizmos.gizmo_options.base import LazyGizmoOptions, TethysGizmoOptions
+from tethys_gizmos.profiling import profile_construction, profile_gizmos
 from datetime import datetime, date
 from django.template import base
 from django.template import TemplateSyntaxError
-from django.template import Context
+from django.template import Context, Template
+from django.test import override_settings
 from importlib import reload
 
 
@@ -186,10 +188,10 @@ class TestTethysGizmoIncludeDependency(unittest.TestCase):
 class TestTethysGizmoIncludeNode(unittest.TestCase):
     def setUp(self):
         self.gizmo_name = 'tethysext.test_extension'
-        pass
+        gizmos_templatetags.clear_gizmo_caches()
 
     def tearDown(self):
-        pass
+        gizmos_templatetags.clear_gizmo_caches()
 
     def test_render(self):
         gizmos_templatetags.GIZMO_NAME_MAP[TestGizmo.gizmo_name] = TestGizmo
@@ -210,6 +212,53 @@ class TestTethysGizmoIncludeNode(unittest.TestCase):
         # Check Result
         self.assertEqual('test_render_no_name', result_render)
 
+    def test_render_lazy(self):
+        factory = mock.MagicMock(return_value=TestGizmo(name='test_render_lazy'))
+        node = gizmos_templatetags.TethysGizmoIncludeNode(options='foo', gizmo_name=None)
+
+        result = node.render(Context({'foo': LazyGizmoOptions(factory, TestGizmo)}))
+
+        self.assertEqual('test_render_lazy', result)
+        factory.assert_called_once()
+
+    @mock.patch.object(TestGizmo, '__init__', profile_construction(TestGizmo.__init__))
+    def test_render_profiled(self):
+        node = gizmos_templatetags.TethysGizmoIncludeNode(options='foo', gizmo_name=None)
+
+        with profile_gizmos() as profile:
+            options = TestGizmo(name='test_render_profiled')
+            result = node.render(Context({'foo': options}))
+
+        self.assertEqual('test_render_profiled', result)
+        self.assertEqual(1, len(profile.records))
+        record = profile.records[0]
+        self.assertEqual('foo', record.name)
+        self.assertEqual('TestGizmo', record.gizmo_class)
+        self.assertIsNotNone(record.construction_time)
+        self.assertIsNotNone(record.render_time)
+        self.assertEqual(len(result), record.html_size)
+
+    def test_jsonify_profiled(self):
+        with profile_gizmos() as profile:
+            with profile.rendering('foo', TestGizmo(name='test')):
+                gizmos_templatetags.jsonify({'a': [1, 2]})
+
+        self.assertEqual(len('{"a": [1, 2]}'), profile.records[0].payload_size)
+
+    def test_get_gizmo_name(self):
+        gizmos_templatetags.GIZMO_NAME_MAP[TestGizmo.gizmo_name] = TestGizmo
+        node = gizmos_templatetags.TethysGizmoIncludeNode(options='foo', gizmo_name=TestGizmo.gizmo_name)
+        node.render(Context({'foo': TestGizmo(name='test_render')}))
+
+        # Name given in the tag is kept after rendering
+        self.assertEqual(TestGizmo.gizmo_name, node.get_gizmo_name(Context({})))
+
+    def test_get_gizmo_name_from_options(self):
+        node = gizmos_templatetags.TethysGizmoIncludeNode(options='foo', gizmo_name=None)
+
+        self.assertEqual('test_gizmo', node.get_gizmo_name(Context({'foo': TestGizmo(name='test_render')})))
+        self.assertIsNone(node.get_gizmo_name(Context({})))
+
     @mock.patch('tethys_gizmos.templatetags.tethys_gizmos.get_template')
     def test_render_in_extension_path(self, mock_gt):
         # Reset EXTENSION_PATH_MAP
@@ -315,10 +364,10 @@ class TestTags(unittest.TestCase):
 
 class TestTethysGizmoDependenciesNode(unittest.TestCase):
     def setUp(self):
-        pass
+        gizmos_templatetags.clear_gizmo_caches()
 
     def tearDown(self):
-        pass
+        gizmos_templatetags.clear_gizmo_caches()
 
     def test_render(self):
         gizmos_templatetags.GIZMO_NAME_MAP[TestGizmo.gizmo_name] = TestGizmo
@@ -333,9 +382,8 @@ class TestTethysGizmoDependenciesNode(unittest.TestCase):
 
         # TEST render
         context = Context({'foo': TestGizmo(name='test_render')})
-        context.update({'gizmos_rendered': []})
+        context.update({'gizmos_rendered': [TestGizmo.gizmo_name]})
 
-        #  unless it has the same gizmo name as the predefined one
         render_globalcss = gizmos_templatetags.TethysGizmoDependenciesNode(output_type=output_global_css).\
             render(context=context)
         render_css = gizmos_templatetags.TethysGizmoDependenciesNode(output_type=output_css).\
@@ -352,3 +400,189 @@ class TestTethysGizmoDependenciesNode(unittest.TestCase):
         self.assertIn('openlayers/ol.js', render_globaljs)
         self.assertIn('plotly-load_from_python.js', render_js)
         self.assertNotIn('openlayers/ol.js', render_js)
+
+    @mock.patch('tethys_gizmos.templatetags.tethys_gizmos.get_plotlyjs')
+    @mock.patch('tethys_gizmos.templatetags.tethys_gizmos.get_plotlyjs_static_path')
+    def test_render_plotlyjs_static(self, mock_static_path, mock_get_plotlyjs):
+        mock_static_path.return_value = 'tethys_gizmos/vendor/plotly/plotly-1.0.0.abc.min.js'
+        context = Context({'gizmos_rendered': ['plotly_view']})
+
+        render_globaljs = gizmos_templatetags.TethysGizmoDependenciesNode(output_type='global_js').\
+            render(context=context)
+
+        self.assertEqual('<script src="/static/tethys_gizmos/vendor/plotly/plotly-1.0.0.abc.min.js" '
+                         'type="text/javascript"></script>', render_globaljs)
+        mock_get_plotlyjs.assert_not_called()
+
+    @mock.patch('tethys_gizmos.templatetags.tethys_gizmos.get_plotlyjs')
+    @mock.patch('tethys_gizmos.templatetags.tethys_gizmos.get_plotlyjs_static_path')
+    def test_render_plotlyjs_inline(self, mock_static_path, mock_get_plotlyjs):
+        mock_static_path.return_value = None
+        mock_get_plotlyjs.return_value = 'var plotly;'
+        context = Context({'gizmos_rendered': ['plotly_view']})
+
+        render_globaljs = gizmos_templatetags.TethysGizmoDependenciesNode(output_type='global_js').\
+            render(context=context)
+
+        self.assertEqual('<script type="text/javascript">var plotly;</script>', render_globaljs)
+
+    @override_settings(DEBUG=True)
+    @mock.patch('tethys_gizmos.templatetags.tethys_gizmos.get_plotlyjs')
+    @mock.patch('tethys_gizmos.templatetags.tethys_gizmos.get_plotlyjs_static_path')
+    def test_render_plotlyjs_debug(self, mock_static_path, mock_get_plotlyjs):
+        mock_get_plotlyjs.return_value = 'var plotly;'
+        context = Context({'gizmos_rendered': ['plotly_view']})
+
+        render_globaljs = gizmos_templatetags.TethysGizmoDependenciesNode(output_type='global_js').\
+            render(context=context)
+
+        self.assertEqual('<script type="text/javascript">var plotly;</script>', render_globaljs)
+        mock_static_path.assert_not_called()
+
+    def test_render_gizmo_not_rendered_yet(self):
+        gizmos_templatetags.GIZMO_NAME_MAP[TestGizmo.gizmo_name] = TestGizmo
+        t = Template('{% load tethys_gizmos %}'
+                     '{% gizmo_dependencies global_css %}|{% gizmo foo %}|{% gizmo_dependencies js %}')
+
+        result = t.render(Context({'foo': TestGizmo(name='test_render'), 'bar': TestGizmo(name='not_rendered')}))
+
+        render_globalcss, render_gizmo, render_js = result.split('|')
+        self.assertIn('openlayers/ol.css', render_globalcss)
+        self.assertEqual('test_render', render_gizmo)
+        self.assertIn('plotly-load_from_python.js', render_js)
+
+    def test_render_lazy_gizmo_not_rendered(self):
+        gizmos_templatetags.GIZMO_NAME_MAP[TestGizmo.gizmo_name] = TestGizmo
+        factory = mock.MagicMock()
+        t = Template('{% load tethys_gizmos %}{% gizmo_dependencies global_css %}'
+                     '{% if show %}{% gizmo foo %}{% endif %}')
+
+        result = t.render(Context({'foo': LazyGizmoOptions(factory, TestGizmo), 'show': False}))
+
+        # The dependencies are loaded from the name of the gizmo, without constructing the options
+        self.assertIn('openlayers/ol.css', result)
+        factory.assert_not_called()
+
+    def test_render_gizmo_not_in_template(self):
+        gizmos_templatetags.GIZMO_NAME_MAP[TestGizmo.gizmo_name] = TestGizmo
+        t = Template('{% load tethys_gizmos %}{% gizmo_dependencies global_css %}')
+
+        # Gizmo options in the context are not loaded unless a gizmo tag renders them
+        result = t.render(Context({'foo': TestGizmo(name='test_render')}))
+
+        self.assertEqual('', result)
+
+    def test_render_gizmo_in_included_template(self):
+        node = gizmos_templatetags.TethysGizmoDependenciesNode(output_type='global_js')
+        included = Template('{% load tethys_gizmos %}{% gizmo plot %}')
+        t = Template('{% load tethys_gizmos %}{% include "test_included.html" %}')
+        context = Context({'plot': mock.MagicMock(gizmo_name='plotly_view')})
+        context.template = t
+
+        with mock.patch.object(gizmos_templatetags, '_get_template',
+                               return_value=mock.MagicMock(template=included)) as mock_get_template:
+            gizmo_nodes = node._get_gizmo_nodes(context)
+
+        mock_get_template.assert_called_once_with('test_included.html')
+        self.assertEqual(1, len(gizmo_nodes))
+        self.assertEqual('plotly_view', gizmo_nodes[0].get_gizmo_name(context))
+
+    def test_get_gizmo_nodes_cached(self):
+        node = gizmos_templatetags.TethysGizmoDependenciesNode(output_type='global_js')
+        t = Template('{% load tethys_gizmos %}{% gizmo plot %}')
+        context = Context({'plot': mock.MagicMock(gizmo_name='plotly_view')})
+        context.template = t
+        next_context = Context()
+        next_context.template = t
+
+        # The tags are found once for all the renders of the template
+        with mock.patch.object(gizmos_templatetags.TethysGizmoDependenciesNode, '_find_gizmo_nodes',
+                               wraps=node._find_gizmo_nodes) as mock_find:
+            gizmo_nodes = node._get_gizmo_nodes(context)
+            self.assertIs(gizmo_nodes, node._get_gizmo_nodes(next_context))
+
+        mock_find.assert_called_once_with(t, ())
+        self.assertEqual(1, len(gizmo_nodes))
+        self.assertIn(t, gizmos_templatetags._gizmo_nodes)
+
+        gizmos_templatetags.clear_gizmo_caches()
+        self.assertNotIn(t, gizmos_templatetags._gizmo_nodes)
+
+    @override_settings(GIZMO_BUNDLE_ASSETS=True)
+    @mock.patch('tethys_gizmos.templatetags.tethys_gizmos.bundle_dependencies')
+    def test_render_bundled(self, mock_bundle):
+        gizmos_templatetags.GIZMO_NAME_MAP[TestGizmo.gizmo_name] = TestGizmo
+        mock_bundle.side_effect = lambda dependencies: [
+            'tethys_gizmos/bundles/gizmos.{}'.format(d.rsplit('.', 1)[1]) for d in dependencies[:1]
+        ]
+        context = Context({'gizmos_rendered': [TestGizmo.gizmo_name]})
+
+        render_globalcss = gizmos_templatetags.TethysGizmoDependenciesNode(output_type='global_css').\
+            render(context=context)
+        render_js = gizmos_templatetags.TethysGizmoDependenciesNode(output_type='js').\
+            render(context=context)
+
+        self.assertEqual('<link href="/static/tethys_gizmos/bundles/gizmos.js" rel="preload" as="script" />\n'
+                         '<link href="/static/tethys_gizmos/bundles/gizmos.js" rel="preload" as="script" />\n'
+                         '<link href="/static/tethys_gizmos/bundles/gizmos.css" rel="stylesheet" />',
+                         render_globalcss)
+        self.assertEqual('<script src="/static/tethys_gizmos/bundles/gizmos.js" type="text/javascript"></script>',
+                         render_js)
+        mock_bundle.assert_any_call(['tethys_gizmos/js/plotly-load_from_python.js',
+                                     'tethys_gizmos/js/tethys_gizmos.js'])
+
+    def test_render_not_bundled(self):
+        gizmos_templatetags.GIZMO_NAME_MAP[TestGizmo.gizmo_name] = TestGizmo
+        context = Context({'gizmos_rendered': [TestGizmo.gizmo_name]})
+
+        render_globalcss = gizmos_templatetags.TethysGizmoDependenciesNode(output_type='global_css').\
+            render(context=context)
+
+        self.assertEqual('<link href="/static/tethys_gizmos/vendor/openlayers/ol.css" rel="stylesheet" />',
+                         render_globalcss)
+
+    def test_get_dependencies(self):
+        gizmos_templatetags.GIZMO_NAME_MAP[TestGizmo.gizmo_name] = TestGizmo
+
+        ret = gizmos_templatetags.TethysGizmoDependenciesNode.get_dependencies([TestGizmo.gizmo_name])
+
+        self.assertEqual(['tethys_gizmos/vendor/openlayers/ol.js'], ret['global_js'])
+        self.assertEqual(['tethys_gizmos/vendor/openlayers/ol.css'], ret['global_css'])
+        self.assertEqual('tethys_gizmos/js/plotly-load_from_python.js', ret['js'][0])
+        self.assertEqual('tethys_gizmos/css/tethys_map_view.min.css', ret['css'][0])
+
+    def test_render_memoized(self):
+        gizmos_templatetags.GIZMO_NAME_MAP[TestGizmo.gizmo_name] = TestGizmo
+        node = gizmos_templatetags.TethysGizmoDependenciesNode(output_type='css')
+
+        with mock.patch.object(node, '_render_tags', return_value='<link />') as mock_render_tags:
+            node.render(Context({'gizmos_rendered': [TestGizmo.gizmo_name]}))
+            result = node.render(Context({'gizmos_rendered': [TestGizmo.gizmo_name]}))
+
+        self.assertEqual('<link />', result)
+        mock_render_tags.assert_called_once_with((TestGizmo.gizmo_name,))
+
+
+class TestGetTemplate(unittest.TestCase):
+    def setUp(self):
+        gizmos_templatetags.clear_gizmo_caches()
+
+    def tearDown(self):
+        gizmos_templatetags.clear_gizmo_caches()
+
+    @override_settings(DEBUG=False)
+    @mock.patch('tethys_gizmos.templatetags.tethys_gizmos.get_template')
+    def test_get_template_memoized(self, mock_gt):
+        result1 = gizmos_templatetags._get_template('tethys_gizmos/gizmos/test_gizmo.html')
+        result2 = gizmos_templatetags._get_template('tethys_gizmos/gizmos/test_gizmo.html')
+
+        self.assertIs(result1, result2)
+        mock_gt.assert_called_once_with('tethys_gizmos/gizmos/test_gizmo.html')
+
+    @override_settings(DEBUG=True)
+    @mock.patch('tethys_gizmos.templatetags.tethys_gizmos.get_template')
+    def test_get_template_debug(self, mock_gt):
+        gizmos_templatetags._get_template('tethys_gizmos/gizmos/test_gizmo.html')
+        gizmos_templatetags._get_template('tethys_gizmos/gizmos/test_gizmo.html')
+
+        self.assertEqual(2, mock_gt.call_count)
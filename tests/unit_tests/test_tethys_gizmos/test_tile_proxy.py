@@ -0,0 +1,228 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from django.core.signing import BadSignature
+from requests import RequestException
+
+from tethys_gizmos import tile_proxy
+from tethys_gizmos.tile_proxy import Tile, TileCache, TileProxy
+
+
+class TestTileProxyUrls(unittest.TestCase):
+
+    def test_get_tile_proxy_url(self):
+        result = tile_proxy.get_tile_proxy_url('http://localhost:8181/geoserver/wms')
+
+        self.assertTrue(result.startswith('/developer/gizmos/tile-proxy/'))
+        self.assertTrue(result.endswith('/wms'))
+        token = result.split('/')[-2]
+        self.assertEqual('http://localhost:8181/geoserver/wms',
+                         tile_proxy.get_upstream_url(token, 'wms'))
+
+    def test_get_tile_proxy_url_query(self):
+        result = tile_proxy.get_tile_proxy_url('http://localhost:8181/geoserver/wms?REQUEST=GetLegendGraphic&LAYER=a')
+
+        path, query = result.split('?')
+        self.assertTrue(path.endswith('/wms'))
+        self.assertEqual('REQUEST=GetLegendGraphic&LAYER=a', query)
+
+    def test_get_upstream_url_sorts_query(self):
+        token = tile_proxy.get_tile_proxy_url('https://example.com/arcgis/rest/services/Roads/MapServer').split('/')[-2]
+
+        result = tile_proxy.get_upstream_url(token, 'MapServer/export', 'F=image&BBOX=1,2,3,4&DPI=')
+
+        self.assertEqual('https://example.com/arcgis/rest/services/Roads/MapServer/export'
+                         '?BBOX=1%2C2%2C3%2C4&DPI=&F=image', result)
+
+    def test_get_upstream_url_bad_signature(self):
+        self.assertRaises(BadSignature, tile_proxy.get_upstream_url, 'http://evil.com/', 'wms')
+
+    def test_get_upstream_url_parent_path(self):
+        token = tile_proxy.get_tile_proxy_url('http://localhost:8181/geoserver/wms').split('/')[-2]
+
+        self.assertRaises(ValueError, tile_proxy.get_upstream_url, token, '../admin/secrets')
+
+    def test_get_upstream_url_unsigned_path(self):
+        token = tile_proxy.get_tile_proxy_url('http://localhost:8181/geoserver/wms').split('/')[-2]
+
+        for path in ('rest/workspaces', 'web/', 'wms/../rest', 'ows', 'wfs/extra', ''):
+            self.assertRaises(ValueError, tile_proxy.get_upstream_url, token, path)
+
+    def test_get_upstream_url_derived_path(self):
+        token = tile_proxy.get_tile_proxy_url('http://localhost:8181/geoserver/wms').split('/')[-2]
+
+        result = tile_proxy.get_upstream_url(token, 'wfs', 'typeName=a')
+
+        self.assertEqual('http://localhost:8181/geoserver/wfs?typeName=a', result)
+
+
+class TestTileCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.cache = TileCache(self.directory, max_size=100, ttl=60)
+        self.tile = Tile(200, 'image/png', b'0123456789')
+
+    def test_get_set(self):
+        key = TileCache.get_key('http://localhost/wms?x=1')
+
+        self.assertIsNone(self.cache.get(key))
+        self.cache.set(key, self.tile)
+
+        self.assertEqual(self.tile, self.cache.get(key))
+        self.assertEqual(1, len(self.cache))
+        self.assertEqual(20, self.cache.size)
+        self.assertTrue(os.path.isfile(os.path.join(self.directory, key[:2], key)))
+
+    def test_evicts_least_recently_used(self):
+        keys = [TileCache.get_key(str(i)) for i in range(6)]
+
+        for key in keys[:5]:
+            self.cache.set(key, self.tile)
+        self.cache.get(keys[0])
+        self.cache.set(keys[5], self.tile)
+
+        self.assertEqual(5, len(self.cache))
+        self.assertEqual(100, self.cache.size)
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertFalse(os.path.exists(os.path.join(self.directory, keys[1][:2], keys[1])))
+
+    def test_expired(self):
+        key = TileCache.get_key('a')
+        self.cache.set(key, self.tile)
+        path = os.path.join(self.directory, key[:2], key)
+        os.utime(path, (time.time(), time.time() - 61))
+
+        self.assertIsNone(self.cache.get(key))
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(0, self.cache.size)
+
+    def test_load_existing_tiles(self):
+        keys = [TileCache.get_key(str(i)) for i in range(3)]
+        for key in keys:
+            self.cache.set(key, self.tile)
+        # The first tile was used most recently
+        os.utime(os.path.join(self.directory, keys[0][:2], keys[0]), (time.time() + 10, time.time()))
+
+        cache = TileCache(self.directory, max_size=40, ttl=60)
+
+        self.assertEqual(self.tile, cache.get(keys[0]))
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get(keys[1]))
+
+    def test_tile_removed_by_other_process(self):
+        key = TileCache.get_key('a')
+        self.cache.set(key, self.tile)
+        os.remove(os.path.join(self.directory, key[:2], key))
+
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(0, len(self.cache))
+
+    def test_clear(self):
+        self.cache.set(TileCache.get_key('a'), self.tile)
+
+        self.cache.clear()
+
+        self.assertEqual(0, len(self.cache))
+        self.assertEqual([], [f for _, _, files in os.walk(self.directory) for f in files])
+
+
+class TestTileProxy(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.proxy = TileProxy(TileCache(self.directory, max_size=1000, ttl=60), timeout=5)
+        self.proxy.session = mock.MagicMock()
+        self.response = mock.MagicMock(status_code=200, headers={'Content-Type': 'image/png'}, content=b'png')
+        self.proxy.session.get.return_value = self.response
+
+    def test_get_tile(self):
+        tile, cache_status = self.proxy.get_tile('http://localhost/wms?x=1')
+
+        self.assertEqual(Tile(200, 'image/png', b'png'), tile)
+        self.assertEqual('MISS', cache_status)
+        self.proxy.session.get.assert_called_once_with('http://localhost/wms?x=1', timeout=5)
+
+        tile, cache_status = self.proxy.get_tile('http://localhost/wms?x=1')
+
+        self.assertEqual(b'png', tile.content)
+        self.assertEqual('HIT', cache_status)
+        self.proxy.session.get.assert_called_once()
+
+        metrics = self.proxy.get_metrics()
+        self.assertEqual(2, metrics['requests'])
+        self.assertEqual(1, metrics['hits'])
+        self.assertEqual(1, metrics['misses'])
+        self.assertEqual(0.5, metrics['hit_ratio'])
+        self.assertEqual(1, metrics['cached_tiles'])
+
+    def test_get_tile_not_cached(self):
+        self.response.status_code = 500
+        self.response.headers = {'Content-Type': 'text/xml'}
+
+        self.proxy.get_tile('http://localhost/wms?x=1')
+        self.response.status_code = 200
+        self.proxy.get_tile('http://localhost/wms?x=1')
+
+        self.assertEqual(2, self.proxy.session.get.call_count)
+
+    def test_get_tile_error(self):
+        self.proxy.session.get.side_effect = RequestException('timeout')
+
+        self.assertRaises(RequestException, self.proxy.get_tile, 'http://localhost/wms?x=1')
+
+        self.assertEqual(1, self.proxy.get_metrics()['errors'])
+        self.assertEqual({}, self.proxy._pending)
+
+    def test_get_tile_coalesced(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return self.response
+
+        self.proxy.session.get.side_effect = slow_get
+        results = []
+        leader = threading.Thread(target=lambda: results.append(self.proxy.get_tile('http://localhost/wms')))
+        leader.start()
+        started.wait(5)
+
+        followers = [threading.Thread(target=lambda: results.append(self.proxy.get_tile('http://localhost/wms')))
+                     for _ in range(3)]
+        for follower in followers:
+            follower.start()
+        while self.proxy.get_metrics()['coalesced'] < 3:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+
+        self.proxy.session.get.assert_called_once()
+        self.assertEqual(['COALESCED'] * 3 + ['MISS'], sorted(status for _, status in results))
+        self.assertTrue(all(tile.content == b'png' for tile, _ in results))
+
+    @mock.patch('tethys_gizmos.tile_proxy._tile_proxy', None)
+    @mock.patch('tethys_gizmos.tile_proxy.settings')
+    def test_get_tile_proxy(self, mock_settings):
+        mock_settings.TILE_PROXY_CACHE_DIR = self.directory
+        mock_settings.TILE_PROXY_CACHE_SIZE = 2
+        mock_settings.TILE_PROXY_CACHE_TTL = 10
+        mock_settings.TILE_PROXY_TIMEOUT = 3
+
+        result = tile_proxy.get_tile_proxy()
+
+        self.assertIs(result, tile_proxy.get_tile_proxy())
+        self.assertEqual(self.directory, result.cache.directory)
+        self.assertEqual(2 * 1024 * 1024, result.cache.max_size)
+        self.assertEqual(10, result.cache.ttl)
+        self.assertEqual(3, result.timeout)
@@ -129,3 +129,18 @@ class TestUrls(TethysTestCase):
         self.assertEqual('update_status', resolver.func.__name__)
         self.assertEqual('tethys_gizmos.views.gizmos.jobs_table', resolver.func.__module__)
         self.assertEqual('gizmos', resolver.namespaces[0])
+
+    def test_urls_tile_proxy(self):
+        url = reverse('gizmos:tile_proxy', kwargs={'token': 'abc.de:12-f_g', 'path': 'MapServer/export'})
+        resolver = resolve(url)
+        self.assertEqual('/developer/gizmos/tile-proxy/abc.de:12-f_g/MapServer/export', url)
+        self.assertEqual('tile_proxy', resolver.func.__name__)
+        self.assertEqual('tethys_gizmos.views.gizmos.map_view', resolver.func.__module__)
+        self.assertEqual('gizmos', resolver.namespaces[0])
+
+    def test_urls_tile_proxy_metrics(self):
+        url = reverse('gizmos:tile_proxy_metrics')
+        resolver = resolve(url)
+        self.assertEqual('/developer/gizmos/tile-proxy/metrics/', url)
+        self.assertEqual('tile_proxy_metrics', resolver.func.__name__)
+        self.assertEqual('gizmos', resolver.namespaces[0])
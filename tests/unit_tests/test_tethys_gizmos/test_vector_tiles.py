@@ -0,0 +1,354 @@
+import json
+import os
+import struct
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from tethys_gizmos import vector_tiles
+from tethys_gizmos.vector_tiles import VectorTileSource, encode_tile, read_wkb
+
+
+def read_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, offset
+
+
+def read_message(data):
+    """
+    Decode a protocol buffers message to a list of (field, value) tuples.
+    """
+    fields = []
+    offset = 0
+    while offset < len(data):
+        key, offset = read_varint(data, offset)
+        field, wire_type = key >> 3, key & 0x7
+        if wire_type == 0:
+            value, offset = read_varint(data, offset)
+        elif wire_type == 1:
+            value = struct.unpack_from('<d', data, offset)[0]
+            offset += 8
+        else:
+            length, offset = read_varint(data, offset)
+            value = data[offset:offset + length]
+            offset += length
+        fields.append((field, value))
+    return fields
+
+
+def read_packed(data):
+    values = []
+    offset = 0
+    while offset < len(data):
+        value, offset = read_varint(data, offset)
+        values.append(value)
+    return values
+
+
+def unzigzag(value):
+    return (value >> 1) ^ -(value & 1)
+
+
+def decode_geometry(commands):
+    """
+    Decode geometry commands to a list of paths of (x, y) tuples. Closed paths end with their first point.
+    """
+    paths = []
+    x = y = 0
+    i = 0
+    while i < len(commands):
+        command_id, count = commands[i] & 0x7, commands[i] >> 3
+        i += 1
+        if command_id == 7:
+            paths[-1].append(paths[-1][0])
+            continue
+        for _ in range(count):
+            x += unzigzag(commands[i])
+            y += unzigzag(commands[i + 1])
+            i += 2
+            if command_id == 1:
+                paths.append([])
+            paths[-1].append((x, y))
+    return paths
+
+
+def decode_tile(data):
+    """
+    Decode a Mapbox Vector Tile to a dictionary of layers with the extent and features of each layer.
+    """
+    layers = {}
+    for _, layer_data in read_message(data):
+        layer = dict(read_message(layer_data))
+        fields = read_message(layer_data)
+        keys = [v.decode() for f, v in fields if f == 3]
+        values = []
+        for f, v in fields:
+            if f == 4:
+                value_field, value = read_message(v)[0]
+                values.append(value.decode() if value_field == 1 else bool(value) if value_field == 7
+                              else unzigzag(value) if value_field == 6 else value)
+        features = []
+        for f, v in fields:
+            if f == 2:
+                feature = dict(read_message(v))
+                tags = read_packed(feature.get(2, b''))
+                features.append({
+                    'id': feature.get(1),
+                    'type': feature[3],
+                    'properties': {keys[tags[i]]: values[tags[i + 1]] for i in range(0, len(tags), 2)},
+                    'geometry': decode_geometry(read_packed(feature[4])),
+                })
+        layers[layer[1].decode()] = {'version': layer[15], 'extent': layer[5], 'features': features}
+    return layers
+
+
+def point(lon, lat, feature_id=None, **properties):
+    feature = {'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': [lon, lat]}, 'properties': properties}
+    if feature_id is not None:
+        feature['id'] = feature_id
+    return feature
+
+
+class TestEncodeTile(unittest.TestCase):
+
+    def test_encode_tile(self):
+        geometry = vector_tiles._encode_geometry(vector_tiles.POINT, np.array([[25, 17]]))
+        ret = encode_tile('points', [(1, {'name': 'a', 'value': -2, 'flag': True, 'ratio': 0.5, 'none': None,
+                                          'count': np.int64(3), 'tags': ['x']}, 1, geometry)])
+
+        layer = decode_tile(ret)['points']
+        self.assertEqual(2, layer['version'])
+        self.assertEqual(4096, layer['extent'])
+        self.assertEqual([{
+            'id': 1,
+            'type': 1,
+            'properties': {'name': 'a', 'value': -2, 'flag': True, 'ratio': 0.5, 'count': 3, 'tags': '["x"]'},
+            'geometry': [[(25, 17)]],
+        }], layer['features'])
+
+    def test_encode_tile_spec_example(self):
+        # Geometry examples of the Mapbox Vector Tile specification
+        self.assertEqual([9, 50, 34], vector_tiles._encode_geometry(vector_tiles.POINT, np.array([[25, 17]])))
+        self.assertEqual(
+            [9, 4, 4, 18, 0, 16, 16, 0, 9, 17, 17, 10, 4, 8],
+            vector_tiles._encode_geometry(vector_tiles.LINESTRING, [np.array([[2, 2], [2, 10], [10, 10]]),
+                                                                    np.array([[1, 1], [3, 5]])])
+        )
+        self.assertEqual(
+            [9, 6, 12, 18, 10, 12, 24, 44, 15],
+            vector_tiles._encode_geometry(vector_tiles.POLYGON, [[np.array([[3, 6], [8, 12], [20, 34], [3, 6]])]])
+        )
+
+    def test_encode_tile_empty(self):
+        self.assertEqual(b'', encode_tile('empty', []))
+
+
+class TestReadWKB(unittest.TestCase):
+
+    def test_read_wkb_point(self):
+        wkb = struct.pack('<BIdd', 1, 1, -111.5, 40.25)
+        self.assertEqual({'type': 'Point', 'coordinates': [-111.5, 40.25]}, read_wkb(wkb))
+        self.assertEqual({'type': 'Point', 'coordinates': [-111.5, 40.25]}, read_wkb(wkb.hex()))
+
+    def test_read_wkb_big_endian_ewkb_z(self):
+        # Point Z with SRID (PostGIS EWKB)
+        wkb = struct.pack('>BIIddd', 0, 0x80000001 | 0x20000000, 4326, 1.0, 2.0, 3.0)
+        self.assertEqual({'type': 'Point', 'coordinates': [1.0, 2.0]}, read_wkb(memoryview(wkb)))
+
+    def test_read_wkb_polygon(self):
+        ring = [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 0.0)]
+        wkb = struct.pack('<BII', 1, 3, 1) + struct.pack('<I', 4) + b''.join(struct.pack('<dd', *p) for p in ring)
+        self.assertEqual({'type': 'Polygon', 'coordinates': [[list(p) for p in ring]]}, read_wkb(wkb))
+
+    def test_read_wkb_multi_line_string_iso_z(self):
+        line = struct.pack('<BII', 1, 1002, 2) + struct.pack('<6d', 0, 0, 9, 1, 1, 9)
+        wkb = struct.pack('<BII', 1, 5, 2) + line + line
+        self.assertEqual({'type': 'MultiLineString', 'coordinates': [[[0, 0], [1, 1]], [[0, 0], [1, 1]]]},
+                         read_wkb(wkb))
+
+    def test_read_wkb_invalid(self):
+        self.assertRaises(ValueError, read_wkb, struct.pack('<BI', 1, 17))
+
+
+class TestVectorTileSource(unittest.TestCase):
+
+    def test_invalid_srid(self):
+        self.assertRaises(ValueError, VectorTileSource, 'foo', [], srid=27700)
+
+    def test_get_tile_invalid(self):
+        source = VectorTileSource('foo', [])
+        self.assertRaises(ValueError, source.get_tile, 1, 2, 0)
+        self.assertRaises(ValueError, source.get_tile, -1, 0, 0)
+
+    def test_get_tile_points(self):
+        source = VectorTileSource('gauges', [point(-90, 45, feature_id=7, name='a'), point(90, -45, name='b')])
+
+        layer = decode_tile(source.get_tile(1, 0, 0))['gauges']
+
+        self.assertEqual(1, len(layer['features']))
+        feature = layer['features'][0]
+        self.assertEqual(7, feature['id'])
+        self.assertEqual({'name': 'a'}, feature['properties'])
+        x, y = feature['geometry'][0][0]
+        self.assertEqual(2048, x)
+        self.assertAlmostEqual(2947, y, delta=1)
+
+        # No features in the tile
+        self.assertEqual(b'', source.get_tile(1, 1, 0))
+
+    def test_get_tile_web_mercator(self):
+        collection = {
+            'type': 'FeatureCollection',
+            'crs': {'type': 'name', 'properties': {'name': 'EPSG:3857'}},
+            'features': [{'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': [0, 0]}}],
+        }
+        source = VectorTileSource('foo', collection)
+
+        layer = decode_tile(source.get_tile(0, 0, 0))['foo']
+
+        self.assertEqual([[(2048, 2048)]], layer['features'][0]['geometry'])
+
+    def test_get_tile_line_clipped(self):
+        line = {'type': 'Feature', 'properties': {}, 'geometry': {
+            'type': 'LineString', 'coordinates': [[-90, 0], [90, 0]]}}
+        source = VectorTileSource('rivers', [line])
+
+        layer = decode_tile(source.get_tile(1, 0, 1))['rivers']
+
+        # Clipped to the buffered tile
+        self.assertEqual([[(2048, 0), (4160, 0)]], layer['features'][0]['geometry'])
+
+    def test_get_tile_line_split(self):
+        line = {'type': 'Feature', 'properties': {}, 'geometry': {
+            'type': 'LineString', 'coordinates': [[-100, 10], [-100, -10], [-50, -10], [-50, 10]]}}
+        source = VectorTileSource('rivers', [line], buffer=0)
+
+        layer = decode_tile(source.get_tile(1, 0, 0))['rivers']
+
+        # The line leaves the tile and enters it again
+        self.assertEqual(1, len(layer['features']))
+        self.assertEqual(2, len(layer['features'][0]['geometry']))
+
+    def test_get_tile_polygon(self):
+        # Counterclockwise exterior ring and clockwise hole (RFC 7946)
+        polygon = {'type': 'Feature', 'properties': {'name': 'lake'}, 'geometry': {'type': 'Polygon', 'coordinates': [
+            [[-10, -10], [10, -10], [10, 10], [-10, 10], [-10, -10]],
+            [[-5, -5], [-5, 5], [5, 5], [5, -5], [-5, -5]],
+        ]}}
+        source = VectorTileSource('lakes', [polygon])
+
+        feature = decode_tile(source.get_tile(0, 0, 0))['lakes']['features'][0]
+
+        self.assertEqual(3, feature['type'])
+        exterior, hole = [np.array(ring) for ring in feature['geometry']]
+        self.assertGreater(vector_tiles._ring_area(exterior), 0)
+        self.assertLess(vector_tiles._ring_area(hole), 0)
+        self.assertEqual(tuple(exterior[0]), tuple(exterior[-1]))
+
+    def test_get_tile_polygon_clipped(self):
+        polygon = {'type': 'Feature', 'properties': {}, 'geometry': {'type': 'Polygon', 'coordinates': [
+            [[-10, -10], [10, -10], [10, 10], [-10, 10], [-10, -10]],
+        ]}}
+        source = VectorTileSource('lakes', [polygon], buffer=0)
+
+        feature = decode_tile(source.get_tile(1, 1, 1))['lakes']['features'][0]
+
+        ring = np.array(feature['geometry'][0])
+        self.assertEqual(0, ring.min())
+        self.assertLess(ring.max(), 4096)
+        self.assertGreater(vector_tiles._ring_area(ring), 0)
+
+    def test_get_tile_small_features_dropped(self):
+        polygon = {'type': 'Feature', 'properties': {}, 'geometry': {'type': 'Polygon', 'coordinates': [
+            [[0, 0], [0.001, 0], [0.001, 0.001], [0, 0]],
+        ]}}
+        source = VectorTileSource('lakes', [polygon])
+
+        self.assertEqual(b'', source.get_tile(0, 0, 0))
+        self.assertEqual(1, len(decode_tile(source.get_tile(16, 32768, 32767))['lakes']['features']))
+
+    def test_get_tile_wkb_and_multipoint(self):
+        features = [
+            {'id': 1, 'geometry': struct.pack('<BIdd', 1, 1, 10, 10), 'properties': {}},
+            {'id': 2, 'geometry': json.dumps({'type': 'MultiPoint', 'coordinates': [[-10, -10], [-20, -20]]})},
+            {'id': 3, 'geometry': None},
+        ]
+        source = VectorTileSource('foo', features)
+
+        layer = decode_tile(source.get_tile(0, 0, 0))['foo']
+
+        self.assertEqual([1, 2], sorted(f['id'] for f in layer['features']))
+        multipoint = [f for f in layer['features'] if f['id'] == 2][0]
+        self.assertEqual(2, len(multipoint['geometry']))
+
+    def test_get_tile_clusters(self):
+        features = [point(-100 + i * 0.01, 40, feature_id=i) for i in range(10)] + [point(100, -40, feature_id=99)]
+        source = VectorTileSource('gauges', features, cluster_radius=40, cluster_max_zoom=5)
+
+        layer = decode_tile(source.get_tile(0, 0, 0))['gauges']
+
+        clusters = [f for f in layer['features'] if f['properties'].get('cluster')]
+        self.assertEqual(1, len(clusters))
+        self.assertEqual(10, clusters[0]['properties']['point_count'])
+        self.assertEqual([99], [f['id'] for f in layer['features'] if not f['properties'].get('cluster')])
+
+        # Not clustered above the maximum zoom
+        layer = decode_tile(source.get_tile(6, 14, 24))['gauges']
+        self.assertEqual(10, len(layer['features']))
+
+    def test_get_tile_cached(self):
+        get_features = mock.MagicMock(return_value=[point(0, 0)])
+        source = VectorTileSource('foo', get_features, max_cached_tiles=1)
+
+        with mock.patch.object(source, '_render_tile', wraps=source._render_tile) as mock_render:
+            tile = source.get_tile(0, 0, 0)
+            self.assertIs(tile, source.get_tile(0, 0, 0))
+            source.get_tile(1, 0, 0)
+            source.get_tile(0, 0, 0)
+
+        self.assertEqual(3, mock_render.call_count)
+        get_features.assert_called_once()
+        self.assertEqual(1, len(source._tiles))
+
+    def test_clear_cache(self):
+        get_features = mock.MagicMock(return_value=[point(0, 0)])
+        source = VectorTileSource('foo', get_features)
+        source.get_tile(0, 0, 0)
+
+        source.clear_cache()
+        source.get_tile(0, 0, 0)
+        get_features.assert_called_once()
+
+        source.clear_cache(reload_features=True)
+        source.get_tile(0, 0, 0)
+        self.assertEqual(2, get_features.call_count)
+
+    def test_from_geojson(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        path = os.path.join(temp_dir, 'gauges.geojson')
+        with open(path, 'w') as f:
+            json.dump({'type': 'FeatureCollection', 'features': [point(0, 0, name='a')]}, f)
+
+        source = VectorTileSource.from_geojson('gauges', path)
+
+        layer = decode_tile(source.get_tile(0, 0, 0))['gauges']
+        self.assertEqual({'name': 'a'}, layer['features'][0]['properties'])
+
+    def test_persistent_store_features(self):
+        mock_engine = mock.MagicMock()
+        mock_row = mock.MagicMock(_mapping={'id': 4, 'name': 'a', 'geometry': b'wkb'})
+        mock_engine.connect.return_value.__enter__.return_value.execute.return_value = [mock_row]
+
+        ret = VectorTileSource.persistent_store_features(mock_engine, 'SELECT * FROM gauges', id_column='id')
+
+        self.assertEqual([{'type': 'Feature', 'id': 4, 'geometry': b'wkb', 'properties': {'name': 'a'}}], ret)
@@ -0,0 +1,56 @@
+import datetime
+import json
+import unittest
+
+import numpy as np
+from django.test import RequestFactory
+
+from tethys_gizmos.views.gizmos import datatable_view
+
+
+class TestDataTableView(unittest.TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.rows = [
+            ['Bill', np.int64(30), datetime.date(2020, 1, 2)],
+            ['Fred', np.int64(18), None],
+            ['Bob', np.int64(26), datetime.date(2021, 3, 4)],
+        ]
+
+    def tearDown(self):
+        pass
+
+    def test_table_data_response(self):
+        request = self.factory.get('/people/', {'draw': '4', 'start': '0', 'length': '2',
+                                                'order[0][column]': '1', 'order[0][dir]': 'asc'})
+
+        result = datatable_view.table_data_response(request, self.rows)
+
+        self.assertEqual(200, result.status_code)
+        self.assertEqual({
+            'draw': 4,
+            'recordsTotal': 3,
+            'recordsFiltered': 3,
+            'data': [['Fred', 18, None], ['Bob', 26, '2021-03-04']],
+        }, json.loads(result.content))
+
+    def test_table_data_response_post(self):
+        request = self.factory.post('/people/', {'draw': '1', 'search[value]': 'bi'})
+
+        result = datatable_view.table_data_response(request, self.rows, columns=[0, 1])
+
+        self.assertEqual([['Bill', 30]], json.loads(result.content)['data'])
+
+    def test_table_data_response_max_length(self):
+        request = self.factory.get('/people/', {'length': '-1'})
+
+        result = datatable_view.table_data_response(request, self.rows, max_length=1)
+
+        self.assertEqual(1, len(json.loads(result.content)['data']))
+
+    def test_table_data_response_invalid(self):
+        request = self.factory.get('/people/', {'length': 'all'})
+
+        result = datatable_view.table_data_response(request, self.rows)
+
+        self.assertEqual(400, result.status_code)
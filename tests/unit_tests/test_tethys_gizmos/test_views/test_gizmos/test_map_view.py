@@ -0,0 +1,123 @@
+import unittest
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.signing import BadSignature
+from django.test import RequestFactory
+from requests import RequestException
+
+from tethys_gizmos.tile_proxy import Tile
+from tethys_gizmos.views.gizmos import map_view
+
+
+class TestMapView(unittest.TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.source = mock.MagicMock()
+        self.source.get_tile.return_value = b'tile'
+
+    def tearDown(self):
+        pass
+
+    def test_vector_tile_response(self):
+        request = self.factory.get('/gauges/1/0/1/')
+
+        result = map_view.vector_tile_response(request, self.source, '1', '0', '1')
+
+        self.source.get_tile.assert_called_once_with(1, 0, 1)
+        self.assertEqual(200, result.status_code)
+        self.assertEqual('application/vnd.mapbox-vector-tile', result['Content-Type'])
+        self.assertEqual(b'tile', result.content)
+        self.assertFalse(result.has_header('Cache-Control'))
+
+    def test_vector_tile_response_max_age(self):
+        request = self.factory.get('/gauges/1/0/1/')
+
+        result = map_view.vector_tile_response(request, self.source, 1, 0, 1, max_age=3600)
+
+        self.assertEqual('max-age=3600', result['Cache-Control'])
+
+    def test_vector_tile_response_invalid_tile(self):
+        request = self.factory.get('/gauges/1/2/1/')
+        self.source.get_tile.side_effect = ValueError('Tile out of range')
+
+        result = map_view.vector_tile_response(request, self.source, 1, 2, 1)
+
+        self.assertEqual(400, result.status_code)
+
+    def test_vector_tile_response_not_a_number(self):
+        request = self.factory.get('/gauges/a/0/1/')
+
+        result = map_view.vector_tile_response(request, self.source, 'a', 0, 1)
+
+        self.assertEqual(400, result.status_code)
+        self.source.get_tile.assert_not_called()
+
+    @mock.patch('tethys_gizmos.views.gizmos.map_view.get_tile_proxy')
+    @mock.patch('tethys_gizmos.views.gizmos.map_view.get_upstream_url')
+    def test_tile_proxy(self, mock_upstream, mock_proxy):
+        request = self.factory.get('/tile-proxy/token/wms?LAYERS=a&BBOX=1,2,3,4')
+        mock_upstream.return_value = 'http://localhost/wms?BBOX=1,2,3,4&LAYERS=a'
+        mock_proxy().get_tile.return_value = (Tile(200, 'image/png', b'png'), 'HIT')
+        mock_proxy().cache.ttl = 60
+
+        result = map_view.tile_proxy(request, 'token', 'wms')
+
+        mock_upstream.assert_called_once_with('token', 'wms', 'LAYERS=a&BBOX=1,2,3,4')
+        mock_proxy().get_tile.assert_called_once_with('http://localhost/wms?BBOX=1,2,3,4&LAYERS=a')
+        self.assertEqual(200, result.status_code)
+        self.assertEqual(b'png', result.content)
+        self.assertEqual('image/png', result['Content-Type'])
+        self.assertEqual('HIT', result['X-Tile-Cache'])
+        self.assertEqual('max-age=60', result['Cache-Control'])
+
+    @mock.patch('tethys_gizmos.views.gizmos.map_view.get_tile_proxy')
+    @mock.patch('tethys_gizmos.views.gizmos.map_view.get_upstream_url')
+    def test_tile_proxy_upstream_error_status(self, _, mock_proxy):
+        request = self.factory.get('/tile-proxy/token/wms')
+        mock_proxy().get_tile.return_value = (Tile(404, 'text/xml', b'<error/>'), 'MISS')
+
+        result = map_view.tile_proxy(request, 'token', 'wms')
+
+        self.assertEqual(404, result.status_code)
+        self.assertFalse(result.has_header('Cache-Control'))
+
+    @mock.patch('tethys_gizmos.views.gizmos.map_view.get_upstream_url')
+    def test_tile_proxy_invalid_url(self, mock_upstream):
+        request = self.factory.get('/tile-proxy/token/wms')
+        mock_upstream.side_effect = BadSignature
+
+        result = map_view.tile_proxy(request, 'token', 'wms')
+
+        self.assertEqual(400, result.status_code)
+
+    @mock.patch('tethys_gizmos.views.gizmos.map_view.log')
+    @mock.patch('tethys_gizmos.views.gizmos.map_view.get_tile_proxy')
+    @mock.patch('tethys_gizmos.views.gizmos.map_view.get_upstream_url')
+    def test_tile_proxy_unreachable(self, _, mock_proxy, mock_log):
+        request = self.factory.get('/tile-proxy/token/wms')
+        mock_proxy().get_tile.side_effect = RequestException('timeout')
+
+        result = map_view.tile_proxy(request, 'token', 'wms')
+
+        self.assertEqual(502, result.status_code)
+        mock_log.warning.assert_called_once()
+
+    @mock.patch('tethys_gizmos.views.gizmos.map_view.get_tile_proxy')
+    def test_tile_proxy_metrics(self, mock_proxy):
+        request = self.factory.get('/tile-proxy/metrics/')
+        request.user = mock.MagicMock(is_active=True, is_staff=True)
+        mock_proxy().get_metrics.return_value = {'requests': 2, 'hits': 1}
+
+        result = map_view.tile_proxy_metrics(request)
+
+        self.assertEqual(200, result.status_code)
+        self.assertEqual(b'{"requests": 2, "hits": 1}', result.content)
+
+    def test_tile_proxy_metrics_not_staff(self):
+        request = self.factory.get('/tile-proxy/metrics/')
+        request.user = AnonymousUser()
+
+        result = map_view.tile_proxy_metrics(request)
+
+        self.assertEqual(302, result.status_code)
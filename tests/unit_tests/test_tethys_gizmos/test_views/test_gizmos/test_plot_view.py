@@ -0,0 +1,117 @@
+import json
+import struct
+import unittest
+
+import numpy as np
+from django.test import RequestFactory
+
+from tethys_gizmos.views.gizmos import plot_view
+
+
+class TestPlotView(unittest.TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def tearDown(self):
+        pass
+
+    def test_encode_plot_data_json(self):
+        series = [[np.array([0., 1.]), np.array([2., np.nan])]]
+
+        result = plot_view.encode_plot_data(series)
+
+        self.assertEqual('{"series":[[[0.0,1.0],[2.0,null]]]}', result)
+
+    def test_encode_plot_data_binary(self):
+        series = [
+            [np.array([0., 1.]), np.array([2., 3.])],
+            [np.array([4.]), np.array([5.]), np.array([6.])],
+        ]
+
+        result = plot_view.encode_plot_data(series, 'binary')
+
+        header = struct.unpack('<6I', result[:24])
+        self.assertEqual((2, 2, 2, 1, 3, 0), header)
+        np.testing.assert_array_equal([0, 1, 2, 3, 4, 5, 6], np.frombuffer(result[24:], dtype='<f8'))
+
+    def test_plot_data_response_json(self):
+        request = self.factory.get('/data/')
+        series = [[[0, 1], [1, 2]], {'data': [[0, 1, 2]]}]
+
+        response = plot_view.plot_data_response(request, series)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('application/json', response['Content-Type'])
+        self.assertEqual({'series': [[[0, 1], [1, 2]], [[0], [1], [2]]]}, json.loads(response.content))
+
+    def test_plot_data_response_binary(self):
+        request = self.factory.get('/data/', {'format': 'binary'})
+
+        response = plot_view.plot_data_response(request, [[[0, 1], [1, 2]]])
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('application/octet-stream', response['Content-Type'])
+        self.assertEqual(8 + 8 + 4 * 8, len(response.content))
+
+    def test_plot_data_response_points(self):
+        request = self.factory.get('/data/', {'points': '10'})
+        x = np.arange(1000)
+        series = [np.column_stack((x, np.sin(x))), np.column_stack((x, x, x))]
+
+        response = plot_view.plot_data_response(request, series)
+
+        result = json.loads(response.content)['series']
+        self.assertEqual(10, len(result[0][0]))
+        self.assertEqual(0, result[0][0][0])
+        self.assertEqual(999, result[0][0][-1])
+        # Series with more than two columns are not downsampled
+        self.assertEqual(1000, len(result[1][0]))
+
+    def test_plot_data_response_scatter(self):
+        request = self.factory.get('/data/', {'points': '10'})
+        x = np.random.RandomState(0).permutation(1000)
+
+        response = plot_view.plot_data_response(request, [np.column_stack((x, x))])
+
+        result = json.loads(response.content)['series']
+        # Unsorted points are sorted by x before being downsampled
+        self.assertEqual(10, len(result[0][0]))
+        self.assertEqual(sorted(result[0][0]), result[0][0])
+        self.assertEqual(result[0][0], result[0][1])
+        self.assertEqual([0, 999], [result[0][0][0], result[0][0][-1]])
+
+    def test_plot_data_response_max_points(self):
+        x = np.arange(1000)
+        series = [np.column_stack((x, np.sin(x)))]
+
+        response = plot_view.plot_data_response(self.factory.get('/data/'), series, max_points=20)
+        self.assertEqual(20, len(json.loads(response.content)['series'][0][0]))
+
+        response = plot_view.plot_data_response(self.factory.get('/data/', {'points': 50}), series, max_points=20)
+        self.assertEqual(20, len(json.loads(response.content)['series'][0][0]))
+
+        response = plot_view.plot_data_response(self.factory.get('/data/', {'points': 10}), series, max_points=20)
+        self.assertEqual(10, len(json.loads(response.content)['series'][0][0]))
+
+    def test_plot_data_response_min_max(self):
+        request = self.factory.get('/data/', {'points': '10'})
+        x = np.arange(1000)
+        y = np.zeros(1000)
+        y[500] = 100
+
+        response = plot_view.plot_data_response(request, [np.column_stack((x, y))], method='min_max')
+
+        result = json.loads(response.content)['series']
+        self.assertLessEqual(len(result[0][0]), 10)
+        self.assertIn(500, result[0][0])
+
+    def test_plot_data_response_invalid_method(self):
+        self.assertRaises(ValueError, plot_view.plot_data_response, self.factory.get('/data/'), [], method='mean')
+
+    def test_plot_data_response_invalid_format(self):
+        response = plot_view.plot_data_response(self.factory.get('/data/', {'format': 'csv'}), [])
+        self.assertEqual(400, response.status_code)
+
+    def test_plot_data_response_invalid_points(self):
+        response = plot_view.plot_data_response(self.factory.get('/data/', {'points': 'many'}), [])
+        self.assertEqual(400, response.status_code)
@@ -1,11 +1,12 @@
 import asyncio
 import asynctest
 from unittest import mock
+from django.test import override_settings
 from tethys_sdk.testing import TethysTestCase
 
 from bokeh.server.django import autoload
 from bokeh.server.django.consumers import SessionConsumer, ConsumerHelper
-from tethys_portal.consumers.bokeh_consumers import BokehAutoloadJsCDN
+from tethys_portal.consumers.bokeh_consumers import BokehAutoloadJsCDN, clear_autoload_templates
 from tethysapp.test_app.controllers import home_handler
 
 
@@ -28,6 +29,8 @@ class BokehAutoloadJsCDNTests(TethysTestCase):
 
         self.consumer = BokehAutoloadJsCDN(self.scope)
         self.consumer.send_response = asynctest.CoroutineMock()
+        clear_autoload_templates()
+        self.addCleanup(clear_autoload_templates)
 
     def test_resources(self):
         res = BokehAutoloadJsCDN.resources(SessionConsumer)
@@ -38,6 +41,20 @@ class BokehAutoloadJsCDNTests(TethysTestCase):
         self.assertIn('bokeh-tables', res.js_components)
         self.assertIn('bokeh-gl', res.js_components)
 
+    @override_settings(BOKEH_RESOURCES='static', STATIC_URL='/static/')
+    def test_resources_static(self):
+        res = BokehAutoloadJsCDN.resources(SessionConsumer)
+
+        self.assertEqual('server', res.mode)
+        self.assertTrue(res.js_files[0].startswith('/static/bokeh/static/js/bokeh.min.js?v='))
+
+    @override_settings(BOKEH_RESOURCES='inline')
+    def test_resources_inline(self):
+        res = BokehAutoloadJsCDN.resources(SessionConsumer)
+
+        self.assertEqual('inline', res.mode)
+        self.assertEqual([], res.js_files)
+
     def test_handle(self):
         self.event_loop.run_until_complete(self.consumer.handle(self.body))
         self.consumer.send_response.assert_awaited_once()
@@ -68,3 +85,18 @@ class BokehAutoloadJsCDNTests(TethysTestCase):
             aal = self.consumer.send_response.await_args_list
             self.assertIn(b'var js_urls = []', aal[0][0][1])
             self.assertIn(b'css_urls = []', aal[0][0][1])
+
+    @mock.patch('tethys_portal.consumers.bokeh_consumers.bundle_all_models', return_value='var bundle;')
+    def test_handle_cached(self, mock_bundle):
+        self.event_loop.run_until_complete(self.consumer.handle(self.body))
+        self.scope['query_string'] = b'bokeh-autoload-element=5678&bokeh-app-path=/apps/other-app'
+        self.event_loop.run_until_complete(self.consumer.handle(self.body))
+
+        mock_bundle.assert_called_once()
+        js = self.consumer.send_response.await_args_list[1][0][1]
+        self.assertIn(b'var bundle;', js)
+        self.assertIn(b'"elementid":"5678"', js)
+        self.assertIn(b'document.getElementById("5678")', js)
+        self.assertIn(b'"/apps/other-app"', js)
+        self.assertNotIn(b'1234', js)
+        self.assertNotIn(b'TETHYS_BOKEH_AUTOLOAD', js)
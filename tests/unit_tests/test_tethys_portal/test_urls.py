@@ -80,6 +80,13 @@ class TestUrls(TethysTestCase):
         self.assertEqual('delete_account', resolver.func.__name__)
         self.assertEqual('tethys_portal.views.user', resolver.func.__module__)
 
+    def test_user_urls_manage_storage_usage(self):
+        url = reverse('user:manage_storage_usage', kwargs={'username': 'foo'})
+        resolver = resolve(url)
+        self.assertEqual('/user/foo/manage-storage/usage/', url)
+        self.assertEqual('manage_storage_usage', resolver.func.__name__)
+        self.assertEqual('tethys_portal.views.user', resolver.func.__module__)
+
     def test_developer_urls_developer_home(self):
         url = reverse('developer_home')
         resolver = resolve(url)
@@ -1,6 +1,8 @@
 import unittest
 from unittest import mock
-from tethys_portal.views.admin import clear_workspace
+import json
+from django.http import Http404
+from tethys_portal.views.admin import clear_workspace, workspace_usage
 from tethys_apps.models import TethysApp
 
 
@@ -49,3 +51,40 @@ class TethysPortalTethysAppTests(unittest.TestCase):
 
         mock_message.assert_called_once_with(mock_request, 'Your workspace has been successfully cleared.')
         mock_redirect.assert_called_once_with('/admin/tethys_apps/tethysapp/myapp/change/')
+
+    @mock.patch('tethys_portal.views.admin._get_app_workspace')
+    @mock.patch('tethys_portal.views.admin.get_app_class')
+    @mock.patch('tethys_portal.views.admin.get_object_or_404')
+    def test_workspace_usage(self, mock_get_object, mock_get_app_class, mock_gaw):
+        mock_request = mock.MagicMock()
+        mock_request.user.is_active = True
+        mock_request.user.is_staff = True
+        mock_gaw().get_size.return_value = 2.0
+
+        ret = workspace_usage(mock_request, 1)
+
+        mock_get_object.assert_called_with(TethysApp, id=1)
+        mock_get_app_class.assert_called_with(mock_get_object())
+        mock_gaw().get_size.assert_called_with('gb')
+        self.assertEqual(200, ret.status_code)
+        self.assertDictEqual({'success': True, 'current_use': '2 GB'}, json.loads(ret.content))
+
+    @mock.patch('tethys_portal.views.admin.get_app_class')
+    @mock.patch('tethys_portal.views.admin.get_object_or_404')
+    def test_workspace_usage_not_installed(self, _, mock_get_app_class):
+        mock_request = mock.MagicMock()
+        mock_request.user.is_active = True
+        mock_request.user.is_staff = True
+        mock_get_app_class.return_value = None
+
+        ret = workspace_usage(mock_request, 1)
+
+        self.assertEqual(404, ret.status_code)
+        self.assertFalse(json.loads(ret.content)['success'])
+
+    def test_workspace_usage_unknown_app(self):
+        mock_request = mock.MagicMock()
+        mock_request.user.is_active = True
+        mock_request.user.is_staff = True
+
+        self.assertRaises(Http404, workspace_usage, mock_request, 999999)
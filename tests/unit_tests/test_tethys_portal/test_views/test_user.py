@@ -1,8 +1,10 @@
 import unittest
 from unittest import mock
 from django.contrib.auth.models import User
+import json
 from tethys_portal.views.user \
-    import profile, settings, change_password, social_disconnect, delete_account, manage_storage, clear_workspace
+    import profile, settings, change_password, social_disconnect, delete_account, manage_storage, clear_workspace, \
+    manage_storage_usage
 from tethys_apps.models import TethysApp
 
 
@@ -324,16 +326,19 @@ class TethysPortalUserTests(unittest.TestCase):
         mock_redirect.assert_called_once_with('user:profile', username=mock_request.user.username)
 
     @mock.patch('tethys_quotas.utilities.log')
-    @mock.patch('tethys_portal.views.user._get_user_workspace')
+    @mock.patch('tethys_portal.views.user._get_user_workspaces')
     @mock.patch('tethys_portal.views.user._convert_storage_units')
     @mock.patch('tethys_portal.views.user.User')
     @mock.patch('tethys_portal.views.user.SingletonHarvester')
     @mock.patch('tethys_portal.views.user.render')
-    def test_manage_storage_successful(self, mock_render, mock_harvester, mock_user, mock_convert_storage, _, __):
+    def test_manage_storage_successful(self, mock_render, mock_harvester, mock_user, mock_convert_storage, mock_guw, _):
         mock_request = mock.MagicMock()
         mock_request.user.username = 'ThisIsMe'
-        app = TethysApp(name="app_name")
+        app = TethysApp(pk=1, name="app_name")
         mock_harvester().apps = [app]
+        mock_workspace = mock.MagicMock()
+        mock_workspace.get_cached_size.return_value = 0.0
+        mock_guw.return_value = {app: mock_workspace}
         mock_user.objects.get.return_value = mock.MagicMock()
         mock_convert_storage.return_value = '0 bytes'
 
@@ -346,6 +351,58 @@ class TethysPortalUserTests(unittest.TestCase):
         manage_storage(mock_request, 'ThisIsMe')
 
         mock_render.assert_called_once_with(mock_request, 'tethys_portal/user/manage_storage.html', expected_context)
+        mock_guw.assert_called_once_with(mock_request.user, mock_harvester().apps)
+        mock_workspace.get_cached_size.assert_called_once_with('gb')
+        self.assertEqual('0 bytes', app.current_use)
+
+    @mock.patch('tethys_quotas.utilities.log')
+    @mock.patch('tethys_portal.views.user._get_user_workspaces')
+    @mock.patch('tethys_portal.views.user.SingletonHarvester')
+    @mock.patch('tethys_portal.views.user.render')
+    def test_manage_storage_not_cached(self, mock_render, mock_harvester, mock_guw, _):
+        mock_request = mock.MagicMock()
+        mock_request.user.username = 'ThisIsMe'
+        app = TethysApp(pk=1, name="app_name")
+        app2 = TethysApp(pk=2, name="app_name2")
+        mock_harvester().apps = [app, app2]
+        mock_workspace = mock.MagicMock()
+        mock_workspace.get_cached_size.return_value = 0.0
+        mock_workspace2 = mock.MagicMock()
+        mock_workspace2.get_cached_size.return_value = None
+        mock_guw.return_value = {app: mock_workspace, app2: mock_workspace2}
+
+        manage_storage(mock_request, 'ThisIsMe')
+
+        self.assertIsNone(mock_render.call_args[0][2]['current_use'])
+        self.assertEqual('0 bytes', app.current_use)
+        self.assertIsNone(app2.current_use)
+
+    @mock.patch('tethys_portal.views.user._get_workspace_sizes')
+    @mock.patch('tethys_portal.views.user._get_user_workspaces')
+    def test_manage_storage_usage(self, mock_guw, mock_gws):
+        mock_request = mock.MagicMock()
+        mock_request.user.username = 'ThisIsMe'
+        app = TethysApp(pk=1, name='app_name', root_url='app-name')
+        app2 = TethysApp(pk=2, name='app_name2', root_url='app-name2')
+        mock_gws.return_value = {app: 1.0, app2: 2.0}
+
+        ret = manage_storage_usage(mock_request, 'ThisIsMe')
+
+        mock_guw.assert_called_once_with(mock_request.user)
+        mock_gws.assert_called_once_with(mock_guw(), 'gb')
+        expected = {'success': True, 'apps': {'app-name': '1 GB', 'app-name2': '2 GB'}, 'current_use': '3 GB'}
+        self.assertDictEqual(expected, json.loads(ret.content))
+
+    @mock.patch('tethys_portal.views.user._get_user_workspaces')
+    def test_manage_storage_usage_different_user(self, mock_guw):
+        mock_request = mock.MagicMock()
+        mock_request.user.username = 'ThisIsNotMe'
+
+        ret = manage_storage_usage(mock_request, 'ThisIsMe')
+
+        self.assertEqual(403, ret.status_code)
+        self.assertFalse(json.loads(ret.content)['success'])
+        mock_guw.assert_not_called()
 
     @mock.patch('tethys_portal.views.user.redirect')
     @mock.patch('tethys_portal.views.user.messages.warning')
@@ -1,5 +1,6 @@
 import unittest
 from unittest import mock
+from asgiref.sync import async_to_sync
 from tethys_quotas.decorators import enforce_quota
 from tethys_quotas.models import ResourceQuota
 from django.http import HttpRequest
@@ -12,6 +13,11 @@ def a_controller(request):
     return 'Success'
 
 
+@enforce_quota(codename='foo')
+async def an_async_controller(request):
+    return 'Success'
+
+
 class DecoratorsTest(unittest.TestCase):
 
     def setUp(self):
@@ -89,3 +95,27 @@ class DecoratorsTest(unittest.TestCase):
         with self.assertRaises(PermissionDenied) as context:
             a_controller(mock_request)
         self.assertTrue("helpful message" in str(context.exception))
+
+    @mock.patch('tethys_quotas.decorators.passes_quota')
+    @mock.patch('tethys_quotas.decorators.ResourceQuota')
+    def test_enforce_quota_async(self, mock_RQ, mock_passes_quota):
+        mock_RQ.objects.get.return_value = mock.MagicMock(codename='foo', applies_to='django.contrib.auth.models.User')
+        mock_request = mock.MagicMock(spec=HttpRequest, user=mock.MagicMock())
+
+        ret = async_to_sync(an_async_controller)(mock_request)
+
+        mock_passes_quota.assert_called_with(mock_request.user, 'foo')
+        self.assertEqual('Success', ret)
+
+    @mock.patch('tethys_quotas.decorators.passes_quota', return_value=False)
+    @mock.patch('tethys_quotas.decorators.ResourceQuota')
+    def test_enforce_quota_async_passes_quota_false(self, mock_RQ, _):
+        mock_RQ.DoesNotExist = ResourceQuota.DoesNotExist
+        mock_RQ.objects.get.return_value = mock.MagicMock(codename='foo', applies_to='django.contrib.auth.models.User',
+                                                          help='helpful message')
+        mock_request = mock.MagicMock(spec=HttpRequest, user=mock.MagicMock())
+
+        with self.assertRaises(PermissionDenied) as context:
+            async_to_sync(an_async_controller)(mock_request)
+
+        self.assertIn('helpful message', str(context.exception))
@@ -33,6 +33,56 @@ class TethysQuotasUtilitiesTest(TestCase):
         utilities.sync_resource_quota_handlers()
         mock_log.warning.assert_called()
 
+    @mock.patch('tethys_quotas.utilities.settings', RESOURCE_QUOTA_HANDLERS=[
+        'tethys_quotas.handlers.workspace.WorkspaceQuotaHandler'])
+    def test_sync_resource_quota_handlers(self, _):
+        from tethys_quotas.handlers.workspace import WorkspaceQuotaHandler
+        stale_rq = ResourceQuota(
+            codename='user_stale_quota',
+            name='Stale Quota',
+            default=1,
+            units='GB',
+            applies_to='django.contrib.auth.models.User',
+            help='Exceeded quota',
+            _handler='tethys_quotas.handlers.stale.StaleQuotaHandler'
+        )
+        stale_rq.save()
+        utilities._handler_classes.clear()
+
+        # Savepoint, read codenames, bulk insert, collect and delete stale quotas with their entity quotas, release
+        with self.assertNumQueries(7):
+            utilities.sync_resource_quota_handlers()
+
+        codenames = sorted(ResourceQuota.objects.values_list('codename', flat=True))
+        self.assertListEqual(['tethysapp_workspace_quota', 'user_workspace_quota'], codenames)
+        rq = ResourceQuota.objects.get(codename='user_workspace_quota')
+        self.assertEqual('User Workspace Quota', rq.name)
+        self.assertEqual('django.contrib.auth.models.User', rq.applies_to)
+        self.assertIs(WorkspaceQuotaHandler,
+                      utilities._handler_classes['tethys_quotas.handlers.workspace.WorkspaceQuotaHandler'])
+
+        # Existing quotas are not recreated
+        utilities.sync_resource_quota_handlers()
+        self.assertEqual(2, ResourceQuota.objects.count())
+
+    @mock.patch('tethys_apps.base.function_extractor.TethysFunctionExtractor')
+    def test_get_resource_quota_handler_cached(self, mock_tfe):
+        utilities._handler_classes.clear()
+        handler = mock.MagicMock()
+        mock_tfe().function = handler
+        mock_tfe.reset_mock()
+
+        self.assertIs(handler, utilities.get_resource_quota_handler('foo.Bar'))
+        self.assertIs(handler, utilities.get_resource_quota_handler('foo.Bar'))
+        mock_tfe.assert_called_once_with('foo.Bar', prefix='')
+
+        mock_tfe().function = None
+        mock_tfe.reset_mock()
+
+        self.assertIsNone(utilities.get_resource_quota_handler('foo.DoesNotExist'))
+        self.assertNotIn('foo.DoesNotExist', utilities._handler_classes)
+        utilities._handler_classes.clear()
+
     @mock.patch('tethys_quotas.models.ResourceQuota')
     def test_passes_quota_passes(self, mock_rq):
         rq = mock.MagicMock()
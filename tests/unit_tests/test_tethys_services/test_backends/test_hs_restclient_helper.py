@@ -8,10 +8,21 @@ from django.test import override_settings
 
 class HsRestClientHelperTest(unittest.TestCase):
     def setUp(self):
-        pass
+        hs_client_init_exception.clear_client_cache()
 
     def tearDown(self):
-        pass
+        hs_client_init_exception.clear_client_cache()
+
+    def get_mock_request(self, expires_at, provider='hydroshare'):
+        mock_social_auth_obj = mock.MagicMock(provider=provider)
+        mock_social_auth_obj.extra_data = {'id': 'id', 'access_token': 'my_access_token', 'expires_at': expires_at}
+        mock_backend_instance = mock.MagicMock(auth_server_hostname='foo')
+        mock_backend_instance.name = provider
+        mock_social_auth_obj.get_backend_instance.return_value = mock_backend_instance
+        mock_request = mock.MagicMock()
+        mock_request.user.pk = 1
+        mock_request.user.social_auth.all.return_value = [mock_social_auth_obj]
+        return mock_request
 
     def test_init(self):
         exc = HSClientInitException('foo')
@@ -54,7 +65,7 @@ class HsRestClientHelperTest(unittest.TestCase):
         hs_client_init_exception.get_oauth_hs(mock_request)
 
         mock_logger.debug.assert_any_call('Found oauth backend: hydroshare')
-        mock_refresh_user_token.assert_called_once_with(mock_social_auth_obj)
+        mock_refresh_user_token.assert_called_once_with(mock_social_auth_obj, 0)
         mock_hs_r.HydroShareAuthOAuth2.assert_called_once_with('', '', token=mock_social_auth_obj.extra_data)
         mock_hs_r.HydroShare.assert_called_once_with(auth=mock_hs_r.HydroShareAuthOAuth2(),
                                                      hostname=mock_backend_instance.auth_server_hostname)
@@ -90,7 +101,7 @@ class HsRestClientHelperTest(unittest.TestCase):
         self.assertRaises(HSClientInitException, hs_client_init_exception.get_oauth_hs, mock_request)
 
         mock_logger.debug.assert_any_call('Found oauth backend: hydroshare')
-        mock_refresh_user_token.assert_called_once_with(mock_social_auth_obj)
+        mock_refresh_user_token.assert_called_once_with(mock_social_auth_obj, 0)
         mock_hs_r.HydroShareAuthOAuth2.assert_called_once_with('', '', token=mock_social_auth_obj.extra_data)
         mock_hs_r.HydroShare.assert_called_once_with(auth=mock_hs_r.HydroShareAuthOAuth2(),
                                                      hostname=mock_backend_instance.auth_server_hostname)
@@ -183,3 +194,97 @@ class HsRestClientHelperTest(unittest.TestCase):
         mock_refresh_request.assert_not_called()
         mock_time.assert_called_once()
         mock_log.error.assert_called_once_with('Failed to refresh token: foo')
+
+    @mock.patch('tethys_services.backends.hs_restclient_helper.load_strategy')
+    @mock.patch('tethys_services.backends.hs_restclient_helper.hs_r')
+    @mock.patch('tethys_services.backends.hs_restclient_helper.refresh_user_token')
+    def test_get_oauth_hs_cached(self, mock_refresh_user_token, mock_hs_r, _):
+        mock_request = self.get_mock_request(int(time.time()) + 3600)
+
+        hs1 = hs_client_init_exception.get_oauth_hs(mock_request)
+        hs2 = hs_client_init_exception.get_oauth_hs(mock_request)
+
+        self.assertIs(hs1, hs2)
+        mock_request.user.social_auth.all.assert_called_once()
+        mock_refresh_user_token.assert_called_once()
+        mock_hs_r.HydroShare.assert_called_once()
+
+    @mock.patch('tethys_services.backends.hs_restclient_helper.load_strategy')
+    @mock.patch('tethys_services.backends.hs_restclient_helper.hs_r')
+    @mock.patch('tethys_services.backends.hs_restclient_helper.refresh_user_token')
+    def test_get_oauth_hs_expired(self, mock_refresh_user_token, mock_hs_r, _):
+        mock_request = self.get_mock_request(int(time.time()) - 1)
+
+        hs_client_init_exception.get_oauth_hs(mock_request)
+        hs_client_init_exception.get_oauth_hs(mock_request)
+
+        self.assertEqual(2, mock_request.user.social_auth.all.call_count)
+        self.assertEqual(2, mock_refresh_user_token.call_count)
+
+    @override_settings(HYDROSHARE_TOKEN_REFRESH_WINDOW=600)
+    @mock.patch('tethys_services.backends.hs_restclient_helper.close_old_connections')
+    @mock.patch('tethys_services.backends.hs_restclient_helper.load_strategy')
+    @mock.patch('tethys_services.backends.hs_restclient_helper.hs_r')
+    @mock.patch('tethys_services.backends.hs_restclient_helper.refresh_user_token')
+    def test_get_oauth_hs_refresh_in_background(self, mock_refresh_user_token, mock_hs_r, _, __):
+        mock_request = self.get_mock_request(int(time.time()) + 300)
+        hs1 = hs_client_init_exception.get_oauth_hs(mock_request)
+
+        with mock.patch('tethys_services.backends.hs_restclient_helper._executor') as mock_executor:
+            hs2 = hs_client_init_exception.get_oauth_hs(mock_request)
+            # Refreshed once while the refresh is in progress
+            hs_client_init_exception.get_oauth_hs(mock_request)
+
+        # The cached client is returned while the token is refreshed
+        self.assertIs(hs1, hs2)
+        mock_executor.submit.assert_called_once_with(hs_client_init_exception._refresh_client, mock_request.user)
+
+        hs_client_init_exception._refresh_client(mock_request.user)
+
+        mock_refresh_user_token.assert_called_with(mock_request.user.social_auth.all()[0], 600)
+        self.assertEqual(set(), hs_client_init_exception._refreshing)
+
+    @mock.patch('tethys_services.backends.hs_restclient_helper.close_old_connections')
+    @mock.patch('tethys_services.backends.hs_restclient_helper.logger')
+    def test_refresh_client_exception(self, mock_logger, mock_close_old_connections):
+        mock_user = mock.MagicMock(pk=1)
+        mock_user.social_auth.all.side_effect = Exception('foo')
+        hs_client_init_exception._refreshing.add(1)
+
+        hs_client_init_exception._refresh_client(mock_user)
+
+        mock_logger.warning.assert_called_once()
+        mock_close_old_connections.assert_called_once()
+        self.assertNotIn(1, hs_client_init_exception._refreshing)
+
+    @mock.patch('tethys_services.backends.hs_restclient_helper.load_strategy')
+    @mock.patch('tethys_services.backends.hs_restclient_helper.hs_r')
+    @mock.patch('tethys_services.backends.hs_restclient_helper.refresh_user_token')
+    def test_get_oauth_token(self, _, __, ___):
+        mock_request = self.get_mock_request(int(time.time()) + 3600)
+        hs_client_init_exception.get_oauth_hs(mock_request)
+
+        ret = hs_client_init_exception.get_oauth_token(mock_request.user, 'hydroshare')
+
+        self.assertEqual('my_access_token', ret)
+        mock_request.user.social_auth.get.assert_not_called()
+
+    def test_get_oauth_token_not_cached(self):
+        mock_user = mock.MagicMock(pk=1)
+        mock_user.social_auth.get.return_value.extra_data = {'access_token': 'db_token'}
+
+        ret = hs_client_init_exception.get_oauth_token(mock_user, 'hydroshare')
+
+        self.assertEqual('db_token', ret)
+        mock_user.social_auth.get.assert_called_once_with(provider='hydroshare')
+
+    @mock.patch('tethys_services.backends.hs_restclient_helper.load_strategy')
+    @mock.patch('tethys_services.backends.hs_restclient_helper.hs_r')
+    @mock.patch('tethys_services.backends.hs_restclient_helper.refresh_user_token')
+    def test_invalidate_client(self, _, __, ___):
+        mock_request = self.get_mock_request(int(time.time()) + 3600)
+        hs_client_init_exception.get_oauth_hs(mock_request)
+
+        hs_client_init_exception.invalidate_client(sender=None, instance=mock.MagicMock(user_id=1))
+
+        self.assertIsNone(hs_client_init_exception._get_cached_client(mock_request.user))
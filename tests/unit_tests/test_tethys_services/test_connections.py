@@ -0,0 +1,112 @@
+import unittest
+from unittest import mock
+
+import requests
+from django.test import override_settings
+from siphon.http_util import HTTPSessionManager
+from tethys_dataset_services.engines import CkanDatasetEngine, GeoServerSpatialDatasetEngine
+
+import tethys_services.connections as connections
+
+
+class TestServiceHTTPAdapter(unittest.TestCase):
+
+    def test_init(self):
+        adapter = connections.ServiceHTTPAdapter(pool_size=5, retries=2, backoff_factor=0.1, timeout=10)
+
+        self.assertEqual(5, adapter._pool_maxsize)
+        self.assertEqual(5, adapter._pool_connections)
+        self.assertEqual(2, adapter.max_retries.total)
+        self.assertEqual(0.1, adapter.max_retries.backoff_factor)
+        self.assertIn(503, adapter.max_retries.status_forcelist)
+        self.assertEqual(10, adapter.timeout)
+
+    @mock.patch('tethys_services.connections.HTTPAdapter.send')
+    def test_send_default_timeout(self, mock_send):
+        adapter = connections.ServiceHTTPAdapter(timeout=10)
+        mock_request = mock.MagicMock()
+
+        adapter.send(mock_request, timeout=None)
+        mock_send.assert_called_with(mock_request, timeout=10)
+
+        adapter.send(mock_request, timeout=3)
+        mock_send.assert_called_with(mock_request, timeout=3)
+
+    def test_close(self):
+        adapter = connections.ServiceHTTPAdapter()
+        adapter.poolmanager.connection_from_url('http://localhost:8181')
+
+        session = connections.use_pooled_connections(requests.Session())
+        session.mount('http://', adapter)
+        session.close()
+
+        # The pools are shared, so they are kept when a session is closed
+        self.assertEqual(1, len(adapter.poolmanager.pools))
+
+
+class TestServiceCredentials(unittest.TestCase):
+
+    def test_call(self):
+        credentials = connections.ServiceCredentials()
+        credentials.register('http://localhost:8383/thredds/catalog.xml', 'foo', 'bar')
+
+        request = requests.Request('GET', 'http://localhost:8383/thredds/other/catalog.xml').prepare()
+        credentials(request)
+        self.assertTrue(request.headers['Authorization'].startswith('Basic '))
+
+        # Other hosts and ports are not authenticated
+        request = requests.Request('GET', 'http://localhost:8080/thredds/catalog.xml').prepare()
+        credentials(request)
+        self.assertNotIn('Authorization', request.headers)
+
+    def test_call_authorization(self):
+        credentials = connections.ServiceCredentials()
+        credentials.register('http://localhost:8383/thredds/', 'foo', 'bar')
+        request = requests.Request('GET', 'http://localhost:8383/thredds/', headers={'Authorization': 'x'}).prepare()
+
+        credentials(request)
+
+        self.assertEqual('x', request.headers['Authorization'])
+
+
+class TestConnections(unittest.TestCase):
+
+    @override_settings(SERVICE_HTTP_POOL_SIZE=20, SERVICE_HTTP_TIMEOUT=5)
+    @mock.patch('tethys_services.connections._adapter', None)
+    def test_get_adapter(self):
+        adapter = connections.get_adapter()
+
+        self.assertEqual(20, adapter._pool_maxsize)
+        self.assertEqual(5, adapter.timeout)
+        self.assertIs(adapter, connections.get_adapter())
+
+    def test_create_session(self):
+        session = connections.create_session()
+
+        self.assertIs(connections.get_adapter(), session.get_adapter('https://localhost/geoserver/rest'))
+        self.assertIs(connections.get_adapter(), session.get_adapter('http://localhost/geoserver/rest'))
+
+    def test_use_pooled_engine_connections(self):
+        engine = GeoServerSpatialDatasetEngine(endpoint='http://localhost:8181/geoserver/rest/')
+
+        ret = connections.use_pooled_engine_connections(engine)
+
+        self.assertIs(engine, ret)
+        self.assertIs(connections.get_adapter(), engine.catalog.client.get_adapter('http://localhost:8181/'))
+
+    def test_use_pooled_engine_connections_other(self):
+        engine = CkanDatasetEngine(endpoint='http://localhost/api/3/action/')
+
+        self.assertIs(engine, connections.use_pooled_engine_connections(engine))
+
+    def test_configure_siphon(self):
+        session_manager = HTTPSessionManager()
+
+        connections.configure_siphon(session_manager, 'http://localhost:8484/thredds/', 'foo', 'bar')
+        connections.configure_siphon(session_manager, 'http://localhost:8485/thredds/', 'foo2', 'bar2')
+
+        session = session_manager.create_session()
+        self.assertIs(connections.get_credentials(), session.auth)
+        self.assertIs(connections.get_adapter(), session.get_adapter('http://localhost:8484/thredds/catalog.xml'))
+        self.assertEqual(('foo', 'bar'), session.auth.get('http://localhost:8484/thredds/catalog.xml'))
+        self.assertEqual(('foo2', 'bar2'), session.auth.get('http://localhost:8485/thredds/catalog.xml'))
@@ -0,0 +1,92 @@
+import unittest
+from unittest import mock
+
+from django.test import override_settings
+
+import tethys_services.engine_cache as engine_cache
+from tethys_services.engine_cache import EngineCache
+
+
+class TestEngineCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = EngineCache(ttl=60)
+
+    def test_get(self):
+        factory = mock.MagicMock()
+
+        ret1 = self.cache.get(('service', 1), ('http://localhost', 'foo'), factory)
+        ret2 = self.cache.get(('service', 1), ('http://localhost', 'foo'), factory)
+
+        self.assertIs(ret1, ret2)
+        factory.assert_called_once()
+        self.assertEqual(1, len(self.cache))
+
+    def test_get_credentials(self):
+        self.cache.get(('service', 1), ('http://localhost', 'foo'), mock.MagicMock)
+        self.cache.get(('service', 1), ('http://localhost', 'bar'), mock.MagicMock)
+
+        self.assertEqual(2, len(self.cache))
+
+    def test_get_key(self):
+        tag, digest = EngineCache.get_key(('service', 1), ('http://localhost', 'password'))
+
+        self.assertEqual(('service', 1), tag)
+        self.assertNotIn('password', digest)
+
+    def test_get_none(self):
+        factory = mock.MagicMock(return_value=None)
+
+        self.assertIsNone(self.cache.get(('service', 1), (), factory))
+        self.assertIsNone(self.cache.get(('service', 1), (), factory))
+        self.assertEqual(2, factory.call_count)
+
+    @mock.patch('tethys_services.engine_cache.time.monotonic')
+    def test_get_expired(self, mock_monotonic):
+        factory = mock.MagicMock(side_effect=lambda: mock.MagicMock())
+        mock_monotonic.return_value = 100
+
+        ret1 = self.cache.get(('service', 1), (), factory)
+
+        mock_monotonic.return_value = 161
+        self.assertIsNone(self.cache.lookup(('service', 1), ()))
+        ret2 = self.cache.get(('service', 1), (), factory)
+
+        self.assertIsNot(ret1, ret2)
+        # The expired engine is dropped when the new one is added
+        self.assertEqual(1, len(self.cache))
+
+    def test_get_disabled(self):
+        cache = EngineCache(ttl=0)
+        factory = mock.MagicMock()
+
+        cache.get(('service', 1), (), factory)
+        cache.get(('service', 1), (), factory)
+
+        self.assertEqual(2, factory.call_count)
+        self.assertEqual(0, len(cache))
+
+    def test_invalidate(self):
+        self.cache.set(('service', 1), ('foo',), 'engine1')
+        self.cache.set(('service', 1), ('bar',), 'engine2')
+        self.cache.set(('service', 2), ('foo',), 'engine3')
+
+        self.cache.invalidate(('service', 1))
+
+        self.assertIsNone(self.cache.lookup(('service', 1), ('foo',)))
+        self.assertEqual('engine3', self.cache.lookup(('service', 2), ('foo',)))
+
+    def test_clear(self):
+        self.cache.set(('service', 1), (), 'engine')
+
+        self.cache.clear()
+
+        self.assertEqual(0, len(self.cache))
+
+    @override_settings(ENGINE_CACHE_TTL=10)
+    @mock.patch('tethys_services.engine_cache._engine_cache', None)
+    def test_get_engine_cache(self):
+        ret = engine_cache.get_engine_cache()
+
+        self.assertEqual(10, ret.ttl)
+        self.assertIs(ret, engine_cache.get_engine_cache())
@@ -1,5 +1,6 @@
 from tethys_sdk.testing import TethysTestCase
 import tethys_services.models as service_model
+from tethys_services.engine_cache import get_engine_cache
 from django.core.exceptions import ObjectDoesNotExist
 from social_core.exceptions import AuthException
 from unittest import mock
@@ -7,7 +8,7 @@ from unittest import mock
 
 class DatasetServiceTests(TethysTestCase):
     def set_up(self):
-        pass
+        get_engine_cache().clear()
 
     def tear_down(self):
         pass
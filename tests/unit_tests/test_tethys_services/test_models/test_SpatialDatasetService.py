@@ -1,11 +1,13 @@
 from tethys_sdk.testing import TethysTestCase
 import tethys_services.models as service_model
+from tethys_services.connections import get_adapter, get_credentials
+from tethys_services.engine_cache import get_engine_cache
 from unittest import mock
 
 
 class SpatialDatasetServiceTests(TethysTestCase):
     def set_up(self):
-        pass
+        get_engine_cache().clear()
 
     def tear_down(self):
         pass
@@ -32,10 +34,12 @@ class SpatialDatasetServiceTests(TethysTestCase):
         # Check result
         mock_sds.assert_called_with(endpoint='http://localhost/geoserver/rest/', password='password', username='foo')
         self.assertEqual('http://publichost/geoserver/rest/', ret.public_endpoint)
+        ret.catalog.client.mount.assert_any_call('http://', get_adapter())
+        ret.catalog.client.mount.assert_any_call('https://', get_adapter())
 
-    @mock.patch('tethys_services.models.TDSCatalog')
+    @mock.patch('tethys_services.models.get_catalog_cache')
     @mock.patch('tethys_services.models.session_manager')
-    def test_get_engine_thredds(self, mock_session_manager, mock_TDSCatalog):
+    def test_get_engine_thredds(self, mock_session_manager, mock_get_catalog_cache):
         sds = service_model.SpatialDatasetService(
             name='test_sds',
             engine=service_model.SpatialDatasetService.THREDDS,
@@ -47,15 +51,19 @@ class SpatialDatasetServiceTests(TethysTestCase):
         sds.save()
         ret = sds.get_engine()
 
-        mock_session_manager.set_session_options.assert_called_with(auth=('foo', 'password'))
-        mock_TDSCatalog.assert_called_with('http://localhost/thredds/catalog.xml')
+        mock_adapter = mock_get_catalog_cache().adapter
+        mock_session_manager.set_session_options.assert_called_with(
+            auth=get_credentials(), adapters={'https://': mock_adapter, 'http://': mock_adapter}
+        )
+        self.assertEqual(('foo', 'password'), get_credentials().get('http://localhost/thredds/catalog.xml'))
+        mock_get_catalog_cache().get_catalog.assert_called_with('http://localhost/thredds/catalog.xml')
 
         # Check result
-        self.assertEqual(mock_TDSCatalog(), ret)
+        self.assertEqual(mock_get_catalog_cache().get_catalog(), ret)
 
-    @mock.patch('tethys_services.models.TDSCatalog')
+    @mock.patch('tethys_services.models.get_catalog_cache')
     @mock.patch('tethys_services.models.session_manager')
-    def test_get_engine_thredds_no_trailing_slashes(self, mock_session_manager, mock_TDSCatalog):
+    def test_get_engine_thredds_no_trailing_slashes(self, mock_session_manager, mock_get_catalog_cache):
         sds = service_model.SpatialDatasetService(
             name='test_sds',
             engine=service_model.SpatialDatasetService.THREDDS,
@@ -67,15 +75,19 @@ class SpatialDatasetServiceTests(TethysTestCase):
         sds.save()
         ret = sds.get_engine()
 
-        mock_session_manager.set_session_options.assert_called_with(auth=('foo', 'password'))
-        mock_TDSCatalog.assert_called_with('http://localhost/thredds/catalog.xml')
+        mock_adapter = mock_get_catalog_cache().adapter
+        mock_session_manager.set_session_options.assert_called_with(
+            auth=get_credentials(), adapters={'https://': mock_adapter, 'http://': mock_adapter}
+        )
+        self.assertEqual(('foo', 'password'), get_credentials().get('http://localhost/thredds/catalog.xml'))
+        mock_get_catalog_cache().get_catalog.assert_called_with('http://localhost/thredds/catalog.xml')
 
         # Check result
-        self.assertEqual(mock_TDSCatalog(), ret)
+        self.assertEqual(mock_get_catalog_cache().get_catalog(), ret)
 
-    @mock.patch('tethys_services.models.TDSCatalog')
+    @mock.patch('tethys_services.models.get_catalog_cache')
     @mock.patch('tethys_services.models.session_manager')
-    def test_get_engine_thredds_no_username_password(self, mock_session_manager, mock_TDSCatalog):
+    def test_get_engine_thredds_no_username_password(self, mock_session_manager, mock_get_catalog_cache):
         sds = service_model.SpatialDatasetService(
             name='test_sds',
             engine=service_model.SpatialDatasetService.THREDDS,
@@ -85,8 +97,53 @@ class SpatialDatasetServiceTests(TethysTestCase):
         sds.save()
         ret = sds.get_engine()
 
-        mock_session_manager.set_session_options.assert_not_called()
-        mock_TDSCatalog.assert_called_with('http://localhost/thredds/catalog.xml')
+        # The credentials of other services on the host are kept
+        mock_adapter = mock_get_catalog_cache().adapter
+        mock_session_manager.set_session_options.assert_called_with(
+            auth=get_credentials(), adapters={'https://': mock_adapter, 'http://': mock_adapter}
+        )
+        mock_get_catalog_cache().get_catalog.assert_called_with('http://localhost/thredds/catalog.xml')
 
         # Check result
-        self.assertEqual(mock_TDSCatalog(), ret)
+        self.assertEqual(mock_get_catalog_cache().get_catalog(), ret)
+
+    @mock.patch('tethys_services.models.GeoServerSpatialDatasetEngine')
+    def test_get_engine_cached(self, mock_sds):
+        mock_sds.side_effect = lambda **kwargs: mock.MagicMock()
+        sds = service_model.SpatialDatasetService(
+            name='test_sds',
+            engine=service_model.SpatialDatasetService.GEOSERVER,
+            endpoint='http://localhost/geoserver/rest/',
+            username='foo',
+            password='password'
+        )
+        sds.save()
+
+        ret1 = sds.get_engine()
+        ret2 = sds.get_engine()
+
+        self.assertIs(ret1, ret2)
+        mock_sds.assert_called_once()
+
+        # Saving the service invalidates its engine
+        sds.public_endpoint = 'http://publichost/geoserver/rest/'
+        sds.save()
+        ret3 = sds.get_engine()
+
+        self.assertIsNot(ret1, ret3)
+        self.assertEqual('http://publichost/geoserver/rest/', ret3.public_endpoint)
+
+        # Deleting the service invalidates its engine
+        service_model.SpatialDatasetService.objects.filter(pk=sds.pk).delete()
+        self.assertEqual(0, len(get_engine_cache()))
+
+    @mock.patch('tethys_services.models.get_catalog_cache')
+    def test_save_thredds_invalidates_catalogs(self, mock_get_catalog_cache):
+        sds = service_model.SpatialDatasetService(
+            name='test_sds',
+            engine=service_model.SpatialDatasetService.THREDDS,
+            endpoint='http://localhost/thredds/',
+        )
+        sds.save()
+
+        mock_get_catalog_cache().invalidate.assert_called_with('http://localhost/thredds')
@@ -1,5 +1,6 @@
 from tethys_sdk.testing import TethysTestCase
 import tethys_services.models as service_model
+from tethys_services.engine_cache import get_capabilities_tag, get_engine_cache, load_capabilities
 from unittest import mock
 
 from tethys_services.models import HTTPError, URLError
@@ -7,7 +8,7 @@ from tethys_services.models import HTTPError, URLError
 
 class WebProcessingServiceTests(TethysTestCase):
     def set_up(self):
-        pass
+        get_engine_cache().clear()
 
     def tear_down(self):
         pass
@@ -118,3 +119,22 @@ class WebProcessingServiceTests(TethysTestCase):
         mock_wps.assert_called_with('http://localhost/geoserver/rest/', password='password',
                                     skip_caps=True, username='foo', verbose=False)
         mock_activate.assert_called_with(wps=mock_wps())
+
+    def test_save_invalidates_capabilities(self):
+        wps = service_model.WebProcessingService(
+            name='test_wps',
+            endpoint='http://localhost/wps/WebProcessingService?service=WPS',
+        )
+        wps.save()
+
+        # owslib removes the service parameter from the URL of its WebProcessingService objects
+        mock_wps = mock.MagicMock(url='http://localhost/wps/WebProcessingService', username=None, password=None)
+        mock_wps.auth = mock_wps
+        load_capabilities(mock_wps)
+        tag = get_capabilities_tag(mock_wps.url)
+
+        self.assertIsNotNone(get_engine_cache().lookup(tag, (None, None)))
+
+        wps.save()
+
+        self.assertIsNone(get_engine_cache().lookup(tag, (None, None)))
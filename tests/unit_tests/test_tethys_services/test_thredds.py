@@ -0,0 +1,221 @@
+import unittest
+from unittest import mock
+
+import requests
+from django.test import override_settings
+from siphon.http_util import session_manager
+
+import tethys_services.thredds as thredds
+
+CATALOG = b'''<?xml version="1.0" encoding="UTF-8"?>
+<catalog xmlns="http://www.unidata.ucar.edu/namespaces/thredds/InvCatalog/v1.0"
+         xmlns:xlink="http://www.w3.org/1999/xlink" name="Test Catalog" version="1.0.1">
+  <service name="odap" serviceType="OpenDAP" base="/thredds/dodsC/"/>
+  <dataset name="Test Data" ID="test">
+    <metadata inherited="true"><serviceName>odap</serviceName></metadata>
+    <dataset name="data.nc" ID="test/data.nc" urlPath="test/data.nc"/>
+  </dataset>
+  <catalogRef xlink:href="child/catalog.xml" xlink:title="child" ID="child" name=""/>
+</catalog>
+'''
+
+CATALOG_URL = 'http://localhost:8383/thredds/catalog.xml'
+CHILD_URL = 'http://localhost:8383/thredds/child/catalog.xml'
+
+
+def make_response(url, status_code=200, content=CATALOG, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = url
+    response._content = content
+    response.headers = requests.structures.CaseInsensitiveDict(headers or {'Content-Type': 'application/xml'})
+    return response
+
+
+class TestCatalogCache(unittest.TestCase):
+
+    def setUp(self):
+        self.options = session_manager.options
+        self.cache = thredds.CatalogCache(ttl=60, size=10, prefetch=False)
+        self.mock_session = mock.MagicMock()
+        self.mock_session.get.side_effect = lambda url, headers: make_response(
+            url, headers={'Content-Type': 'application/xml', 'ETag': '"1"'}
+        )
+        self.cache._session = self.mock_session
+
+    def tearDown(self):
+        session_manager.options = self.options
+
+    def test_is_catalog_url(self):
+        self.assertTrue(thredds.is_catalog_url(CATALOG_URL))
+        self.assertTrue(thredds.is_catalog_url('http://localhost/thredds/enhancedCatalog.xml?dataset=test'))
+        self.assertFalse(thredds.is_catalog_url('http://localhost/thredds/dodsC/test/data.nc'))
+
+    def test_fetch(self):
+        entry = self.cache.fetch(CATALOG_URL)
+
+        self.assertIs(entry, self.cache.fetch(CATALOG_URL))
+        self.assertEqual(CATALOG, entry.content)
+        self.assertEqual('"1"', entry.etag)
+        self.mock_session.get.assert_called_once_with(CATALOG_URL, headers={})
+
+    @mock.patch('tethys_services.thredds.time.monotonic')
+    def test_fetch_not_modified(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        entry = self.cache.fetch(CATALOG_URL)
+        entry.last_modified = 'Wed, 21 Oct 2026 07:28:00 GMT'
+        self.mock_session.get.side_effect = lambda url, headers: make_response(url, 304, b'')
+
+        mock_monotonic.return_value = 200
+        ret = self.cache.fetch(CATALOG_URL)
+
+        self.assertIs(entry, ret)
+        self.assertEqual(200, ret.checked)
+        self.mock_session.get.assert_called_with(CATALOG_URL, headers={
+            'If-None-Match': '"1"', 'If-Modified-Since': 'Wed, 21 Oct 2026 07:28:00 GMT'
+        })
+
+    @mock.patch('tethys_services.thredds.time.monotonic')
+    def test_fetch_modified(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        entry = self.cache.fetch(CATALOG_URL)
+
+        mock_monotonic.return_value = 200
+        ret = self.cache.fetch(CATALOG_URL)
+
+        self.assertIsNot(entry, ret)
+        self.assertEqual(2, self.mock_session.get.call_count)
+
+    def test_fetch_error(self):
+        self.mock_session.get.side_effect = lambda url, headers: make_response(url, 404, b'Not Found')
+
+        self.assertRaises(requests.HTTPError, self.cache.fetch, CATALOG_URL)
+        self.assertEqual(0, len(self.cache))
+
+    def test_fetch_size(self):
+        for i in range(12):
+            self.cache.fetch('http://localhost:8383/thredds/{}/catalog.xml'.format(i))
+
+        self.assertEqual(10, len(self.cache))
+        self.assertIsNone(self.cache._get_entry('http://localhost:8383/thredds/0/catalog.xml'))
+
+    def test_get_catalog(self):
+        catalog = self.cache.get_catalog(CATALOG_URL)
+
+        self.assertEqual('Test Catalog', catalog.catalog_name)
+        self.assertIn('data.nc', catalog.datasets)
+        self.assertIn('child', catalog.catalog_refs)
+        self.assertIs(catalog, self.cache.get_catalog(CATALOG_URL))
+        # The document is parsed from the cache, without requesting it again
+        self.mock_session.get.assert_called_once()
+
+    def test_get_catalog_follow(self):
+        catalog = self.cache.get_catalog(CATALOG_URL)
+
+        child = catalog.catalog_refs['child'].follow()
+
+        self.assertEqual('Test Catalog', child.catalog_name)
+        self.mock_session.get.assert_called_with(CHILD_URL, headers={})
+        self.assertIsNotNone(self.cache._get_entry(CHILD_URL))
+
+    @mock.patch('tethys_services.thredds.ThreadPoolExecutor')
+    def test_get_catalog_prefetch(self, mock_executor):
+        self.cache.prefetch = True
+
+        self.cache.get_catalog(CATALOG_URL)
+
+        mock_executor().submit.assert_called_once_with(self.cache._prefetch_catalog, CHILD_URL)
+
+    @mock.patch('tethys_services.thredds.ThreadPoolExecutor')
+    def test_get_catalog_prefetch_limit(self, mock_executor):
+        self.cache.prefetch = True
+        self.cache.prefetch_limit = 2
+        catalog = mock.MagicMock()
+        catalog.catalog_refs = {str(i): mock.MagicMock(href=str(i)) for i in range(5)}
+
+        self.cache._prefetch(catalog)
+
+        self.assertEqual(2, mock_executor().submit.call_count)
+        self.assertEqual(2, self.cache._pending)
+
+        mock_executor().submit().add_done_callback.call_args[0][0](None)
+        self.assertEqual(1, self.cache._pending)
+
+    @mock.patch('tethys_services.thredds.PREFETCH_QUEUE_SIZE', 3)
+    @mock.patch('tethys_services.thredds.ThreadPoolExecutor')
+    def test_get_catalog_prefetch_queue_full(self, mock_executor):
+        catalog = mock.MagicMock()
+        catalog.catalog_refs = {str(i): mock.MagicMock(href=str(i)) for i in range(5)}
+        self.cache._pending = 2
+
+        self.cache._prefetch(catalog)
+
+        mock_executor().submit.assert_called_once_with(self.cache._prefetch_catalog, '0')
+        self.assertEqual(3, self.cache._pending)
+
+    def test_prefetch_catalog(self):
+        self.cache._prefetch_catalog(CHILD_URL)
+
+        self.assertIsNotNone(self.cache._get_entry(CHILD_URL).catalog)
+
+    def test_prefetch_catalog_error(self):
+        self.mock_session.get.side_effect = requests.ConnectionError
+
+        self.cache._prefetch_catalog(CHILD_URL)
+
+        self.assertEqual(0, len(self.cache))
+
+    def test_invalidate(self):
+        self.cache.fetch(CATALOG_URL)
+        self.cache.fetch(CHILD_URL)
+        self.cache.fetch('http://localhost:8080/thredds/catalog.xml')
+
+        self.cache.invalidate('http://localhost:8383/thredds')
+
+        self.assertEqual(1, len(self.cache))
+
+    def test_clear(self):
+        self.cache.fetch(CATALOG_URL)
+
+        self.cache.clear()
+
+        self.assertEqual(0, len(self.cache))
+
+    @mock.patch('tethys_services.thredds.get_adapter')
+    def test_adapter_other_requests(self, mock_get_adapter):
+        request = requests.Request('GET', 'http://localhost:8383/thredds/dodsC/test/data.nc').prepare()
+
+        ret = self.cache.adapter.send(request, timeout=None)
+
+        self.assertEqual(mock_get_adapter().send(), ret)
+        self.mock_session.get.assert_not_called()
+
+    @mock.patch('tethys_services.thredds.get_adapter')
+    def test_adapter_other_hosts(self, mock_get_adapter):
+        self.cache.get_catalog(CATALOG_URL)
+        request = requests.Request('GET', 'http://example.com/thredds/catalog.xml').prepare()
+
+        ret = self.cache.adapter.send(request)
+
+        self.assertEqual(mock_get_adapter().send(), ret)
+        self.mock_session.get.assert_called_once_with(CATALOG_URL, headers={})
+
+    def test_adapter_error(self):
+        self.mock_session.get.side_effect = lambda url, headers: make_response(url, 404, b'Not Found')
+        self.cache.hosts.add('localhost:8383')
+        request = requests.Request('GET', CATALOG_URL).prepare()
+
+        ret = self.cache.adapter.send(request)
+
+        self.assertEqual(404, ret.status_code)
+
+    @override_settings(THREDDS_CATALOG_CACHE_TTL=10, THREDDS_CATALOG_PREFETCH=False, THREDDS_CATALOG_PREFETCH_LIMIT=5)
+    @mock.patch('tethys_services.thredds._catalog_cache', None)
+    def test_get_catalog_cache(self):
+        ret = thredds.get_catalog_cache()
+
+        self.assertEqual(10, ret.ttl)
+        self.assertEqual(thredds.DEFAULT_SIZE, ret.size)
+        self.assertFalse(ret.prefetch)
+        self.assertEqual(5, ret.prefetch_limit)
+        self.assertIs(ret, thredds.get_catalog_cache())
@@ -5,6 +5,7 @@ from django.core.exceptions import ObjectDoesNotExist
 from social_core.exceptions import AuthAlreadyAssociated, AuthException
 
 from tethys_dataset_services.engines import HydroShareDatasetEngine
+from tethys_services.engine_cache import get_engine_cache
 from tethys_services.utilities import ensure_oauth2, initialize_engine_object, list_dataset_engines, \
     get_dataset_engine, list_spatial_dataset_engines, get_spatial_dataset_engine, abstract_is_link, activate_wps, \
     list_wps_service_engines, get_wps_service_engine
@@ -22,7 +23,7 @@ def enforced_controller(request, *args, **kwargs):
 class TestUtilites(unittest.TestCase):
 
     def setUp(self):
-        pass
+        get_engine_cache().clear()
 
     def tearDown(self):
         pass
@@ -291,8 +292,8 @@ class TestUtilites(unittest.TestCase):
 
     @mock.patch('tethys_services.utilities.issubclass')
     @mock.patch('tethys_services.utilities.initialize_engine_object')
-    @mock.patch('tethys_services.utilities.DsModel.objects.all')
-    def test_get_dataset_engine_dataset_services(self, mock_ds_model_object_all, mock_initialize_engine_object,
+    @mock.patch('tethys_services.utilities.DsModel.objects.filter')
+    def test_get_dataset_engine_dataset_services(self, mock_ds_model_object_filter, mock_initialize_engine_object,
                                                  mock_subclass):
         mock_name = 'foo'
 
@@ -306,12 +307,14 @@ class TestUtilites(unittest.TestCase):
 
         mock_site_dataset_services.name = 'foo'
 
-        mock_ds_model_object_all.return_value = [mock_site_dataset_services]
+        mock_ds_model_object_filter().first.return_value = mock_site_dataset_services
 
         mock_init_return.public_endpoint = mock_site_dataset_services.public_endpoint
 
         ret = get_dataset_engine(mock_name,  app_class=None)
 
+        mock_ds_model_object_filter.assert_called_with(name='foo')
+
         mock_initialize_engine_object.assert_called_with(engine=mock_site_dataset_services.engine,
                                                          endpoint=mock_site_dataset_services.endpoint,
                                                          apikey=mock_site_dataset_services.apikey,
@@ -322,15 +325,11 @@ class TestUtilites(unittest.TestCase):
         self.assertEqual(mock_init_return, ret)
 
     @mock.patch('tethys_services.utilities.initialize_engine_object')
-    @mock.patch('tethys_services.utilities.DsModel.objects.all')
-    def test_get_dataset_engine_name_error(self, mock_ds_model_object_all, mock_initialize_engine_object):
+    @mock.patch('tethys_services.utilities.DsModel.objects.filter')
+    def test_get_dataset_engine_name_error(self, mock_ds_model_object_filter, mock_initialize_engine_object):
         mock_name = 'foo'
 
-        mock_site_dataset_services = mock.MagicMock()
-
-        mock_site_dataset_services.name = 'foo'
-
-        mock_ds_model_object_all.return_value = None
+        mock_ds_model_object_filter().first.return_value = None
 
         self.assertRaises(NameError, get_dataset_engine, mock_name, app_class=None)
 
@@ -384,7 +383,7 @@ class TestUtilites(unittest.TestCase):
         name = 'foo'
         mock_site_sds = mock.MagicMock()
         mock_site_sds.name = 'foo'
-        mock_sds_model.objects.all.return_value = [mock_site_sds]
+        mock_sds_model.objects.filter().first.return_value = mock_site_sds
         mock_sdo = mock.MagicMock()
         mock_sdo.public_endpoint = mock_site_sds.public_endpoint
         mock_initialize_engine_object.return_value = mock_sdo
@@ -392,6 +391,7 @@ class TestUtilites(unittest.TestCase):
         ret = get_spatial_dataset_engine(name=name, app_class=None)
 
         self.assertEqual(mock_sdo, ret)
+        mock_sds_model.objects.filter.assert_called_with(name='foo')
         mock_initialize_engine_object.assert_called_once_with(engine=mock_site_sds.engine,
                                                               endpoint=mock_site_sds.endpoint,
                                                               apikey=mock_site_sds.apikey,
@@ -401,7 +401,7 @@ class TestUtilites(unittest.TestCase):
     @mock.patch('tethys_services.utilities.SdsModel')
     def test_get_spatial_dataset_engine_with_name_error(self, mock_sds_model):
         name = 'foo'
-        mock_sds_model.objects.all.return_value = None
+        mock_sds_model.objects.filter().first.return_value = None
 
         self.assertRaises(NameError, get_spatial_dataset_engine, name=name, app_class=None)
 
@@ -506,7 +506,7 @@ class TestUtilites(unittest.TestCase):
         mock_site_ws = mock.MagicMock()
         mock_site_ws.name = 'foo'
 
-        mock_wps_model.objects.all.return_value = [mock_site_ws]
+        mock_wps_model.objects.filter().first.return_value = mock_site_ws
 
         mock_sdo = mock.MagicMock()
         mock_sdo.public_endpoint = mock_site_ws.public_endpoint
@@ -515,6 +515,8 @@ class TestUtilites(unittest.TestCase):
 
         get_wps_service_engine(name=name, app_class=None)
 
+        mock_wps_model.objects.filter.assert_called_with(name='foo')
+
         mock_wps.assert_called_once_with(mock_site_ws.endpoint,
                                          username=mock_site_ws.username,
                                          password=mock_site_ws.password,
@@ -526,7 +528,7 @@ class TestUtilites(unittest.TestCase):
     @mock.patch('tethys_services.utilities.WpsModel')
     def test_get_wps_service_engine_with_name_error(self, mock_wps_model):
         name = 'foo'
-        mock_wps_model.objects.all.return_value = None
+        mock_wps_model.objects.filter().first.return_value = None
         self.assertRaises(NameError, get_wps_service_engine, name=name, app_class=None)
 
     @mock.patch('tethys_services.utilities.activate_wps')
@@ -593,3 +595,57 @@ class TestUtilites(unittest.TestCase):
         mock_activate_wps.call_once_with(wps=mock_sdo, endpoint=mock_site_ws.endpoint, name=mock_site_ws.name)
 
         self.assertEqual(mock_activate_wps(), ret[0])
+
+    @mock.patch('tethys_services.utilities.initialize_engine_object')
+    @mock.patch('tethys_services.utilities.SdsModel')
+    def test_get_spatial_dataset_engine_cached(self, mock_sds_model, mock_initialize_engine_object):
+        mock_site_sds = mock.MagicMock()
+        mock_sds_model.objects.filter().first.return_value = mock_site_sds
+        mock_initialize_engine_object.side_effect = lambda **kwargs: mock.MagicMock()
+
+        ret1 = get_spatial_dataset_engine(name='foo')
+        ret2 = get_spatial_dataset_engine(name='foo')
+
+        self.assertIs(ret1, ret2)
+        mock_initialize_engine_object.assert_called_once()
+
+        # Changed credentials are initialized again
+        mock_site_sds.password = 'new_password'
+        ret3 = get_spatial_dataset_engine(name='foo')
+
+        self.assertIsNot(ret1, ret3)
+        self.assertEqual(2, mock_initialize_engine_object.call_count)
+
+    @mock.patch('tethys_services.utilities.initialize_engine_object')
+    @mock.patch('tethys_services.utilities.DsModel.objects.filter')
+    def test_get_dataset_engine_hydroshare_not_cached(self, mock_ds_model_object_filter, mock_initialize_engine_object):
+        mock_site_dataset_service = mock.MagicMock(engine='tethys_dataset_services.engines.HydroShareDatasetEngine')
+        mock_ds_model_object_filter().first.return_value = mock_site_dataset_service
+        mock_request = mock.MagicMock()
+
+        get_dataset_engine('foo', request=mock_request)
+        get_dataset_engine('foo', request=mock_request)
+
+        self.assertEqual(2, mock_initialize_engine_object.call_count)
+        mock_initialize_engine_object.assert_called_with(engine=mock_site_dataset_service.engine,
+                                                         endpoint=mock_site_dataset_service.endpoint,
+                                                         apikey=mock_site_dataset_service.apikey,
+                                                         username=mock_site_dataset_service.username,
+                                                         password=mock_site_dataset_service.password,
+                                                         request=mock_request)
+
+    def test_activate_wps_cached_capabilities(self):
+        from owslib.etree import etree
+
+        capabilities = etree.fromstring('<Capabilities/>')
+        mock_wps1 = mock.MagicMock(url='http://localhost/wps/WebProcessingService', _capabilities=capabilities)
+        mock_wps1.auth.username = 'foo'
+        mock_wps1.auth.password = 'bar'
+        mock_wps2 = mock.MagicMock(url='http://localhost/wps/WebProcessingService', auth=mock_wps1.auth)
+
+        activate_wps(mock_wps1, 'http://localhost/wps/WebProcessingService', 'foo')
+        ret = activate_wps(mock_wps2, 'http://localhost/wps/WebProcessingService', 'foo')
+
+        self.assertEqual(mock_wps2, ret)
+        mock_wps1.getcapabilities.assert_called_once_with()
+        mock_wps2.getcapabilities.assert_called_once_with(xml=b'<Capabilities/>')
@@ -11,11 +11,13 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import User
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 from django.shortcuts import reverse
 from tethys_quotas.admin import TethysAppQuotasSettingInline, UserQuotasSettingInline
 from guardian.admin import GuardedModelAdmin
 from tethys_quotas.utilities import get_quota, _convert_storage_units
-from tethys_quotas.handlers.workspace import WorkspaceQuotaHandler
+from tethys_apps.base.workspace import _get_app_workspace
+from tethys_apps.utilities import get_app_class
 from tethys_apps.models import (TethysApp,
                                 TethysExtension,
                                 CustomSetting,
@@ -99,22 +101,38 @@ class TethysAppAdmin(GuardedModelAdmin):
 
     def manage_app_storage(self, app):
         codename = 'tethysapp_workspace_quota'
-        rqh = WorkspaceQuotaHandler(app)
-        current_use = _convert_storage_units(rqh.units, rqh.get_current_use())
+        current_use = None
+        app_class = get_app_class(app)
+        if app_class is not None:
+            current_use = _get_app_workspace(app_class).get_cached_size('gb')
+        if current_use is not None:
+            current_use = _convert_storage_units('gb', current_use)
+        else:
+            current_use = 'Calculating...'
         quota = get_quota(app, codename)
         if quota['quota']:
             quota = _convert_storage_units(quota['units'], quota['quota'])
         else:
-            quota = "&#8734;"
+            quota = mark_safe("&#8734;")
 
         url = reverse('admin:clear_workspace', kwargs={'app_id': app.id})
+        usage_url = reverse('admin:workspace_usage', kwargs={'app_id': app.id})
 
         return format_html("""
-        <span>{} of {}</span>
+        <span id="workspace-usage">{}</span><span> of {}</span>
         <a id="clear-workspace" class="btn btn-danger btn-sm"
         href="{url}">
         Clear Workspace</a>
-        """.format(current_use, quota, url=url))
+        <script>
+        fetch("{usage_url}", {{credentials: "same-origin"}})
+            .then(function(response) {{ return response.json(); }})
+            .then(function(json) {{
+                if (json.success) {{
+                    document.getElementById("workspace-usage").textContent = json.current_use;
+                }}
+            }});
+        </script>
+        """, current_use, quota, url=url, usage_url=usage_url)
 
 
 class TethysExtensionAdmin(GuardedModelAdmin):
@@ -8,8 +8,10 @@
 ********************************************************************************
 """
 from django.apps import AppConfig
+from django.utils.autoreload import file_changed
 
 from tethys_apps.harvester import SingletonHarvester
+from tethys_apps.base.function_extractor import clear_function_cache
 
 
 class TethysAppsConfig(AppConfig):
@@ -23,3 +25,6 @@ class TethysAppsConfig(AppConfig):
         # Perform App Harvesting
         harvester = SingletonHarvester()
         harvester.harvest()
+
+        # Resolve functions from source again when the development server detects changes
+        file_changed.connect(clear_function_cache, dispatch_uid='tethys_apps_clear_function_cache')
@@ -21,7 +21,8 @@ from django.conf.urls import url
 
 from tethys_apps.base.testing.environment import is_testing_environment, get_test_db_name, TESTING_DB_FLAG
 from tethys_apps.base import permissions
-from .handoff import HandoffManager
+from .controller import async_controller
+from .handoff import get_app_handoff_manager
 from .workspace import TethysWorkspace
 from .mixins import TethysBaseMixin
 from ..exceptions import TethysAppSettingDoesNotExist, TethysAppSettingNotAssigned
@@ -116,6 +117,7 @@ class TethysBase(TethysBaseMixin):
 
             app_endpoint = '/'.join(['apps', self.root_url, stripped_url])
         bokeh_app = autoload(app_endpoint, handler_function)
+
         kwargs = dict(app_context=bokeh_app.app_context)
 
         def urlpattern(suffix=""):
@@ -195,6 +197,11 @@ class TethysBase(TethysBaseMixin):
 
                 # Create django url object
                 controller_function = self._resolve_ref_function(url_map.controller, 'controller', is_extension)
+
+                # Async controllers run on the event loop of the server
+                if url_map.protocol == 'http':
+                    controller_function = async_controller(controller_function)
+
                 django_url = url(url_map.url, controller_function, name=url_map.name)
 
                 # Append to namespace list
@@ -785,11 +792,9 @@ class TethysAppBase(TethysBase):
     @classmethod
     def get_handoff_manager(cls):
         """
-        Get the HandoffManager for the app.
+        Get the HandoffManager for the app. The manager is created once per app and reused.
         """
-        app = cls()
-        handoff_manager = HandoffManager(app)
-        return handoff_manager
+        return get_app_handoff_manager(cls)
 
     @classmethod
     def get_job_manager(cls):
@@ -7,17 +7,30 @@
 ********************************************************************************
 """
 # Native Imports
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 
 # Third Party Imports
 from bokeh.document import Document
 
 # Django Imports
+from django.conf import settings
+from django.db import close_old_connections
 from django.http.request import HttpRequest
 
 # Tethys Imports
 from tethys_sdk.workspaces import user_workspace, app_workspace
 
+log = logging.getLogger('tethys.' + __name__)
+
+DEFAULT_POOL_SIZE = 2  # documents
+DEFAULT_DATA_TTL = 5 * 60  # seconds
+PREWARM_WORKERS = 2
+
 
 def with_request(handler):
     @wraps(handler)
@@ -50,3 +63,154 @@ def get_user_workspace(request, user_workspace):
 @app_workspace
 def get_app_workspace(request, app_workspace):
     return app_workspace
+
+
+class DocumentPool:
+    """
+    Pool of Bokeh documents pre-initialized by a handler. The models of a pooled document are moved to the document of a new session, so the handler does not run while the session waits, and the pool is refilled in the background.
+
+    Args:
+        handler(callable): The handler function, which adds the models to a document.
+        size(int): Number of documents kept initialized.
+    """  # noqa: E501
+
+    def __init__(self, handler, size=DEFAULT_POOL_SIZE):
+        self.handler = handler
+        self.size = size
+        self._documents = deque()
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def __len__(self):
+        return len(self._documents)
+
+    def create_document(self):
+        """
+        Create a document initialized by the handler.
+        """
+        doc = Document()
+        self.handler(doc)
+        return doc
+
+    def prewarm(self):
+        """
+        Initialize documents in the background until the pool is full.
+        """
+        with self._lock:
+            missing = self.size - len(self._documents) - self._pending
+            self._pending += max(missing, 0)
+
+        for _ in range(missing):
+            _get_executor().submit(self._add_document)
+
+    def _add_document(self):
+        try:
+            doc = self.create_document()
+        except Exception:
+            log.exception('Unable to prewarm a document of Bokeh handler "{}"'.format(self.handler.__name__))
+            doc = None
+        finally:
+            close_old_connections()
+
+        with self._lock:
+            self._pending -= 1
+            if doc is not None:
+                self._documents.append(doc)
+
+    def get_document(self):
+        """
+        Take a document from the pool, or create one if the pool is empty, and refill the pool in the background.
+        """
+        with self._lock:
+            doc = self._documents.popleft() if self._documents else None
+
+        if doc is None:
+            doc = self.create_document()
+
+        self.prewarm()
+        return doc
+
+    def populate(self, doc):
+        """
+        Move the models, title, template and theme of a pooled document to the document of a session.
+        """
+        source = self.get_document()
+        roots = list(source.roots)
+        source.clear()
+
+        doc.title = source.title
+        doc.template = source.template
+        doc.template_variables.update(source.template_variables)
+        doc.theme = source.theme
+
+        for root in roots:
+            doc.add_root(root)
+
+
+def with_document_pool(handler=None, size=None):
+    """
+    Decorator that initializes the documents of a Bokeh handler ahead of the sessions, in a pool of documents prewarmed in the background from the first session of the handler on. The pool is not filled when the handler is registered, so management commands and other processes that only build the url patterns do not run the handler. The size of the pool defaults to the BOKEH_DOCUMENT_POOL_SIZE setting.
+
+    The handler must not depend on the session: the documents are initialized without a request and only their models are moved to the document of the session, so callbacks must be attached to the models rather than to the document (e.g. not with ``doc.add_periodic_callback``).
+    """  # noqa: E501
+    def decorator(handler):
+        pool = DocumentPool(handler, size or getattr(settings, 'BOKEH_DOCUMENT_POOL_SIZE', DEFAULT_POOL_SIZE))
+
+        @wraps(handler)
+        def wrapper(doc: Document):
+            pool.populate(doc)
+
+        wrapper.document_pool = pool
+        return wrapper
+
+    return decorator(handler) if handler is not None else decorator
+
+
+def cache_handler_data(func=None, ttl=None):
+    """
+    Decorator that caches the data returned by a function used by Bokeh handlers (e.g. to query a large dataset) across sessions, by the arguments of the function, for ttl seconds. The ttl defaults to the BOKEH_HANDLER_DATA_TTL setting. The arguments must be hashable.
+    """  # noqa: E501
+    def decorator(func):
+        cache = {}
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+
+            with lock:
+                entry = cache.get(key)
+
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+            data = func(*args, **kwargs)
+            expires = now + (ttl if ttl is not None else getattr(settings, 'BOKEH_HANDLER_DATA_TTL', DEFAULT_DATA_TTL))
+
+            with lock:
+                # Drop the expired entries, so the data of arguments no longer used does not accumulate
+                for k in [k for k, v in cache.items() if v[0] <= now]:
+                    del cache[k]
+                cache[key] = (expires, data)
+
+            return data
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=PREWARM_WORKERS, thread_name_prefix='tethys_bokeh_prewarm')
+
+    return _executor
@@ -7,6 +7,10 @@
 * License: BSD 2-Clause
 ********************************************************************************
 """
+import asyncio
+
+from asgiref.sync import async_to_sync
+from django.utils.functional import wraps
 from django.views.generic import View
 
 
@@ -18,3 +22,23 @@ class TethysController(View):
         Thin veneer around the as_view method to make interface more consistent with Tethys terminology.
         """
         return cls.as_view(**kwargs)
+
+
+def async_controller(controller):
+    """
+    Wrap an async controller (an ``async def`` function) in a view that Django can call. The request is still handled by a worker thread, but the controller runs on the event loop of the ASGI server, so it can await many requests to other services (e.g. with ``asyncio.gather``) without blocking a thread for each of them. Sync controllers are returned unchanged.
+
+    Args:
+        controller(callable): The controller function.
+
+    Returns:
+        callable: A sync view that runs the controller.
+    """  # noqa: E501
+    if not asyncio.iscoroutinefunction(controller):
+        return controller
+
+    @wraps(controller)
+    def view(*args, **kwargs):
+        return async_to_sync(controller)(*args, **kwargs)
+
+    return view
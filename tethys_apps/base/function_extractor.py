@@ -1,3 +1,15 @@
+# Functions resolved from dot-paths, keyed by (module path, function name). Paths that could not be imported are
+# cached as the exception that was raised.
+_resolved_functions = {}
+
+
+def clear_function_cache(**kwargs):
+    """
+    Clear the functions resolved by all TethysFunctionExtractor objects, so that paths are imported again the next time they are accessed. Connected to Django's autoreload file_changed signal.
+    """  # noqa: E501
+    _resolved_functions.clear()
+
+
 class TethysFunctionExtractor:
     """
     Base class for PersistentStore and HandoffHandler that returns a function handle from a string path to the function.
@@ -29,18 +41,39 @@ class TethysFunctionExtractor:
                 # Pre-process handler path
                 full_module_path = '.'.join((self.prefix, module_path)) if self.prefix else module_path
 
-                # Import module
-                module = __import__(full_module_path, fromlist=[str(function_name)])
-
-            except (ValueError, ImportError) as e:
+            except ValueError as e:
                 self._valid = False
                 if self._throw:
                     raise e
+                return
+
+            key = (full_module_path, function_name)
+
+            try:
+                result = _resolved_functions[key]
+            except KeyError:
+                result = self._import_function(full_module_path, function_name)
+                _resolved_functions[key] = result
+
+            if isinstance(result, ImportError):
+                self._valid = False
+                if self._throw:
+                    raise result.with_traceback(None)
             else:
-                # Get the function
-                self._function = getattr(module, function_name)
+                self._function = result
                 self._valid = True
 
+    @staticmethod
+    def _import_function(full_module_path, function_name):
+        try:
+            # Import module
+            module = __import__(full_module_path, fromlist=[str(function_name)])
+        except ImportError as e:
+            return e
+
+        # Get the function
+        return getattr(module, function_name)
+
     @property
     def valid(self):
         """
@@ -9,6 +9,8 @@
 """
 import inspect
 import json
+import logging
+import threading
 import warnings
 from django.shortcuts import redirect
 from django.http import HttpResponseBadRequest
@@ -16,6 +18,43 @@ from django.http import HttpResponseBadRequest
 import tethys_apps
 from tethys_apps.base.function_extractor import TethysFunctionExtractor
 
+tethys_log = logging.getLogger('tethys.' + __name__)
+
+# HandoffManagers of the apps, by package
+_handoff_managers = dict()
+_handoff_managers_lock = threading.Lock()
+
+
+def get_app_handoff_manager(app_class):
+    """
+    Get the HandoffManager of an app. The manager is created, and its handlers imported and validated, the first time it is requested (when the app is harvested) and then reused.
+
+    Args:
+        app_class (class): The class of the app.
+
+    Returns:
+        HandoffManager: The HandoffManager of the app.
+    """  # noqa: E501
+    manager = _handoff_managers.get(app_class.package)
+
+    if manager is None:
+        with _handoff_managers_lock:
+            manager = _handoff_managers.get(app_class.package)
+
+            if manager is None:
+                manager = HandoffManager(app_class())
+                _handoff_managers[app_class.package] = manager
+
+    return manager
+
+
+def clear_handoff_managers():
+    """
+    Remove the HandoffManagers of the apps (e.g. after the handoff handlers of an app are changed).
+    """
+    with _handoff_managers_lock:
+        _handoff_managers.clear()
+
 
 class HandoffManager:
     """
@@ -35,6 +74,7 @@ class HandoffManager:
         self.app = app
         self.handlers = app.handoff_handlers() or []
         self.valid_handlers = self._get_valid_handlers()
+        self._capabilities_json = dict()
 
     def __repr__(self):
         """
@@ -57,14 +97,14 @@ class HandoffManager:
         manager = self._get_handoff_manager_for_app(app_name)
 
         if manager:
+            if jsonify:
+                return manager._get_capabilities_json(external_only)
+
             handlers = manager.valid_handlers
 
             if external_only:
                 handlers = [handler for handler in handlers if not handler.internal]
 
-            if jsonify:
-                handlers = json.dumps([handler.__dict__ for handler in handlers])
-
             return handlers
 
     def get_handler(self, handler_name, app_name=None):
@@ -134,6 +174,12 @@ class HandoffManager:
         if not app_name:
             return self
 
+        # Managers of harvested apps are registered by package
+        manager = _handoff_managers.get(app_name)
+
+        if manager is not None:
+            return manager
+
         # Get the app
         harvester = tethys_apps.harvester.SingletonHarvester()
         apps = harvester.apps
@@ -147,7 +193,29 @@ class HandoffManager:
         """
         Returns a list of valid HandoffHandler objects.
         """
-        return [handler for handler in self.handlers if handler.valid]
+        valid_handlers = []
+
+        for handler in self.handlers:
+            if handler.valid:
+                valid_handlers.append(handler)
+            else:
+                tethys_log.warning('Handoff handler "{0}" of app "{1}" is not valid: unable to import "{2}".'.format(
+                    handler.name, self.app.package, handler.handler))
+
+        return valid_handlers
+
+    def _get_capabilities_json(self, external_only=False):
+        """
+        Returns the JSON representation of the valid HandoffHandlers, encoded once and then reused.
+        """
+        capabilities = self._capabilities_json.get(external_only)
+
+        if capabilities is None:
+            handlers = [handler for handler in self.valid_handlers if not (external_only and handler.internal)]
+            capabilities = json.dumps([handler.__dict__() for handler in handlers])
+            self._capabilities_json[external_only] = capabilities
+
+        return capabilities
 
 
 class HandoffHandler(TethysFunctionExtractor):
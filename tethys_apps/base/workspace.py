@@ -10,8 +10,19 @@
 
 import os
 import sys
+import json
+import heapq
+import base64
+import hashlib
 import shutil
+import fnmatch
+import asyncio
+import time
 import logging
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
 from django.utils.functional import wraps
 from django.core.exceptions import PermissionDenied
 from django.http import HttpRequest
@@ -20,6 +31,80 @@ from tethys_quotas.utilities import passes_quota, _get_storage_units
 
 log = logging.getLogger('tethys.' + __name__)
 
+# Maximum number of workspace objects kept in the workspace cache
+WORKSPACE_CACHE_SIZE = 1024
+
+# Seconds between the checks that the directory of a cached workspace still exists
+WORKSPACE_CHECK_INTERVAL = 60
+
+# Prefix of the cache keys used to store the last computed size of each workspace
+WORKSPACE_SIZE_CACHE_PREFIX = 'tethys_workspace_size:'
+
+WORKSPACE_SORT_KEYS = {
+    'name': lambda entry: (entry.relative_path,),
+    'size': lambda entry: (entry.size, entry.relative_path),
+    'modified': lambda entry: (entry.modified, entry.relative_path),
+}
+
+
+class WorkspaceEntry:
+    """
+    Represents a file or directory in a workspace. Entries wrap the ``os.DirEntry`` objects returned by the directory scan, so the type and stat information of an entry is cached and reading it does not require additional system calls.
+
+    Attributes:
+      name(str): The name of the file or directory.
+      path(str): The absolute path to the file or directory.
+      relative_path(str): The path to the file or directory relative to the workspace directory.
+    """  # noqa: E501
+    __slots__ = ('_entry', 'relative_path')
+
+    def __init__(self, dir_entry, relative_path):
+        """
+        Constructor
+        """
+        self._entry = dir_entry
+        self.relative_path = relative_path
+
+    def __repr__(self):
+        """
+        Rendering
+        """
+        return '<WorkspaceEntry path="{0}">'.format(self.relative_path)
+
+    @property
+    def name(self):
+        return self._entry.name
+
+    @property
+    def path(self):
+        return self._entry.path
+
+    @property
+    def size(self):
+        """
+        Size of the entry in bytes.
+        """
+        return self.stat().st_size
+
+    @property
+    def modified(self):
+        """
+        Time of the last modification of the entry in seconds since the epoch.
+        """
+        return self.stat().st_mtime
+
+    def is_file(self):
+        return self._entry.is_file()
+
+    def is_dir(self):
+        return self._entry.is_dir()
+
+    def stat(self):
+        """
+        Return the cached ``os.stat_result`` for the entry.
+        """
+        return self._entry.stat()
+
 
 class TethysWorkspace:
     """
@@ -33,12 +118,20 @@ class TethysWorkspace:
         """
         Constructor
         """
+        self._path = path
+        self._checked = None
+
         # Create the path if it doesn't already exist
-        if not os.path.exists(path):
-            os.makedirs(path)
+        self._create()
 
-        # Validate that the path is a directory
-        self._path = path
+    def _create(self):
+        """
+        Create the workspace directory if it doesn't exist, e.g. if it was deleted while the workspace was cached.
+        """
+        if not os.path.exists(self._path):
+            os.makedirs(self._path, exist_ok=True)
+
+        self._checked = time.monotonic()
 
     def __repr__(self):
         """
@@ -48,6 +141,10 @@ class TethysWorkspace:
 
     @property
     def path(self):
+        # Recreate the directory if it was deleted, checking at most once per interval
+        if time.monotonic() - self._checked > WORKSPACE_CHECK_INTERVAL:
+            self._create()
+
         return self._path
 
     @path.setter
@@ -78,12 +175,8 @@ class TethysWorkspace:
             workspace.files(full_path=True)
 
         """
-        if full_path:
-            files = [os.path.join(self._path, f) for f in os.listdir(self._path) if
-                     os.path.isfile(os.path.join(self._path, f))]
-        else:
-            files = [f for f in os.listdir(self._path) if os.path.isfile(os.path.join(self._path, f))]
-        return files
+        attr = 'path' if full_path else 'name'
+        return [getattr(entry, attr) for entry in self.iter_entries(include_directories=False)]
 
     def directories(self, full_path=False):
         """
@@ -106,12 +199,157 @@ class TethysWorkspace:
             workspace.directories(full_path=True)
 
         """
-        if full_path:
-            directories = [os.path.join(self._path, d) for d in os.listdir(self._path) if
-                           os.path.isdir(os.path.join(self._path, d))]
-        else:
-            directories = [d for d in os.listdir(self._path) if os.path.isdir(os.path.join(self._path, d))]
-        return directories
+        attr = 'path' if full_path else 'name'
+        return [getattr(entry, attr) for entry in self.iter_entries(include_files=False)]
+
+    def iter_entries(self, pattern=None, predicate=None, recursive=False, include_files=True,
+                     include_directories=True, sort_by=None, reverse=False):
+        """
+        Iterate over the files and directories in the workspace. Entries are produced lazily from ``os.scandir``, so the listing is never held in memory unless sorting is requested.
+
+        Args:
+          pattern(str): A glob pattern (e.g.: ``'*.nc'``) that the names of the entries must match. Defaults to all entries.
+          predicate(callable): A function that accepts a ``WorkspaceEntry`` and returns True if the entry should be included.
+          recursive(bool): Include the contents of subdirectories when True. Symbolic links to directories are not followed. Defaults to False.
+          include_files(bool): Include files when True. Defaults to True.
+          include_directories(bool): Include directories when True. Defaults to True.
+          sort_by(str): One of 'name', 'size', or 'modified'. Entries are produced in directory order when not given.
+          reverse(bool): Reverse the sort order when True. Defaults to False.
+
+        Returns:
+          iterator: An iterator of ``WorkspaceEntry`` objects.
+
+        **Examples:**
+
+        ::
+
+            # Iterate over all NetCDF files in the workspace and its subdirectories
+            for entry in workspace.iter_entries(pattern='*.nc', recursive=True, include_directories=False):
+                print(entry.relative_path, entry.size)
+
+            # Files larger than 1 MB, largest first
+            large_files = workspace.iter_entries(
+                predicate=lambda e: e.is_file() and e.size > 1024 ** 2,
+                sort_by='size',
+                reverse=True
+            )
+
+        """  # noqa: E501
+        entries = self._iter_entries(pattern, predicate, recursive, include_files, include_directories)
+
+        if sort_by is None:
+            return entries
+
+        return iter(sorted(entries, key=self._get_sort_key(sort_by), reverse=reverse))
+
+    def paginate(self, limit=100, cursor=None, sort_by='name', reverse=False, **kwargs):
+        """
+        Return one page of the files and directories in the workspace. Only ``limit`` entries are held in memory at a time, regardless of the size of the workspace.
+
+        Args:
+          limit(int): The maximum number of entries to return. Defaults to 100.
+          cursor(str): The cursor returned with the previous page. Returns the first page when not given.
+          sort_by(str): One of 'name', 'size', or 'modified'. Defaults to 'name'.
+          reverse(bool): Reverse the sort order when True. Defaults to False.
+          kwargs: Any of the filtering arguments accepted by ``iter_entries`` (``pattern``, ``predicate``, ``recursive``, ``include_files``, and ``include_directories``).
+
+        Returns:
+          tuple: A list of ``WorkspaceEntry`` objects and the cursor for the next page, which is None on the last page.
+
+        **Examples:**
+
+        ::
+
+            entries, cursor = workspace.paginate(limit=50, sort_by='modified', reverse=True)
+
+            while cursor:
+                entries, cursor = workspace.paginate(limit=50, cursor=cursor, sort_by='modified', reverse=True)
+
+        """  # noqa: E501
+        if limit < 1:
+            raise ValueError('The limit argument must be a positive integer.')
+
+        sort_key = self._get_sort_key(sort_by)
+        entries = self._iter_entries(**kwargs)
+
+        if cursor is not None:
+            last_key = self._decode_cursor(cursor)
+            if reverse:
+                entries = (entry for entry in entries if sort_key(entry) < last_key)
+            else:
+                entries = (entry for entry in entries if sort_key(entry) > last_key)
+
+        # Fetch one more than requested to determine whether there is another page
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        page = select(limit + 1, entries, key=sort_key)
+
+        if len(page) <= limit:
+            return page, None
+
+        page = page[:limit]
+        return page, self._encode_cursor(sort_key(page[-1]))
+
+    def _iter_entries(self, pattern=None, predicate=None, recursive=False, include_files=True,
+                      include_directories=True):
+        """
+        Yield WorkspaceEntry objects for the workspace, optionally descending into subdirectories.
+        """
+        pending = [(self._path, '')]
+
+        while pending:
+            directory, relative_directory = pending.pop()
+            subdirectories = []
+
+            try:
+                with os.scandir(directory) as scanner:
+                    for dir_entry in scanner:
+                        relative_path = os.path.join(relative_directory, dir_entry.name)
+                        entry = WorkspaceEntry(dir_entry, relative_path)
+                        is_dir = entry.is_dir()
+
+                        if recursive and is_dir and not dir_entry.is_symlink():
+                            subdirectories.append((dir_entry.path, relative_path))
+
+                        if is_dir and not include_directories:
+                            continue
+
+                        if not is_dir and (not include_files or not entry.is_file()):
+                            continue
+
+                        if pattern is not None and not fnmatch.fnmatch(entry.name, pattern):
+                            continue
+
+                        if predicate is not None and not predicate(entry):
+                            continue
+
+                        yield entry
+
+            except FileNotFoundError:
+                # Directory was removed while it was being listed
+                if directory == self._path:
+                    self._create()
+                continue
+
+            pending.extend(reversed(subdirectories))
+
+    @staticmethod
+    def _get_sort_key(sort_by):
+        try:
+            return WORKSPACE_SORT_KEYS[sort_by]
+        except KeyError:
+            raise ValueError('Invalid value for argument "sort_by": must be one of {}.'.format(
+                ', '.join(sorted(WORKSPACE_SORT_KEYS))))
+
+    @staticmethod
+    def _encode_cursor(key):
+        return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor):
+        try:
+            return tuple(json.loads(base64.urlsafe_b64decode(cursor.encode())))
+        except (TypeError, ValueError):
+            raise ValueError('Invalid value for argument "cursor".')
 
     def clear(self, exclude=[], exclude_files=False, exclude_directories=False):
         """
@@ -139,20 +377,17 @@ class TethysWorkspace:
             workspace.clear(exclude=['file1.txt', '/full/path/to/directory1', 'directory2', '/full/path/to/file2.txt'])
 
         """
-        files = [f for f in os.listdir(self._path) if os.path.isfile(os.path.join(self._path, f))]
-        directories = [d for d in os.listdir(self._path) if os.path.isdir(os.path.join(self._path, d))]
+        entries = [entry for entry in self.iter_entries(include_files=not exclude_files,
+                                                        include_directories=not exclude_directories)
+                   if entry.name not in exclude and entry.path not in exclude]
 
-        if not exclude_files:
-            for file in files:
-                fullpath = os.path.join(self._path, file)
-                if file not in exclude and fullpath not in exclude:
-                    os.remove(fullpath)
+        for entry in entries:
+            if entry.is_dir():
+                shutil.rmtree(entry.path)
+            else:
+                os.remove(entry.path)
 
-        if not exclude_directories:
-            for directory in directories:
-                fullpath = os.path.join(self._path, directory)
-                if directory not in exclude and fullpath not in exclude:
-                    shutil.rmtree(fullpath)
+        self._clear_cached_size()
 
     def remove(self, item):
         """
@@ -187,18 +422,79 @@ class TethysWorkspace:
         elif os.path.isfile(full_path):
             os.remove(full_path)
 
+        self._clear_cached_size()
+
     def get_size(self, units='b'):
-        total_size = 0
-        for file in self.files(True):
-            total_size += os.path.getsize(file)
+        """
+        Compute the total size of the files in the workspace. The result is saved as the cached size of the workspace.
+
+        Args:
+          units(str): Units of the result (e.g.: 'b', 'kb', 'mb', 'gb'). Defaults to 'b'.
+
+        Returns:
+          float: Size of the workspace.
+        """  # noqa: E501
+        total_size = sum(entry.size for entry in self.iter_entries(include_directories=False))
+        cache.set(self._size_cache_key, total_size, None)
+        return total_size / _get_conversion_factor(units)
+
+    def get_cached_size(self, units='b'):
+        """
+        Get the size of the workspace the last time it was computed, without scanning the workspace.
+
+        Args:
+          units(str): Units of the result (e.g.: 'b', 'kb', 'mb', 'gb'). Defaults to 'b'.
+
+        Returns:
+          float: Size of the workspace or None if the size has not been computed or the workspace has changed since.
+        """  # noqa: E501
+        total_size = cache.get(self._size_cache_key)
+
+        if total_size is None:
+            return None
+
+        return total_size / _get_conversion_factor(units)
+
+    @property
+    def _size_cache_key(self):
+        # Paths are hashed to keep keys short and free of whitespace, as required by memcached
+        return WORKSPACE_SIZE_CACHE_PREFIX + hashlib.sha256(self._path.encode()).hexdigest()
+
+    def _clear_cached_size(self):
+        cache.delete(self._size_cache_key)
+
+
+def _get_conversion_factor(units):
+    """
+    Get the number of bytes in one of the given storage units.
+    """
+    if units.lower() == 'b':
+        return 1
+
+    storage_units = _get_storage_units()
+    return [item[0] for item in storage_units if units.upper() in item[1]][0]
+
+
+def _get_workspace_sizes(workspaces, units='b'):
+    """
+    Compute the sizes of several workspaces concurrently.
+
+    Args:
+      workspaces(dict): TethysWorkspace objects with any keys (e.g.: the dictionary returned by _get_user_workspaces).
+      units(str): Units of the sizes (e.g.: 'b', 'kb', 'mb', 'gb'). Defaults to 'b'.
+
+    Returns:
+      dict: The size of each workspace with the same keys as the given dictionary.
+    """  # noqa: E501
+    if not workspaces:
+        return {}
+
+    keys = list(workspaces.keys())
 
-        if units.lower() == 'b':
-            conversion_factor = 1
-        else:
-            storage_units = _get_storage_units()
-            conversion_factor = [item[0] for item in storage_units if units.upper() in item[1]][0]
+    with ThreadPoolExecutor(max_workers=min(len(keys), (os.cpu_count() or 1) * 4)) as executor:
+        sizes = executor.map(lambda key: workspaces[key].get_size(units), keys)
 
-        return total_size / conversion_factor
+    return dict(zip(keys, sizes))
 
 
 def _get_user_workspace(app_class, user_or_request):
@@ -234,6 +530,33 @@ def _get_user_workspace(app_class, user_or_request):
 
             return render(request, 'my_first_app/template.html', context)
 
+    """
+    username = _get_username(user_or_request)
+    return _get_workspace(app_class.__module__, username)
+
+
+def _get_user_workspaces(user_or_request, apps=None):
+    """
+    Get the file workspaces (directories) of the given User for several apps at once.
+
+    Args:
+      user_or_request(User or HttpRequest): User or request object.
+      apps(iterable): The apps to get workspaces for. Defaults to all installed apps.
+
+    Returns:
+      dict: TethysWorkspace objects keyed by app.
+    """
+    if apps is None:
+        from tethys_apps.harvester import SingletonHarvester
+        apps = SingletonHarvester().apps
+
+    username = _get_username(user_or_request)
+    return {app: _get_workspace(app.__module__, username) for app in apps}
+
+
+def _get_username(user_or_request):
+    """
+    Get the name of the user workspace directory for the given User or request.
     """
     username = ''
 
@@ -250,11 +573,38 @@ def _get_user_workspace(app_class, user_or_request):
     if not username:
         username = 'anonymous_user'
 
-    project_directory = os.path.dirname(sys.modules[app_class.__module__].__file__)
-    workspace_directory = os.path.join(project_directory, 'workspaces', 'user_workspaces', username)
+    return username
+
+
+@lru_cache(maxsize=WORKSPACE_CACHE_SIZE)
+def _get_workspace(app_module, username=None):
+    """
+    Get the workspace of the app defined in the given module. Workspace objects are cached, so the workspace path is resolved and the directory is created only the first time a workspace is requested. Directories deleted while the portal is running are recreated when the workspace is next listed or, at most WORKSPACE_CHECK_INTERVAL seconds later, when its path is accessed.
+
+    Args:
+      app_module(str): Name of the module that defines the app class.
+      username(str): Name of the user. Returns the app workspace when not given.
+
+    Returns:
+      tethys_apps.base.TethysWorkspace: An object representing the workspace.
+    """  # noqa: E501
+    project_directory = os.path.dirname(sys.modules[app_module].__file__)
+
+    if username is None:
+        workspace_directory = os.path.join(project_directory, 'workspaces', 'app_workspace')
+    else:
+        workspace_directory = os.path.join(project_directory, 'workspaces', 'user_workspaces', username)
+
     return TethysWorkspace(workspace_directory)
 
 
+def clear_workspace_cache():
+    """
+    Clear the cached workspace objects. Call this if apps are moved while the portal is running.
+    """
+    _get_workspace.cache_clear()
+
+
 def user_workspace(controller):
     """
     **Decorator:** Get the file workspace (directory) for the given User.
@@ -285,8 +635,7 @@ def user_workspace(controller):
             return render(request, 'my_first_app/template.html', context)
 
     """
-    @wraps(controller)
-    def wrapper(*args, **kwargs):
+    def get_workspace(args):
         from tethys_quotas.models import ResourceQuota
         from tethys_apps.utilities import get_active_app
 
@@ -315,8 +664,18 @@ def user_workspace(controller):
         # Get the active app
         app = get_active_app(request, get_class=True)
 
-        the_workspace = _get_user_workspace(app, user)
+        return _get_user_workspace(app, user)
+
+    if asyncio.iscoroutinefunction(controller):
+        @wraps(controller)
+        async def async_wrapper(*args, **kwargs):
+            the_workspace = await sync_to_async(get_workspace, thread_sensitive=True)(args)
+            return await controller(*args, the_workspace, **kwargs)
+        return async_wrapper
 
+    @wraps(controller)
+    def wrapper(*args, **kwargs):
+        the_workspace = get_workspace(args)
         return controller(*args, the_workspace, **kwargs)
     return wrapper
 
@@ -354,12 +713,7 @@ def _get_app_workspace(app_class):
             return render(request, 'my_first_app/template.html', context)
 
     """
-    # Find the path to the app project directory
-    # Hint: cls is a child class of this class.
-    # Credits: http://stackoverflow.com/questions/4006102/ is-possible-to-know-the-_path-of-the-file-of-a-subclass-in-python  # noqa: E501
-    project_directory = os.path.dirname(sys.modules[app_class.__module__].__file__)
-    workspace_directory = os.path.join(project_directory, 'workspaces', 'app_workspace')
-    return TethysWorkspace(workspace_directory)
+    return _get_workspace(app_class.__module__)
 
 
 def app_workspace(controller):
@@ -392,8 +746,7 @@ def app_workspace(controller):
             return render(request, 'my_first_app/template.html', context)
 
     """
-    @wraps(controller)
-    def wrapper(*args, **kwargs):
+    def get_workspace(args):
         from tethys_quotas.models import ResourceQuota
         from tethys_apps.utilities import get_active_app
 
@@ -419,7 +772,17 @@ def app_workspace(controller):
         if not passes_quota(app, codename):
             raise PermissionDenied(rq.help)
 
-        the_workspace = _get_app_workspace(app)
+        return _get_app_workspace(app)
+
+    if asyncio.iscoroutinefunction(controller):
+        @wraps(controller)
+        async def async_wrapper(*args, **kwargs):
+            the_workspace = await sync_to_async(get_workspace, thread_sensitive=True)(args)
+            return await controller(*args, the_workspace, **kwargs)
+        return async_wrapper
 
+    @wraps(controller)
+    def wrapper(*args, **kwargs):
+        the_workspace = get_workspace(args)
         return controller(*args, the_workspace, **kwargs)
     return wrapper
@@ -7,8 +7,10 @@
 * License:
 ********************************************************************************
 """
+import asyncio
 from urllib.parse import urlparse
 
+from asgiref.sync import sync_to_async
 from django.http import HttpRequest
 from django.contrib import messages
 from django.urls import reverse
@@ -22,9 +24,26 @@ from django.contrib.auth import REDIRECT_FIELD_NAME
 
 def login_required(function=None, redirect_field_name=REDIRECT_FIELD_NAME, login_url=None):
     """
-    Decorator for Tethys App controllers that checks whether a user has a permission.
+    Decorator for Tethys App controllers that checks whether a user has a permission. Supports async controllers.
     """
     def decorator(controller_func):
+        if asyncio.iscoroutinefunction(controller_func):
+            def check_login(request, *args, **kwargs):
+                from django.contrib.auth.decorators import login_required as lr
+                dec = lr(function=function, redirect_field_name=redirect_field_name, login_url=login_url)
+                # Returns the redirect to the login page, or None if the user is logged in
+                return dec(lambda *a, **kw: None)(request, *args, **kwargs)
+
+            async def async_wrapper(request, *args, **kwargs):
+                if not getattr(settings, 'ENABLE_OPEN_PORTAL', False):
+                    response = await sync_to_async(check_login, thread_sensitive=True)(request, *args, **kwargs)
+                    if response is not None:
+                        return response
+
+                return await controller_func(request, *args, **kwargs)
+
+            return wraps(controller_func)(async_wrapper)
+
         def wrapper(request, *args, **kwargs):
 
             if not getattr(settings, 'ENABLE_OPEN_PORTAL', False):
@@ -41,7 +60,7 @@ def login_required(function=None, redirect_field_name=REDIRECT_FIELD_NAME, login
 
 def permission_required(*args, **kwargs):
     """
-    Decorator for Tethys App controllers that checks whether a user has a permission.
+    Decorator for Tethys App controllers that checks whether a user has a permission. Supports async controllers.
 
     Args:
         *args: Any number of permission names for the app (e.g. 'create_projects')
@@ -110,7 +129,7 @@ def permission_required(*args, **kwargs):
         raise ValueError('Must supply at least one permission to test.')
 
     def decorator(controller_func):
-        def _wrapped_controller(*args, **kwargs):
+        def check_permissions(*args):
             # With OR check, we assume the permission test passes upfront
             # Find request (varies position if class method is wrapped)
             # e.g.: func(request, *args, **kwargs) vs. method(self, request, *args, **kwargs)
@@ -130,7 +149,8 @@ def permission_required(*args, **kwargs):
             if request_args_index > 0:
                 the_self = args[0]
 
-            args = args[request_args_index+1:]
+            # Args of the controller (the request and everything after it, after self for methods)
+            controller_args = args[request_args_index:] if the_self is None else (the_self,) + args[request_args_index:]
 
             # OR Loop
             if use_or:
@@ -178,7 +198,7 @@ def permission_required(*args, **kwargs):
                                     redirect_url = parsed_referer.path
 
                         # Redirect to apps library with message
-                        return redirect(redirect_url)
+                        return redirect(redirect_url), controller_args
 
                     # If not authenticated...
                     else:
@@ -186,17 +206,33 @@ def permission_required(*args, **kwargs):
                         messages.add_message(request, messages.INFO, "You must be logged in to access this feature.")
 
                         # Redirect to login page
-                        return redirect(reverse('accounts:login') + '?next=' + request.path)
+                        return redirect(reverse('accounts:login') + '?next=' + request.path), controller_args
 
                 else:
-                    return tethys_portal_error.handler_403(request)
+                    return tethys_portal_error.handler_403(request), controller_args
+
+            return None, controller_args
+
+        if asyncio.iscoroutinefunction(controller_func):
+            async def _wrapped_async_controller(*args, **kwargs):
+                response, controller_args = await sync_to_async(check_permissions, thread_sensitive=True)(*args)
+
+                if response is not None:
+                    return response
+
+                # Call the controller
+                return await controller_func(*controller_args, **kwargs)
+
+            return wraps(controller_func)(_wrapped_async_controller)
+
+        def _wrapped_controller(*args, **kwargs):
+            response, controller_args = check_permissions(*args)
+
+            if response is not None:
+                return response
 
             # Call the controller
-            if the_self is not None:
-                response = controller_func(the_self, request, *args, **kwargs)
-            else:
-                response = controller_func(request, *args, **kwargs)
+            return controller_func(*controller_args, **kwargs)
 
-            return response
         return wraps(controller_func)(_wrapped_controller)
     return decorator
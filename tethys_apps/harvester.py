@@ -280,6 +280,13 @@ class SingletonHarvester:
                                 app_instance.remove_from_db()
                                 continue
 
+                            # load/validate app handoff handlers
+                            try:
+                                app_instance.get_handoff_manager()
+                            except Exception:
+                                tethys_log.exception(
+                                    'Unable to load the handoff handlers of app {0}:'.format(app_package))
+
                             # register app permissions
                             try:
                                 app_instance.register_app_permissions()
@@ -0,0 +1,65 @@
+"""
+********************************************************************************
+* Name: bundle_gizmo_assets.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from requests import RequestException
+
+from tethys_gizmos.assets import bundle_dependencies, get_cdn_static_path, vendor_cdn_asset
+
+
+class Command(BaseCommand):
+    """
+    Command class that handles the bundle_gizmo_assets command.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument('--no-vendor', action='store_true', default=False,
+                            help='Do not download the libraries loaded from CDNs.')
+
+    def handle(self, *args, **options):
+        """
+        Download the JavaScript and CSS libraries of the gizmos loaded from CDNs to the STATIC_ROOT and write the
+        bundles of the dependencies of each gizmo, so they are not written on the first page request. Bundles of other
+        combinations of gizmos are written to the STATIC_ROOT when first requested.
+        """
+        if not settings.STATIC_ROOT:
+            print('WARNING: Cannot find the STATIC_ROOT setting. Please provide the path to the static directory using '
+                  'the STATIC_ROOT setting in the portal_config.yml file and try again.')
+            exit(1)
+
+        # Import here, as the gizmo template tags harvest the installed extensions
+        from tethys_gizmos.templatetags.tethys_gizmos import GIZMO_NAME_MAP, TethysGizmoDependenciesNode
+
+        gizmo_dependencies = {
+            gizmo_name: TethysGizmoDependenciesNode.get_dependencies([gizmo_name])
+            for gizmo_name in sorted(GIZMO_NAME_MAP)
+        }
+
+        if not options['no_vendor']:
+            urls = sorted({
+                dependency
+                for dependencies in gizmo_dependencies.values()
+                for dependency_list in dependencies.values()
+                for dependency in dependency_list
+                if get_cdn_static_path(dependency)
+            })
+
+            for url in urls:
+                try:
+                    vendor_cdn_asset(url)
+                    print('INFO: Successfully vendored "{0}".'.format(url))
+                except (RequestException, OSError) as e:
+                    print('WARNING: Unable to vendor "{0}", it will be loaded from its CDN: {1}'.format(url, e))
+
+        for gizmo_name, dependencies in gizmo_dependencies.items():
+            for dependency_list in dependencies.values():
+                bundle_dependencies(dependency_list)
+
+        print('INFO: Successfully bundled the dependencies of {0} gizmos.'.format(len(gizmo_dependencies)))
@@ -10,10 +10,12 @@
 import os
 import shutil
 
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from django.conf import settings
 
 from tethys_apps.helpers import get_installed_tethys_apps, get_installed_tethys_extensions
+from tethys_gizmos.assets import get_plotlyjs_static_path
 
 
 class Command(BaseCommand):
@@ -67,3 +69,11 @@ class Command(BaseCommand):
             elif os.path.isdir(static_path):
                 os.symlink(static_path, static_root_path)
                 print('INFO: Successfully linked static directory to STATIC_ROOT for app "{0}".'.format(item))
+
+        # Write plotly.js to the STATIC_ROOT, like the gizmo bundles, so it is not written on the first page request
+        if get_plotlyjs_static_path():
+            print('INFO: Successfully wrote plotly.js to STATIC_ROOT.')
+
+        # Vendor and bundle the gizmo dependencies so they are collected with the other static files
+        if getattr(settings, 'GIZMO_BUNDLE_ASSETS', False):
+            call_command('bundle_gizmo_assets')
@@ -71,3 +71,36 @@ class TethysStaticFinder(BaseFinder):
             storage = self.storages[root]
             for path in utils.get_files(storage, ignore_patterns):
                 yield path, storage
+
+
+class BokehStaticFinder(TethysStaticFinder):
+    """
+    A static files finder for the files of BokehJS, so that Bokeh apps can load BokehJS from the static files of Tethys instead of the Bokeh CDN (see the BOKEH_RESOURCES setting).
+    Only the bundles of BokehJS are collected, not the compiler, sources and types that are also distributed with Bokeh.
+    """  # noqa: E501
+
+    def __init__(self, apps=None, *args, **kwargs):
+        from bokeh.util.paths import bokehjsdir
+
+        # List of locations with static files
+        self.locations = [('bokeh/static', bokehjsdir())]
+
+        # Maps dir paths to an appropriate storage instance
+        self.storages = SortedDict()
+
+        for prefix, root in self.locations:
+            filesystem_storage = FileSystemStorage(location=root)
+            filesystem_storage.prefix = prefix
+            self.storages[root] = filesystem_storage
+
+        BaseFinder.__init__(self, *args, **kwargs)
+
+    def list(self, ignore_patterns):
+        """
+        List the bundles of BokehJS.
+        """
+        for prefix, root in self.locations:
+            storage = self.storages[root]
+            for name in storage.listdir('js')[1]:
+                if name.endswith('.js') and not utils.matches_patterns(name, ignore_patterns):
+                    yield os.path.join('js', name), storage
@@ -0,0 +1,55 @@
+"""
+********************************************************************************
+* Name: url_resolvers.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+import re
+
+from django.urls.resolvers import RegexPattern, URLResolver
+from django.utils.functional import cached_property
+
+# Root pattern of an app or extension, as generated in tethys_apps.urls (e.g. "^my-app/")
+_ROOT_PATTERN = re.compile(r'^\^([\w-]+)/$')
+
+
+class AppsURLResolver(URLResolver):
+    """
+    Resolver of the url patterns of the apps (or extensions), each included under the root url of its app. Instead of matching the root pattern of every app in turn, it looks up the app by the first segment of the path and only matches the url patterns of that app. Reversing urls is unchanged.
+
+    Args:
+        url_patterns(list): The url patterns including the url patterns of each app under its root url.
+    """  # noqa: E501
+
+    def __init__(self, url_patterns):
+        super().__init__(RegexPattern(r'^'), url_patterns)
+
+    @cached_property
+    def app_resolvers(self):
+        """
+        Resolvers of the url patterns of each app, by the root url of the app. Patterns with a root pattern that is not a plain path segment are matched for every path, after the patterns of the app.
+        """  # noqa: E501
+        root_urls = {}
+        others = []
+
+        for pattern in self.url_patterns:
+            match = _ROOT_PATTERN.match(str(pattern.pattern)) if isinstance(pattern, URLResolver) else None
+
+            if match and match.group(1) not in root_urls:
+                root_urls[match.group(1)] = pattern
+            else:
+                others.append(pattern)
+
+        return {root_url: URLResolver(self.pattern, [pattern] + others) for root_url, pattern in root_urls.items()}
+
+    def resolve(self, path):
+        path = str(path)  # path may be a reverse_lazy object
+        resolver = self.app_resolvers.get(path.split('/', 1)[0])
+
+        if resolver is None:
+            return super().resolve(path)
+
+        return resolver.resolve(path)
@@ -9,6 +9,7 @@
 """
 from django.conf.urls import url, include
 from tethys_apps.harvester import SingletonHarvester
+from tethys_apps.url_resolvers import AppsURLResolver
 from tethys_apps.views import library, send_beta_feedback_email
 import logging
 
@@ -24,12 +25,19 @@ harvester = SingletonHarvester()
 app_url_patterns = harvester.get_url_patterns()['app_url_patterns']
 ext_url_patterns = harvester.get_url_patterns()['ext_url_patterns']
 
+app_urls = []
+
 for namespace, urls in app_url_patterns.items():
     root_pattern = r'^{0}/'.format(namespace.replace('_', '-'))
-    urlpatterns.append(url(root_pattern, include((urls, namespace), namespace=namespace)))
+    app_urls.append(url(root_pattern, include((urls, namespace), namespace=namespace)))
+
+# Resolve the app urls by root url instead of matching the root url of each app in turn
+urlpatterns.append(AppsURLResolver(app_urls))
 
 extension_urls = []
 
 for namespace, urls in ext_url_patterns.items():
     root_pattern = r'^{0}/'.format(namespace.replace('_', '-'))
     extension_urls.append(url(root_pattern, include((urls, namespace), namespace=namespace)))
+
+extension_urls = [AppsURLResolver(extension_urls)]
@@ -15,6 +15,7 @@ from django.urls import reverse
 from tethys_compute.models.tethys_job import TethysJob
 from tethys_compute.models.basic_job import BasicJob
 from tethys_compute.models.dask.dask_job import DaskJob
+from tethys_compute.models.wps_job import WpsJob
 from tethys_compute.models.condor.condor_job import CondorJob
 from tethys_compute.models.condor.condor_workflow import CondorWorkflow
 
@@ -25,6 +26,7 @@ JOB_TYPES = {'CONDOR': CondorJob,
              'CONDORWORKFLOW': CondorWorkflow,
              'BASIC': BasicJob,
              'DASK': DaskJob,
+             'WPS': WpsJob,
              }
 
 
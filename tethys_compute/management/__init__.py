@@ -0,0 +1,9 @@
+"""
+********************************************************************************
+* Name: management/__init__.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
@@ -0,0 +1,45 @@
+"""
+********************************************************************************
+* Name: poll_wps_jobs.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from tethys_compute.models.wps_job import poll_wps_jobs
+
+
+class Command(BaseCommand):
+    """
+    Command class that handles the poll_wps_jobs command, the reconciler of WPS jobs.
+    """
+    help = 'Poll the status of the WPS jobs due for a poll and process the results of the jobs that have succeeded.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-i', '--interval', type=float, default=0,
+                            help='Number of seconds between polls. Poll once if 0 (e.g. when run by cron).')
+        parser.add_argument('-b', '--batch-size', type=int, default=None,
+                            help='Maximum number of jobs polled at a time.')
+
+    def handle(self, *args, **options):
+        """
+        Poll the WPS jobs once or, with an interval, until interrupted.
+        """
+        interval = options.get('interval') or 0
+        batch_size = options.get('batch_size')
+
+        while True:
+            polled = poll_wps_jobs(batch_size=batch_size)
+
+            if options.get('verbosity', 1) > 1:
+                self.stdout.write('Polled {} WPS jobs.'.format(polled))
+
+            if interval <= 0:
+                break
+
+            time.sleep(interval)
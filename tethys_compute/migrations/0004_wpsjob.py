@@ -0,0 +1,36 @@
+# Generated by Django 2.2 on 2026-10-18 12:00
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tethys_services', '0001_initial_20'),
+        ('tethys_compute', '0003_auto_20190506_1714'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WpsJob',
+            fields=[
+                ('tethysjob_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE,
+                                                       parent_link=True, primary_key=True, serialize=False,
+                                                       to='tethys_compute.TethysJob')),
+                ('process_identifier', models.CharField(max_length=1024)),
+                ('inputs', django.contrib.postgres.fields.jsonb.JSONField(blank=True, default=list)),
+                ('outputs', django.contrib.postgres.fields.jsonb.JSONField(blank=True, default=list)),
+                ('results', django.contrib.postgres.fields.jsonb.JSONField(blank=True, default=dict)),
+                ('errors', django.contrib.postgres.fields.jsonb.JSONField(blank=True, default=list)),
+                ('status_location', models.CharField(blank=True, default='', max_length=2048)),
+                ('next_poll_time', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('poll_count', models.IntegerField(default=0)),
+                ('wps_service', models.ForeignKey(blank=True, null=True,
+                                                  on_delete=django.db.models.deletion.SET_NULL,
+                                                  to='tethys_services.WebProcessingService')),
+            ],
+            bases=('tethys_compute.tethysjob',),
+        ),
+    ]
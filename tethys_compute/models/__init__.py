@@ -14,6 +14,7 @@ from tethys_compute.models.scheduler import Scheduler  # noqa: F401
 from tethys_compute.models.condor.condor_scheduler import CondorScheduler  # noqa: F401
 from tethys_compute.models.tethys_job import TethysJob  # noqa: F401
 from tethys_compute.models.basic_job import BasicJob  # noqa: F401
+from tethys_compute.models.wps_job import WpsJob
 
 from tethys_compute.models.condor.condor_base import CondorBase  # noqa: F401
 from tethys_compute.models.condor.condor_py_job import CondorPyJob  # noqa: F401
@@ -27,6 +28,7 @@ from tethys_compute.models.dask.dask_job import DaskJob
 from tethys_compute.models.dask.dask_scheduler import DaskScheduler  # noqa: F401
 
 
+@receiver(post_save, sender=WpsJob)
 @receiver(post_save, sender=DaskJob)
 @receiver(post_save, sender=CondorJob)
 @receiver(post_save, sender=BasicJob)
@@ -0,0 +1,293 @@
+"""
+********************************************************************************
+* Name: wps_job.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+import datetime
+import logging
+import mimetypes
+import os
+import tempfile
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.contrib.postgres.fields import JSONField
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+from owslib.wps import ComplexDataInput, WPSExecution
+
+from tethys_compute.models.tethys_job import TethysJob
+from tethys_services.connections import create_session, get_credentials
+
+log = logging.getLogger('tethys.' + __name__)
+
+DEFAULT_POLL_INTERVAL = 5  # seconds
+DEFAULT_MAX_POLL_INTERVAL = 5 * 60  # seconds
+DEFAULT_POLL_BATCH_SIZE = 100  # jobs
+DEFAULT_POLL_LEASE = 10 * 60  # seconds
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # bytes
+
+WPS_STATUSES = {
+    'ProcessAccepted': 'SUB',
+    'ProcessStarted': 'RUN',
+    'ProcessPaused': 'RUN',
+    'ProcessSucceeded': 'RES',
+    'ProcessFailed': 'ERR',
+    'Exception': 'ERR',
+}
+
+_session = None
+
+
+def _get_session():
+    global _session
+
+    if _session is None:
+        session = create_session()
+        session.auth = get_credentials()
+        _session = session
+
+    return _session
+
+
+class WpsJob(TethysJob):
+    """
+    Job that executes a process of a Web Processing Service asynchronously. The status of the execution is polled from its status location by a background reconciler (see the poll_wps_jobs management command), with an exponential backoff, so requests for the status of the job only read the database. The outputs returned as references are downloaded to the workspace of the job when the execution succeeds.
+
+    Args:
+        wps_service(WebProcessingService): The web processing service.
+        process_identifier(str): The identifier of the process executed.
+        inputs(list): The inputs of the process as (identifier, value) pairs. Values are literals or, for complex data given by reference, dictionaries with an "href" and an optional "mime_type".
+        outputs(list): The identifiers of the outputs requested as references.
+    """  # noqa: E501
+    wps_service = models.ForeignKey('tethys_services.WebProcessingService', on_delete=models.SET_NULL,
+                                    blank=True, null=True)
+    process_identifier = models.CharField(max_length=1024)
+    inputs = JSONField(default=list, blank=True)
+    outputs = JSONField(default=list, blank=True)
+    results = JSONField(default=dict, blank=True)
+    errors = JSONField(default=list, blank=True)
+    status_location = models.CharField(max_length=2048, blank=True, default='')
+    next_poll_time = models.DateTimeField(blank=True, null=True, db_index=True)
+    poll_count = models.IntegerField(default=0)
+
+    @staticmethod
+    def get_poll_delay(poll_count):
+        """
+        Get the delay before the next poll of a job polled poll_count times without a change of status, doubling from the WPS_JOB_POLL_INTERVAL setting up to the WPS_JOB_MAX_POLL_INTERVAL setting (in seconds).
+        """  # noqa: E501
+        interval = getattr(settings, 'WPS_JOB_POLL_INTERVAL', DEFAULT_POLL_INTERVAL)
+        max_interval = getattr(settings, 'WPS_JOB_MAX_POLL_INTERVAL', DEFAULT_MAX_POLL_INTERVAL)
+        return datetime.timedelta(seconds=min(interval * 2 ** min(poll_count, 32), max_interval))
+
+    def _schedule_poll(self):
+        self.next_poll_time = timezone.now() + self.get_poll_delay(self.poll_count)
+
+    def _get_inputs(self):
+        inputs = []
+        for identifier, value in self.inputs:
+            if isinstance(value, dict):
+                value = ComplexDataInput(value['href'], mimeType=value.get('mime_type'))
+            else:
+                value = str(value)
+            inputs.append((identifier, value))
+        return inputs
+
+    def _execute(self, *args, **kwargs):
+        if self.wps_service is None:
+            raise ValueError('The WPS job "{}" has no web processing service.'.format(self.name))
+
+        wps = self.wps_service.get_engine()
+
+        if wps is None:
+            raise RuntimeError('The web processing service "{}" could not be reached.'.format(self.wps_service))
+
+        if self.wps_service.username and self.wps_service.password:
+            get_credentials().register(self.wps_service.endpoint, self.wps_service.username,
+                                       self.wps_service.password)
+
+        output = [(identifier, True) for identifier in self.outputs] or None
+        execution = wps.execute(self.process_identifier, self._get_inputs(), output=output)
+
+        if not execution.statusLocation:
+            errors = '; '.join(error.text for error in execution.errors)
+            raise RuntimeError('The process "{}" was not accepted for asynchronous execution: {}'.format(
+                self.process_identifier, errors or execution.status))
+
+        self.status_location = execution.statusLocation
+        self.poll_count = 0
+        self._schedule_poll()
+
+    def is_time_to_update(self):
+        """
+        Check if it is time to poll the status of the execution again.
+
+        Returns:
+            bool: True if the next poll time has passed, else False.
+        """
+        return self.next_poll_time is None or self.next_poll_time <= timezone.now()
+
+    def update_status(self, status=None, *args, poll=False, **kwargs):
+        """
+        Update status of job. The status of the execution is only polled when poll is True, by the reconciler.
+        """
+        if status or poll:
+            super().update_status(status, *args, **kwargs)
+
+    def _update_status(self, *args, **kwargs):
+        try:
+            response = _get_session().get(self.status_location)
+            response.raise_for_status()
+            execution = WPSExecution()
+            execution.checkStatus(response=response.content, sleepSecs=0)
+        except Exception as e:
+            log.warning('Unable to poll the status of WPS job "%s": %s', self, e)
+            self.poll_count += 1
+            self._schedule_poll()
+            return
+
+        status = WPS_STATUSES.get(execution.status)
+
+        if status is None:
+            log.error('Unknown WPS Status: "{}"'.format(execution.status))
+            status = self._status
+
+        if status == 'RES':
+            self.results = {
+                output.identifier: {'reference': output.reference, 'mime_type': output.mimeType}
+                if output.reference else {'data': output.data}
+                for output in execution.processOutputs
+            }
+        elif status == 'ERR':
+            self.errors = [{'code': error.code, 'locator': error.locator, 'text': error.text}
+                           for error in execution.errors]
+
+        # Poll again soon after the status changes, less and less often while it does not
+        self.poll_count = 0 if status != self._status else self.poll_count + 1
+        self._status = status
+
+        if status in ('SUB', 'RUN'):
+            self._schedule_poll()
+        else:
+            self.next_poll_time = None
+
+    def _download(self, identifier, result):
+        url = result['reference']
+        extension = mimetypes.guess_extension(result.get('mime_type') or '') or \
+            os.path.splitext(urlsplit(url).path)[1]
+
+        # The identifier and extension are given by the service, so they must not leave the workspace
+        try:
+            file_name = get_valid_filename(identifier + extension).lstrip('.')
+        except SuspiciousFileOperation:
+            file_name = ''
+
+        workspace = os.path.realpath(self.workspace)
+        path = os.path.realpath(os.path.join(workspace, file_name))
+
+        if not file_name or os.path.dirname(path) != workspace:
+            raise ValueError('Invalid name of output "{}".'.format(identifier))
+
+        with _get_session().get(url, stream=True) as response:
+            response.raise_for_status()
+            fd, temp_path = tempfile.mkstemp(dir=workspace, prefix='.' + file_name)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+
+        return path
+
+    def _process_results(self, *args, **kwargs):
+        os.makedirs(self.workspace, exist_ok=True)
+        results = dict(self.results)
+
+        for identifier, result in results.items():
+            if result.get('reference') and not result.get('path'):
+                try:
+                    result['path'] = self._download(identifier, result)
+                except (requests.RequestException, OSError, ValueError) as e:
+                    log.warning('Unable to download output "%s" of WPS job "%s": %s', identifier, self, e)
+                    self.errors = self.errors + [{'code': 'DownloadFailed', 'locator': identifier, 'text': str(e)}]
+
+        self.results = results
+
+        if self.process_results_function:
+            try:
+                self.results = self.process_results_function(results)
+            except Exception as e:
+                log.exception('Process Results Function Error')
+                self.errors = self.errors + [{'code': 'ProcessResultsFailed', 'locator': None, 'text': str(e)}]
+
+    def process_results(self, *args, **kwargs):
+        """
+        Process the results, with an error status if an output could not be downloaded or processed.
+        """
+        super().process_results(*args, **kwargs)
+
+        if self.errors:
+            self._status = 'ERR'
+            self.save()
+
+    def stop(self):
+        """
+        Stops polling the execution, which version 1.0 of WPS cannot cancel.
+        """
+        self._status = 'ABT'
+        self.next_poll_time = None
+        self.completion_time = timezone.now()
+        self.save()
+
+    def pause(self):
+        """
+        Pausing executions is not supported by version 1.0 of WPS.
+        """
+        raise NotImplementedError()
+
+    def resume(self):
+        """
+        Resuming executions is not supported by version 1.0 of WPS.
+        """
+        raise NotImplementedError()
+
+
+def poll_wps_jobs(batch_size=None):
+    """
+    Poll the status of the WPS jobs due for a poll, processing the results of the executions that have succeeded. The jobs are claimed in a short transaction, by moving their next poll time forward by the WPS_JOB_POLL_LEASE setting (in seconds), and then polled outside of it, so other reconcilers skip them and a job that fails to update is polled again when its lease expires.
+
+    Args:
+        batch_size(int): Maximum number of jobs polled. Defaults to the WPS_JOB_POLL_BATCH_SIZE setting.
+
+    Returns:
+        int: The number of jobs polled.
+    """  # noqa: E501
+    if batch_size is None:
+        batch_size = getattr(settings, 'WPS_JOB_POLL_BATCH_SIZE', DEFAULT_POLL_BATCH_SIZE)
+
+    lease = datetime.timedelta(seconds=getattr(settings, 'WPS_JOB_POLL_LEASE', DEFAULT_POLL_LEASE))
+
+    with transaction.atomic():
+        jobs = list(WpsJob.objects.select_for_update(skip_locked=True).filter(
+            _status__in=['SUB', 'RUN'], next_poll_time__lte=timezone.now(),
+        ).order_by('next_poll_time')[:batch_size])
+
+        WpsJob.objects.filter(pk__in=[job.pk for job in jobs]).update(next_poll_time=timezone.now() + lease)
+
+    for job in jobs:
+        try:
+            job.update_status(poll=True)
+        except Exception:
+            log.exception('Unable to update the status of WPS job "%s"', job)
+
+    return len(jobs)
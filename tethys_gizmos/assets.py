@@ -0,0 +1,282 @@
+"""
+********************************************************************************
+* Name: assets.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+import os
+import re
+import hashlib
+import logging
+import posixpath
+from functools import lru_cache
+from urllib.parse import urljoin, urlparse
+
+import plotly
+import requests
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from plotly.offline.offline import get_plotlyjs
+
+try:
+    from rjsmin import jsmin
+except ImportError:
+    jsmin = None
+
+log = logging.getLogger('tethys.' + __name__)
+
+PLOTLYJS_STATIC_DIR = 'tethys_gizmos/vendor/plotly'
+CDN_STATIC_DIR = 'tethys_gizmos/vendor/cdn'
+BUNDLES_STATIC_DIR = 'tethys_gizmos/bundles'
+EXTERNAL_INDICATOR = '://'
+
+# CDNs serving self-contained files that can be vendored (libraries that load other files relative to their own URL,
+# like Cesium or the ArcGIS API, are always loaded from their CDN)
+VENDORED_CDN_HOSTS = ('cdnjs.cloudflare.com', 'cdn.jsdelivr.net', 'cdn.datatables.net')
+
+CSS_URL_PATTERN = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+CSS_COMMENT_PATTERN = re.compile(r'/\*(?!!).*?\*/', re.DOTALL)
+SOURCE_MAP_PATTERN = re.compile(r'^\s*(//|/\*)# sourceMappingURL=.*$', re.MULTILINE)
+
+
+def _write_static_file(static_path, content, static_dir):
+    """
+    Write content to the given path relative to a static directory, if the file does not exist yet.
+    """
+    file_path = os.path.join(static_dir, *static_path.split('/'))
+
+    if os.path.isfile(file_path):
+        return
+
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+    # Write to a temporary file first so concurrent processes never serve a partially written file
+    tmp_path = '{}.{}.tmp'.format(file_path, os.getpid())
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+@lru_cache(maxsize=None)
+def get_plotlyjs_static_path(static_dir=None):
+    """
+    Get the path of the plotly.js library relative to the static directory, writing it to the static directory the first time it is requested. The file name includes the plotly version and a hash of the library, so it can be cached by browsers indefinitely.
+
+    Args:
+        static_dir(str): The directory plotly.js is written to. Defaults to the STATIC_ROOT setting.
+
+    Returns:
+        str: The static path of plotly.js (e.g.: "tethys_gizmos/vendor/plotly/plotly-4.1.1.0123456789ab.min.js") or None if the file could not be written.
+    """  # noqa: E501
+    static_dir = static_dir or settings.STATIC_ROOT
+
+    if not static_dir:
+        log.warning('The STATIC_ROOT setting is not set. plotly.js will be inlined in each page instead.')
+        return None
+
+    plotlyjs = get_plotlyjs()
+    digest = hashlib.md5(plotlyjs.encode('utf-8')).hexdigest()[:12]
+    static_path = '{}/plotly-{}.{}.min.js'.format(PLOTLYJS_STATIC_DIR, plotly.__version__, digest)
+
+    try:
+        _write_static_file(static_path, plotlyjs, static_dir)
+    except OSError:
+        log.exception('Unable to write plotly.js to the STATIC_ROOT. It will be inlined in each page instead.')
+        return None
+
+    return static_path
+
+
+def get_cdn_static_path(url):
+    """
+    Get the static path of the local copy of a JavaScript or CSS library loaded from a CDN.
+
+    Args:
+        url(str): The URL of the library (e.g.: "https://cdnjs.cloudflare.com/ajax/libs/d3/4.12.2/d3.min.js").
+
+    Returns:
+        str: The static path of the local copy (e.g.: "tethys_gizmos/vendor/cdn/cdnjs.cloudflare.com/ajax/libs/d3/4.12.2/d3.min.js") or None if the library cannot be vendored.
+    """  # noqa: E501
+    parsed_url = urlparse(url)
+
+    if parsed_url.netloc not in VENDORED_CDN_HOSTS or not parsed_url.path.endswith(('.js', '.css')) \
+            or parsed_url.query:
+        return None
+
+    return '{}/{}{}'.format(CDN_STATIC_DIR, parsed_url.netloc, parsed_url.path)
+
+
+def _replace_relative_css_urls(content, replace_url):
+    """
+    Replace the relative URLs of a stylesheet (e.g.: images and fonts) with the result of replace_url(url).
+    """
+    def replace(match):
+        quote, css_url = match.groups()
+        if css_url.startswith(('data:', '#', '/')) or EXTERNAL_INDICATOR in css_url:
+            return match.group(0)
+        return 'url({0}{1}{0})'.format(quote, replace_url(css_url))
+
+    return CSS_URL_PATTERN.sub(replace, content)
+
+
+def vendor_cdn_asset(url, timeout=30, static_dir=None):
+    """
+    Download a JavaScript or CSS library from a CDN to the static directory, so it can be bundled with the other gizmo dependencies. Relative URLs in stylesheets are made absolute, so images and fonts are still loaded from the CDN.
+
+    Args:
+        url(str): The URL of the library.
+        timeout(int): The timeout of the download in seconds.
+        static_dir(str): The directory the library is written to. Defaults to the STATIC_ROOT setting.
+
+    Returns:
+        str: The static path of the local copy or None if the library cannot be vendored.
+    """  # noqa: E501
+    static_dir = static_dir or settings.STATIC_ROOT
+    static_path = get_cdn_static_path(url)
+
+    if static_path is None or not static_dir:
+        return None
+
+    if os.path.isfile(os.path.join(static_dir, *static_path.split('/'))):
+        return static_path
+
+    download_url = 'https:' + url if url.startswith('//') else url
+    response = requests.get(download_url, timeout=timeout)
+    response.raise_for_status()
+    content = response.text
+
+    if static_path.endswith('.css'):
+        content = _replace_relative_css_urls(content, lambda css_url: urljoin(download_url, css_url))
+
+    _write_static_file(static_path, content, static_dir)
+    find_static_file.cache_clear()
+    return static_path
+
+
+@lru_cache(maxsize=None)
+def find_static_file(static_path):
+    """
+    Get the absolute path of a static file using the static files finders or, for the files written by tethys_gizmos (e.g. vendored libraries), in the STATIC_ROOT.
+    """  # noqa: E501
+    file_path = finders.find(static_path)
+
+    if file_path is None and settings.STATIC_ROOT:
+        file_path = os.path.join(settings.STATIC_ROOT, *static_path.split('/'))
+        if not os.path.isfile(file_path):
+            return None
+
+    return file_path
+
+
+def get_local_static_path(dependency):
+    """
+    Get the static path of a gizmo dependency if it can be read from a static directory, using the vendored copy of libraries loaded from a CDN.
+
+    Args:
+        dependency(str): A static path or the URL of a library loaded from a CDN.
+
+    Returns:
+        str: The static path of the dependency or None if it is only available externally.
+    """  # noqa: E501
+    if EXTERNAL_INDICATOR in dependency or dependency.startswith('//'):
+        static_path = get_cdn_static_path(dependency)
+    else:
+        static_path = dependency
+
+    if static_path is None or not find_static_file(static_path):
+        return None
+
+    return static_path
+
+
+def _read_bundle_source(static_path):
+    """
+    Read a file to be bundled, making the relative URLs of stylesheets relative to the static URL.
+    """
+    with open(find_static_file(static_path), encoding='utf-8') as f:
+        content = f.read()
+
+    # Source maps are not bundled
+    content = SOURCE_MAP_PATTERN.sub('', content)
+
+    if static_path.endswith('.css'):
+        static_dir = posixpath.dirname(static_path)
+        content = _replace_relative_css_urls(
+            content, lambda css_url: static(posixpath.normpath(posixpath.join(static_dir, css_url)))
+        )
+        content = CSS_COMMENT_PATTERN.sub('', content)
+        content = '\n'.join(line.strip() for line in content.splitlines() if line.strip())
+
+    elif jsmin is not None and not static_path.endswith('.min.js'):
+        content = jsmin(content)
+
+    return content.strip()
+
+
+@lru_cache(maxsize=None)
+def get_bundle_static_path(static_paths, static_dir=None):
+    """
+    Concatenate and minify JavaScript or CSS files into a bundle. The file name of the bundle includes a hash of its content, so it can be cached by browsers indefinitely.
+
+    Args:
+        static_paths(tuple): The static paths of the files to bundle, in load order. All files must have the same extension.
+        static_dir(str): The directory the bundle is written to. Defaults to the STATIC_ROOT setting.
+
+    Returns:
+        str: The static path of the bundle (e.g.: "tethys_gizmos/bundles/gizmos.0123456789ab.js") or None if the bundle could not be written.
+    """  # noqa: E501
+    static_dir = static_dir or settings.STATIC_ROOT
+    extension = posixpath.splitext(static_paths[0])[1]
+    separator = '\n' if extension == '.css' else '\n;\n'
+
+    try:
+        content = separator.join(_read_bundle_source(static_path) for static_path in static_paths)
+        digest = hashlib.md5(content.encode('utf-8')).hexdigest()[:12]
+        bundle_path = '{}/gizmos.{}{}'.format(BUNDLES_STATIC_DIR, digest, extension)
+        _write_static_file(bundle_path, content, static_dir)
+    except (OSError, TypeError, UnicodeDecodeError):
+        log.exception('Unable to write the gizmo bundle of {}. The files will be loaded separately instead.'.format(
+            ', '.join(static_paths)))
+        return None
+
+    return bundle_path
+
+
+def bundle_dependencies(dependencies, static_dir=None):
+    """
+    Replace consecutive gizmo dependencies that can be read from a static directory with bundles. Dependencies only available externally are kept in place, so the load order is preserved.
+
+    Args:
+        dependencies(list): The static paths and external URLs of the JavaScript or CSS dependencies, in load order.
+        static_dir(str): The directory the bundles are written to. Defaults to the STATIC_ROOT setting.
+
+    Returns:
+        list: The static paths of the bundles and the dependencies that were not bundled.
+    """  # noqa: E501
+    bundled = []
+    group = []
+
+    def add_group():
+        bundle_path = get_bundle_static_path(tuple(group), static_dir) if len(group) > 1 else None
+        bundled.extend([bundle_path] if bundle_path else group)
+        group.clear()
+
+    for dependency in dependencies:
+        static_path = get_local_static_path(dependency)
+
+        if static_path is None:
+            add_group()
+            bundled.append(dependency)
+        else:
+            group.append(static_path)
+
+    add_group()
+    return bundled
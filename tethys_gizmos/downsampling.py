@@ -0,0 +1,247 @@
+"""
+********************************************************************************
+* Name: downsampling.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+import datetime
+import warnings
+
+import numpy as np
+
+__all__ = ['get_series_columns', 'columns_to_points', 'lttb', 'min_max', 'downsample']
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _datetime_to_ms(value):
+    """
+    Convert a datetime to milliseconds since the epoch, treating naive datetimes as UTC.
+    """
+    if value.tzinfo is not None:
+        return value.timestamp() * 1000
+    return (value - EPOCH).total_seconds() * 1000
+
+
+def _column_to_float(column):
+    """
+    Convert a column of series values to a float64 array, converting dates to milliseconds since the epoch and missing values to NaN.
+    """  # noqa: E501
+    column = np.asarray(column)
+
+    if column.dtype.kind == 'M':
+        values = column.astype('datetime64[ms]')
+        result = values.astype(np.int64).astype(np.float64)
+        result[np.isnat(values)] = np.nan
+        return result
+
+    try:
+        return column.astype(np.float64)
+    except (TypeError, ValueError):
+        pass
+
+    # Naive datetimes are converted by numpy without a Python loop
+    first = next((v for v in column if v is not None), None)
+    if isinstance(first, datetime.datetime) and first.tzinfo is None:
+        with warnings.catch_warnings():
+            # Timezone aware datetimes mixed in are handled below
+            warnings.simplefilter('error', DeprecationWarning)
+            try:
+                return _column_to_float(column.astype('datetime64[ms]'))
+            except (TypeError, ValueError, DeprecationWarning):
+                pass
+
+    return np.array([
+        np.nan if v is None else _datetime_to_ms(v) if isinstance(v, datetime.datetime) else v for v in column
+    ], dtype=np.float64)
+
+
+def _is_pandas(data):
+    return type(data).__module__.split('.')[0] == 'pandas'
+
+
+def get_series_columns(data):
+    """
+    Convert the data of a plot series to a list of float64 columns (e.g.: [x, y] or [x, low, high]). Dates are converted to milliseconds since the epoch.
+
+    Args:
+        data(list|numpy.ndarray|pandas.Series|pandas.DataFrame|dict): The points of the series (e.g.: [[x1, y1], [x2, y2]]), the y values of the series, a pandas object with the x values as index or a series dictionary with a "data" item.
+
+    Returns:
+        list: A list of numpy.ndarray objects, one for each column of the series.
+    """  # noqa: E501
+    if isinstance(data, dict):
+        data = data.get('data', [])
+
+    if _is_pandas(data):
+        if hasattr(data, 'columns'):
+            # DataFrame: index is x, each column is another column of the series (e.g.: low and high)
+            return [_column_to_float(data.index.values)] + [_column_to_float(data[c].values) for c in data.columns]
+        return [_column_to_float(data.index.values), _column_to_float(data.values)]
+
+    array = np.asarray(data)
+
+    if array.size == 0:
+        return [np.empty(0), np.empty(0)]
+
+    if array.ndim == 1:
+        # Only y values given
+        return [np.arange(len(array), dtype=np.float64), _column_to_float(array)]
+
+    return [_column_to_float(array[:, i]) for i in range(array.shape[1])]
+
+
+def _column_to_list(column):
+    """
+    Convert a float64 column to a list, with whole numbers (e.g.: dates in milliseconds) as int and missing values as None.
+    """  # noqa: E501
+    missing = np.isnan(column)
+    values = column[~missing]
+
+    if values.size and np.all(values == np.round(values)) and np.all(np.abs(values) < 2 ** 53):
+        column = np.where(missing, 0, column).astype(np.int64)
+
+    if missing.any():
+        column = column.astype(object)
+        column[missing] = None
+
+    return column.tolist()
+
+
+def _columns_to_rows(columns):
+    """
+    Convert the columns of a series to a list of point tuples, which can be serialized to JSON faster than lists.
+    """
+    return list(zip(*[_column_to_list(np.asarray(c, dtype=np.float64)) for c in columns]))
+
+
+def columns_to_points(columns):
+    """
+    Convert the columns of a series to a list of points that can be serialized to JSON, with missing values as None.
+
+    Args:
+        columns(list): The columns of the series (see get_series_columns).
+
+    Returns:
+        list: The points of the series (e.g.: [[x1, y1], [x2, y2]]).
+    """
+    return [list(point) for point in _columns_to_rows(columns)]
+
+
+def lttb(x, y, threshold):
+    """
+    Select the points of a series to keep using the Largest-Triangle-Three-Buckets algorithm, which preserves the visual shape of the series. The x values must be sorted in ascending order.
+
+    Args:
+        x(array-like): The x values of the series.
+        y(array-like): The y values of the series.
+        threshold(int): The number of points to keep.
+
+    Returns:
+        numpy.ndarray: Sorted indices of the points to keep. All indices are returned if the series has no more points than the threshold.
+    """  # noqa: E501
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # The first and last points are always kept, the points in between are split into threshold - 2 buckets
+    every = (n - 2) / (threshold - 2)
+    edges = (np.arange(threshold - 1) * every).astype(np.intp) + 1
+    edges[-1] = n - 1
+
+    indices = np.empty(threshold, dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+
+        # Third point of the triangle is the average of the next bucket
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        # Keep the point of the bucket forming the largest triangle with the previously kept point
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        areas[np.isnan(areas)] = -1
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+
+    return indices
+
+
+def min_max(x, y, threshold):
+    """
+    Select the points of a series to keep by splitting the series into equal buckets and keeping the minimum and maximum of each bucket, which preserves the peaks of the series. The x values must be sorted in ascending order.
+
+    Args:
+        x(array-like): The x values of the series.
+        y(array-like): The y values of the series.
+        threshold(int): The maximum number of points to keep.
+
+    Returns:
+        numpy.ndarray: Sorted indices of the points to keep. All indices are returned if the series has no more points than the threshold.
+    """  # noqa: E501
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+
+    if threshold >= n or threshold < 4:
+        return np.arange(n)
+
+    # The first and last points are always kept, the minimum and maximum of each bucket fill the rest
+    n_buckets = (threshold - 2) // 2
+    size = -(-n // n_buckets)
+
+    buckets = np.full(n_buckets * size, np.nan)
+    buckets[:n] = y
+    buckets = buckets.reshape(n_buckets, size)
+    missing = np.isnan(buckets)
+
+    offsets = np.arange(n_buckets) * size
+    minimums = offsets + np.where(missing, np.inf, buckets).argmin(axis=1)
+    maximums = offsets + np.where(missing, -np.inf, buckets).argmax(axis=1)
+
+    indices = np.unique(np.concatenate(([0, n - 1], minimums, maximums)))
+    return indices[indices < n]
+
+
+DOWNSAMPLING_METHODS = {
+    'lttb': lttb,
+    'min_max': min_max,
+}
+
+
+def downsample(columns, threshold, method='lttb'):
+    """
+    Downsample a series with more points than the threshold. Only series with two columns (x and y) are downsampled. Series with unsorted x values (e.g.: scatter data) are sorted by x before being downsampled.
+
+    Args:
+        columns(list): The columns of the series (see get_series_columns).
+        threshold(int): The maximum number of points of the series.
+        method(str): The downsampling method, either 'lttb' (Largest-Triangle-Three-Buckets, preserves the shape of the series) or 'min_max' (minimum and maximum of each bucket, preserves the peaks of the series). Defaults to 'lttb'.
+
+    Returns:
+        list: The columns of the downsampled series.
+    """  # noqa: E501
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError('Invalid downsampling method "{}". Must be one of: {}.'.format(
+            method, ', '.join(DOWNSAMPLING_METHODS)))
+
+    if not threshold or len(columns) != 2 or len(columns[0]) <= threshold:
+        return columns
+
+    x = columns[0]
+    if np.any(x[1:] < x[:-1]):
+        # The downsampling methods require x values sorted in ascending order
+        order = np.argsort(x, kind='stable')
+        columns = [c[order] for c in columns]
+
+    indices = DOWNSAMPLING_METHODS[method](columns[0], columns[1], threshold)
+    return [c[indices] for c in columns]
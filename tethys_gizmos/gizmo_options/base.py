@@ -9,6 +9,8 @@
 """
 import re
 
+from ..profiling import is_profiling_enabled, profile_construction
+
 
 class TethysGizmoOptions(dict):
     """
@@ -17,6 +19,22 @@ class TethysGizmoOptions(dict):
 
     gizmo_name = "tethys_gizmo_options"
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Measure the construction of the options when gizmos are profiled (see the GIZMO_PROFILING setting)
+        if '__init__' in cls.__dict__ and is_profiling_enabled():
+            cls.__init__ = profile_construction(cls.__init__)
+
+    @classmethod
+    def lazy(cls, *args, **kwargs):
+        """
+        Defer the construction of the options until the gizmo is rendered.
+
+        Returns:
+            LazyGizmoOptions: The lazy options.
+        """
+        return LazyGizmoOptions(lambda: cls(*args, **kwargs), cls)
+
     def __init__(self, attributes={}, classes=''):
         """
         Constructor for Tethys Gizmo Options base.
@@ -101,3 +119,58 @@ class SecondaryGizmoOptions(dict):
 
         # Dictionary magic
         self.__dict__ = self
+
+
+class LazyGizmoOptions:
+    """
+    Gizmo options constructed when the gizmo is first rendered. Gizmos in branches of templates that are not rendered are never constructed, along with any data queried by the factory.
+
+    Args:
+        factory(callable): A function with no arguments that returns the gizmo options.
+        gizmo(type|str): The class of the gizmo options or the name of the gizmo, used to load the dependencies of the gizmo without constructing it.
+
+    Example
+
+    ::
+
+        from tethys_sdk.gizmos import LazyGizmoOptions, TimeSeries
+
+        def streamflow_plot():
+            return TimeSeries(series=[{'name': 'Observed', 'data': get_observed_streamflow()}])
+
+        context = {
+            'streamflow_plot': LazyGizmoOptions(streamflow_plot, TimeSeries),
+            'select_station': SelectInput.lazy(name='station', options=get_stations()),
+        }
+    """  # noqa: E501
+
+    def __init__(self, factory, gizmo):
+        self.factory = factory
+        self.gizmo_name = getattr(gizmo, 'gizmo_name', gizmo)
+        self._options = None
+
+    def resolve(self):
+        """
+        Construct the options on the first call.
+
+        Returns:
+            TethysGizmoOptions: The options.
+        """
+        if self._options is None:
+            self._options = self.factory()
+        return self._options
+
+    @property
+    def is_resolved(self):
+        return self._options is not None
+
+    def __getitem__(self, key):
+        return self.resolve()[key]
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __repr__(self):
+        return '<LazyGizmoOptions: {}{}>'.format(self.gizmo_name, '' if self.is_resolved else ' (not constructed)')
@@ -21,11 +21,12 @@ class DataTableView(TethysGizmoOptions):
     .. note:: The current version of DataTables in Tethys Platform is 1.10.12.
 
     Attributes:
-        rows(tuple or list, required): A list/tuple of lists/tuples representing each row in the table.
+        rows(tuple or list, required): A list/tuple of lists/tuples representing each row in the table. Not required when data_url is given.
         column_names(tuple or list): A tuple or list of strings that represent the table columns names.
         footer(Optional[bool]):If True, it will add the column names to the bottom of the table.
         attributes(Optional[dict]): A dictionary representing additional HTML attributes to add to the primary element (e.g. {"onclick": "run_me();"}).
         classes(Optional[str]): Additional classes to add to the primary HTML element (e.g. "example-class another-class").
+        data_url(Optional[str]): The url of a controller that returns the rows of the table with table_data_response. When given, the rows are not rendered in the page: DataTables requests each page of rows as it is displayed, and the rows are searched, ordered and paged on the server (server-side processing).
         **kwargs(DataTable Options): See https://datatables.net/reference/option.
 
     Regular Controller Example
@@ -53,6 +54,24 @@ class DataTableView(TethysGizmoOptions):
 
         {% gizmo datatable_view %}
 
+    Server-side Processing Controller Example
+
+    ::
+
+        from tethys_sdk.gizmos import DataTableView, table_data_response
+        from .model import Gauge
+
+        @login_required()
+        def home(request):
+            gauges_table = DataTableView(column_names=('Name', 'River', 'Elevation'),
+                                         data_url=reverse('my_first_app:gauges_data'),
+                                         pageLength=25)
+            ...
+
+        @login_required()
+        def gauges_data(request):
+            return table_data_response(request, Gauge.objects.all(), columns=['name', 'river', 'elevation'])
+
     .. note:: You can also add extensions to the data table view as shown in the next example.
               To learn more about DataTable extensions, go to https://datatables.net/extensions/index.
 
@@ -97,14 +116,21 @@ class DataTableView(TethysGizmoOptions):
     #                         'fixedHeader', 'responsive',  'scroller')
     gizmo_name = "datatable_view"
 
-    def __init__(self, rows, column_names, footer=False, attributes={}, classes='', **kwargs):
+    def __init__(self, rows=None, column_names=(), footer=False, attributes={}, classes='', data_url=None, **kwargs):
         """
         Constructor
         """
         # Initialize super class
         super().__init__(attributes=attributes, classes=classes)
 
-        self.rows = rows
+        if data_url:
+            # The ajax option is given as an object, because jQuery only parses objects and arrays from data attributes
+            kwargs.update(serverSide=True, processing=True, ajax={'url': data_url})
+        elif rows is None:
+            raise ValueError('The rows of the DataTableView are required when no data_url is given.')
+
+        self.rows = rows or []
+        self.data_url = data_url
         self.column_names = column_names
         self.footer = footer
         self.datatable_options = {}
@@ -8,6 +8,7 @@
 ********************************************************************************
 """
 from .base import TethysGizmoOptions, SecondaryGizmoOptions
+from ..tile_proxy import TILE_PROXY_SOURCES, get_tile_proxy_url
 from django.conf import settings
 import logging
 log = logging.getLogger('tethys.tethys_gizmos.gizmo_options.map_view')
@@ -525,6 +526,8 @@ class MVLayer(SecondaryGizmoOptions):
         legend_extent (list): A list of four ordinates representing the extent that will be used on "zoom to layer": [minx, miny, maxx, maxy].
         legend_extent_projection (str): The EPSG projection of the extent coordinates. Defaults to "EPSG:4326".
         data (dict): Dictionary representation of layer data
+        cluster (bool|dict): Set to True to cluster the points of the layer. For "GeoJSON" layers, the points are clustered in the browser and a dictionary of options for ol.source.Cluster may be given (e.g.: {'distance': 40}). For "VectorTile" layers, the points are clustered by the VectorTileSource. Clusters are drawn as circles labeled with their number of points. Defaults to False.
+        proxy (bool): Set to True to request the images or tiles of "ImageWMS", "TileWMS" and "TileArcGISRest" layers through the tile proxy of the portal, which caches them on disk (see the TILE_PROXY settings). Defaults to False.
 
     Example
 
@@ -662,6 +665,14 @@ class MVLayer(SecondaryGizmoOptions):
                                   },
                                   legend_title='USA Population')
 
+        # Define GeoServer Tile Layer requested through the tile proxy of the portal, which caches the tiles on disk
+        proxied_layer = MVLayer(source='TileWMS',
+                                options={'url': 'http://192.168.59.103:8181/geoserver/wms',
+                                         'params': {'LAYERS': 'topp:states', 'TILED': True},
+                                         'serverType': 'geoserver'},
+                                legend_title='USA Population',
+                                proxy=True)
+
         # Define KML Layer
         kml_layer = MVLayer(source='KML',
                             options={'url': '/static/tethys_gizmos/data/model.kml'},
@@ -677,12 +688,19 @@ class MVLayer(SecondaryGizmoOptions):
                                 options={'url': 'http://sampleserver1.arcgisonline.com/ArcGIS/rest/services/' + 'Specialty/ESRI_StateCityHighway_USA/MapServer'},
                                 legend_title='ESRI USA Highway',
                                 legend_extent=[-173, 17, -65, 72]),
+
+        # Vector Tile Layer served by a controller with vector_tile_response (see VectorTileSource)
+        vector_tile_layer = MVLayer(source='VectorTile',
+                                    options={'url': '/apps/my-first-app/gauges/{z}/{x}/{y}/'},
+                                    layer_options={'style_map': style_map},
+                                    legend_title='Stream Gauges',
+                                    cluster=True)
     """  # noqa: E501
 
     def __init__(self, source, options, legend_title, layer_options=None, editable=True,
                  legend_classes=None, legend_extent=None,
                  legend_extent_projection='EPSG:4326',
-                 feature_selection=False, geometry_attribute=None, data=None):
+                 feature_selection=False, geometry_attribute=None, data=None, cluster=False, proxy=False):
         """
         Constructor
         """
@@ -699,6 +717,18 @@ class MVLayer(SecondaryGizmoOptions):
         self.feature_selection = feature_selection
         self.geometry_attribute = geometry_attribute
         self.data = data or dict()
+        self.cluster = cluster
+
+        if proxy:
+            if source not in TILE_PROXY_SOURCES:
+                raise ValueError('The tile proxy does not support "{}" layers. Supported sources: {}.'.format(
+                    source, ', '.join(TILE_PROXY_SOURCES)))
+
+            self.options = dict(options)
+            if 'url' in options:
+                self.options['url'] = get_tile_proxy_url(options['url'])
+            if 'urls' in options:
+                self.options['urls'] = [get_tile_proxy_url(url) for url in options['urls']]
 
         if feature_selection and not geometry_attribute:
             log.warning("geometry_attribute not defined -using default value 'the_geom'")
@@ -816,6 +846,7 @@ class MVLegendGeoServerImageClass(MVLegendImageClass):
         layer (str, required): The name of the geoserver layer (e.g. rivers).
         width (int): The legend width (default is 20).
         height (int): The legend height (default is 10).
+        proxy (bool): Set to True to request the legend through the tile proxy of the portal (default is False).
 
     Example
 
@@ -829,7 +860,7 @@ class MVLegendGeoServerImageClass(MVLegendImageClass):
                                                   height=10)
     """  # noqa: E501
 
-    def __init__(self, value, geoserver_url, style, layer, width=20, height=10):
+    def __init__(self, value, geoserver_url, style, layer, width=20, height=10, proxy=False):
         """
         Constructor
         """
@@ -838,5 +869,8 @@ class MVLegendGeoServerImageClass(MVLegendImageClass):
                     "LEGEND_OPTIONS=forceRule:true&" \
                     "LAYER={4}".format(geoserver_url, style, width, height, layer)
 
+        if proxy:
+            image_url = get_tile_proxy_url(image_url)
+
         # Initialize super class
         super().__init__(value, image_url)
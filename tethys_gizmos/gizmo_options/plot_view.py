@@ -1,5 +1,6 @@
 # coding=utf-8
 from .base import TethysGizmoOptions
+from ..downsampling import DOWNSAMPLING_METHODS, columns_to_points, downsample, get_series_columns
 
 __all__ = ['PlotObject', 'LinePlot', 'PolarPlot', 'ScatterPlot',
            'PiePlot', 'BarPlot', 'TimeSeries', 'AreaRange', 'HeatMap']
@@ -7,11 +8,24 @@ __all__ = ['PlotObject', 'LinePlot', 'PolarPlot', 'ScatterPlot',
 
 class PlotViewBase(TethysGizmoOptions):
     """
-    Plot view classes inherit from this class.
-    """
+    Plot view classes inherit from this class. The Line Plot, Scatter Plot, Time Series, Area Range and Heat Map views accept the following options for series with many points.
+
+    Attributes:
+        data_url(str): URL of a controller that returns the data of the series using plot_data_response. The data is
+            loaded after the page instead of being embedded in it. Use for series with many points.
+        data_format(str): Format used to transfer the data from the data_url, either 'json' or 'binary' (typed
+            arrays). Defaults to 'json'.
+        points_per_pixel(float): Number of points per pixel of plot width requested from the data_url. Series with more
+            points are downsampled on the server. All points are requested if not given.
+        downsample_threshold(int): Maximum number of points of each series embedded in the page. Series with more points
+            are downsampled. The data of the series may also be given as numpy arrays or pandas objects.
+        downsample_method(str): Downsampling method, either 'lttb' (preserves the shape of the series) or 'min_max'
+            (preserves the peaks of the series). Defaults to 'lttb'.
+    """  # noqa: E501
     gizmo_name = "plot_view"
 
-    def __init__(self, width='500px', height='500px', engine='d3'):
+    def __init__(self, width='500px', height='500px', engine='d3', data_url=None, data_format='json',
+                 points_per_pixel=None, downsample_threshold=None, downsample_method='lttb'):
         """
         Constructor
         """
@@ -24,9 +38,48 @@ class PlotViewBase(TethysGizmoOptions):
         if engine not in ('d3', 'highcharts'):
             raise ValueError('Parameter "engine" must be either "d3" or "highcharts".')
 
+        if data_format not in ('json', 'binary'):
+            raise ValueError('Parameter "data_format" must be either "json" or "binary".')
+
+        if downsample_method not in DOWNSAMPLING_METHODS:
+            raise ValueError('Parameter "downsample_method" must be one of: {}.'.format(
+                ', '.join(DOWNSAMPLING_METHODS)))
+
         self.engine = engine
+        self.data_url = data_url
+        self.data_format = data_format
+        self.points_per_pixel = points_per_pixel
+        self.downsample_threshold = downsample_threshold
+        self.downsample_method = downsample_method
         self.plot_object = PlotObject()
 
+    def _prepare_series(self, series):
+        """
+        Convert series data given as numpy arrays or pandas objects to lists of points and downsample series with more points than the downsample threshold.
+        """  # noqa: E501
+        prepared_series = []
+
+        for s in series:
+            data = s.get('data') if isinstance(s, dict) else None
+            is_list = isinstance(data, (list, tuple))
+            exceeds_threshold = self.downsample_threshold and data is not None and len(data) > self.downsample_threshold
+
+            if data is None or (is_list and not exceeds_threshold):
+                prepared_series.append(s)
+                continue
+
+            try:
+                columns = get_series_columns(data)
+            except (TypeError, ValueError):
+                # Data that is not numeric or dates (e.g.: categories) is left as is
+                prepared_series.append(s)
+                continue
+
+            columns = downsample(columns, self.downsample_threshold, self.downsample_method)
+            prepared_series.append(dict(s, data=columns_to_points(columns)))
+
+        return prepared_series
+
     @staticmethod
     def get_vendor_js():
         """
@@ -100,6 +153,7 @@ class PlotObject(TethysGizmoOptions):
 class LinePlot(PlotViewBase):
     """
     Used to create line plot visualizations.
+    Series with many points can be loaded or downsampled with the options of PlotViewBase.
 
     Attributes:
         series(list, required): A list of  series dictionaries.
@@ -173,12 +227,16 @@ class LinePlot(PlotViewBase):
     """
 
     def __init__(self, series, height='500px', width='500px', engine='d3', title='', subtitle='', spline=False,
-                 x_axis_title='', x_axis_units='', y_axis_title='', y_axis_units='', **kwargs):
+                 x_axis_title='', x_axis_units='', y_axis_title='', y_axis_units='',
+                 data_url=None, data_format='json', points_per_pixel=None,
+                 downsample_threshold=None, downsample_method='lttb', **kwargs):
         """
         Constructor
         """
         # Initialize super class
-        super().__init__(height=height, width=width, engine=engine)
+        super().__init__(height=height, width=width, engine=engine, data_url=data_url, data_format=data_format,
+                         points_per_pixel=points_per_pixel, downsample_threshold=downsample_threshold,
+                         downsample_method=downsample_method)
 
         chart = kwargs.pop('chart', None)
 
@@ -220,7 +278,8 @@ class LinePlot(PlotViewBase):
         }
 
         # Initialize the plot view object
-        self.plot_object = PlotObject(chart=chart, title=title, subtitle=subtitle, series=series,
+        self.plot_object = PlotObject(chart=chart, title=title, subtitle=subtitle,
+                                      series=self._prepare_series(series),
                                       x_axis=x_axis, y_axis=y_axis, tooltip_format=tooltip_format, **kwargs)
 
 
@@ -322,6 +381,7 @@ class PolarPlot(PlotViewBase):
 class ScatterPlot(PlotViewBase):
     """
     Use to create a  scatter plot visualization.
+    Series with many points can be loaded or downsampled with the options of PlotViewBase.
 
     Attributes:
         series(list, required): A list of  series dictionaries.
@@ -418,12 +478,16 @@ class ScatterPlot(PlotViewBase):
     """
 
     def __init__(self, series=[], height='500px', width='500px', engine='d3', title='', subtitle='',
-                 x_axis_title='', x_axis_units='', y_axis_title='', y_axis_units='', **kwargs):
+                 x_axis_title='', x_axis_units='', y_axis_title='', y_axis_units='',
+                 data_url=None, data_format='json', points_per_pixel=None,
+                 downsample_threshold=None, downsample_method='lttb', **kwargs):
         """
         Constructor
         """
         # Initialize super class
-        super().__init__(height=height, width=width, engine=engine)
+        super().__init__(height=height, width=width, engine=engine, data_url=data_url, data_format=data_format,
+                         points_per_pixel=points_per_pixel, downsample_threshold=downsample_threshold,
+                         downsample_method=downsample_method)
 
         chart = kwargs.pop('chart', None)
 
@@ -455,7 +519,8 @@ class ScatterPlot(PlotViewBase):
         }
 
         # Initialize super class
-        self.plot_object = PlotObject(chart=chart, title=title, subtitle=subtitle, series=series,
+        self.plot_object = PlotObject(chart=chart, title=title, subtitle=subtitle,
+                                      series=self._prepare_series(series),
                                       x_axis=x_axis, y_axis=y_axis, tooltip_format=tooltip_format, **kwargs)
 
 
@@ -684,6 +749,7 @@ class BarPlot(PlotViewBase):
 class TimeSeries(PlotViewBase):
     """
     Use to create a timeseries plot visualization
+    Series with many points can be loaded or downsampled with the options of PlotViewBase.
 
     Attributes:
         series(list, required): A list of  series dictionaries.
@@ -751,12 +817,16 @@ class TimeSeries(PlotViewBase):
     """
 
     def __init__(self, series=[], height='500px', width='500px', engine='d3', title='', subtitle='', y_axis_title='',
-                 y_axis_units='', y_min=0, **kwargs):
+                 y_axis_units='', y_min=0,
+                 data_url=None, data_format='json', points_per_pixel=None,
+                 downsample_threshold=None, downsample_method='lttb', **kwargs):
         """
         Constructor
         """
         # Initialize super class
-        super().__init__(height=height, width=width, engine=engine)
+        super().__init__(height=height, width=width, engine=engine, data_url=data_url, data_format=data_format,
+                         points_per_pixel=points_per_pixel, downsample_threshold=downsample_threshold,
+                         downsample_method=downsample_method)
 
         chart = kwargs.pop('chart', None)
         x_axis = kwargs.pop('x_axis', None)
@@ -786,13 +856,15 @@ class TimeSeries(PlotViewBase):
         }
 
         # Initialize super class
-        self.plot_object = PlotObject(chart=chart, title=title, subtitle=subtitle, series=series,
+        self.plot_object = PlotObject(chart=chart, title=title, subtitle=subtitle,
+                                      series=self._prepare_series(series),
                                       x_axis=x_axis, y_axis=y_axis, tooltip_format=tooltip_format, **kwargs)
 
 
 class AreaRange(PlotViewBase):
     """
     Use to create a area range plot visualization.
+    Series with many points can be loaded or downsampled with the options of PlotViewBase.
 
     Attributes:
         series(list, required): A list of  series dictionaries.
@@ -878,12 +950,16 @@ class AreaRange(PlotViewBase):
     """  # noqa: E501
 
     def __init__(self, series=[], height='500px', width='500px', engine='d3', title='', subtitle='',
-                 y_axis_title='', y_axis_units='', **kwargs):
+                 y_axis_title='', y_axis_units='',
+                 data_url=None, data_format='json', points_per_pixel=None,
+                 downsample_threshold=None, downsample_method='lttb', **kwargs):
         """
         Constructor
         """
         # Initialize super class
-        super().__init__(height=height, width=width, engine=engine)
+        super().__init__(height=height, width=width, engine=engine, data_url=data_url, data_format=data_format,
+                         points_per_pixel=points_per_pixel, downsample_threshold=downsample_threshold,
+                         downsample_method=downsample_method)
 
         chart = kwargs.pop('chart', None)
         x_axis = kwargs.pop('x_axis', None)
@@ -912,13 +988,15 @@ class AreaRange(PlotViewBase):
         }
 
         # Initialize super class
-        self.plot_object = PlotObject(chart=chart, title=title, subtitle=subtitle, series=series,
+        self.plot_object = PlotObject(chart=chart, title=title, subtitle=subtitle,
+                                      series=self._prepare_series(series),
                                       x_axis=x_axis, y_axis=y_axis, tooltip_format=tooltip_format, **kwargs)
 
 
 class HeatMap(PlotViewBase):
     """
     Use to create a  heat map visualization.
+    Series with many points can be loaded or downsampled with the options of PlotViewBase.
 
     Attributes:
         series(list, required): A list of  series dictionaries.
@@ -998,12 +1076,16 @@ class HeatMap(PlotViewBase):
     """  # noqa: E501
 
     def __init__(self, series=[], height='500px', width='500px', engine='d3', title='', subtitle='', x_categories=[],
-                 y_categories=[], tooltip_phrase_one='', tooltip_phrase_two='', **kwargs):
+                 y_categories=[], tooltip_phrase_one='', tooltip_phrase_two='',
+                 data_url=None, data_format='json', points_per_pixel=None,
+                 downsample_threshold=None, downsample_method='lttb', **kwargs):
         """
         Constructor
         """
         # Initialize super class
-        super().__init__(height=height, width=width, engine=engine)
+        super().__init__(height=height, width=width, engine=engine, data_url=data_url, data_format=data_format,
+                         points_per_pixel=points_per_pixel, downsample_threshold=downsample_threshold,
+                         downsample_method=downsample_method)
 
         chart = kwargs.pop('chart', None)
 
@@ -1030,5 +1112,6 @@ class HeatMap(PlotViewBase):
         }
 
         # Initialize super class
-        self.plot_object = PlotObject(chart=chart, title=title, subtitle=subtitle, series=series, x_axis=x_axis,
+        self.plot_object = PlotObject(chart=chart, title=title, subtitle=subtitle,
+                                      series=self._prepare_series(series), x_axis=x_axis,
                                       y_axis=y_axis, tooltip_format=tooltip_format, **kwargs)
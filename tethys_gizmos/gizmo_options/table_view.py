@@ -17,7 +17,7 @@ class TableView(TethysGizmoOptions):
     Table views can be used to display tabular data. The table view gizmo can be configured to have columns that are editable. When used in this capacity, embed the table view in a form with a submit button.
 
     Attributes:
-        rows(tuple or list, required): A list/tuple of lists/tuples representing each row in the table.
+        rows(tuple or list, required): A list/tuple of lists/tuples representing each row in the table. Not required when data_url is given.
         column_names(tuple or list): A tuple or list of strings that represent the table columns names.
         hover(bool): Illuminate rows on hover (does not work on striped tables)
         striped(bool): Stripe rows
@@ -27,6 +27,8 @@ class TableView(TethysGizmoOptions):
         row_ids(list or tuple): A list or tuple of ids for each row in the table. These will be combined with the string in the editable_columns parameter to create unique identifiers for easy input field in the table. If not specified, each row will be assigned an integer value.
         attributes(dict): A dictionary representing additional HTML attributes to add to the primary element (e.g. {"onclick": "run_me();"}).
         classes(str): Additional classes to add to the primary HTML element (e.g. "example-class another-class").
+        data_url(str): The url of a controller that returns the rows of the table with table_data_response. When given, the rows are not rendered in the page: they are requested one page at a time, with buttons to move between pages. Editable columns are not supported with a data_url.
+        page_length(int): The number of rows of each page when data_url is given. Defaults to 10.
 
     Controller Example
 
@@ -54,9 +56,15 @@ class TableView(TethysGizmoOptions):
                                     editable_columns=(False, 'ageInput', 'jobInput'),
                                     row_ids=[21, 25, 31])
 
+        table_view_paged = TableView(column_names=('Name', 'River', 'Elevation'),
+                                     data_url=reverse('my_first_app:gauges_data'),
+                                     page_length=20,
+                                     striped=True)
+
         context = {
                     'table_view': table_view,
                     'table_view_edit': table_view_edit,
+                    'table_view_paged': table_view_paged,
                   }
 
     Template Example
@@ -67,19 +75,26 @@ class TableView(TethysGizmoOptions):
 
         {% gizmo table_view %}
         {% gizmo table_view_edit %}
+        {% gizmo table_view_paged %}
 
     """  # noqa: E501
     gizmo_name = "table_view"
 
-    def __init__(self, rows, column_names='', hover=False, striped=False, bordered=False, condensed=False,
-                 editable_columns='', row_ids='', attributes={}, classes=''):
+    def __init__(self, rows=None, column_names='', hover=False, striped=False, bordered=False, condensed=False,
+                 editable_columns='', row_ids='', attributes={}, classes='', data_url=None, page_length=10):
         """
         Constructor
         """
         # Initialize super class
         super().__init__(attributes=attributes, classes=classes)
 
-        self.rows = rows
+        if data_url and editable_columns:
+            raise ValueError('Editable columns are not supported by TableViews with a data_url.')
+
+        if not data_url and rows is None:
+            raise ValueError('The rows of the TableView are required when no data_url is given.')
+
+        self.rows = rows or []
         self.column_names = column_names
         self.hover = hover
         self.striped = striped
@@ -87,3 +102,13 @@ class TableView(TethysGizmoOptions):
         self.condensed = condensed
         self.editable_columns = editable_columns
         self.row_ids = row_ids
+        self.data_url = data_url
+        self.page_length = page_length
+
+    @staticmethod
+    def get_gizmo_js():
+        """
+        JavaScript specific to gizmo to be placed in the
+        {% block scripts %} block
+        """
+        return ('tethys_gizmos/js/table_view.js',)
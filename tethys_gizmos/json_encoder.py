@@ -0,0 +1,149 @@
+"""
+********************************************************************************
+* Name: json_encoder.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+import json
+import datetime
+from functools import lru_cache
+
+import numpy as np
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+from .downsampling import _column_to_list, _columns_to_rows, _is_pandas, get_series_columns
+
+DEFAULT_GIZMO_JSON_ENCODER = 'tethys_gizmos.json_encoder.GizmoJSONEncoder'
+EPOCH = datetime.datetime(1970, 1, 1)
+MILLISECOND = datetime.timedelta(milliseconds=1)
+
+
+def _array_to_list(array):
+    """
+    Convert a numpy array to a list that can be serialized to JSON, with dates as milliseconds since the epoch and missing values as None.
+    """  # noqa: E501
+    if array.dtype.kind == 'f' and array.ndim == 1:
+        return _column_to_list(array)
+
+    if array.dtype.kind == 'f' and array.ndim == 2:
+        # Points, encoded column by column so whole numbers (e.g.: dates in milliseconds) are encoded as int
+        return _columns_to_rows(array.T)
+
+    if array.dtype.kind == 'M':
+        missing = np.isnat(array)
+        array = array.astype('datetime64[ms]').astype(np.int64)
+    elif array.dtype.kind == 'f':
+        missing = np.isnan(array)
+    else:
+        return array.tolist()
+
+    if missing.any():
+        array = array.astype(object)
+        array[missing] = None
+
+    return array.tolist()
+
+
+def _datetime_points_to_rows(points):
+    """
+    Convert a list of points with naive datetime x values (e.g.: [[datetime, y1], [datetime, y2]]) column by column, with the dates as milliseconds since the epoch. Returns None if the points cannot be converted this way.
+    """  # noqa: E501
+    lengths = set(map(len, points))
+    if len(lengths) != 1:
+        return None
+
+    columns = list(zip(*points))
+
+    try:
+        x = [(value - EPOCH) // MILLISECOND for value in columns[0]]
+    except TypeError:
+        # Missing or timezone aware dates
+        return None
+
+    return list(zip(x, *columns[1:]))
+
+
+def _prepare(obj):
+    """
+    Replace lists of points with datetime x values in obj, so they are encoded without a default() call per datetime.
+    """
+    if isinstance(obj, dict):
+        return {key: _prepare(value) for key, value in obj.items()}
+
+    if isinstance(obj, (list, tuple)) and obj:
+        first = obj[0]
+
+        if not isinstance(first, (dict, list, tuple)):
+            # Lists of values are encoded as they are
+            return obj
+
+        if isinstance(first, (list, tuple)):
+            if first and isinstance(first[0], datetime.datetime):
+                rows = _datetime_points_to_rows(obj)
+                if rows is not None:
+                    return rows
+
+            if not first or not isinstance(first[0], (dict, list, tuple)):
+                # Lists of points are encoded as they are
+                return obj
+
+        return [_prepare(value) for value in obj]
+
+    return obj
+
+
+class GizmoJSONEncoder(DjangoJSONEncoder):
+    """
+    JSON encoder used to render gizmo options. Dates are encoded as milliseconds since the epoch, with naive dates treated as UTC, as expected by the JavaScript plotting libraries. NumPy arrays, NumPy scalars and pandas objects are converted with vectorized operations, with pandas Series and DataFrames encoded as lists of points indexed by x.
+    """  # noqa: E501
+    def encode(self, o):
+        return super().encode(_prepare(o))
+
+    def default(self, obj):
+        if isinstance(obj, datetime.datetime):
+            if obj.tzinfo is not None:
+                obj = obj.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+            return (obj - EPOCH) // MILLISECOND
+
+        if isinstance(obj, np.ndarray):
+            return _array_to_list(obj)
+
+        if isinstance(obj, np.datetime64):
+            return _array_to_list(np.array([obj]))[0]
+
+        if isinstance(obj, np.generic):
+            return obj.item()
+
+        if _is_pandas(obj):
+            if hasattr(obj, 'index') and hasattr(obj, 'values'):
+                # Series and DataFrame
+                return _columns_to_rows(get_series_columns(obj))
+
+            if hasattr(obj, 'values'):
+                # Index
+                return _array_to_list(np.asarray(obj.values))
+
+        return super().default(obj)
+
+
+@lru_cache(maxsize=None)
+def get_gizmo_json_encoder():
+    """
+    Get the JSON encoder class used to render gizmo options, given by the dot-path in the GIZMO_JSON_ENCODER setting.
+
+    Returns:
+        type: A json.JSONEncoder subclass (GizmoJSONEncoder by default).
+    """
+    return import_string(getattr(settings, 'GIZMO_JSON_ENCODER', DEFAULT_GIZMO_JSON_ENCODER))
+
+
+def gizmo_json_dumps(data):
+    """
+    Serialize gizmo options to a JSON string using the configured gizmo JSON encoder.
+    """
+    return json.dumps(data, cls=get_gizmo_json_encoder())
@@ -0,0 +1,91 @@
+"""
+********************************************************************************
+* Name: middleware.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.template.loader import render_to_string
+
+from .profiling import profile_gizmos
+
+log = logging.getLogger('tethys.tethys_gizmos.middleware')
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+
+def _format_ms(seconds):
+    return '-' if seconds is None else '{:.1f}'.format(seconds * 1000)
+
+
+class GizmoProfilingMiddleware:
+    """
+    Measure the construction time, JSON payload size and render time of the gizmos of each request, when the GIZMO_PROFILING setting is True. The measurements are logged, sent in the Server-Timing header and shown in a panel added to HTML pages.
+    """  # noqa: E501
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'GIZMO_PROFILING', False):
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with profile_gizmos() as profile:
+            start = time.perf_counter()
+            response = self.get_response(request)
+
+            # Template responses are rendered after the middleware, unless rendered here
+            if callable(getattr(response, 'render', None)) and not getattr(response, 'is_rendered', True):
+                response.render()
+
+            total_time = time.perf_counter() - start
+
+        if not profile.records:
+            return response
+
+        totals = profile.get_totals()
+        response['Server-Timing'] = 'gizmo-construction;dur={:.1f}, gizmo-render;dur={:.1f}'.format(
+            totals['construction_time'] * 1000, totals['render_time'] * 1000)
+
+        log.debug('%s: %d gizmos constructed in %.1f ms and rendered in %.1f ms, with %d bytes of JSON.',
+                  request.path, len(profile.records), totals['construction_time'] * 1000,
+                  totals['render_time'] * 1000, totals['payload_size'])
+
+        content_type = response.get('Content-Type', '').split(';')[0]
+        if getattr(response, 'streaming', False) or content_type not in HTML_CONTENT_TYPES:
+            return response
+
+        content = response.content.decode(response.charset)
+        index = content.rfind('</body>')
+        if index == -1:
+            return response
+
+        panel = render_to_string('tethys_gizmos/gizmo_profile.html', {
+            'gizmos': [{
+                'name': record.name,
+                'gizmo_class': record.gizmo_class,
+                'rendered': record.rendered,
+                'construction_time': _format_ms(record.construction_time),
+                'render_time': _format_ms(record.render_time),
+                'payload_size': record.payload_size,
+                'html_size': record.html_size,
+            } for record in profile.records],
+            'construction_time': _format_ms(totals['construction_time']),
+            'render_time': _format_ms(totals['render_time']),
+            'payload_size': totals['payload_size'],
+            'html_size': totals['html_size'],
+            'total_time': _format_ms(total_time),
+        })
+        response.content = content[:index] + panel + content[index:]
+
+        if response.has_header('Content-Length'):
+            response['Content-Length'] = len(response.content)
+
+        return response
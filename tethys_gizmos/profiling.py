@@ -0,0 +1,162 @@
+"""
+********************************************************************************
+* Name: profiling.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+import contextvars
+import functools
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+_current_profile = contextvars.ContextVar('tethys_gizmo_profile', default=None)
+
+
+class GizmoRecord:
+    """
+    Measurements of a gizmo: the time to construct its options, the size of the JSON serialized in its template and the time to render it and size of the HTML rendered.
+    """  # noqa: E501
+
+    def __init__(self, gizmo_class, construction_time=None):
+        self.gizmo_class = gizmo_class
+        self.construction_time = construction_time
+        self.name = None
+        self.render_time = None
+        self.payload_size = 0
+        self.html_size = 0
+
+    @property
+    def rendered(self):
+        return self.render_time is not None
+
+
+class GizmoProfile:
+    """
+    Measurements of the gizmos constructed and rendered while handling a request.
+    """
+
+    def __init__(self):
+        # Records of the options constructed, by id of the options
+        self._constructed = {}
+        self._constructing = set()
+        self._rendering = []
+        self.records = []
+
+    @contextmanager
+    def construction(self, options):
+        """
+        Measure the construction of gizmo options. Constructors of parent classes called by the constructor of the options are not measured separately.
+        """  # noqa: E501
+        key = id(options)
+
+        if key in self._constructing:
+            yield
+            return
+
+        self._constructing.add(key)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._constructing.discard(key)
+
+        record = GizmoRecord(type(options).__name__, time.perf_counter() - start)
+        self._constructed[key] = (options, record)
+        self.records.append(record)
+
+    @contextmanager
+    def rendering(self, name, options):
+        """
+        Measure the rendering of a gizmo. The record of the gizmo is yielded, so the size of the HTML rendered can be set.
+        """  # noqa: E501
+        constructed = self._constructed.get(id(options))
+
+        if constructed is not None and constructed[0] is options and not constructed[1].rendered:
+            record = constructed[1]
+        else:
+            record = GizmoRecord(type(options).__name__)
+            self.records.append(record)
+
+        record.name = name
+        self._rendering.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.render_time = time.perf_counter() - start
+            self._rendering.pop()
+
+    def add_payload(self, size):
+        """
+        Add the size of JSON serialized to the gizmo being rendered.
+        """
+        if self._rendering:
+            self._rendering[-1].payload_size += size
+
+    def get_totals(self):
+        """
+        Get the total construction time, render time, JSON size and HTML size of the gizmos.
+        """
+        return {
+            'construction_time': sum(r.construction_time or 0 for r in self.records),
+            'render_time': sum(r.render_time or 0 for r in self.records),
+            'payload_size': sum(r.payload_size for r in self.records),
+            'html_size': sum(r.html_size for r in self.records),
+        }
+
+
+def is_profiling_enabled():
+    """
+    Determine if gizmos are profiled, given by the GIZMO_PROFILING setting.
+    """
+    try:
+        return getattr(settings, 'GIZMO_PROFILING', False)
+    except ImproperlyConfigured:
+        # Settings are not configured (e.g. when building the documentation)
+        return False
+
+
+def get_profile():
+    """
+    Get the gizmo profile of the current request, or None if gizmos are not being profiled.
+    """
+    return _current_profile.get()
+
+
+@contextmanager
+def profile_gizmos():
+    """
+    Profile the gizmos constructed and rendered in the block.
+
+    Yields:
+        GizmoProfile: The profile.
+    """
+    profile = GizmoProfile()
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+def profile_construction(init):
+    """
+    Decorate the constructor of gizmo options to measure it when gizmos are profiled.
+    """
+    @functools.wraps(init)
+    def wrapper(self, *args, **kwargs):
+        profile = _current_profile.get()
+
+        if profile is None:
+            return init(self, *args, **kwargs)
+
+        with profile.construction(self):
+            return init(self, *args, **kwargs)
+
+    return wrapper
@@ -26,7 +26,7 @@ var TETHYS_PLOT_VIEW = (function() {
  	*************************************************************************/
  	// Date picker private methods
  	var functionReviver, initD3Plot, initD3LinePlot, initD3PiePlot, initD3ScatterPlot, initHighChartsPlot,
- 	    initD3BarPlot, initD3TimeSeriesPlot;
+ 	    initD3BarPlot, initD3TimeSeriesPlot, loadPlotData, mergeSeriesData, parseBinarySeries;
 
  	functionReviver = function(k, v) {
  		if (typeof v === 'string' && v.indexOf('function') !== -1) {
@@ -45,6 +45,115 @@ var TETHYS_PLOT_VIEW = (function() {
  		}
  	};
 
+	/*
+	 * Parse series returned by a plot data endpoint in binary format: the number of series (uint32), the number of
+	 * points and columns of each series (uint32 pairs) and padding to 8 bytes, followed by the float64 columns.
+	 */
+	parseBinarySeries = function(buffer) {
+	    var view = new DataView(buffer),
+	        count = view.getUint32(0, true),
+	        offset = 8 + 8 * count,
+	        series = [],
+	        i, k, length, n_columns, columns;
+
+	    for (i = 0; i < count; i++) {
+	        length = view.getUint32(4 + 8 * i, true);
+	        n_columns = view.getUint32(8 + 8 * i, true);
+	        columns = [];
+
+	        for (k = 0; k < n_columns; k++) {
+	            columns.push(new Float64Array(buffer, offset, length));
+	            offset += 8 * length;
+	        }
+	        series.push(columns);
+	    }
+	    return series;
+	};
+
+	/*
+	 * Set the data of the plot series from the columns of each series (e.g.: [x, y]) returned by a plot data endpoint.
+	 */
+	mergeSeriesData = function(json, series_columns) {
+	    var i, j, k, columns, data, point, value;
+
+	    json.series = json.series || [];
+
+	    for (i = 0; i < series_columns.length; i++) {
+	        columns = series_columns[i];
+	        data = new Array(columns[0].length);
+
+	        for (j = 0; j < data.length; j++) {
+	            point = [columns[0][j]];
+	            for (k = 1; k < columns.length; k++) {
+	                value = columns[k][j];
+	                // Missing values are encoded as null or NaN
+	                point.push(value === null || isNaN(value) ? null : value);
+	            }
+	            data[j] = point;
+	        }
+
+	        json.series[i] = json.series[i] || {};
+	        json.series[i].data = data;
+	    }
+	    return json;
+	};
+
+	/*
+	 * Load the series of plots with a data-url attribute before calling the callback with the plot json. The
+	 * series are only requested once per element.
+	 */
+	loadPlotData = function(element, json, callback) {
+	    var data_url = $(element).attr('data-url'),
+	        series_columns = $(element).data('plot-series'),
+	        data_format, points_per_pixel, params, onLoad, onError, xhr;
+
+	    if (!data_url) {
+	        callback(json);
+	        return;
+	    }
+
+	    if (series_columns) {
+	        callback(mergeSeriesData(json, series_columns));
+	        return;
+	    }
+
+	    data_format = $(element).attr('data-format') || 'json';
+	    points_per_pixel = parseFloat($(element).attr('data-points-per-pixel'));
+	    params = {'format': data_format};
+
+	    if (points_per_pixel) {
+	        params.points = Math.max(Math.round($(element).width() * points_per_pixel), 3);
+	    }
+
+	    data_url += (data_url.indexOf('?') === -1 ? '?' : '&') + $.param(params);
+
+	    onLoad = function(series_columns) {
+	        $(element).data('plot-series', series_columns);
+	        callback(mergeSeriesData(json, series_columns));
+	    };
+
+	    onError = function() {
+	        console.error('Unable to load the plot data from "' + data_url + '".');
+	    };
+
+	    if (data_format === 'binary') {
+	        xhr = new XMLHttpRequest();
+	        xhr.open('GET', data_url);
+	        xhr.responseType = 'arraybuffer';
+	        xhr.onload = function() {
+	            if (xhr.status === 200) {
+	                onLoad(parseBinarySeries(xhr.response));
+	            } else {
+	                onError();
+	            }
+	        };
+	        xhr.onerror = onError;
+	        xhr.send();
+	    } else {
+	        $.getJSON(data_url).done(function(data) { onLoad(data.series); }).fail(onError);
+	    }
+	};
+
 	initD3Plot = function(element, json) {
 	    var chart_type;
 
@@ -833,7 +942,9 @@ var TETHYS_PLOT_VIEW = (function() {
 
             // Parse the json_string with special reviver
             json = JSON.parse(json_string, functionReviver);
-            $(element).highcharts(json);
+            loadPlotData(element, json, function(json) {
+                $(element).highcharts(json);
+            });
         }
         else if (plot_type === 'line' || plot_type === 'spline') {
             initLinePlot(element, plot_type);
@@ -865,7 +976,7 @@ var TETHYS_PLOT_VIEW = (function() {
                 // Parse the json_string with special reviver
                 json = JSON.parse(json_string, functionReviver);
 
-		        initD3Plot(this, json);
+		        loadPlotData(this, json, initD3Plot.bind(null, this));
 		    }
 		});
 
@@ -893,7 +1004,7 @@ var TETHYS_PLOT_VIEW = (function() {
                     // Parse the json_string with special reviver
                     json = JSON.parse(json_string, functionReviver);
 
-                    initD3Plot(this, json);
+                    loadPlotData(this, json, initD3Plot.bind(null, this));
 		        }
 		    });
 		    redraw = true;
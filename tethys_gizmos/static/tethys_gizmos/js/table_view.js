@@ -0,0 +1,88 @@
+/*****************************************************************************
+ * FILE:    table_view.js
+ * DATE:    18 October 2026
+ * AUTHOR: Nathan Swain
+ * COPYRIGHT: (c) 2026 Brigham Young University
+ * LICENSE: BSD 2-Clause
+ *****************************************************************************/
+
+/*****************************************************************************
+ *                      LIBRARY WRAPPER
+ *****************************************************************************/
+
+var TETHYS_TABLE_VIEW = (function() {
+	// Wrap the library in a package function
+	"use strict"; // And enable strict mode for this library
+
+	/************************************************************************
+ 	*                      MODULE LEVEL / GLOBAL VARIABLES
+ 	*************************************************************************/
+ 	var public_interface;				// Object returned by the module
+
+     /************************************************************************
+ 	*                    PRIVATE FUNCTION DECLARATIONS
+ 	*************************************************************************/
+ 	// private methods
+ 	var initTableView, loadPage;
+
+ 	// Request a page of rows from the data url of the table, using the DataTables server-side processing protocol
+ 	loadPage = function(container, start) {
+        var table = container.find('table'),
+            page_length = parseInt(table.data('page-length'), 10),
+            draw = (container.data('draw') || 0) + 1;
+
+        container.data('draw', draw);
+
+        $.getJSON(table.data('url'), {draw: draw, start: start, length: page_length}, function(result) {
+            var tbody = table.find('tbody'),
+                end = start + result.data.length;
+
+            // Ignore the responses of pages that are no longer requested
+            if (result.draw !== draw) { return; }
+
+            tbody.empty();
+            $.each(result.data, function(index, row) {
+                var tr = $('<tr>');
+                $.each(row, function(index, value) {
+                    tr.append($('<td style="width:auto;">').text(value === null ? '' : value));
+                });
+                tbody.append(tr);
+            });
+
+            container.find('.table-view-info').text(
+                result.recordsFiltered ? 'Showing ' + (start + 1) + ' to ' + end + ' of ' + result.recordsFiltered : ''
+            );
+            container.find('.table-view-previous').prop('disabled', start === 0).off('click').on('click', function() {
+                loadPage(container, Math.max(start - page_length, 0));
+            });
+            container.find('.table-view-next').prop('disabled', end >= result.recordsFiltered).off('click').on('click', function() {
+                loadPage(container, end);
+            });
+        });
+ 	};
+
+ 	initTableView = function(tag) {
+        $(tag).each(function() {
+            loadPage($(this), 0);
+        });
+ 	};
+
+	/************************************************************************
+ 	*                            TOP LEVEL CODE
+ 	*************************************************************************/
+	/*
+	 * Library object that contains public facing functions of the package.
+	 */
+	public_interface = {
+        initTableView: initTableView,
+     };
+
+	// Initialization: jQuery function that gets called when
+	// the DOM tree finishes loading
+	$(function() {
+        initTableView(".table-view-paged");
+	});
+
+	return public_interface;
+
+}()); // End of package wrapper
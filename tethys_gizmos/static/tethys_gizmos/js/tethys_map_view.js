@@ -125,7 +125,7 @@ var TETHYS_MAP_VIEW = (function() {
   var update_field;
 
   // Utility Methods
-  var is_defined, in_array, string_to_function, build_ol_objects;
+  var is_defined, in_array, string_to_function, build_ol_objects, cluster_style_function, get_wfs_url;
 
   // Class Declarations
   var DrawingControl, DragFeatureInteraction, DeleteFeatureInteraction;
@@ -554,7 +554,7 @@ var TETHYS_MAP_VIEW = (function() {
                 wms_url = source.getUrls()[0];
 
                 // Convert the wfs url to a wms url
-                wfs_url = wms_url.replace('wms', 'wfs');
+                wfs_url = get_wfs_url(wms_url);
 
                 // Define the function used to load the WFS feature data
                 wfs_url_func = function(extent) {
@@ -720,7 +720,8 @@ var TETHYS_MAP_VIEW = (function() {
   {
     // Constants
     var GEOJSON = 'GeoJSON',
-        KML = 'KML';
+        KML = 'KML',
+        VECTOR_TILE = 'VectorTile';
 
     var TILE_SOURCES = ['TileDebug', 'TileUTFGrid', 'UrlTile', 'TileImage', 'VectorTile', 'BingMaps', 'TileArcGISRest',
                         'TileJSON', 'TileWMS', 'WMTS', 'XYZ', 'Zoomify', 'CartoDB', 'OSM', 'Stamen'];
@@ -782,8 +783,20 @@ var TETHYS_MAP_VIEW = (function() {
           current_layer_layer_options = {};
         }
 
+        // Vector tile layer case
+        if (current_layer.source === VECTOR_TILE) {
+          var vector_tile_options = current_layer.options;
+
+          if (!('format' in vector_tile_options)) {
+            vector_tile_options['format'] = new ol.format.MVT();
+          }
+
+          current_layer_layer_options['source'] = new ol.source.VectorTile(vector_tile_options);
+          layer = new ol.layer.VectorTile(current_layer_layer_options);
+        }
+
         // Tile layer case
-        if (in_array(current_layer.source, TILE_SOURCES)) {
+        else if (in_array(current_layer.source, TILE_SOURCES)) {
           var resolutions, source_options, tile_grid;
 
           source_options = current_layer.options;
@@ -862,6 +875,13 @@ var TETHYS_MAP_VIEW = (function() {
               features: features
             });
 
+            // Cluster the points in the browser
+            if (current_layer.cluster) {
+              var cluster_options = (typeof current_layer.cluster === 'object') ? current_layer.cluster : {};
+              cluster_options['source'] = geojson_source;
+              geojson_source = new ol.source.Cluster(cluster_options);
+            }
+
             current_layer_layer_options['source'] = geojson_source;
             layer = new ol.layer.Vector(current_layer_layer_options);
           }
@@ -901,6 +921,10 @@ var TETHYS_MAP_VIEW = (function() {
         }
 
         if (typeof layer !== typeof undefined) {
+          if (current_layer.cluster) {
+            layer.setStyle(cluster_style_function(layer.getStyleFunction()));
+          }
+
           // Set legend properties
           layer.tethys_legend_title = current_layer.legend_title;
           layer.tethys_legend_classes = current_layer.legend_classes;
@@ -937,6 +961,41 @@ var TETHYS_MAP_VIEW = (function() {
     }
   };
 
+  // Style clusters as circles labeled with their number of points and other features with the layer style
+  cluster_style_function = function(feature_style_function)
+  {
+    var cluster_styles = {};
+
+    return function(feature, resolution) {
+      var features, count, radius;
+
+      // Clusters of ol.source.Cluster have the clustered features, clusters of vector tiles have a point count
+      features = feature.get('features');
+      count = is_defined(features) ? features.length : (feature.get('point_count') || 1);
+
+      if (count === 1) {
+        return feature_style_function(is_defined(features) ? features[0] : feature, resolution);
+      }
+
+      if (!(count in cluster_styles)) {
+        radius = 10 + Math.min(Math.round(Math.log(count) * 2), 15);
+        cluster_styles[count] = new ol.style.Style({
+          image: new ol.style.Circle({
+            radius: radius,
+            fill: new ol.style.Fill({color: 'rgba(51, 153, 204, 0.8)'}),
+            stroke: new ol.style.Stroke({color: '#fff', width: 2})
+          }),
+          text: new ol.style.Text({
+            text: count.toString(),
+            fill: new ol.style.Fill({color: '#fff'})
+          })
+        });
+      }
+
+      return cluster_styles[count];
+    };
+  };
+
   // Initialize the legend
   ol_legend_init = function()
   {
@@ -1981,7 +2040,7 @@ var TETHYS_MAP_VIEW = (function() {
         }
       }
 
-      url = wms_url.replace('wms', 'wfs')
+      url = get_wfs_url(wms_url)
           + '?SERVICE=wfs'
           + '&VERSION=2.0.0'
           + '&REQUEST=GetFeature'
@@ -2053,7 +2112,7 @@ var TETHYS_MAP_VIEW = (function() {
         layer_view_params = source_params.VIEWPARAMS ? source_params.VIEWPARAMS : '';
 
         // Create callback url
-        url = wms_url.replace('wms', 'wfs')
+        url = get_wfs_url(wms_url)
               + '?SERVICE=wfs'
               + '&VERSION=2.0.0'
               + '&REQUEST=GetFeature'
@@ -2110,6 +2169,14 @@ var TETHYS_MAP_VIEW = (function() {
     return !!(typeof variable !== typeof undefined && variable !== false && variable !== null);
   };
 
+  // Get the WFS url of a WMS url. Only the last occurrence of "wms" is replaced, which is the last segment of the path
+  // of the urls of the tile proxy.
+  get_wfs_url = function(wms_url)
+  {
+    var index = wms_url.lastIndexOf('wms');
+    return index === -1 ? wms_url : wms_url.slice(0, index) + 'wfs' + wms_url.slice(index + 3);
+  };
+
   // Instantiate a function from a string
   // credits: http://stackoverflow.com/questions/1366127/instantiate-a-javascript-object-using-a-string-to-define-the-class-name
   string_to_function = function(str) {
@@ -0,0 +1,360 @@
+"""
+********************************************************************************
+* Name: table_data.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+import re
+from collections import namedtuple
+from functools import reduce
+
+import numpy as np
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import CharField, F, Q, TextField
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Cast
+from django.db.models.query import QuerySet
+
+from .downsampling import _is_pandas
+
+__all__ = ['TableRequest', 'parse_table_request', 'get_table_data', 'TableData', 'SequenceTableData',
+           'QuerySetTableData', 'SQLAlchemyTableData', 'DataFrameTableData']
+
+TableRequest = namedtuple('TableRequest', ['draw', 'start', 'length', 'search', 'order', 'column_search',
+                                           'not_searchable'])
+
+_ORDER_COLUMN = re.compile(r'^order\[(\d+)\]\[column\]$')
+_COLUMN_SEARCHABLE = re.compile(r'^columns\[(\d+)\]\[searchable\]$')
+_COLUMN_SEARCH = re.compile(r'^columns\[(\d+)\]\[search\]\[value\]$')
+
+
+def _get_int(params, name, default):
+    try:
+        return int(params.get(name, default))
+    except (TypeError, ValueError):
+        raise ValueError('Invalid value for parameter "{}": {}.'.format(name, params.get(name)))
+
+
+def parse_table_request(params):
+    """
+    Parse the parameters of a DataTables server-side processing request (see https://datatables.net/manual/server-side).
+
+    Args:
+        params(QueryDict): The GET or POST parameters of the request.
+
+    Returns:
+        TableRequest: The draw counter, the first row and number of rows of the page (-1 for all rows), the search terms, the ordering as a list of (column index, descending) tuples, the search terms of each column and the indices of the columns that are not searchable.
+
+    Raises:
+        ValueError: if a parameter is invalid.
+    """  # noqa: E501
+    draw = _get_int(params, 'draw', 0)
+    start = max(_get_int(params, 'start', 0), 0)
+    length = _get_int(params, 'length', -1)
+
+    order = []
+    column_search = {}
+    not_searchable = set()
+
+    for name in params:
+        match = _ORDER_COLUMN.match(name)
+        if match:
+            index = int(match.group(1))
+            descending = params.get('order[{}][dir]'.format(index), 'asc') == 'desc'
+            order.append((index, _get_int(params, name, 0), descending))
+            continue
+
+        match = _COLUMN_SEARCH.match(name)
+        if match and params[name]:
+            column_search[int(match.group(1))] = params[name].split()
+            continue
+
+        match = _COLUMN_SEARCHABLE.match(name)
+        if match and params[name] == 'false':
+            not_searchable.add(int(match.group(1)))
+
+    order = [(column, descending) for _, column, descending in sorted(order)]
+    search = params.get('search[value]', '').split()
+
+    return TableRequest(draw, start, length, search, order, column_search, not_searchable)
+
+
+class TableData:
+    """
+    Base class of the providers of the rows of a table, which filter, order and page the rows where they are stored (e.g. in the database).
+
+    Args:
+        data: The rows of the table.
+        columns(list): The columns of the table, in the order of the columns of the table view.
+    """  # noqa: E501
+
+    def __init__(self, data, columns):
+        self.data = data
+        self.columns = list(columns)
+
+    def _copy(self, data):
+        return self.__class__(data, self.columns)
+
+    def count(self):
+        """
+        Count the rows.
+        """
+        raise NotImplementedError
+
+    def search(self, terms, column_indices):
+        """
+        Filter the rows that contain each term in at least one of the given columns, ignoring case.
+        """
+        raise NotImplementedError
+
+    def order(self, order):
+        """
+        Order the rows by the given list of (column index, descending) tuples.
+        """
+        raise NotImplementedError
+
+    def page(self, start, length):
+        """
+        Get the rows of a page as lists of values. A length of -1 returns all the rows from start.
+        """
+        raise NotImplementedError
+
+    def process(self, table_request, max_length=None):
+        """
+        Answer a DataTables server-side processing request.
+
+        Args:
+            table_request(TableRequest): The parsed request.
+            max_length(int): Maximum number of rows returned, regardless of the number of rows requested.
+
+        Returns:
+            dict: The response expected by DataTables.
+        """
+        columns = range(len(self.columns))
+        records_total = self.count()
+        filtered = self
+
+        if table_request.search:
+            searchable = [i for i in columns if i not in table_request.not_searchable]
+            filtered = filtered.search(table_request.search, searchable)
+
+        for index, terms in sorted(table_request.column_search.items()):
+            if index in columns:
+                filtered = filtered.search(terms, [index])
+
+        records_filtered = filtered.count() if filtered is not self else records_total
+
+        order = [(index, descending) for index, descending in table_request.order if index in columns]
+        if order:
+            filtered = filtered.order(order)
+
+        length = table_request.length
+        if max_length is not None and (length < 0 or length > max_length):
+            length = max_length
+
+        return {
+            'draw': table_request.draw,
+            'recordsTotal': records_total,
+            'recordsFiltered': records_filtered,
+            'data': filtered.page(table_request.start, length),
+        }
+
+
+class SequenceTableData(TableData):
+    """
+    Rows given as a list of lists or tuples, filtered and ordered in Python.
+    """
+
+    def __init__(self, data, columns=None):
+        if columns is None:
+            columns = range(len(data[0])) if data else []
+        super().__init__(data, columns)
+
+    def count(self):
+        return len(self.data)
+
+    def search(self, terms, column_indices):
+        columns = [self.columns[i] for i in column_indices]
+        terms = [term.lower() for term in terms]
+        rows = [
+            row for row in self.data
+            if all(any(term in str(row[column]).lower() for column in columns) for term in terms)
+        ]
+        return self._copy(rows)
+
+    def order(self, order):
+        rows = list(self.data)
+        # Sort by the last key first, relying on the stability of sorted, with missing values last
+        for index, descending in reversed(order):
+            column = self.columns[index]
+            present = [row for row in rows if row[column] is not None]
+            missing = [row for row in rows if row[column] is None]
+            rows = sorted(present, key=lambda row: row[column], reverse=descending) + missing
+        return self._copy(rows)
+
+    def page(self, start, length):
+        rows = self.data[start:] if length < 0 else self.data[start:start + length]
+        return [[row[column] for column in self.columns] for row in rows]
+
+
+class QuerySetTableData(TableData):
+    """
+    Rows of a Django QuerySet, filtered, ordered and paged by the database. The columns are field names or lookups (e.g. "owner__username") and default to the concrete fields of the model, with foreign keys given by their id (e.g. "owner_id"). Columns that are not text (e.g. numbers, dates and foreign keys) are searched as text.
+    """  # noqa: E501
+
+    def __init__(self, data, columns=None):
+        if columns is None:
+            columns = [field.attname for field in data.model._meta.concrete_fields]
+        super().__init__(data, columns)
+
+    def count(self):
+        return self.data.count()
+
+    def _is_text(self, column):
+        """
+        Determine if a column is a text field, which can be searched without a cast.
+        """
+        model = self.data.model
+        field = None
+
+        try:
+            for name in column.split(LOOKUP_SEP):
+                field = model._meta.get_field(name)
+                model = field.related_model
+        except (AttributeError, FieldDoesNotExist):
+            # Annotations and lookups that are not fields
+            return False
+
+        return isinstance(field, (CharField, TextField)) and not field.is_relation
+
+    def search(self, terms, column_indices):
+        data = self.data
+        lookups = []
+
+        for i in column_indices:
+            column = self.columns[i]
+            if self._is_text(column):
+                lookups.append(column)
+            else:
+                # Other fields would reject text terms (e.g. "Related Field got invalid lookup")
+                alias = '_search_{}'.format(i)
+                data = data.annotate(**{alias: Cast(column, output_field=TextField())})
+                lookups.append(alias)
+
+        query = Q()
+        for term in terms:
+            query &= reduce(lambda a, b: a | b, (Q(**{lookup + '__icontains': term}) for lookup in lookups), Q())
+        return self._copy(data.filter(query))
+
+    def order(self, order):
+        fields = [F(self.columns[index]).desc(nulls_last=True) if descending else
+                  F(self.columns[index]).asc(nulls_last=True) for index, descending in order]
+        # Order by primary key last, so the pages are stable
+        return self._copy(self.data.order_by(*fields, 'pk'))
+
+    def page(self, start, length):
+        rows = self.data.values_list(*self.columns)
+        rows = rows[start:] if length < 0 else rows[start:start + length]
+        return [list(row) for row in rows]
+
+
+class SQLAlchemyTableData(TableData):
+    """
+    Rows of a SQLAlchemy ORM Query, filtered, ordered and paged by the database. The columns are column objects or the names of the columns selected by the query and default to all the selected columns.
+    """  # noqa: E501
+
+    def __init__(self, data, columns=None):
+        selected = data.statement.selected_columns
+        if columns is None:
+            columns = list(selected)
+        else:
+            columns = [selected[column] if isinstance(column, str) else column for column in columns]
+        super().__init__(data, columns)
+
+    def count(self):
+        return self.data.order_by(None).count()
+
+    def search(self, terms, column_indices):
+        from sqlalchemy import String, and_, cast, func, or_
+
+        columns = [func.lower(cast(self.columns[i], String)) for i in column_indices]
+        condition = and_(*(
+            or_(*(column.contains(term.lower(), autoescape=True) for column in columns)) for term in terms
+        ))
+        return self._copy(self.data.filter(condition))
+
+    def order(self, order):
+        clauses = [(self.columns[index].desc() if descending else self.columns[index].asc()).nullslast()
+                   for index, descending in order]
+        # Replace the ordering of the query, as order_by appends to it
+        return self._copy(self.data.order_by(None).order_by(*clauses))
+
+    def page(self, start, length):
+        query = self.data.with_entities(*self.columns).offset(start)
+        if length >= 0:
+            query = query.limit(length)
+        return [list(row) for row in query]
+
+
+class DataFrameTableData(TableData):
+    """
+    Rows of a pandas DataFrame, filtered and ordered with vectorized operations. The columns are column labels and default to all the columns of the DataFrame.
+    """  # noqa: E501
+
+    def __init__(self, data, columns=None):
+        super().__init__(data, data.columns if columns is None else columns)
+
+    def count(self):
+        return len(self.data)
+
+    def search(self, terms, column_indices):
+        text = [self.data[self.columns[i]].astype(str) for i in column_indices]
+        mask = np.ones(len(self.data), dtype=bool)
+        for term in terms:
+            term_mask = np.zeros(len(self.data), dtype=bool)
+            for column in text:
+                term_mask |= column.str.contains(term, case=False, regex=False).to_numpy(dtype=bool)
+            mask &= term_mask
+        return self._copy(self.data[mask])
+
+    def order(self, order):
+        by = [self.columns[index] for index, _ in order]
+        ascending = [not descending for _, descending in order]
+        return self._copy(self.data.sort_values(by=by, ascending=ascending, kind='mergesort', na_position='last'))
+
+    def page(self, start, length):
+        rows = self.data.iloc[start:] if length < 0 else self.data.iloc[start:start + length]
+        rows = rows[self.columns].astype(object)
+        return rows.where(rows.notna(), None).values.tolist()
+
+
+def get_table_data(data, columns=None):
+    """
+    Get the provider of the rows of a table.
+
+    Args:
+        data(QuerySet|Query|DataFrame|list): A Django QuerySet, a SQLAlchemy ORM Query, a pandas DataFrame or a list of rows.
+        columns(list): The columns of the table, in the order of the columns of the table view: field names for a QuerySet, column objects or names for a Query, column labels for a DataFrame or indices for a list of rows. Defaults to all the columns.
+
+    Returns:
+        TableData: The provider of the rows.
+    """  # noqa: E501
+    if isinstance(data, TableData):
+        return data
+
+    if isinstance(data, QuerySet):
+        return QuerySetTableData(data, columns)
+
+    if _is_pandas(data):
+        return DataFrameTableData(data, columns)
+
+    if type(data).__module__.split('.')[0] == 'sqlalchemy':
+        return SQLAlchemyTableData(data, columns)
+
+    if isinstance(data, (list, tuple)):
+        return SequenceTableData(data, columns)
+
+    raise TypeError('Unsupported table data of type "{}".'.format(type(data).__name__))
@@ -8,13 +8,14 @@
 ********************************************************************************
 """
 import os
-import json
 import time
 import inspect
+import weakref
 from datetime import datetime
 from django.conf import settings
 from django import template
 from django.template.loader import get_template
+from django.template.loader_tags import BLOCK_CONTEXT_KEY, IncludeNode
 from django.template import TemplateSyntaxError
 from django.templatetags.static import static
 from django.core.serializers.json import DjangoJSONEncoder
@@ -23,7 +24,11 @@ import plotly  # noqa: F401
 from plotly.offline.offline import get_plotlyjs
 from tethys_apps.harvester import SingletonHarvester
 
-from ..gizmo_options.base import TethysGizmoOptions
+from ..assets import bundle_dependencies, get_plotlyjs_static_path
+from ..json_encoder import gizmo_json_dumps
+from ..profiling import get_profile
+
+from ..gizmo_options.base import LazyGizmoOptions, TethysGizmoOptions
 import tethys_sdk.gizmos
 
 GIZMO_NAME_PROPERTY = 'gizmo_name'
@@ -66,6 +71,38 @@ JS_OUTPUT_TYPES = (JS_OUTPUT_TYPE, JS_GLOBAL_OUTPUT_TYPE)
 GLOBAL_OUTPUT_TYPES = (CSS_GLOBAL_OUTPUT_TYPE, JS_GLOBAL_OUTPUT_TYPE)
 VALID_OUTPUT_TYPES = CSS_OUTPUT_TYPES + JS_OUTPUT_TYPES
 
+# Compiled templates by template name (see _get_template)
+_templates = {}
+
+# Rendered dependency tags by (gizmo names, output type)
+_dependency_tags = {}
+
+# Gizmo tags of compiled templates by template and the blocks of the templates it extends (see _get_gizmo_nodes)
+_gizmo_nodes = weakref.WeakKeyDictionary()
+
+
+def _get_template(template_name):
+    """
+    Get a compiled template, compiling it only once per process unless DEBUG is enabled.
+    """
+    if settings.DEBUG:
+        return get_template(template_name)
+
+    try:
+        return _templates[template_name]
+    except KeyError:
+        compiled_template = _templates[template_name] = get_template(template_name)
+        return compiled_template
+
+
+def clear_gizmo_caches():
+    """
+    Clear the compiled gizmo templates, the gizmo tags found in templates and the rendered dependency tags.
+    """
+    _templates.clear()
+    _gizmo_nodes.clear()
+    _dependency_tags.clear()
+
 
 class HighchartsDateEncoder(DjangoJSONEncoder):
     """
@@ -140,9 +177,15 @@ def json_date_handler(obj):
 @register.filter
 def jsonify(data):
     """
-    Convert python data structures into a JSON string
+    Convert python data structures into a JSON string using the gizmo JSON encoder (see GIZMO_JSON_ENCODER setting)
     """
-    return json.dumps(data, default=json_date_handler)
+    json_data = gizmo_json_dumps(data)
+
+    profile = get_profile()
+    if profile is not None:
+        profile.add_payload(len(json_data))
+
+    return json_data
 
 
 @register.filter
@@ -211,11 +254,31 @@ class TethysGizmoIncludeNode(TethysGizmoIncludeDependency):
     def __init__(self, options, gizmo_name, *args, **kwargs):
         self.options = options
         super().__init__(gizmo_name, *args, **kwargs)
+        # Name given in the tag, as gizmo_name is reset after each render
+        self.tag_gizmo_name = self.gizmo_name
+
+    def get_gizmo_name(self, context):
+        """
+        Get the name of the gizmo this node renders, so its dependencies can be loaded before it is rendered.
+        """
+        if self.tag_gizmo_name in GIZMO_NAME_MAP:
+            return self.tag_gizmo_name
+
+        try:
+            resolved_options = template.Variable(self.options).resolve(context)
+        except template.VariableDoesNotExist:
+            return None
+
+        return getattr(resolved_options, GIZMO_NAME_PROPERTY, None)
 
     def render(self, context):
         resolved_options = template.Variable(self.options).resolve(context)
+        profile = get_profile()
 
         try:
+            if isinstance(resolved_options, LazyGizmoOptions):
+                resolved_options = resolved_options.resolve()
+
             if self.gizmo_name is None or self.gizmo_name not in GIZMO_NAME_MAP:
                 if hasattr(resolved_options, GIZMO_NAME_PROPERTY):
                     self._load_gizmo_name(resolved_options.gizmo_name)
@@ -239,8 +302,15 @@ class TethysGizmoIncludeNode(TethysGizmoIncludeDependency):
             self._load_gizmo_name(None)
 
             # Retrieve the gizmo template and render
-            t = get_template(template_name)
-            return t.render(resolved_options)
+            t = _get_template(template_name)
+
+            if profile is None:
+                return t.render(resolved_options)
+
+            with profile.rendering(self.options, resolved_options) as record:
+                html = t.render(resolved_options)
+                record.html_size = len(html)
+            return html
 
         except Exception:
             if hasattr(settings, 'TEMPLATES'):
@@ -330,103 +400,211 @@ class TethysGizmoDependenciesNode(template.Node):
         super().__init__(*args, **kwargs)
         self.output_type = output_type
 
-    def _append_dependency(self, dependency, dependency_list):
+    @staticmethod
+    def _append_dependency(dependency, dependency_list):
         """
         Add dependency to list if not already in list
         """
+        if dependency not in dependency_list:
+            dependency_list.append(dependency)
+
+    @staticmethod
+    def _get_dependency_url(dependency):
+        """
+        Get the URL of a dependency given as a static path or an external URL.
+        """
         if EXTERNAL_INDICATOR in dependency:
-            static_url = dependency
-        else:
-            static_url = static(dependency)
+            return dependency
+
+        # Lookup the static url given the path
+        return static(dependency)
 
-        if static_url not in dependency_list:
-            # Lookup the static url given the path
-            dependency_list.append(static_url)
+    @classmethod
+    def get_dependencies(cls, gizmo_names):
+        """
+        Get the JavaScript and CSS dependencies of the given gizmos, as static paths or external URLs in load order.
+
+        Args:
+            gizmo_names(iterable): The names of the gizmos.
+
+        Returns:
+            dict: The lists of dependencies by output type (i.e.: "global_css", "css", "global_js" and "js").
+        """
+        dependencies = {output_type: [] for output_type in VALID_OUTPUT_TYPES}
+
+        for rendered_gizmo in gizmo_names:
+            # Retrieve the "gizmo_dependencies" module and find the appropriate function
+            dependencies_module = GIZMO_NAME_MAP[rendered_gizmo]
+
+            # Only append dependencies if they do not already exist
+            for dependency in dependencies_module.get_gizmo_css():
+                cls._append_dependency(dependency, dependencies[CSS_OUTPUT_TYPE])
+            for dependency in dependencies_module.get_gizmo_js():
+                cls._append_dependency(dependency, dependencies[JS_OUTPUT_TYPE])
+            for dependency in dependencies_module.get_vendor_css():
+                cls._append_dependency(dependency, dependencies[CSS_GLOBAL_OUTPUT_TYPE])
+            for dependency in dependencies_module.get_vendor_js():
+                cls._append_dependency(dependency, dependencies[JS_GLOBAL_OUTPUT_TYPE])
+
+            # Add the main gizmo dependencies last
+            for dependency in TethysGizmoOptions.get_tethys_gizmos_css():
+                cls._append_dependency(dependency, dependencies[CSS_OUTPUT_TYPE])
+            for dependency in TethysGizmoOptions.get_tethys_gizmos_js():
+                cls._append_dependency(dependency, dependencies[JS_OUTPUT_TYPE])
+
+        return dependencies
+
+    @staticmethod
+    def _get_gizmo_nodes(context):
+        """
+        Get the gizmo tags of the template being rendered, including the blocks of the templates it extends and templates included by name. The tags are found only once per compiled template unless DEBUG is enabled.
+        """  # noqa: E501
+        compiled_template = getattr(context, 'template', None)
+        block_context = context.render_context.get(BLOCK_CONTEXT_KEY)
+        blocks = () if block_context is None else \
+            tuple(block for block_list in block_context.blocks.values() for block in block_list)
+
+        if compiled_template is None or settings.DEBUG:
+            return TethysGizmoDependenciesNode._find_gizmo_nodes(compiled_template, blocks)
+
+        # The blocks are part of the key, as the template extended can be chosen at render time
+        template_gizmo_nodes = _gizmo_nodes.setdefault(compiled_template, {})
+
+        try:
+            return template_gizmo_nodes[blocks]
+        except KeyError:
+            gizmo_nodes = template_gizmo_nodes[blocks] = \
+                TethysGizmoDependenciesNode._find_gizmo_nodes(compiled_template, blocks)
+            return gizmo_nodes
+
+    @staticmethod
+    def _find_gizmo_nodes(compiled_template, blocks):
+        """
+        Find the gizmo tags of a template, the given blocks and the templates they include by name.
+        """
+        nodelists = []
+
+        if compiled_template is not None:
+            nodelists.append(compiled_template.nodelist)
+
+        nodelists.extend(block.nodelist for block in blocks)
+
+        gizmo_nodes = []
+        included = set()
+
+        while nodelists:
+            nodelist = nodelists.pop()
+            gizmo_nodes.extend(nodelist.get_nodes_by_type(TethysGizmoIncludeNode))
+
+            for include_node in nodelist.get_nodes_by_type(IncludeNode):
+                template_name = include_node.template.var
+                if isinstance(template_name, str) and not include_node.template.filters \
+                        and template_name not in included:
+                    included.add(template_name)
+                    try:
+                        nodelists.append(_get_template(template_name).template.nodelist)
+                    except template.TemplateDoesNotExist:
+                        pass
+
+        return gizmo_nodes
+
+    def _get_gizmo_names(self, context):
+        """
+        Get the names of the gizmos of the page: gizmos registered by gizmo and import_gizmo_dependency tags that have been rendered and gizmo tags that have not been rendered yet.
+        """  # noqa: E501
+        gizmo_names = []
+
+        for gizmo_name in context.get('gizmos_rendered', []):
+            if gizmo_name in GIZMO_NAME_MAP and gizmo_name not in gizmo_names:
+                gizmo_names.append(gizmo_name)
+
+        # The templates being rendered do not change between the dependency tags of a page
+        if 'gizmo_nodes' not in context.render_context:
+            context.render_context['gizmo_nodes'] = self._get_gizmo_nodes(context)
+
+        for node in context.render_context['gizmo_nodes']:
+            gizmo_name = node.get_gizmo_name(context)
+            if gizmo_name in GIZMO_NAME_MAP and gizmo_name not in gizmo_names:
+                gizmo_names.append(gizmo_name)
+
+        return tuple(gizmo_names)
 
     def render(self, context):
         """
         Load in JS/CSS dependencies to HTML
         """
-        # NOTE: Use render_context as it is recommended to do so here
-        # https://docs.djangoproject.com/en/1.10/howto/custom-template-tags/
-
-        # initialize lists to store global gizmo css/js dependencies
-        if 'global_gizmo_js_list' not in context.render_context:
-            context.render_context['global_gizmo_js_list'] = []
-
-        if 'global_gizmo_css_list' not in context.render_context:
-            context.render_context['global_gizmo_css_list'] = []
-
-        # initialize lists to store gizmo css/js dependencies
-        if 'gizmo_js_list' not in context.render_context:
-            context.render_context['gizmo_js_list'] = []
-
-        if 'gizmo_css_list' not in context.render_context:
-            context.render_context['gizmo_css_list'] = []
-
-        # load list of gizmo css/js dependencies
-        if 'gizmo_dependencies_loaded' not in context.render_context:
-            # add all gizmos in context to be loaded
-            for dict_element in context:
-                for key in dict_element:
-                    resolved_options = template.Variable(key).resolve(context)
-                    if hasattr(resolved_options, GIZMO_NAME_PROPERTY):
-                        if resolved_options.gizmo_name not in context['gizmos_rendered']:
-                            context['gizmos_rendered'].append(resolved_options.gizmo_name)
-
-            for rendered_gizmo in context['gizmos_rendered']:
-                # Retrieve the "gizmo_dependencies" module and find the appropriate function
-                dependencies_module = GIZMO_NAME_MAP[rendered_gizmo]
-
-                # Only append dependencies if they do not already exist
-                for dependency in dependencies_module.get_gizmo_css():
-                    self._append_dependency(dependency, context.render_context['gizmo_css_list'])
-                for dependency in dependencies_module.get_gizmo_js():
-                    self._append_dependency(dependency, context.render_context['gizmo_js_list'])
-                for dependency in dependencies_module.get_vendor_css():
-                    self._append_dependency(dependency, context.render_context['global_gizmo_css_list'])
-                for dependency in dependencies_module.get_vendor_js():
-                    self._append_dependency(dependency, context.render_context['global_gizmo_js_list'])
-
-                # Add the main gizmo dependencies last
-                for dependency in TethysGizmoOptions.get_tethys_gizmos_css():
-                    self._append_dependency(dependency, context.render_context['gizmo_css_list'])
-                for dependency in TethysGizmoOptions.get_tethys_gizmos_js():
-                    self._append_dependency(dependency, context.render_context['gizmo_js_list'])
-
-            context.render_context['gizmo_dependencies_loaded'] = True
+        gizmo_names = self._get_gizmo_names(context)
+        key = (gizmo_names, self.output_type)
+
+        try:
+            return _dependency_tags[key]
+        except KeyError:
+            tags_string = _dependency_tags[key] = self._render_tags(gizmo_names)
+            return tags_string
+
+    def _render_tags(self, gizmo_names):
+        """
+        Render the script and link tags of the dependencies of the given gizmos.
+        """
+        dependencies = self.get_dependencies(gizmo_names)
+        bundle_assets = getattr(settings, 'GIZMO_BUNDLE_ASSETS', False)
+
+        if bundle_assets:
+            dependencies = {output_type: bundle_dependencies(dependency_list)
+                            for output_type, dependency_list in dependencies.items()}
+
+        global_gizmo_css_list = [self._get_dependency_url(d) for d in dependencies[CSS_GLOBAL_OUTPUT_TYPE]]
+        gizmo_css_list = [self._get_dependency_url(d) for d in dependencies[CSS_OUTPUT_TYPE]]
+        global_gizmo_js_list = [self._get_dependency_url(d) for d in dependencies[JS_GLOBAL_OUTPUT_TYPE]]
+        gizmo_js_list = [self._get_dependency_url(d) for d in dependencies[JS_OUTPUT_TYPE]]
 
         # Create markup tags
+        preload_tags = []
         script_tags = []
         style_tags = []
 
+        if bundle_assets and self.output_type == CSS_GLOBAL_OUTPUT_TYPE:
+            # Start downloading the scripts of the page while the stylesheets load
+            for dependency in global_gizmo_js_list + gizmo_js_list:
+                if EXTERNAL_INDICATOR not in dependency:
+                    preload_tags.append('<link href="{0}" rel="preload" as="script" />'.format(dependency))
+
         if self.output_type == CSS_GLOBAL_OUTPUT_TYPE or self.output_type is None:
-            for dependency in context.render_context['global_gizmo_css_list']:
+            for dependency in global_gizmo_css_list:
                 style_tags.append('<link href="{0}" rel="stylesheet" />'.format(dependency))
 
         if self.output_type == CSS_OUTPUT_TYPE or self.output_type is None:
-            for dependency in context.render_context['gizmo_css_list']:
+            for dependency in gizmo_css_list:
                 style_tags.append('<link href="{0}" rel="stylesheet" />'.format(dependency))
 
         if self.output_type == JS_GLOBAL_OUTPUT_TYPE or self.output_type is None:
-            for dependency in context.render_context['global_gizmo_js_list']:
+            for dependency in global_gizmo_js_list:
                 if dependency.endswith('plotly-load_from_python.js'):
-                    script_tags.append(''.join(
-                        [
-                            '<script type="text/javascript">',
-                            get_plotlyjs(),
-                            '</script>',
-                        ])
-                    )
+                    # plotly.js is written to the STATIC_ROOT, which is not served by the development server
+                    plotlyjs_path = None if settings.DEBUG else get_plotlyjs_static_path()
+
+                    if plotlyjs_path:
+                        script_tags.append(
+                            '<script src="{0}" type="text/javascript"></script>'.format(static(plotlyjs_path))
+                        )
+                    else:
+                        # Fall back to inlining plotly.js if it could not be written to the static directory
+                        script_tags.append(''.join(
+                            [
+                                '<script type="text/javascript">',
+                                get_plotlyjs(),
+                                '</script>',
+                            ])
+                        )
                 else:
                     script_tags.append('<script src="{0}" type="text/javascript"></script>'.format(dependency))
 
         if self.output_type == JS_OUTPUT_TYPE or self.output_type is None:
-            for dependency in context.render_context['gizmo_js_list']:
+            for dependency in gizmo_js_list:
                 script_tags.append('<script src="{0}" type="text/javascript"></script>'.format(dependency))
 
         # Combine all tags
-        tags = style_tags + script_tags
+        tags = preload_tags + style_tags + script_tags
         tags_string = '\n'.join(tags)
         return tags_string
 
@@ -0,0 +1,374 @@
+"""
+********************************************************************************
+* Name: tile_proxy.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+
+from tethys_apps.utilities import get_tethys_home_dir
+
+log = logging.getLogger('tethys.tethys_gizmos.tile_proxy')
+
+TILE_PROXY_SALT = 'tethys_gizmos.tile_proxy'
+TILE_PROXY_SOURCES = ('ImageWMS', 'TileWMS', 'TileArcGISRest')
+CACHED_CONTENT_TYPES = ('image/', 'application/vnd.mapbox-vector-tile')
+
+DEFAULT_CACHE_SIZE = 1024  # MB
+DEFAULT_CACHE_TTL = 24 * 60 * 60  # seconds
+DEFAULT_TIMEOUT = 30  # seconds
+
+Tile = namedtuple('Tile', ['status', 'content_type', 'content'])
+
+
+# Paths requested by OpenLayers and the Map View in place of the last segment of a proxied url
+DERIVED_PATHS = {
+    'wms': ('wfs',),
+    'MapServer': ('MapServer/export',),
+    'ImageServer': ('ImageServer/exportImage',),
+}
+
+
+def get_tile_proxy_url(url):
+    """
+    Get the url of the tile proxy for a WMS or ArcGIS REST url.
+
+    The url (without its query) is signed, so only urls created by the server can be proxied. The last segment of its path is kept in the url of the tile proxy, because OpenLayers and the Map View derive the urls of other requests from it (e.g. "MapServer/export" or "wfs"). Only these derived paths are proxied besides the signed url (see DERIVED_PATHS).
+
+    Args:
+        url(str): The WMS or ArcGIS REST url (e.g. http://localhost:8181/geoserver/wms).
+
+    Returns:
+        str: The url of the tile proxy.
+    """  # noqa: E501
+    parts = urlsplit(url)
+    name = parts.path.rpartition('/')[2]
+    token = signing.dumps(urlunsplit((parts.scheme, parts.netloc, parts.path, '', '')), salt=TILE_PROXY_SALT)
+    proxy_url = reverse('gizmos:tile_proxy', kwargs={'token': token, 'path': name})
+    return proxy_url + '?' + parts.query if parts.query else proxy_url
+
+
+def get_upstream_url(token, path, query=''):
+    """
+    Get the url proxied by a url of the tile proxy. The parameters of the query are sorted, so identical tiles requested with parameters in a different order share their cache entry.
+
+    Raises:
+        BadSignature: if the token was not created by get_tile_proxy_url.
+        ValueError: if the path is neither the last segment of the signed url nor a path derived from it.
+    """  # noqa: E501
+    parts = urlsplit(signing.loads(token, salt=TILE_PROXY_SALT))
+    directory, _, name = parts.path.rpartition('/')
+
+    if path != name and path not in DERIVED_PATHS.get(name, ()):
+        raise ValueError('Invalid path "{}".'.format(path))
+
+    query = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc, directory + '/' + path, query, ''))
+
+
+class TileCache:
+    """
+    Cache of tiles on disk, bounded in size, with a time to live. The least recently used tiles are evicted first.
+
+    Each tile is a file named after the hash of its url. The time it was written (mtime) is used to expire it and the time it was last read (atime) to order the tiles found on disk when the cache is loaded. Tiles written by other processes sharing the directory are found on disk when requested, but the size of the cache is tracked per process.
+    """  # noqa: E501
+
+    def __init__(self, directory, max_size, ttl):
+        self.directory = directory
+        self.max_size = max_size
+        self.ttl = ttl
+        self._index = OrderedDict()
+        self._size = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._index)
+
+    @property
+    def size(self):
+        return self._size
+
+    @staticmethod
+    def get_key(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _get_path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def _load(self):
+        """
+        Index the tiles found on disk from the least to the most recently used. Must be called with the lock held.
+        """
+        if self._loaded:
+            return
+
+        entries = []
+
+        for root, _, file_names in os.walk(self.directory):
+            for file_name in file_names:
+                if file_name.endswith('.tmp'):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, file_name))
+                except OSError:
+                    continue
+                entries.append((stat.st_atime, file_name, stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._size += size
+
+        self._loaded = True
+        self._evict()
+
+    def _track(self, key, size):
+        """
+        Record the use of a tile. Must be called with the lock held.
+        """
+        self._size += size - self._index.pop(key, 0)
+        self._index[key] = size
+
+    def _discard(self, key):
+        """
+        Remove a tile from the index. Must be called with the lock held.
+        """
+        self._size -= self._index.pop(key, 0)
+
+    def _remove(self, key):
+        """
+        Remove a tile from the index and from disk. Must be called with the lock held.
+        """
+        self._discard(key)
+        try:
+            os.remove(self._get_path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """
+        Remove the least recently used tiles until the cache fits in its maximum size. Must be called with the lock held.
+        """  # noqa: E501
+        while self._index and self._size > self.max_size:
+            self._remove(next(iter(self._index)))
+
+    def get(self, key):
+        """
+        Get a tile from the cache.
+
+        Returns:
+            Tile: The tile, or None if it is not cached or has expired.
+        """
+        path = self._get_path(key)
+
+        with self._lock:
+            self._load()
+
+        try:
+            stat = os.stat(path)
+            now = time.time()
+
+            if now - stat.st_mtime > self.ttl:
+                with self._lock:
+                    self._remove(key)
+                return None
+
+            with open(path, 'rb') as f:
+                content_type = f.readline().decode('utf-8').strip()
+                content = f.read()
+
+            os.utime(path, (now, stat.st_mtime))
+        except OSError:
+            with self._lock:
+                self._discard(key)
+            return None
+
+        with self._lock:
+            self._track(key, stat.st_size)
+
+        return Tile(200, content_type, content)
+
+    def set(self, key, tile):
+        """
+        Write a tile to the cache, evicting the least recently used tiles if the cache is full.
+        """
+        path = self._get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temporary file first, so partially written tiles are never read
+        header = tile.content_type.encode('utf-8') + b'\n'
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header)
+                f.write(tile.content)
+            os.replace(temp_path, path)
+        except OSError:
+            os.remove(temp_path)
+            raise
+
+        with self._lock:
+            self._load()
+            self._track(key, len(header) + len(tile.content))
+            self._evict()
+
+    def clear(self):
+        """
+        Remove all the tiles from the cache.
+        """
+        with self._lock:
+            self._load()
+            for key in list(self._index):
+                self._remove(key)
+
+
+class _Request:
+    """
+    A request to the upstream server, shared by the identical requests received while it is pending.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.tile = None
+        self.error = None
+
+
+class TileProxy:
+    """
+    Proxy of the tiles of WMS and ArcGIS REST servers, which caches the tiles on disk. Identical tiles requested concurrently are requested from the upstream server only once.
+
+    Args:
+        cache(TileCache): The cache of the tiles.
+        timeout(int): Number of seconds to wait for the upstream server.
+    """  # noqa: E501
+
+    def __init__(self, cache, timeout=DEFAULT_TIMEOUT):
+        self.cache = cache
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._metrics = dict.fromkeys(('requests', 'hits', 'misses', 'coalesced', 'errors'), 0)
+        self._metrics['upstream_seconds'] = 0.0
+
+    def _count(self, metric, value=1):
+        with self._lock:
+            self._metrics[metric] += value
+
+    def get_metrics(self):
+        """
+        Get the metrics of the proxy since it was created.
+
+        Returns:
+            dict: The number of requests, cache hits, cache misses, requests coalesced with a pending identical request and upstream errors, the total time spent waiting for the upstream server and the number and size of the cached tiles.
+        """  # noqa: E501
+        with self._lock:
+            metrics = dict(self._metrics)
+
+        metrics['hit_ratio'] = metrics['hits'] / metrics['requests'] if metrics['requests'] else 0.0
+        metrics['cached_tiles'] = len(self.cache)
+        metrics['cache_size'] = self.cache.size
+        return metrics
+
+    def get_tile(self, url):
+        """
+        Get a tile from the cache or from the upstream server.
+
+        Args:
+            url(str): The upstream url of the tile.
+
+        Returns:
+            tuple(Tile, str): The tile and how it was obtained: "HIT", "MISS" or "COALESCED".
+
+        Raises:
+            RequestException: if the upstream server could not be reached.
+        """
+        self._count('requests')
+        key = self.cache.get_key(url)
+
+        tile = self.cache.get(key)
+        if tile is not None:
+            self._count('hits')
+            return tile, 'HIT'
+
+        with self._lock:
+            pending = self._pending.get(key)
+            is_leader = pending is None
+            if is_leader:
+                pending = self._pending[key] = _Request()
+
+        if not is_leader:
+            self._count('coalesced')
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.tile, 'COALESCED'
+
+        self._count('misses')
+
+        try:
+            pending.tile = self._fetch(url)
+        except requests.RequestException as e:
+            self._count('errors')
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.done.set()
+
+        if pending.tile.status == 200 and pending.tile.content_type.startswith(CACHED_CONTENT_TYPES):
+            try:
+                self.cache.set(key, pending.tile)
+            except OSError as e:
+                log.warning('Unable to cache tile "%s": %s', url, e)
+
+        return pending.tile, 'MISS'
+
+    def _fetch(self, url):
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        finally:
+            self._count('upstream_seconds', time.perf_counter() - start)
+
+        content_type = response.headers.get('Content-Type', 'application/octet-stream')
+        return Tile(response.status_code, content_type, response.content)
+
+
+_tile_proxy = None
+_tile_proxy_lock = threading.Lock()
+
+
+def get_tile_proxy():
+    """
+    Get the tile proxy of the portal, configured with the TILE_PROXY_CACHE_DIR, TILE_PROXY_CACHE_SIZE (in MB), TILE_PROXY_CACHE_TTL (in seconds) and TILE_PROXY_TIMEOUT (in seconds) settings.
+    """  # noqa: E501
+    global _tile_proxy
+
+    with _tile_proxy_lock:
+        if _tile_proxy is None:
+            directory = getattr(settings, 'TILE_PROXY_CACHE_DIR', None)
+            cache = TileCache(
+                directory=directory or os.path.join(get_tethys_home_dir(), 'tile_cache'),
+                max_size=getattr(settings, 'TILE_PROXY_CACHE_SIZE', DEFAULT_CACHE_SIZE) * 1024 * 1024,
+                ttl=getattr(settings, 'TILE_PROXY_CACHE_TTL', DEFAULT_CACHE_TTL),
+            )
+            _tile_proxy = TileProxy(cache, timeout=getattr(settings, 'TILE_PROXY_TIMEOUT', DEFAULT_TIMEOUT))
+
+    return _tile_proxy
@@ -10,6 +10,7 @@
 from django.conf.urls import url, include
 from tethys_gizmos.views import gizmo_showcase as gizmo_showcase_views
 from tethys_gizmos.views.gizmos import jobs_table as jobs_table_views
+from tethys_gizmos.views.gizmos import map_view as map_view_views
 
 ajax_urls = [
     url(r'^get-kml/$', gizmo_showcase_views.get_kml, name='get_kml'),
@@ -34,4 +35,6 @@ urlpatterns = [
     url(r'^(?P<job_id>[\d.@+-]+)/results$', gizmo_showcase_views.jobs_table_results, name='results'),
     url(r'^sample-jobs$', gizmo_showcase_views.create_sample_jobs, name='sample_jobs'),
     url(r'^ajax/', include(ajax_urls)),
+    url(r'^tile-proxy/metrics/$', map_view_views.tile_proxy_metrics, name='tile_proxy_metrics'),
+    url(r'^tile-proxy/(?P<token>[\w.:-]+)/(?P<path>.*)$', map_view_views.tile_proxy, name='tile_proxy'),
 ]
@@ -0,0 +1,760 @@
+"""
+********************************************************************************
+* Name: vector_tiles.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+import json
+import struct
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+__all__ = ['VectorTileSource', 'encode_tile', 'read_wkb']
+
+EXTENT = 4096
+BUFFER = 64
+WEB_MERCATOR_HALF_WORLD = 20037508.342789244
+MAX_LATITUDE = 85.0511287798066
+SUPPORTED_SRIDS = (4326, 3857)
+
+# Geometry types and commands of the Mapbox Vector Tile specification (version 2)
+POINT = 1
+LINESTRING = 2
+POLYGON = 3
+MOVE_TO = 1
+LINE_TO = 2
+CLOSE_PATH = 7
+
+# Protocol buffers wire types
+VARINT = 0
+FIXED64 = 1
+LENGTH_DELIMITED = 2
+
+WKB_GEOMETRY_TYPES = {
+    1: 'Point',
+    2: 'LineString',
+    3: 'Polygon',
+    4: 'MultiPoint',
+    5: 'MultiLineString',
+    6: 'MultiPolygon',
+    7: 'GeometryCollection',
+}
+
+
+def _varint(value):
+    """
+    Encode a non-negative integer as a protocol buffers varint.
+    """
+    encoded = bytearray()
+    while value > 0x7f:
+        encoded.append((value & 0x7f) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _key(field, wire_type):
+    return _varint((field << 3) | wire_type)
+
+
+def _length_delimited(field, data):
+    return _key(field, LENGTH_DELIMITED) + _varint(len(data)) + data
+
+
+def _packed(field, values):
+    return _length_delimited(field, b''.join(_varint(value) for value in values))
+
+
+def _zigzag(values):
+    """
+    Zigzag encode an int64 array, so small negative numbers are encoded as small varints.
+    """
+    return (values << 1) ^ (values >> 63)
+
+
+def _encode_value(value):
+    """
+    Encode a property value as a Value message.
+    """
+    if isinstance(value, bool):
+        return _key(7, VARINT) + _varint(int(value))
+
+    if isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+        if value >= 0:
+            return _key(5, VARINT) + _varint(value)
+        return _key(6, VARINT) + _varint((value << 1) ^ (value >> 63))
+
+    if isinstance(value, float):
+        return _key(3, FIXED64) + struct.pack('<d', value)
+
+    return _length_delimited(1, str(value).encode('utf-8'))
+
+
+def _command(command_id, count):
+    return (command_id & 0x7) | (count << 3)
+
+
+def _encode_geometry(geometry_type, parts):
+    """
+    Encode the parts of a geometry in tile coordinates (int64 arrays) as geometry commands.
+    """
+    commands = []
+    cursor = np.zeros((1, 2), dtype=np.int64)
+
+    def deltas(path):
+        # Coordinates are encoded relative to the previous point
+        nonlocal cursor
+        encoded = _zigzag(np.diff(path, axis=0, prepend=cursor)).tolist()
+        cursor = path[-1:]
+        return encoded
+
+    if geometry_type == POINT:
+        commands.append(_command(MOVE_TO, len(parts)))
+        for delta in deltas(parts):
+            commands.extend(delta)
+        return commands
+
+    if geometry_type == LINESTRING:
+        paths = parts
+    else:
+        # The closing point of rings is implied by the ClosePath command
+        paths = [ring[:-1] for polygon in parts for ring in polygon]
+
+    for path in paths:
+        path_deltas = deltas(path)
+        commands.append(_command(MOVE_TO, 1))
+        commands.extend(path_deltas[0])
+        commands.append(_command(LINE_TO, len(path) - 1))
+        for delta in path_deltas[1:]:
+            commands.extend(delta)
+        if geometry_type == POLYGON:
+            commands.append(_command(CLOSE_PATH, 1))
+
+    return commands
+
+
+def encode_tile(layer_name, features, extent=EXTENT):
+    """
+    Encode features as a Mapbox Vector Tile with one layer.
+
+    Args:
+        layer_name(str): The name of the layer.
+        features(list): A list of (id, properties, geometry type, geometry commands) tuples.
+        extent(int): The extent of the tile coordinates.
+
+    Returns:
+        bytes: The encoded tile (empty if there are no features).
+    """
+    if not features:
+        return b''
+
+    keys = OrderedDict()
+    values = OrderedDict()
+    layer = [_key(15, VARINT) + _varint(2), _length_delimited(1, layer_name.encode('utf-8'))]
+
+    for feature_id, properties, geometry_type, geometry in features:
+        tags = []
+        for key, value in properties.items():
+            if value is None:
+                continue
+            if isinstance(value, np.generic):
+                value = value.item()
+            elif isinstance(value, (dict, list, tuple)):
+                value = json.dumps(value)
+            tags.append(keys.setdefault(key, len(keys)))
+            tags.append(values.setdefault((type(value), value), len(values)))
+
+        feature = b''
+        if isinstance(feature_id, int) and feature_id >= 0:
+            feature += _key(1, VARINT) + _varint(feature_id)
+        if tags:
+            feature += _packed(2, tags)
+        feature += _key(3, VARINT) + _varint(geometry_type) + _packed(4, geometry)
+        layer.append(_length_delimited(2, feature))
+
+    layer.extend(_length_delimited(3, str(key).encode('utf-8')) for key in keys)
+    layer.extend(_length_delimited(4, _encode_value(value)) for _, value in values)
+    layer.append(_key(5, VARINT) + _varint(extent))
+
+    return _length_delimited(3, b''.join(layer))
+
+
+def read_wkb(wkb):
+    """
+    Convert a 2D, 3D or 4D geometry in Well-Known Binary (WKB or PostGIS EWKB) format to a GeoJSON geometry. The Z and M values are discarded.
+
+    Args:
+        wkb(bytes|memoryview|str): The geometry as WKB or as a hexadecimal WKB string.
+
+    Returns:
+        dict: The GeoJSON geometry.
+    """  # noqa: E501
+    data = bytes.fromhex(wkb) if isinstance(wkb, str) else bytes(wkb)
+
+    def read(offset):
+        endian = '<' if data[offset] == 1 else '>'
+        geometry_type, = struct.unpack_from(endian + 'I', data, offset + 1)
+        offset += 5
+
+        # EWKB flags
+        has_z = bool(geometry_type & 0x80000000)
+        has_m = bool(geometry_type & 0x40000000)
+        if geometry_type & 0x20000000:
+            offset += 4
+        geometry_type &= 0x0FFFFFFF
+
+        # ISO WKB dimensions (e.g.: 1001 is a Point Z)
+        dimensions, geometry_type = divmod(geometry_type, 1000)
+        has_z = has_z or dimensions in (1, 3)
+        has_m = has_m or dimensions in (2, 3)
+        point_size = 8 * (2 + has_z + has_m)
+
+        def read_points(offset):
+            count, = struct.unpack_from(endian + 'I', data, offset)
+            offset += 4
+            values = np.frombuffer(data, dtype=endian + 'f8', count=count * point_size // 8, offset=offset)
+            return values.reshape(count, point_size // 8)[:, :2].tolist(), offset + count * point_size
+
+        def read_count(offset):
+            return struct.unpack_from(endian + 'I', data, offset)[0], offset + 4
+
+        name = WKB_GEOMETRY_TYPES.get(geometry_type)
+
+        if name == 'Point':
+            coordinates = list(struct.unpack_from(endian + 'dd', data, offset))
+            return {'type': name, 'coordinates': coordinates}, offset + point_size
+
+        if name == 'LineString':
+            coordinates, offset = read_points(offset)
+            return {'type': name, 'coordinates': coordinates}, offset
+
+        if name == 'Polygon':
+            count, offset = read_count(offset)
+            rings = []
+            for _ in range(count):
+                ring, offset = read_points(offset)
+                rings.append(ring)
+            return {'type': name, 'coordinates': rings}, offset
+
+        if name is not None:
+            count, offset = read_count(offset)
+            geometries = []
+            for _ in range(count):
+                geometry, offset = read(offset)
+                geometries.append(geometry)
+
+            if name == 'GeometryCollection':
+                return {'type': name, 'geometries': geometries}, offset
+            return {'type': name, 'coordinates': [g['coordinates'] for g in geometries]}, offset
+
+        raise ValueError('Unsupported WKB geometry type: {}.'.format(geometry_type))
+
+    return read(0)[0]
+
+
+def _project(coordinates, srid):
+    """
+    Project coordinates to world coordinates: Web Mercator scaled to [0, 1], with y increasing to the south.
+    """
+    try:
+        coordinates = np.array(coordinates, dtype=np.float64)[:, :2]
+    except ValueError:
+        # Coordinates with different dimensions
+        coordinates = np.array([c[:2] for c in coordinates], dtype=np.float64)
+
+    if srid == 3857:
+        x = coordinates[:, 0] / (2 * WEB_MERCATOR_HALF_WORLD) + 0.5
+        y = 0.5 - coordinates[:, 1] / (2 * WEB_MERCATOR_HALF_WORLD)
+    else:
+        x = coordinates[:, 0] / 360 + 0.5
+        sin = np.sin(np.radians(np.clip(coordinates[:, 1], -MAX_LATITUDE, MAX_LATITUDE)))
+        y = 0.5 - 0.25 * np.log((1 + sin) / (1 - sin)) / np.pi
+
+    return np.column_stack((x, y))
+
+
+def _geometry_paths(geometry):
+    """
+    Get the geometry type, the coordinate paths (points, lines or rings) and the number of rings of each polygon of a GeoJSON geometry. Returns None for empty or unsupported geometries.
+    """  # noqa: E501
+    geometry_type = geometry.get('type')
+    coordinates = geometry.get('coordinates')
+
+    if not coordinates:
+        return None
+
+    if geometry_type == 'Point':
+        return POINT, [[coordinates]], None
+
+    if geometry_type == 'MultiPoint':
+        return POINT, [coordinates], None
+
+    if geometry_type == 'LineString':
+        return LINESTRING, [coordinates], None
+
+    if geometry_type == 'MultiLineString':
+        lines = [line for line in coordinates if line]
+        return (LINESTRING, lines, None) if lines else None
+
+    if geometry_type == 'Polygon':
+        polygons = [coordinates]
+    elif geometry_type == 'MultiPolygon':
+        polygons = coordinates
+    else:
+        return None
+
+    polygons = [rings for rings in ([ring for ring in polygon if ring] for polygon in polygons) if rings]
+    if not polygons:
+        return None
+
+    return POLYGON, [ring for polygon in polygons for ring in polygon], [len(polygon) for polygon in polygons]
+
+
+def _intersect(a, b, axis, k):
+    t = (k - a[axis]) / (b[axis] - a[axis])
+    if axis == 0:
+        return k, a[1] + (b[1] - a[1]) * t
+    return a[0] + (b[0] - a[0]) * t, k
+
+
+def _clip(points, axis, k1, k2, is_ring):
+    """
+    Clip a line or closed ring (list of point tuples) to the slab k1 <= coordinate <= k2 along an axis. Lines leaving the slab are split into several lines.
+    """  # noqa: E501
+    parts = []
+    part = []
+
+    for a, b in zip(points, points[1:]):
+        ak, bk = a[axis], b[axis]
+        exited = False
+
+        if ak < k1:
+            if bk > k1:
+                part.append(_intersect(a, b, axis, k1))
+        elif ak > k2:
+            if bk < k2:
+                part.append(_intersect(a, b, axis, k2))
+        else:
+            part.append(a)
+
+        if bk < k1 <= ak:
+            part.append(_intersect(a, b, axis, k1))
+            exited = True
+        if bk > k2 >= ak:
+            part.append(_intersect(a, b, axis, k2))
+            exited = True
+
+        if not is_ring and exited:
+            parts.append(part)
+            part = []
+
+    last = points[-1]
+    if k1 <= last[axis] <= k2:
+        part.append(last)
+
+    if is_ring and part and part[0] != part[-1]:
+        part.append(part[0])
+
+    if part:
+        parts.append(part)
+
+    return parts
+
+
+def _clip_to_tile(path, lo, hi, is_ring):
+    """
+    Clip a path in tile coordinates to the buffered tile. Returns a list of paths.
+    """
+    if path.min() >= lo and path.max() <= hi:
+        return [path]
+
+    points = [tuple(point) for point in path.tolist()]
+    parts = []
+    for part in _clip(points, 0, lo, hi, is_ring):
+        parts.extend(_clip(part, 1, lo, hi, is_ring))
+
+    return [np.array(part) for part in parts if len(part) > 1]
+
+
+def _quantize(path):
+    """
+    Round a path to integer tile coordinates, removing repeated points.
+    """
+    path = np.rint(path).astype(np.int64)
+    keep = np.ones(len(path), dtype=bool)
+    keep[1:] = np.any(path[1:] != path[:-1], axis=1)
+    return path[keep]
+
+
+def _ring_area(ring):
+    return int(np.sum(ring[:-1, 0] * ring[1:, 1] - ring[1:, 0] * ring[:-1, 1]))
+
+
+class _LRUCache:
+    """
+    Thread-safe least recently used cache with a maximum number of items.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._items.move_to_end(key)
+            except KeyError:
+                return None
+            return self._items[key]
+
+    def set(self, key, value):
+        if not self.max_size:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class VectorTileSource:
+    """
+    Features served as Mapbox Vector Tiles, so large layers can be displayed in a Map View without embedding the features in the page. The features are indexed the first time a tile is requested and tiles are cached in memory. Use the vector_tile_response function to serve the tiles from a controller and an MVLayer with the "VectorTile" source to display them.
+
+    Attributes:
+        name(str): The name of the layer of the tiles.
+        features(list|dict|callable): A list of GeoJSON features, a GeoJSON FeatureCollection or a function returning either of them, which is called the first time a tile is requested. Feature geometries may be given as GeoJSON geometries or as WKB.
+        srid(int): The spatial reference of the coordinates of the features, either 4326 (longitude and latitude) or 3857 (Web Mercator). The "crs" member of a FeatureCollection takes precedence. Defaults to 4326.
+        max_cached_tiles(int): The maximum number of tiles cached in memory. Defaults to 1024.
+        cluster_radius(int): Cluster the points of the layer that are closer than this distance in pixels (assuming 256 pixel tiles). Clusters are points with "cluster" and "point_count" properties. Disabled by default.
+        cluster_max_zoom(int): The maximum zoom level at which points are clustered. Defaults to all zoom levels.
+        extent(int): The extent of the tile coordinates. Defaults to 4096.
+        buffer(int): The buffer around the tiles in tile coordinates, so features crossing tiles are drawn without gaps. Defaults to 64.
+
+    **Controller Example**
+
+    ::
+
+        from tethys_sdk.gizmos import VectorTileSource, vector_tile_response
+        from .app import MyFirstApp as app
+
+        def get_parcels():
+            engine = app.get_persistent_store_database('parcels')
+            return VectorTileSource.persistent_store_features(
+                engine, 'SELECT id, owner, ST_AsBinary(geom) AS geometry FROM parcels', id_column='id'
+            )
+
+        parcels_source = VectorTileSource('parcels', get_parcels, cluster_radius=40)
+
+        def parcel_tiles(request, z, x, y):
+            return vector_tile_response(request, parcels_source, z, x, y, max_age=3600)
+    """  # noqa: E501
+
+    def __init__(self, name, features, srid=4326, max_cached_tiles=1024, cluster_radius=None, cluster_max_zoom=None,
+                 extent=EXTENT, buffer=BUFFER):
+        if srid not in SUPPORTED_SRIDS:
+            raise ValueError('Invalid srid "{}". Must be one of: {}.'.format(
+                srid, ', '.join(str(s) for s in SUPPORTED_SRIDS)))
+
+        self.name = name
+        self.features = features
+        self.srid = srid
+        self.cluster_radius = cluster_radius
+        self.cluster_max_zoom = cluster_max_zoom
+        self.extent = extent
+        self.buffer = buffer
+        self._tiles = _LRUCache(max_cached_tiles)
+        self._index = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_geojson(cls, name, path, **kwargs):
+        """
+        Create a source from a GeoJSON file (e.g.: in the workspace of the app), which is read the first time a tile is requested.
+
+        Args:
+            name(str): The name of the layer of the tiles.
+            path(str): The path to the GeoJSON file.
+            **kwargs: Other VectorTileSource arguments.
+
+        Returns:
+            VectorTileSource: The source.
+        """  # noqa: E501
+        def read_features():
+            with open(path) as f:
+                return json.load(f)
+
+        return cls(name, read_features, **kwargs)
+
+    @staticmethod
+    def persistent_store_features(engine, query, geometry_column='geometry', id_column=None):
+        """
+        Query the features of a source from a persistent store database. The other columns of the query are the properties of the features.
+
+        Args:
+            engine(Engine): SQLAlchemy engine of the persistent store database.
+            query(str): The SQL query. The geometry column must contain WKB (e.g.: ST_AsBinary(geom)) or GeoJSON (e.g.: ST_AsGeoJSON(geom)).
+            geometry_column(str): The name of the geometry column. Defaults to "geometry".
+            id_column(str): The name of the column with the integer ids of the features.
+
+        Returns:
+            list: The GeoJSON features.
+        """  # noqa: E501
+        from sqlalchemy import text
+
+        features = []
+        with engine.connect() as connection:
+            for row in connection.execute(text(query)):
+                properties = dict(getattr(row, '_mapping', row))
+                feature = {'type': 'Feature', 'geometry': properties.pop(geometry_column), 'properties': properties}
+                if id_column is not None:
+                    feature['id'] = properties.pop(id_column)
+                features.append(feature)
+
+        return features
+
+    def clear_cache(self, reload_features=False):
+        """
+        Clear the cached tiles, e.g.: after the features have changed.
+
+        Args:
+            reload_features(bool): Also reload and index the features the next time a tile is requested. Defaults to False.
+        """  # noqa: E501
+        with self._lock:
+            if reload_features:
+                self._index = None
+            self._tiles.clear()
+
+    def _get_index(self):
+        """
+        Load the features, projected to world coordinates, and index their bounding boxes.
+        """
+        with self._lock:
+            if self._index is None:
+                self._index = self._build_index()
+            return self._index
+
+    def _build_index(self):
+        features = self.features() if callable(self.features) else self.features
+        srid = self.srid
+
+        if isinstance(features, dict):
+            crs_name = str(features.get('crs', {}).get('properties', {}).get('name', ''))
+            if crs_name.endswith(('3857', '900913')):
+                srid = 3857
+            features = features.get('features', [])
+
+        coordinates = []
+        lengths = []
+        geometries = []
+
+        for feature in features:
+            geometry = feature.get('geometry')
+
+            if isinstance(geometry, str) and geometry.lstrip().startswith('{'):
+                geometry = json.loads(geometry)
+            elif geometry is not None and not isinstance(geometry, dict):
+                geometry = read_wkb(geometry)
+
+            paths = _geometry_paths(geometry) if geometry else None
+            if paths is None:
+                continue
+
+            geometry_type, feature_paths, ring_counts = paths
+            for path in feature_paths:
+                coordinates.extend(path)
+                lengths.append(len(path))
+
+            attributes = (feature.get('id'), feature.get('properties') or {})
+            geometries.append((attributes, geometry_type, len(feature_paths), ring_counts))
+
+        # Project all coordinates at once
+        projected = _project(coordinates, srid) if coordinates else np.empty((0, 2))
+        offsets = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+        paths = np.split(projected, offsets[1:-1]) if lengths else []
+
+        point_indices = []
+        point_features = []
+        bboxes = []
+        other_features = []
+        path_index = 0
+
+        for attributes, geometry_type, count, ring_counts in geometries:
+            start, end = offsets[path_index], offsets[path_index + count]
+            feature_paths = paths[path_index:path_index + count]
+            path_index += count
+
+            if geometry_type == POINT and end - start == 1:
+                point_indices.append(start)
+                point_features.append(attributes)
+                continue
+
+            if geometry_type == POINT:
+                parts = projected[start:end]
+            elif geometry_type == LINESTRING:
+                parts = feature_paths
+            else:
+                ring_offsets = np.cumsum([0] + ring_counts)
+                parts = [feature_paths[i:j] for i, j in zip(ring_offsets[:-1], ring_offsets[1:])]
+
+            feature_coordinates = projected[start:end]
+            bboxes.append(np.concatenate((feature_coordinates.min(axis=0), feature_coordinates.max(axis=0))))
+            other_features.append(attributes + (geometry_type, parts))
+
+        return {
+            'points': projected[np.array(point_indices, dtype=np.int64)],
+            'point_features': point_features,
+            'bboxes': np.array(bboxes).reshape(-1, 4),
+            'multipoints': np.array([f[2] == POINT for f in other_features], dtype=bool),
+            'features': other_features,
+        }
+
+    def get_tile(self, z, x, y):
+        """
+        Get a tile of the source.
+
+        Args:
+            z(int): The zoom level.
+            x(int): The column of the tile.
+            y(int): The row of the tile, from the top.
+
+        Returns:
+            bytes: The Mapbox Vector Tile (empty if there are no features in the tile).
+        """
+        if z < 0 or not 0 <= x < 2 ** z or not 0 <= y < 2 ** z:
+            raise ValueError('Invalid tile {}/{}/{}.'.format(z, x, y))
+
+        tile = self._tiles.get((z, x, y))
+
+        if tile is None:
+            tile = self._render_tile(z, x, y)
+            self._tiles.set((z, x, y), tile)
+
+        return tile
+
+    def _render_tile(self, z, x, y):
+        index = self._get_index()
+        scale = 2 ** z
+        origin = np.array((x, y), dtype=np.float64)
+        lo, hi = -self.buffer, self.extent + self.buffer
+        features = self._render_points(index, z, scale, origin, lo, hi)
+
+        # Features intersecting the tile, ignoring lines and polygons smaller than a tile unit
+        bboxes = index['bboxes']
+        margin = self.buffer / self.extent
+        unit = 1 / (scale * self.extent)
+        in_tile = (
+            (bboxes[:, 2] * scale >= x - margin) & (bboxes[:, 0] * scale <= x + 1 + margin)
+            & (bboxes[:, 3] * scale >= y - margin) & (bboxes[:, 1] * scale <= y + 1 + margin)
+            & ((bboxes[:, 2] - bboxes[:, 0] >= unit) | (bboxes[:, 3] - bboxes[:, 1] >= unit) | index['multipoints'])
+        )
+
+        for i in np.flatnonzero(in_tile):
+            feature_id, properties, geometry_type, parts = index['features'][i]
+            tile_parts = self._tile_geometry(geometry_type, parts, scale, origin, lo, hi)
+            if len(tile_parts):
+                features.append(
+                    (feature_id, properties, geometry_type, _encode_geometry(geometry_type, tile_parts))
+                )
+
+        return encode_tile(self.name, features, self.extent)
+
+    def _render_points(self, index, z, scale, origin, lo, hi):
+        """
+        Encode the single point features of a tile, clustering them if enabled.
+        """
+        tile_points = (index['points'] * scale - origin) * self.extent
+        in_tile = np.all((tile_points >= lo) & (tile_points <= hi), axis=1)
+        indices = np.flatnonzero(in_tile)
+        tile_points = np.rint(tile_points[indices]).astype(np.int64)
+
+        if self.cluster_radius and (self.cluster_max_zoom is None or z <= self.cluster_max_zoom) and len(indices):
+            cell_size = self.cluster_radius * self.extent / 256
+            cells = np.floor((tile_points - lo) / cell_size).astype(np.int64)
+            _, cluster_ids, counts = np.unique(cells[:, 0] * (2 ** 32) + cells[:, 1], return_inverse=True,
+                                               return_counts=True)
+            cluster_ids = cluster_ids.reshape(-1)
+        else:
+            cluster_ids = counts = None
+
+        features = []
+
+        if counts is not None:
+            # Clusters are placed at the center of their points
+            centers = np.rint(np.column_stack((
+                np.bincount(cluster_ids, weights=tile_points[:, 0]) / counts,
+                np.bincount(cluster_ids, weights=tile_points[:, 1]) / counts,
+            ))).astype(np.int64)
+
+            for cluster_id in np.flatnonzero(counts > 1):
+                properties = {'cluster': True, 'point_count': int(counts[cluster_id])}
+                features.append((None, properties, POINT, _encode_geometry(POINT, centers[cluster_id:cluster_id + 1])))
+
+            single = counts[cluster_ids] == 1
+            indices, tile_points = indices[single], tile_points[single]
+
+        # The geometry of a single point is a MoveTo command with its zigzag encoded coordinates
+        move_to = _command(MOVE_TO, 1)
+        point_features = index['point_features']
+        for i, (x, y) in zip(indices.tolist(), _zigzag(tile_points).tolist()):
+            feature_id, properties = point_features[i]
+            features.append((feature_id, properties, POINT, [move_to, x, y]))
+
+        return features
+
+    def _tile_geometry(self, geometry_type, parts, scale, origin, lo, hi):
+        """
+        Transform, clip and quantize the parts of a geometry to tile coordinates.
+        """
+        extent = self.extent
+
+        if geometry_type == POINT:
+            tile_points = (parts * scale - origin) * extent
+            tile_points = tile_points[np.all((tile_points >= lo) & (tile_points <= hi), axis=1)]
+            return np.rint(tile_points).astype(np.int64)
+
+        if geometry_type == LINESTRING:
+            lines = []
+            for line in parts:
+                for clipped in _clip_to_tile((line * scale - origin) * extent, lo, hi, is_ring=False):
+                    clipped = _quantize(clipped)
+                    if len(clipped) > 1:
+                        lines.append(clipped)
+            return lines
+
+        polygons = []
+        for polygon in parts:
+            rings = []
+            for i, ring in enumerate(polygon):
+                clipped = _clip_to_tile((ring * scale - origin) * extent, lo, hi, is_ring=True)
+                clipped = _quantize(clipped[0]) if clipped else None
+                area = _ring_area(clipped) if clipped is not None and len(clipped) > 3 else 0
+
+                if not area:
+                    if i == 0:
+                        # Polygons with an empty exterior ring are dropped
+                        break
+                    continue
+
+                # Exterior rings have a positive area and interior rings a negative area (y increasing downwards)
+                if (area < 0) == (i == 0):
+                    clipped = clipped[::-1]
+                rings.append(clipped)
+
+            if rings:
+                polygons.append(rings)
+
+        return polygons
@@ -0,0 +1,61 @@
+"""
+********************************************************************************
+* Name: datatable_view.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+import numpy as np
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponseBadRequest, JsonResponse
+
+from tethys_gizmos.table_data import get_table_data, parse_table_request
+
+
+class TableDataJSONEncoder(DjangoJSONEncoder):
+    """
+    JSON encoder of the rows of tables, which encodes dates as ISO 8601 strings and NumPy scalars as Python values.
+    """
+    def default(self, obj):
+        if isinstance(obj, np.generic):
+            return obj.item()
+
+        return super().default(obj)
+
+
+def table_data_response(request, data, columns=None, max_length=None):
+    """
+    Create the response for the data endpoint of a DataTableView or TableView (see their data_url option). The requested page of rows is filtered, ordered and paged where the rows are stored: in the database for a Django QuerySet or SQLAlchemy Query and with vectorized operations for a pandas DataFrame.
+
+    Args:
+        request(HttpRequest): The request from the table view, following the DataTables server-side processing protocol.
+        data(QuerySet|Query|DataFrame|list): The rows of the table, as a Django QuerySet, a SQLAlchemy ORM Query, a pandas DataFrame or a list of rows.
+        columns(list): The columns of the table, in the order of the column_names of the table view: field names (e.g. "owner__username") for a QuerySet, column objects or names for a Query, column labels for a DataFrame or indices for a list of rows. Defaults to all the columns.
+        max_length(int): Maximum number of rows returned, regardless of the number of rows requested.
+
+    Returns:
+        JsonResponse: The rows of the requested page and the number of rows before and after filtering.
+
+    **Controller Example**
+
+    ::
+
+        from tethys_sdk.gizmos import table_data_response
+        from .model import Gauge
+
+        @login_required()
+        def gauges_data(request):
+            return table_data_response(request, Gauge.objects.all(), columns=['name', 'river', 'elevation'],
+                                       max_length=1000)
+    """  # noqa: E501
+    params = request.POST if request.method == 'POST' else request.GET
+
+    try:
+        table_request = parse_table_request(params)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+    result = get_table_data(data, columns).process(table_request, max_length=max_length)
+    return JsonResponse(result, encoder=TableDataJSONEncoder)
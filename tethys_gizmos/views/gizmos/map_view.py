@@ -0,0 +1,96 @@
+"""
+********************************************************************************
+* Name: map_view.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+import logging
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.signing import BadSignature
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.utils.cache import patch_cache_control
+from requests import RequestException
+
+from tethys_gizmos.tile_proxy import get_tile_proxy, get_upstream_url
+
+log = logging.getLogger('tethys.tethys_gizmos.views.gizmos.map_view')
+
+VECTOR_TILE_CONTENT_TYPE = 'application/vnd.mapbox-vector-tile'
+
+
+def vector_tile_response(request, source, z, x, y, max_age=None):
+    """
+    Create the response for a tile of a vector tile layer of a Map View (see the "VectorTile" source of MVLayer).
+
+    Args:
+        request(HttpRequest): The request from the Map View.
+        source(VectorTileSource): The source of the tiles.
+        z(int|str): The zoom level of the tile.
+        x(int|str): The column of the tile.
+        y(int|str): The row of the tile, from the top.
+        max_age(int): Number of seconds browsers may cache the tile.
+
+    Returns:
+        HttpResponse: The Mapbox Vector Tile.
+
+    **Controller Example**
+
+    ::
+
+        from tethys_sdk.gizmos import VectorTileSource, vector_tile_response
+
+        gauges_source = VectorTileSource.from_geojson('gauges', '/path/to/workspace/gauges.geojson', cluster_radius=40)
+
+        @login_required()
+        def gauge_tiles(request, z, x, y):
+            return vector_tile_response(request, gauges_source, z, x, y)
+    """  # noqa: E501
+    try:
+        tile = source.get_tile(int(z), int(x), int(y))
+    except ValueError:
+        return HttpResponseBadRequest('Invalid tile "{}/{}/{}".'.format(z, x, y))
+
+    response = HttpResponse(tile, content_type=VECTOR_TILE_CONTENT_TYPE)
+
+    if max_age is not None:
+        patch_cache_control(response, max_age=max_age)
+
+    return response
+
+
+def tile_proxy(request, token, path):
+    """
+    Proxy a request of a layer or legend of a Map View to its WMS or ArcGIS REST server, using the tile cache of the portal (see the proxy option of MVLayer).
+    """  # noqa: E501
+    try:
+        upstream_url = get_upstream_url(token, path, request.META.get('QUERY_STRING', ''))
+    except (BadSignature, ValueError):
+        return HttpResponseBadRequest('Invalid tile proxy url.')
+
+    proxy = get_tile_proxy()
+
+    try:
+        tile, cache_status = proxy.get_tile(upstream_url)
+    except RequestException as e:
+        log.warning('Unable to proxy tile "%s": %s', upstream_url, e)
+        return HttpResponse('Unable to reach the tile server.', status=502)
+
+    response = HttpResponse(tile.content, content_type=tile.content_type, status=tile.status)
+    response['X-Tile-Cache'] = cache_status
+
+    if tile.status == 200:
+        patch_cache_control(response, max_age=proxy.cache.ttl)
+
+    return response
+
+
+@staff_member_required
+def tile_proxy_metrics(request):
+    """
+    Return the metrics of the tile proxy of this process.
+    """
+    return JsonResponse(get_tile_proxy().get_metrics())
@@ -0,0 +1,98 @@
+"""
+********************************************************************************
+* Name: plot_view.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+import json
+import struct
+
+import numpy as np
+from django.http import HttpResponse, HttpResponseBadRequest
+
+from tethys_gizmos.downsampling import DOWNSAMPLING_METHODS, downsample, get_series_columns
+
+PLOT_DATA_FORMATS = ('json', 'binary')
+
+
+def encode_plot_data(series, data_format='json'):
+    """
+    Encode the columns of plot series for transfer to the plot view JavaScript library.
+
+    The "json" format is an object with a "series" item containing a list of columns for each series. The "binary" format is a little-endian buffer with the number of series (uint32), followed by the number of points and columns of each series (uint32 pairs), padded to a multiple of 8 bytes, followed by the columns of each series as float64 values.
+
+    Args:
+        series(list): A list of series, each given as a list of columns.
+        data_format(str): Either "json" or "binary".
+
+    Returns:
+        str|bytes: The encoded series.
+    """  # noqa: E501
+    if data_format == 'binary':
+        header = [len(series)]
+        for columns in series:
+            header.extend((len(columns[0]), len(columns)))
+
+        if len(header) % 2:
+            header.append(0)
+
+        chunks = [struct.pack('<{}I'.format(len(header)), *header)]
+        for columns in series:
+            chunks.extend(np.asarray(c, dtype='<f8').tobytes() for c in columns)
+        return b''.join(chunks)
+
+    series_json = [[np.where(np.isnan(c), None, c).tolist() for c in columns] for columns in series]
+    return json.dumps({'series': series_json}, separators=(',', ':'))
+
+
+def plot_data_response(request, series, max_points=None, method='lttb'):
+    """
+    Create the response for the data endpoint of a plot view gizmo (see the data_url option of the plot views). The format of the response and the number of points of each series are read from the "format" and "points" query parameters of the request. Series with two columns (x and y) that have more points than requested are downsampled.
+
+    Args:
+        request(HttpRequest): The request from the plot view.
+        series(list): A list with the data of each series of the plot, in the same order as the series of the plot view. The data of a series may be given as a list of points (e.g.: [[x1, y1], [x2, y2]]), a numpy array, a pandas Series or DataFrame indexed by x or a series dictionary with a "data" item.
+        max_points(int): Maximum number of points per series returned, regardless of the number of points requested.
+        method(str): The downsampling method, either 'lttb' or 'min_max' (see tethys_gizmos.downsampling.downsample). Defaults to 'lttb'.
+
+    Returns:
+        HttpResponse: The encoded series.
+
+    **Controller Example**
+
+    ::
+
+        from tethys_sdk.gizmos import plot_data_response
+
+        @login_required()
+        def streamflow_data(request):
+            series = [get_streamflow(station) for station in STATIONS]
+            return plot_data_response(request, series, max_points=5000)
+    """  # noqa: E501
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError('Invalid downsampling method "{}". Must be one of: {}.'.format(
+            method, ', '.join(DOWNSAMPLING_METHODS)))
+
+    data_format = request.GET.get('format', 'json')
+
+    if data_format not in PLOT_DATA_FORMATS:
+        return HttpResponseBadRequest('Invalid format "{}". Must be one of: {}.'.format(
+            data_format, ', '.join(PLOT_DATA_FORMATS)))
+
+    try:
+        points = int(request.GET['points']) if 'points' in request.GET else None
+    except ValueError:
+        return HttpResponseBadRequest('Invalid number of points "{}".'.format(request.GET['points']))
+
+    if points is None or (max_points and points > max_points):
+        points = max_points
+
+    encoded_series = [downsample(get_series_columns(data), points, method) for data in series]
+
+    if data_format == 'binary':
+        return HttpResponse(encode_plot_data(encoded_series, 'binary'), content_type='application/octet-stream')
+
+    return HttpResponse(encode_plot_data(encoded_series), content_type='application/json')
@@ -8,18 +8,104 @@
 ********************************************************************************
 """
 
+import json
+import threading
+
 from bokeh.server.django.consumers import SessionConsumer
+from bokeh.server.views.static_handler import StaticHandler
 from bokeh.resources import Resources
 from bokeh.core.templates import AUTOLOAD_JS
 from bokeh.util.compiler import bundle_all_models
 from bokeh.embed.util import RenderItem
 from bokeh.embed.elements import script_for_render_items
+from django.conf import settings
+
+from typing import Optional
+
+# Static files of BokehJS are collected under "bokeh/static/" (see tethys_apps.static_finders.BokehStaticFinder)
+BOKEH_STATIC_ROOT = 'bokeh/'
+
+# Placeholders of the parts of the autoload script that change with each session
+_ELEMENT_ID = 'TETHYS_BOKEH_AUTOLOAD_ELEMENT_ID'
+_SCRIPT = 'TETHYS_BOKEH_AUTOLOAD_SCRIPT'
+
+_autoload_templates = {}
+_autoload_templates_lock = threading.Lock()
+
+
+def get_resources_mode():
+    """
+    Get the mode of the BokehJS resources, from the BOKEH_RESOURCES setting: "cdn" to load BokehJS from the Bokeh CDN, "static" to load it from the static files of Tethys or "inline" to include it in the autoload script.
+    """  # noqa: E501
+    return getattr(settings, 'BOKEH_RESOURCES', 'cdn')
+
+
+def get_autoload_template(key, resources, resources_param):
+    """
+    Get the autoload script of Bokeh apps, rendered once per key with placeholders for the element id and the script of the session. The model bundle is computed when the template is rendered, after the handler of the app has imported its custom models.
+    """  # noqa: E501
+    with _autoload_templates_lock:
+        template = _autoload_templates.get(key)
+
+    if template is not None:
+        return template
+
+    bundle = bundle_all_models() or ""
+
+    if resources_param == "none":
+        js_urls = []
+        css_urls = []
+    else:
+        js_urls = resources.js_files
+        css_urls = resources.css_files
 
-from typing import Optional, List
+    template = AUTOLOAD_JS.render(
+        js_urls=js_urls,
+        css_urls=css_urls,
+        js_raw=resources.js_raw + [bundle, _SCRIPT],
+        css_raw=resources.css_raw_str,
+        elementid=_ELEMENT_ID,
+    )
+
+    with _autoload_templates_lock:
+        _autoload_templates[key] = template
+
+    return template
+
+
+def render_autoload_template(template, element_id, script):
+    """
+    Replace the placeholders of an autoload template, as AUTOLOAD_JS renders the element id and the script.
+    """
+    js = template.replace(json.dumps(_ELEMENT_ID), json.dumps(element_id))
+    js = js.replace(_ELEMENT_ID, element_id)
+    # The script is the last placeholder replaced, so placeholders are not replaced within it
+    return js.replace(_SCRIPT, script.replace('\n', '\n' + ' ' * 6))
+
+
+def clear_autoload_templates():
+    """
+    Remove the rendered autoload templates (e.g. after custom models are added).
+    """
+    with _autoload_templates_lock:
+        _autoload_templates.clear()
 
 
 class BokehAutoloadJsCDN(SessionConsumer):
+    """
+    Consumer of the autoload script of Bokeh apps. BokehJS is loaded as set by the BOKEH_RESOURCES setting and the rendered autoload script is cached per resources mode, so only the session changes with each request.
+    """  # noqa: E501
     def resources(self, version: Optional[str] = None) -> Resources:
+        mode = get_resources_mode()
+
+        if mode == 'static':
+            # The version of each file is appended to its url, so the files can be cached by browsers
+            return Resources(mode='server', root_url=settings.STATIC_URL + BOKEH_STATIC_ROOT,
+                             path_versioner=StaticHandler.append_version)
+
+        if mode == 'inline':
+            return Resources(mode='inline')
+
         return Resources(mode='cdn', version=version)
 
     async def handle(self, body: bytes) -> None:
@@ -32,29 +118,13 @@ class BokehAutoloadJsCDN(SessionConsumer):
         app_path = self.get_argument("bokeh-app-path", default="/")
         absolute_url = self.get_argument("bokeh-absolute-url", default=None)
 
-        resources = self.resources()
-
-        bundle = bundle_all_models() or ""
-
         render_items = [RenderItem(sessionid=session.id, elementid=element_id, use_for_title=False)]
         script = script_for_render_items(None, render_items, app_path=app_path, absolute_url=absolute_url)
 
         resources_param = self.get_argument("resources", "default")
-        js_urls: List[str]
-        css_urls: List[str]
-        if resources_param == "none":
-            js_urls = []
-            css_urls = []
-        else:
-            js_urls = resources.js_files
-            css_urls = resources.css_files
-
-        js = AUTOLOAD_JS.render(
-            js_urls=js_urls,
-            css_urls=css_urls,
-            js_raw=resources.js_raw + [bundle, script],
-            css_raw=resources.css_raw_str,
-            elementid=element_id,
-        )
+        # The template only depends on the resources, not on the (client given) app path
+        key = (get_resources_mode(), resources_param == "none")
+        template = get_autoload_template(key, self.resources(), resources_param)
+        js = render_autoload_template(template, element_id, script)
 
         await self.send_response(200, js.encode(), headers=[(b"Content-Type", b"application/javascript")])
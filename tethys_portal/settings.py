@@ -173,8 +173,12 @@ MIDDLEWARE = local_settings.pop('MIDDLEWARE_OVERRIDE', [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'tethys_portal.middleware.TethysSocialAuthExceptionMiddleware',
     'session_security.middleware.SessionSecurityMiddleware',
-
 ])
+
+GIZMO_PROFILING = local_settings.pop('GIZMO_PROFILING', False)
+if GIZMO_PROFILING:
+    MIDDLEWARE.append('tethys_gizmos.middleware.GizmoProfilingMiddleware')
+
 MIDDLEWARE = tuple(MIDDLEWARE + local_settings.pop('MIDDLEWARE', []))
 
 AUTHENTICATION_BACKENDS = local_settings.pop('AUTHENTICATION_BACKENDS_OVERRIDE', [
@@ -261,7 +265,8 @@ STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'), )
 STATICFILES_FINDERS = (
     'django.contrib.staticfiles.finders.FileSystemFinder',
     'django.contrib.staticfiles.finders.AppDirectoriesFinder',
-    'tethys_apps.static_finders.TethysStaticFinder'
+    'tethys_apps.static_finders.TethysStaticFinder',
+    'tethys_apps.static_finders.BokehStaticFinder',
 )
 
 STATIC_ROOT = local_settings.pop('STATIC_ROOT', os.path.join(TETHYS_HOME, 'static'))
@@ -35,6 +35,10 @@ admin_urls[0].append(url(r'^dask-dashboard/(?P<page>[\w-]+)/(?P<dask_scheduler_i
 admin_urls[0].insert(0, url(r'^tethys_apps/tethysapp/(?P<app_id>[0-9]+)/clear-workspace/$',
                             tethys_portal_admin.clear_workspace, name='clear_workspace'))
 
+# Add app workspace usage url
+admin_urls[0].insert(0, url(r'^tethys_apps/tethysapp/(?P<app_id>[0-9]+)/workspace-usage/$',
+                            tethys_portal_admin.workspace_usage, name='workspace_usage'))
+
 account_urls = [
     url(r'^login/$', tethys_portal_accounts.login_view, name='login'),
     url(r'^logout/$', tethys_portal_accounts.logout_view, name='logout'),
@@ -56,6 +60,7 @@ user_urls = [
     url(r'^delete-account/$', tethys_portal_user.delete_account, name='delete'),
     url(r'^clear-workspace/(?P<root_url>[\w.@+-]+)/$', tethys_portal_user.clear_workspace, name='clear_workspace'),
     url(r'^manage-storage/$', tethys_portal_user.manage_storage, name='manage_storage'),
+    url(r'^manage-storage/usage/$', tethys_portal_user.manage_storage_usage, name='manage_storage_usage'),
 ]
 
 developer_urls = [
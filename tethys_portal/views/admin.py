@@ -1,9 +1,11 @@
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
-from django.shortcuts import render, redirect, reverse
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, render, redirect, reverse
 from tethys_apps.models import TethysApp
 from tethys_apps.utilities import get_app_class
 from tethys_apps.base.workspace import _get_app_workspace
+from tethys_quotas.utilities import _convert_storage_units
 
 
 @staff_member_required
@@ -31,3 +33,21 @@ def clear_workspace(request, app_id):
     context = {'app_name': app.name, 'change_url': url}
 
     return render(request, 'tethys_portal/admin/tethys_app/clear_workspace.html', context)
+
+
+@staff_member_required
+def workspace_usage(request, app_id):
+    """
+    Compute the current usage of the app workspace.
+    """
+    app = get_app_class(get_object_or_404(TethysApp, id=app_id))
+
+    if app is None:
+        return JsonResponse({'success': False, 'error': 'The app is not installed.'}, status=404)
+
+    current_use = _get_app_workspace(app).get_size('gb')
+
+    json = {'success': True,
+            'current_use': _convert_storage_units('gb', current_use)}
+
+    return JsonResponse(json)
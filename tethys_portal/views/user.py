@@ -7,6 +7,7 @@
 * License: BSD 2-Clause
 ********************************************************************************
 """
+from django.http import JsonResponse
 from django.shortcuts import render, redirect
 from tethys_sdk.permissions import login_required
 from django.contrib.auth.models import User
@@ -17,7 +18,7 @@ from rest_framework.authtoken.models import Token
 from tethys_apps.harvester import SingletonHarvester
 from tethys_portal.forms import UserSettingsForm, UserPasswordChangeForm
 from tethys_apps.models import TethysApp
-from tethys_apps.base.workspace import _get_user_workspace
+from tethys_apps.base.workspace import _get_user_workspace, _get_user_workspaces, _get_workspace_sizes
 from tethys_apps.utilities import get_app_class
 from tethys_quotas.handlers.workspace import WorkspaceQuotaHandler
 from tethys_quotas.utilities import get_quota, _convert_storage_units
@@ -223,7 +224,8 @@ def clear_workspace(request, username, root_url):
 @login_required()
 def manage_storage(request, username):
     """
-    Handle clear workspace requests.
+    Handle manage storage requests. The page is rendered with the last known usage of each app and updated with the
+    current usage from the manage_storage_usage endpoint.
     """
     # Users are not allowed to make changes to other users settings
     if request.user.username != username:
@@ -233,13 +235,17 @@ def manage_storage(request, username):
     apps = SingletonHarvester().apps
     user = request.user
 
+    sizes = {app: workspace.get_cached_size('gb') for app, workspace in _get_user_workspaces(user, apps).items()}
+
     for app in apps:
-        workspace = _get_user_workspace(app, user)
-        app.current_use = _convert_storage_units('gb', workspace.get_size('gb'))
+        app.current_use = _convert_cached_size(sizes[app])
+
+    if None in sizes.values():
+        current_use = None
+    else:
+        current_use = _convert_storage_units('gb', sum(sizes.values()))
 
     codename = 'user_workspace_quota'
-    rqh = WorkspaceQuotaHandler(user)
-    current_use = _convert_storage_units(rqh.units, rqh.get_current_use())
     quota = get_quota(user, codename)
     quota = _check_quota_helper(quota)
 
@@ -252,6 +258,31 @@ def manage_storage(request, username):
     return render(request, 'tethys_portal/user/manage_storage.html', context)
 
 
+@login_required()
+def manage_storage_usage(request, username):
+    """
+    Compute the current workspace usage of the user for each app.
+    """
+    if request.user.username != username:
+        return JsonResponse({'success': False,
+                             'error': "You are not allowed to view other users' storage."}, status=403)
+
+    workspaces = _get_user_workspaces(request.user)
+    sizes = _get_workspace_sizes(workspaces, 'gb')
+
+    json = {'success': True,
+            'apps': {app.root_url: _convert_storage_units('gb', size) for app, size in sizes.items()},
+            'current_use': _convert_storage_units('gb', sum(sizes.values()))}
+
+    return JsonResponse(json)
+
+
+def _convert_cached_size(size):
+    if size is None:
+        return None
+    return _convert_storage_units('gb', size)
+
+
 def _check_quota_helper(quota):
     if quota['quota']:
         return _convert_storage_units(quota['units'], quota['quota'])
@@ -6,7 +6,10 @@
 * Copyright: (c) Aquaveo 2018
 ********************************************************************************
 """
+import asyncio
 import logging
+
+from asgiref.sync import sync_to_async
 from django.utils.functional import wraps
 from django.core.exceptions import PermissionDenied
 from django.http import HttpRequest
@@ -19,13 +22,13 @@ log = logging.getLogger('tethys.' + __name__)
 
 def enforce_quota(codename):
     """
-        Decorator to enforce custom quotas
+        Decorator to enforce custom quotas. Supports async controllers.
 
         Args:
             codename (string): codename of quota to enforce
     """  # noqa: E501
     def decorator(controller):
-        def wrapper(*args, **kwargs):
+        def check_quota(args):
             try:
                 request = None
                 for index, arg in enumerate(args):
@@ -56,6 +59,14 @@ def enforce_quota(codename):
             except ResourceQuota.DoesNotExist:
                 log.warning('ResourceQuota with codename {} does not exist.'.format(codename))
 
+        if asyncio.iscoroutinefunction(controller):
+            async def async_wrapper(*args, **kwargs):
+                await sync_to_async(check_quota, thread_sensitive=True)(args)
+                return await controller(*args, **kwargs)
+            return wraps(controller)(async_wrapper)
+
+        def wrapper(*args, **kwargs):
+            check_quota(args)
             return controller(*args, **kwargs)
         return wraps(controller)(wrapper)
     return decorator
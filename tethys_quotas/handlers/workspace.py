@@ -8,7 +8,7 @@
 """
 from django.contrib.auth.models import User
 from tethys_apps.models import TethysApp
-from tethys_apps.base.workspace import _get_user_workspace, _get_app_workspace
+from tethys_apps.base.workspace import _get_user_workspaces, _get_app_workspace, _get_workspace_sizes
 from tethys_apps.harvester import SingletonHarvester
 from tethys_quotas.handlers.base import ResourceQuotaHandler
 
@@ -40,9 +40,8 @@ class WorkspaceQuotaHandler(ResourceQuotaHandler):
             harvester = SingletonHarvester()
             installed_apps = harvester.apps
 
-            for app in installed_apps:
-                workspace = _get_user_workspace(app, self.entity)
-                current_use += float(workspace.get_size(self.units))
+            workspaces = _get_user_workspaces(self.entity, installed_apps)
+            current_use = float(sum(_get_workspace_sizes(workspaces, self.units).values()))
 
         elif isinstance(self.entity, TethysApp):
             harvester = SingletonHarvester()
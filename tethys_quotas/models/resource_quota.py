@@ -13,6 +13,7 @@ from django.db import models
 from tethys_apps.base.function_extractor import TethysFunctionExtractor
 from tethys_apps.models import TethysApp
 from tethys_quotas.handlers.base import ResourceQuotaHandler
+from tethys_quotas.utilities import get_resource_quota_handler
 
 
 log = logging.getLogger('tethys.' + __name__)
@@ -57,8 +58,7 @@ class ResourceQuota(models.Model):
         Returns:
             ResourceQuotaHandler class
         """
-        quota_obj = TethysFunctionExtractor(self._handler, prefix="")
-        return quota_obj.function
+        return get_resource_quota_handler(self._handler)
 
     @handler.setter
     def handler(self, class_path):
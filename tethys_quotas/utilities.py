@@ -12,13 +12,23 @@ from django.conf import settings
 log = logging.getLogger('tethys.' + __name__)
 
 
+# ResourceQuotaHandler classes keyed by dot-path
+_handler_classes = {}
+
+
 def sync_resource_quota_handlers():
+    """
+    Create a ResourceQuota for each entity of each handler listed in the RESOURCE_QUOTA_HANDLERS setting and delete
+    the ResourceQuotas of handlers that are no longer listed. The database is read once and updated in a single
+    transaction.
+    """
+    from django.db import transaction
     from tethys_quotas.models import ResourceQuota
     from tethys_quotas.handlers.base import ResourceQuotaHandler
     from tethys_sdk.quotas import codenames
 
     if hasattr(settings, 'RESOURCE_QUOTA_HANDLERS'):
-        quota_codenames = []
+        resource_quotas = {}
         for quota_class_str in settings.RESOURCE_QUOTA_HANDLERS:
             try:
                 components = quota_class_str.split('.')
@@ -33,31 +43,60 @@ def sync_resource_quota_handlers():
                 log.warning("Unable to load ResourceQuotaHandler: {} is not a subclass of ResourceQuotaHandler"
                             .format(quota_class_str))
                 continue
-            else:
-                for entity in class_obj.applies_to:
-                    entity_type = entity.split('.')[-1]
-                    codename = '{}_{}'.format(entity_type.lower(), class_obj.codename)
-                    quota_codenames.append(codename)
-
-                    if not ResourceQuota.objects.filter(codename=codename).exists():
-                        resource_quota = ResourceQuota(
-                            codename="{}_{}".format(entity_type.lower(), class_obj.codename),
-                            name="{} {}".format(entity_type, class_obj.name),
-                            description=class_obj.description,
-                            default=class_obj.default,
-                            units=class_obj.units,
-                            applies_to=entity,
-                            impose_default=True,
-                            help=class_obj.help,
-                            _handler=quota_class_str
-                        )
-                        resource_quota.save()
-
-        for rq in ResourceQuota.objects.all():
-            if rq.codename not in quota_codenames:
-                rq.delete()
-            else:
-                setattr(codenames, rq.codename.upper(), rq.codename)
+
+            _handler_classes[quota_class_str] = class_obj
+
+            for entity in class_obj.applies_to:
+                entity_type = entity.split('.')[-1]
+                codename = '{}_{}'.format(entity_type.lower(), class_obj.codename)
+
+                if codename not in resource_quotas:
+                    resource_quotas[codename] = ResourceQuota(
+                        codename=codename,
+                        name="{} {}".format(entity_type, class_obj.name),
+                        description=class_obj.description,
+                        default=class_obj.default,
+                        units=class_obj.units,
+                        applies_to=entity,
+                        impose_default=True,
+                        help=class_obj.help,
+                        _handler=quota_class_str
+                    )
+
+        with transaction.atomic():
+            existing_codenames = set(ResourceQuota.objects.values_list('codename', flat=True))
+            ResourceQuota.objects.bulk_create(
+                [rq for codename, rq in resource_quotas.items() if codename not in existing_codenames]
+            )
+            ResourceQuota.objects.exclude(codename__in=resource_quotas.keys()).delete()
+
+        for codename in resource_quotas:
+            setattr(codenames, codename.upper(), codename)
+
+
+def get_resource_quota_handler(class_path):
+    """
+    Get the ResourceQuotaHandler class at the given dot-path. Classes are only imported the first time they are requested.
+
+    Args:
+        class_path (str): dot-path to the ResourceQuotaHandler class (e.g.: "tethys_quotas.handlers.workspace.WorkspaceQuotaHandler").
+
+    Returns:
+        ResourceQuotaHandler class or None if the class does not exist.
+    """  # noqa: E501
+    from tethys_apps.base.function_extractor import TethysFunctionExtractor
+
+    try:
+        return _handler_classes[class_path]
+    except KeyError:
+        pass
+
+    class_obj = TethysFunctionExtractor(class_path, prefix="").function
+
+    if class_obj is not None:
+        _handler_classes[class_path] = class_obj
+
+    return class_obj
 
 
 def passes_quota(entity, codename):
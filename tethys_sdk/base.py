@@ -12,4 +12,4 @@
 from tethys_apps.base import TethysAppBase, TethysExtensionBase
 from tethys_apps.base.url_map import url_map_maker
 from tethys_apps.base.controller import TethysController
-from tethys_apps.base.bokeh_handler import with_request, with_workspaces
+from tethys_apps.base.bokeh_handler import with_request, with_workspaces, with_document_pool, cache_handler_data
@@ -10,4 +10,8 @@
 # flake8: noqa
 # DO NOT ERASE
 from tethys_gizmos.gizmo_options import *
-from tethys_gizmos.gizmo_options.base import TethysGizmoOptions, SecondaryGizmoOptions
+from tethys_gizmos.gizmo_options.base import TethysGizmoOptions, SecondaryGizmoOptions, LazyGizmoOptions
+from tethys_gizmos.vector_tiles import VectorTileSource
+from tethys_gizmos.views.gizmos.datatable_view import table_data_response
+from tethys_gizmos.views.gizmos.map_view import vector_tile_response
+from tethys_gizmos.views.gizmos.plot_view import plot_data_response
@@ -14,5 +14,6 @@ from tethys_compute.models import (
     CondorJob,
     CondorWorkflow,
     CondorWorkflowJobNode,
-    DaskJob
+    DaskJob,
+    WpsJob
 )
@@ -1,52 +1,194 @@
 import logging
+import threading
 import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
 import hs_restclient as hs_r
 from django.conf import settings
+from django.db import close_old_connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from social_django.models import UserSocialAuth
 from social_django.utils import load_strategy
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_REFRESH_WINDOW = 5 * 60  # seconds
 
-def get_oauth_hs(request):
+_CachedClient = namedtuple('_CachedClient', ['provider', 'expires_at', 'access_token', 'hs'])
+
+# HydroShare clients of the users, by primary key of the user
+_clients = {}
+_clients_lock = threading.Lock()
+_refreshing = set()
+_executor = None
+
+
+def _get_refresh_window():
+    return getattr(settings, 'HYDROSHARE_TOKEN_REFRESH_WINDOW', DEFAULT_REFRESH_WINDOW)
+
+
+def _get_cached_client(user):
+    """
+    Get the cached client of a user, or None if it is not cached or its token has expired. The token is refreshed in the background when it expires within the refresh window.
+    """  # noqa: E501
+    pk = getattr(user, 'pk', None)
+
+    if pk is None:
+        return None
+
+    with _clients_lock:
+        cached = _clients.get(pk)
+
+    if cached is None:
+        return None
+
+    now = time.time()
+
+    if now >= cached.expires_at:
+        return None
+
+    if now >= cached.expires_at - _get_refresh_window():
+        _refresh_in_background(user)
+
+    return cached
+
+
+def _cache_client(user, provider, extra_data, hs):
+    pk = getattr(user, 'pk', None)
+    expires_at = extra_data.get('expires_at')
+
+    # Tokens without a known expiry are checked on every call
+    if pk is None or not isinstance(expires_at, (int, float)):
+        return
+
+    with _clients_lock:
+        _clients[pk] = _CachedClient(provider, expires_at, extra_data.get('access_token'), hs)
+
+
+def _refresh_in_background(user):
+    global _executor
+
+    with _clients_lock:
+        if user.pk in _refreshing:
+            return
+
+        _refreshing.add(user.pk)
+
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='tethys_hs_token_refresh')
+
+    _executor.submit(_refresh_client, user)
+
+
+def _refresh_client(user):
+    try:
+        _create_oauth_hs(user, refresh_window=_get_refresh_window())
+    except Exception as ex:
+        logger.warning('Failed to refresh the HydroShare token of user "{0}": {1}'.format(user, ex))
+    finally:
+        with _clients_lock:
+            _refreshing.discard(user.pk)
+        close_old_connections()
+
+
+def clear_client_cache():
+    """
+    Remove all the HydroShare clients from the cache.
+    """
+    with _clients_lock:
+        _clients.clear()
+
+
+@receiver(post_save, sender=UserSocialAuth)
+@receiver(post_delete, sender=UserSocialAuth)
+def invalidate_client(sender, instance, **kwargs):
+    """
+    Remove the cached HydroShare client of a user when the user logs in again or disconnects from a provider.
+    """
+    with _clients_lock:
+        _clients.pop(instance.user_id, None)
+
+
+def _create_oauth_hs(user, refresh_window=0):
     hs = None
+
+    # loop through all social_auth_obj associated with this user to find "hydroshare" login
+    for social_auth_obj in user.social_auth.all():
+        strategy = load_strategy()
+        backend_instance = social_auth_obj.get_backend_instance(strategy)
+        backend_name = backend_instance.name
+        logger.debug("Found oauth backend: {0}".format(backend_name))
+
+        # find hydroshare backend
+        if "hydroshare" in backend_name.lower():
+            user_id = social_auth_obj.extra_data['id']
+            auth_server_hostname = backend_instance.auth_server_hostname
+            client_id = getattr(settings, "SOCIAL_AUTH_{0}_KEY".format(backend_name.upper()), 'None')
+            client_secret = getattr(settings, "SOCIAL_AUTH_{0}_SECRET".format(backend_name.upper()), 'None')
+
+            if hs is None:
+                # refresh token if expired
+                refresh_user_token(social_auth_obj, refresh_window)
+
+                auth = hs_r.HydroShareAuthOAuth2(client_id, client_secret, token=social_auth_obj.extra_data)
+                hs = hs_r.HydroShare(auth=auth, hostname=auth_server_hostname)
+                logger.debug("hs object initialized: {0} @ {1}".format(user_id, auth_server_hostname))
+                _cache_client(user, social_auth_obj.provider, social_auth_obj.extra_data, hs)
+            else:
+                raise Exception("Found another hydroshare oauth instance: {0} @ {1}".format(user_id,
+                                                                                            auth_server_hostname))
+
+    if hs is None:
+        raise Exception("Not logged in through HydroShare")
+
+    return hs
+
+
+def get_oauth_hs(request):
+    """
+    Get a HydroShare client authenticated with the OAuth2 token of the user of a request. Clients are cached per user until their token expires, and tokens about to expire are refreshed in the background, within the HYDROSHARE_TOKEN_REFRESH_WINDOW setting (in seconds).
+
+    Args:
+        request(HttpRequest): A request of a user logged in through HydroShare.
+
+    Returns:
+        hs_restclient.HydroShare: The client.
+
+    Raises:
+        HSClientInitException: if the user is not logged in through HydroShare or the client cannot be initialized.
+    """  # noqa: E501
     error_msg_head = "Failed to initialize hs object: "
 
     try:
-        # loop through all social_auth_obj associated with this user to find "hydroshare" login
-        for social_auth_obj in request.user.social_auth.all():
-            strategy = load_strategy()
-            backend_instance = social_auth_obj.get_backend_instance(strategy)
-            backend_name = backend_instance.name
-            logger.debug("Found oauth backend: {0}".format(backend_name))
-
-            # find hydroshare backend
-            if "hydroshare" in backend_name.lower():
-                user_id = social_auth_obj.extra_data['id']
-                auth_server_hostname = backend_instance.auth_server_hostname
-                client_id = getattr(settings, "SOCIAL_AUTH_{0}_KEY".format(backend_name.upper()), 'None')
-                client_secret = getattr(settings, "SOCIAL_AUTH_{0}_SECRET".format(backend_name.upper()), 'None')
-
-                if hs is None:
-                    # refresh token if expired
-                    refresh_user_token(social_auth_obj)
-
-                    auth = hs_r.HydroShareAuthOAuth2(client_id, client_secret, token=social_auth_obj.extra_data)
-                    hs = hs_r.HydroShare(auth=auth, hostname=auth_server_hostname)
-                    logger.debug("hs object initialized: {0} @ {1}".format(user_id, auth_server_hostname))
-                else:
-                    raise Exception("Found another hydroshare oauth instance: {0} @ {1}".format(user_id,
-                                                                                                auth_server_hostname))
-
-        if hs is None:
-            raise Exception("Not logged in through HydroShare")
-
-        return hs
+        cached = _get_cached_client(request.user)
+
+        if cached is not None:
+            return cached.hs
+
+        return _create_oauth_hs(request.user)
 
     except Exception as ex:
         logger.exception(error_msg_head + str(ex))
         raise HSClientInitException(ex)
 
 
+def get_oauth_token(user, provider):
+    """
+    Get the OAuth2 access token of a user for a provider, from the cached HydroShare client of the user when its token is valid, otherwise from the social auth of the user.
+
+    Raises:
+        ObjectDoesNotExist: if the user is not associated with the provider.
+    """  # noqa: E501
+    cached = _get_cached_client(user)
+
+    if cached is not None and cached.provider == provider:
+        return cached.access_token
+
+    return user.social_auth.get(provider=provider).extra_data['access_token']
+
+
 class HSClientInitException(Exception):
     def __init__(self, value):
         self.value = value
@@ -84,11 +226,12 @@ def _send_refresh_request(user_social):
     logger.debug(user_social.extra_data)
 
 
-def refresh_user_token(user_social):
+def refresh_user_token(user_social, refresh_window=0):
     """
     Utility function to refresh the access token if is (almost) expired
     Args:
         user_social (UserSocialAuth): a user social auth instance
+        refresh_window (int): number of seconds before it expires from which the token is refreshed
     """
     try:
         try:
@@ -98,7 +241,7 @@ def refresh_user_token(user_social):
             return
 
         current_time = int(time.time())
-        if current_time >= expires_at:
+        if current_time >= expires_at - refresh_window:
             _send_refresh_request(user_social)
     except Exception as ex:
         logger.error("Failed to refresh token: " + str(ex))
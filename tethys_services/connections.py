@@ -0,0 +1,174 @@
+"""
+********************************************************************************
+* Name: connections.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from requests.auth import AuthBase, HTTPBasicAuth
+from tethys_dataset_services.engines import GeoServerSpatialDatasetEngine
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_TIMEOUT = 30  # seconds
+
+
+class ServiceHTTPAdapter(HTTPAdapter):
+    """
+    Transport adapter shared by the HTTP sessions of the service engines. It keeps a pool of connections per host, retries idempotent requests on connection errors and 502, 503 and 504 responses with an exponential backoff and applies a default timeout.
+
+    Args:
+        pool_size(int): Maximum number of connections kept alive per host.
+        retries(int): Number of retries of failed idempotent requests.
+        backoff_factor(float): Factor of the exponential backoff between retries, in seconds.
+        timeout(int): Number of seconds to wait for the server when the request does not set a timeout.
+    """  # noqa: E501
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, retries=DEFAULT_RETRIES, backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 timeout=DEFAULT_TIMEOUT):
+        self.timeout = timeout
+        max_retries = Retry(total=retries, backoff_factor=backoff_factor, status_forcelist=(502, 503, 504),
+                            raise_on_status=False)
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=max_retries)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+    def close(self):
+        """
+        Keep the pooled connections open. They are shared by the sessions of all the engines, so closing one session (e.g. when its engine is deleted) must not close them.
+        """  # noqa: E501
+
+
+class ServiceCredentials(AuthBase):
+    """
+    Basic authentication with the credentials registered for the host of each request. Sessions that use it can be shared by services on different hosts without sharing their credentials.
+    """  # noqa: E501
+
+    def __init__(self):
+        self._credentials = {}
+
+    def register(self, url, username, password):
+        """
+        Register the credentials of the host of a url.
+        """
+        self._credentials[urlsplit(url).netloc] = (str(username), str(password))
+
+    def get(self, url):
+        """
+        Get the credentials of the host of a url, or None if none are registered.
+        """
+        return self._credentials.get(urlsplit(url).netloc)
+
+    def __call__(self, request):
+        credentials = self.get(request.url)
+
+        if credentials is not None and 'Authorization' not in request.headers:
+            request = HTTPBasicAuth(*credentials)(request)
+
+        return request
+
+
+_adapter = None
+_credentials = ServiceCredentials()
+_lock = threading.Lock()
+
+
+def get_adapter():
+    """
+    Get the transport adapter shared by the service engines, configured with the SERVICE_HTTP_POOL_SIZE, SERVICE_HTTP_RETRIES, SERVICE_HTTP_BACKOFF_FACTOR and SERVICE_HTTP_TIMEOUT (in seconds) settings.
+    """  # noqa: E501
+    global _adapter
+
+    with _lock:
+        if _adapter is None:
+            _adapter = ServiceHTTPAdapter(
+                pool_size=getattr(settings, 'SERVICE_HTTP_POOL_SIZE', DEFAULT_POOL_SIZE),
+                retries=getattr(settings, 'SERVICE_HTTP_RETRIES', DEFAULT_RETRIES),
+                backoff_factor=getattr(settings, 'SERVICE_HTTP_BACKOFF_FACTOR', DEFAULT_BACKOFF_FACTOR),
+                timeout=getattr(settings, 'SERVICE_HTTP_TIMEOUT', DEFAULT_TIMEOUT),
+            )
+
+    return _adapter
+
+
+def get_credentials():
+    """
+    Get the credentials of the services, used by the sessions that authenticate by host.
+    """
+    return _credentials
+
+
+def use_pooled_connections(session):
+    """
+    Send the requests of a session through the shared connection pools.
+
+    Args:
+        session(requests.Session): The session.
+
+    Returns:
+        requests.Session: The session.
+    """
+    adapter = get_adapter()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def use_pooled_engine_connections(engine):
+    """
+    Send the requests an engine makes with its own session through the shared connection pools. GeoServer engines make their requests to the catalog of GeoServer with the session of the catalog; the other engines do not expose their sessions.
+
+    Args:
+        engine: A dataset or spatial dataset engine.
+
+    Returns:
+        The engine.
+    """  # noqa: E501
+    if isinstance(engine, GeoServerSpatialDatasetEngine):
+        use_pooled_connections(engine.catalog.client)
+
+    return engine
+
+
+def create_session():
+    """
+    Create a session that sends its requests through the shared connection pools.
+    """
+    return use_pooled_connections(requests.Session())
+
+
+def configure_siphon(session_manager, url=None, username=None, password=None, adapter=None):
+    """
+    Configure the siphon session manager, used for THREDDS catalogs, to create sessions that use the shared connection pools and authenticate with the credentials registered for each host. The options of the session manager are set once, instead of setting the credentials of the last service used for every host.
+
+    Args:
+        session_manager(siphon.http_util.HTTPSessionManager): The siphon session manager.
+        url(str): The endpoint of a THREDDS service to register credentials for.
+        username(str): The username of the service.
+        password(str): The password of the service.
+        adapter(requests.adapters.BaseAdapter): The transport adapter of the sessions. Defaults to the shared adapter.
+    """  # noqa: E501
+    if url and username and password:
+        _credentials.register(url, username, password)
+
+    adapter = adapter or get_adapter()
+    options = session_manager.options
+
+    if options.get('auth') is not _credentials or options.get('adapters', {}).get('http://') is not adapter:
+        session_manager.set_session_options(
+            auth=_credentials,
+            adapters={'https://': adapter, 'http://': adapter},
+        )
@@ -0,0 +1,155 @@
+"""
+********************************************************************************
+* Name: engine_cache.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from owslib.util import element_to_string
+
+DEFAULT_TTL = 5 * 60  # seconds
+
+
+def get_service_tag(service):
+    """
+    Get the tag of the engines of a service stored in the database, used to invalidate them when the service changes.
+    """
+    return service._meta.label_lower, service.pk
+
+
+class EngineCache:
+    """
+    Cache of service engines, keyed by the service they connect to and a hash of their credentials. Engines expire after a time to live and are invalidated when their service is saved or deleted.
+
+    Args:
+        ttl(int): Number of seconds engines are cached. Engines are not cached if 0.
+    """  # noqa: E501
+
+    def __init__(self, ttl=DEFAULT_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def get_key(tag, credentials):
+        """
+        Get the key of an engine. The credentials are hashed, so they are not kept in the keys of the cache.
+        """
+        digest = hashlib.sha256(repr(tuple(credentials)).encode('utf-8')).hexdigest()
+        return tag, digest
+
+    def lookup(self, tag, credentials):
+        """
+        Get an engine from the cache.
+
+        Args:
+            tag(tuple): Identifier of the service of the engine (see get_service_tag).
+            credentials(tuple): The endpoint, credentials and any other options the engine is created with.
+
+        Returns:
+            The engine, or None if it is not cached or has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(self.get_key(tag, credentials))
+
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+
+        return entry[1]
+
+    def set(self, tag, credentials, engine):
+        """
+        Add an engine to the cache.
+        """
+        if self.ttl <= 0:
+            return
+
+        now = time.monotonic()
+
+        with self._lock:
+            # Drop the expired entries, so the engines of services no longer used do not accumulate
+            self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            self._entries[self.get_key(tag, credentials)] = (now + self.ttl, engine)
+
+    def get(self, tag, credentials, factory):
+        """
+        Get an engine from the cache, creating it with the factory if it is not cached or has expired. Engines created as None are not cached.
+        """  # noqa: E501
+        engine = self.lookup(tag, credentials)
+
+        if engine is None:
+            engine = factory()
+            if engine is not None:
+                self.set(tag, credentials, engine)
+
+        return engine
+
+    def invalidate(self, tag):
+        """
+        Remove the engines of a service from the cache.
+        """
+        with self._lock:
+            self._entries = {k: v for k, v in self._entries.items() if k[0] != tag}
+
+    def clear(self):
+        """
+        Remove all the engines from the cache.
+        """
+        with self._lock:
+            self._entries = {}
+
+
+_engine_cache = None
+_engine_cache_lock = threading.Lock()
+
+
+def get_engine_cache():
+    """
+    Get the engine cache of the portal, configured with the ENGINE_CACHE_TTL setting (in seconds).
+    """
+    global _engine_cache
+
+    with _engine_cache_lock:
+        if _engine_cache is None:
+            _engine_cache = EngineCache(ttl=getattr(settings, 'ENGINE_CACHE_TTL', DEFAULT_TTL))
+
+    return _engine_cache
+
+
+def get_capabilities_tag(endpoint):
+    """
+    Get the tag of the capabilities document of a WPS endpoint. The endpoint must be cleaned with owslib.util.clean_ows_url, like the URL of owslib WebProcessingService objects.
+    """  # noqa: E501
+    return 'wps_capabilities', endpoint
+
+
+def load_capabilities(wps):
+    """
+    Load the capabilities of an owslib WebProcessingService object, from the engine cache if the capabilities document of its endpoint was requested recently. Otherwise, the document is requested from the server and cached.
+
+    Args:
+        wps(owslib.wps.WebProcessingService): A WebProcessingService object created with skip_caps=True.
+    """  # noqa: E501
+    cache = get_engine_cache()
+    tag = get_capabilities_tag(wps.url)
+    # Recent versions of owslib keep the credentials in an Authentication object
+    auth = getattr(wps, 'auth', wps)
+    credentials = (auth.username, auth.password)
+    document = cache.lookup(tag, credentials)
+
+    if document is not None:
+        wps.getcapabilities(xml=element_to_string(document))
+        return
+
+    wps.getcapabilities()
+    cache.set(tag, credentials, wps._capabilities)
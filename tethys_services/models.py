@@ -8,10 +8,11 @@
 ********************************************************************************
 """
 from django.db import models
+from django.dispatch import receiver
 from django.core.exceptions import (ObjectDoesNotExist, ValidationError)
+from owslib.util import clean_ows_url
 from owslib.wps import WebProcessingService as WPS
 from social_core.exceptions import AuthException
-from siphon.catalog import TDSCatalog
 from siphon.http_util import session_manager
 from tethys_dataset_services.valid_engines import VALID_ENGINES, VALID_SPATIAL_ENGINES
 from tethys_dataset_services.engines import (CkanDatasetEngine,
@@ -19,6 +20,11 @@ from tethys_dataset_services.engines import (CkanDatasetEngine,
                                              HydroShareDatasetEngine)
 from urllib.error import HTTPError, URLError
 
+from .backends.hs_restclient_helper import get_oauth_token
+from .connections import configure_siphon, use_pooled_connections
+from .engine_cache import get_capabilities_tag, get_engine_cache, get_service_tag, load_capabilities
+from .thredds import get_catalog_cache
+
 
 def validate_url(value):
     """
@@ -105,9 +111,7 @@ class DatasetService(models.Model):
             user = request.user
 
             try:
-                # social = user.social_auth.get(provider='google-oauth2')
-                social = user.social_auth.get(provider=HYDROSHARE_OAUTH_PROVIDER_NAME)
-                apikey = social.extra_data['access_token']  # noqa: F841
+                get_oauth_token(user, HYDROSHARE_OAUTH_PROVIDER_NAME)
             except ObjectDoesNotExist:
                 # User is not associated with that provider
                 # Need to prompt for association
@@ -119,10 +123,14 @@ class DatasetService(models.Model):
                                            password=self.password,
                                            apikey=self.apikey)
 
-        return CkanDatasetEngine(endpoint=self.endpoint,
-                                 username=self.username,
-                                 password=self.password,
-                                 apikey=self.apikey)
+        return get_engine_cache().get(
+            get_service_tag(self),
+            (self.engine, self.endpoint, self.apikey, self.username, self.password),
+            lambda: CkanDatasetEngine(endpoint=self.endpoint,
+                                      username=self.username,
+                                      password=self.password,
+                                      apikey=self.apikey)
+        )
 
 
 class SpatialDatasetService(models.Model):
@@ -160,20 +168,30 @@ class SpatialDatasetService(models.Model):
         engine = None
 
         if self.engine == self.GEOSERVER:
-            engine = GeoServerSpatialDatasetEngine(endpoint=self.endpoint,
-                                                   username=self.username,
-                                                   password=self.password)
-            engine.public_endpoint = self.public_endpoint
+            engine = get_engine_cache().get(
+                get_service_tag(self),
+                (self.engine, self.endpoint, self.public_endpoint, self.username, self.password),
+                self._get_geoserver_engine
+            )
 
         elif self.engine == self.THREDDS:
-            if self.username and self.password:
-                session_manager.set_session_options(auth=(str(self.username), str(self.password)))
+            catalog_cache = get_catalog_cache()
+            configure_siphon(session_manager, self.endpoint, self.username, self.password,
+                             adapter=catalog_cache.adapter)
 
             catalog_endpoint = str(self.endpoint).rstrip('/') + '/catalog.xml'
-            engine = TDSCatalog(str(catalog_endpoint))
+            engine = catalog_cache.get_catalog(catalog_endpoint)
 
         return engine
 
+    def _get_geoserver_engine(self):
+        engine = GeoServerSpatialDatasetEngine(endpoint=self.endpoint,
+                                               username=self.username,
+                                               password=self.password)
+        engine.public_endpoint = self.public_endpoint
+        use_pooled_connections(engine.catalog.client)
+        return engine
+
 
 class WebProcessingService(models.Model):
     """
@@ -194,17 +212,17 @@ class WebProcessingService(models.Model):
 
     def activate(self, wps):
         """
-        Activate a WebProcessingService object by calling getcapabilities() on it and handle errors appropriately.
+        Activate a WebProcessingService object by loading its capabilities and handle errors appropriately. The capabilities document is requested from the server only if it is not in the engine cache.
 
         Args:
           wps (owslib.wps.WebProcessingService): A owslib.wps.WebProcessingService object.
 
         Returns:
           (owslib.wps.WebProcessingService): Returns an activated WebProcessingService object or None if it is invalid.
-        """
+        """  # noqa: E501
         # Initialize the object with get capabilities call
         try:
-            wps.getcapabilities()
+            load_capabilities(wps)
         except HTTPError as e:
             if e.code == 404:
                 e.msg = f'The WPS service could not be found at given endpoint "{self.endpoint}" for site WPS ' \
@@ -234,6 +252,27 @@ class WebProcessingService(models.Model):
         return self.activate(wps=wps)
 
 
+@receiver(models.signals.post_save, sender=DatasetService)
+@receiver(models.signals.post_delete, sender=DatasetService)
+@receiver(models.signals.post_save, sender=SpatialDatasetService)
+@receiver(models.signals.post_delete, sender=SpatialDatasetService)
+@receiver(models.signals.post_save, sender=WebProcessingService)
+@receiver(models.signals.post_delete, sender=WebProcessingService)
+def invalidate_service_engines(sender, instance, **kwargs):
+    """
+    Remove the cached engines and catalogs of a service when it is saved or deleted, so they are created with its new settings.
+    """  # noqa: E501
+    cache = get_engine_cache()
+    cache.invalidate(get_service_tag(instance))
+
+    if sender is WebProcessingService:
+        # owslib caches the capabilities under the cleaned endpoint
+        cache.invalidate(get_capabilities_tag(clean_ows_url(instance.endpoint)))
+
+    if sender is SpatialDatasetService and instance.engine == SpatialDatasetService.THREDDS:
+        get_catalog_cache().invalidate(str(instance.endpoint).rstrip('/'))
+
+
 class PersistentStoreService(models.Model):
     """
     ORM for Persistent Store Service settings.
@@ -0,0 +1,275 @@
+"""
+********************************************************************************
+* Name: thredds.py
+* Author: Nathan Swain
+* Created On: October 18, 2026
+* Copyright: (c) Brigham Young University 2026
+* License: BSD 2-Clause
+********************************************************************************
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from siphon.catalog import TDSCatalog
+from siphon.http_util import session_manager
+
+from .connections import configure_siphon, create_session, get_adapter, get_credentials
+
+log = logging.getLogger('tethys.tethys_services.thredds')
+
+DEFAULT_TTL = 5 * 60  # seconds
+DEFAULT_SIZE = 1000  # catalogs
+DEFAULT_PREFETCH_LIMIT = 20  # catalog references per catalog
+PREFETCH_WORKERS = 4
+PREFETCH_QUEUE_SIZE = 100  # catalogs
+
+
+def is_catalog_url(url):
+    """
+    Determine if a url is the url of a THREDDS catalog (e.g. http://localhost/thredds/catalog/data/catalog.xml).
+    """
+    return urlsplit(url).path.lower().endswith('catalog.xml')
+
+
+class _Entry:
+    """
+    A catalog document and, once parsed, its catalog.
+    """
+
+    def __init__(self, url, content, content_type, etag, last_modified):
+        self.url = url
+        self.content = content
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.checked = time.monotonic()
+        self.catalog = None
+
+    def to_response(self, request):
+        """
+        Create the response of a request for the catalog document.
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict({'Content-Type': self.content_type})
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = self.url
+        response.request = request
+        response._content = self.content
+        return response
+
+
+class CatalogCache:
+    """
+    Cache of THREDDS catalogs. The catalog documents are revalidated with their server after a time to live, with a conditional request (ETag and Last-Modified), and their parsed catalogs are reused until the documents change. The catalogs referenced by a catalog can be prefetched in the background, so browsing them does not wait for the server.
+
+    Args:
+        ttl(int): Number of seconds catalog documents are used before they are revalidated.
+        size(int): Maximum number of catalogs cached. The least recently used catalogs are evicted first.
+        prefetch(bool): Prefetch the catalogs referenced by the catalogs requested.
+        prefetch_limit(int): Maximum number of catalogs prefetched for each catalog requested. Catalogs are not prefetched either while PREFETCH_QUEUE_SIZE prefetches are pending.
+    """  # noqa: E501
+
+    def __init__(self, ttl=DEFAULT_TTL, size=DEFAULT_SIZE, prefetch=True, prefetch_limit=DEFAULT_PREFETCH_LIMIT):
+        self.ttl = ttl
+        self.size = size
+        self.prefetch = prefetch
+        self.prefetch_limit = prefetch_limit
+        self.adapter = CatalogCacheAdapter(self)
+        self.hosts = set()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._session = None
+        self._executor = None
+        self._pending = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get_session(self):
+        if self._session is None:
+            session = create_session()
+            session.auth = get_credentials()
+            self._session = session
+        return self._session
+
+    def _get_entry(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def _set_entry(self, url, entry):
+        with self._lock:
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def fetch(self, url):
+        """
+        Get the document of a catalog, requesting it from the server only if it is not cached or has expired. Expired documents are revalidated with a conditional request and used again if they have not changed.
+
+        Returns:
+            _Entry: The cached document.
+
+        Raises:
+            HTTPError: if the server responded with an error.
+        """  # noqa: E501
+        entry = self._get_entry(url)
+
+        if entry is not None and time.monotonic() - entry.checked < self.ttl:
+            return entry
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+
+        response = self._get_session().get(url, headers=headers)
+
+        if response.status_code == 304 and entry is not None:
+            entry.checked = time.monotonic()
+            return entry
+
+        response.raise_for_status()
+
+        entry = _Entry(
+            url=response.url,
+            content=response.content,
+            content_type=response.headers.get('Content-Type', 'text/xml'),
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+        )
+        self._set_entry(url, entry)
+        return entry
+
+    def get_catalog(self, url, prefetch=None):
+        """
+        Get a THREDDS catalog, parsed again only if its document has changed.
+
+        Args:
+            url(str): The url of the catalog (e.g. http://localhost/thredds/catalog.xml).
+            prefetch(bool): Prefetch the catalogs it references. Defaults to the prefetch option of the cache.
+
+        Returns:
+            siphon.catalog.TDSCatalog: The catalog.
+        """
+        entry = self.fetch(url)
+        catalog = entry.catalog
+
+        if catalog is None:
+            # The document is served from the cache by the adapter of the siphon sessions
+            self.hosts.add(urlsplit(url).netloc)
+            configure_siphon(session_manager, adapter=self.adapter)
+            catalog = entry.catalog = TDSCatalog(url)
+
+            if self.prefetch if prefetch is None else prefetch:
+                self._prefetch(catalog)
+
+        return catalog
+
+    def _prefetch(self, catalog):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS,
+                                                thread_name_prefix='tethys_thredds_prefetch')
+
+        for catalog_ref in list(catalog.catalog_refs.values())[:self.prefetch_limit]:
+            with self._lock:
+                if self._pending >= PREFETCH_QUEUE_SIZE:
+                    log.debug('THREDDS catalog prefetch queue is full, skipping the references of "%s".',
+                              catalog.catalog_url)
+                    return
+                self._pending += 1
+
+            future = self._executor.submit(self._prefetch_catalog, catalog_ref.href)
+            future.add_done_callback(self._prefetch_done)
+
+    def _prefetch_done(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def _prefetch_catalog(self, url):
+        try:
+            self.get_catalog(url, prefetch=False)
+        except Exception as e:
+            log.debug('Unable to prefetch THREDDS catalog "%s": %s', url, e)
+
+    def invalidate(self, url):
+        """
+        Remove the catalogs under a url (e.g. the endpoint of a THREDDS service) from the cache.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(url)]:
+                del self._entries[key]
+
+    def clear(self):
+        """
+        Remove all the catalogs from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+class CatalogCacheAdapter(BaseAdapter):
+    """
+    Transport adapter of the siphon sessions, which serves the documents of THREDDS catalogs from the catalog cache (e.g. when a catalog reference is followed) and sends the other requests through the shared connection pools.
+
+    The adapter is mounted on the global siphon session manager, so it handles the requests of every siphon user in the process. Only catalogs on the hosts of the catalogs requested through the cache (i.e. the THREDDS services of the portal) are served from the cache. The catalogs of other hosts are requested from their server as usual.
+    """  # noqa: E501
+
+    def __init__(self, cache):
+        super().__init__()
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        if (request.method != 'GET' or not is_catalog_url(request.url)
+                or urlsplit(request.url).netloc not in self.cache.hosts):
+            return get_adapter().send(request, **kwargs)
+
+        try:
+            entry = self.cache.fetch(request.url)
+        except requests.HTTPError as e:
+            return e.response
+
+        return entry.to_response(request)
+
+    def close(self):
+        """
+        Keep the cache and the shared connection pools when a siphon session is closed.
+        """
+
+
+_catalog_cache = None
+_catalog_cache_lock = threading.Lock()
+
+
+def get_catalog_cache():
+    """
+    Get the THREDDS catalog cache of the portal, configured with the THREDDS_CATALOG_CACHE_TTL (in seconds), THREDDS_CATALOG_CACHE_SIZE, THREDDS_CATALOG_PREFETCH and THREDDS_CATALOG_PREFETCH_LIMIT settings.
+    """  # noqa: E501
+    global _catalog_cache
+
+    with _catalog_cache_lock:
+        if _catalog_cache is None:
+            _catalog_cache = CatalogCache(
+                ttl=getattr(settings, 'THREDDS_CATALOG_CACHE_TTL', DEFAULT_TTL),
+                size=getattr(settings, 'THREDDS_CATALOG_CACHE_SIZE', DEFAULT_SIZE),
+                prefetch=getattr(settings, 'THREDDS_CATALOG_PREFETCH', True),
+                prefetch_limit=getattr(settings, 'THREDDS_CATALOG_PREFETCH_LIMIT', DEFAULT_PREFETCH_LIMIT),
+            )
+
+    return _catalog_cache
@@ -8,7 +8,7 @@
 ********************************************************************************
 """
 from urllib.error import HTTPError, URLError
-from functools import wraps
+from functools import lru_cache, wraps
 
 from owslib.wps import WebProcessingService
 from django.core.exceptions import ObjectDoesNotExist
@@ -17,6 +17,9 @@ from django.shortcuts import redirect
 from social_core.exceptions import AuthAlreadyAssociated, AuthException
 
 from tethys_apps.base.app_base import TethysAppBase
+from .backends.hs_restclient_helper import get_oauth_token
+from .connections import use_pooled_engine_connections
+from .engine_cache import get_engine_cache, get_service_tag, load_capabilities
 from .models import DatasetService as DsModel, SpatialDatasetService as SdsModel, WebProcessingService as WpsModel
 from tethys_dataset_services.engines import HydroShareDatasetEngine
 
@@ -62,13 +65,11 @@ def ensure_oauth2(provider):
     return decorator
 
 
-def initialize_engine_object(engine, endpoint, apikey=None, username=None, password=None, request=None):
+@lru_cache(maxsize=None)
+def get_engine_class(engine):
     """
-    Initialize a DatasetEngine object from a string that points at the engine class.
+    Import the engine class a string points at. The classes are imported once.
     """
-    # Constants
-    HYDROSHARE_OAUTH_PROVIDER_NAME = 'hydroshare'
-
     # Derive import parts from engine string
     engine_split = engine.split('.')
     module_string = '.'.join(engine_split[:-1])
@@ -76,16 +77,24 @@ def initialize_engine_object(engine, endpoint, apikey=None, username=None, passw
 
     # Import
     module_ = __import__(module_string, fromlist=[str(engine_class_string)])
-    EngineClass = getattr(module_, engine_class_string)
+    return getattr(module_, engine_class_string)
+
+
+def initialize_engine_object(engine, endpoint, apikey=None, username=None, password=None, request=None):
+    """
+    Initialize a DatasetEngine object from a string that points at the engine class.
+    """
+    # Constants
+    HYDROSHARE_OAUTH_PROVIDER_NAME = 'hydroshare'
+
+    EngineClass = get_engine_class(engine)
 
     # Get Token for HydroShare interactions
     if EngineClass is HydroShareDatasetEngine:
         user = request.user
 
         try:
-            # social = user.social_auth.get(provider='google-oauth2')
-            social = user.social_auth.get(provider=HYDROSHARE_OAUTH_PROVIDER_NAME)
-            apikey = social.extra_data['access_token']
+            apikey = get_oauth_token(user, HYDROSHARE_OAUTH_PROVIDER_NAME)
         except ObjectDoesNotExist:
             # User is not associated with that provider
             # Need to prompt for association
@@ -104,33 +113,41 @@ def initialize_engine_object(engine, endpoint, apikey=None, username=None, passw
         username=username,
         password=password
     )
-    return engine_instance
+    return use_pooled_engine_connections(engine_instance)
+
+
+def _get_site_engine(service, **kwargs):
+    """
+    Get the engine of a site-wide dataset or spatial dataset service from the engine cache, initializing it if it is not cached. HydroShare engines use the access token of the user of the request, so they are never cached.
+    """  # noqa: E501
+    def initialize():
+        engine = initialize_engine_object(
+            engine=service.engine,
+            endpoint=service.endpoint,
+            apikey=service.apikey,
+            username=service.username,
+            password=service.password,
+            **kwargs
+        )
+        engine.public_endpoint = service.public_endpoint
+        return engine
+
+    if service.engine == DsModel.HYDROSHARE:
+        return initialize()
+
+    return get_engine_cache().get(
+        get_service_tag(service),
+        ('utilities', service.engine, service.endpoint, service.public_endpoint, service.apikey, service.username,
+         service.password),
+        initialize
+    )
 
 
 def list_dataset_engines(request=None):
     """
     Returns a list of the available dataset engines.
     """
-    dataset_service_engines = []
-
-    site_dataset_services = DsModel.objects.all()
-
-    if site_dataset_services:
-        # Search for match
-        for site_dataset_service in site_dataset_services:
-            dataset_service_object = initialize_engine_object(
-                engine=site_dataset_service.engine,
-                endpoint=site_dataset_service.endpoint,
-                apikey=site_dataset_service.apikey,
-                username=site_dataset_service.username,
-                password=site_dataset_service.password,
-                request=request
-            )
-            dataset_service_object.public_endpoint = site_dataset_service.public_endpoint
-
-            dataset_service_engines.append(dataset_service_object)
-
-    return dataset_service_engines
+    return [_get_site_engine(site_dataset_service, request=request) for site_dataset_service in DsModel.objects.all()]
 
 
 def get_dataset_engine(name, app_class=None, request=None):
@@ -168,25 +185,10 @@ def get_dataset_engine(name, app_class=None, request=None):
                 )
 
     # If the dataset engine cannot be found in the app_class, check database for site-wide dataset engines
-    site_dataset_services = DsModel.objects.all()
-
-    if site_dataset_services:
-        # Search for match
-        for site_dataset_service in site_dataset_services:
-
-            # If match is found initiate engine object
-            if site_dataset_service.name == name:
-                dataset_service_object = initialize_engine_object(
-                    engine=site_dataset_service.engine,
-                    endpoint=site_dataset_service.endpoint,
-                    apikey=site_dataset_service.apikey,
-                    username=site_dataset_service.username,
-                    password=site_dataset_service.password,
-                    request=request
-                )
+    site_dataset_service = DsModel.objects.filter(name=name).first()
 
-                dataset_service_object.public_endpoint = site_dataset_service.public_endpoint
-                return dataset_service_object
+    if site_dataset_service:
+        return _get_site_engine(site_dataset_service, request=request)
 
     raise NameError(f'Could not find dataset service with name "{name}". Please check that dataset service with that '
                     f'name exists in your app.py.')
@@ -196,24 +198,7 @@ def list_spatial_dataset_engines():
     """
     Returns a list of available spatial dataset engines
     """
-    spatial_dataset_service_engines = []
-    # If the dataset engine cannot be found in the app_class, check database for site-wide dataset engines
-    site_spatial_dataset_services = SdsModel.objects.all()
-
-    if site_spatial_dataset_services:
-        # Search for match
-        for site_spatial_dataset_service in site_spatial_dataset_services:
-            spatial_dataset_object = initialize_engine_object(
-                engine=site_spatial_dataset_service.engine,
-                endpoint=site_spatial_dataset_service.endpoint,
-                apikey=site_spatial_dataset_service.apikey,
-                username=site_spatial_dataset_service.username,
-                password=site_spatial_dataset_service.password
-            )
-            spatial_dataset_object.public_endpoint = site_spatial_dataset_service.public_endpoint
-            spatial_dataset_service_engines.append(spatial_dataset_object)
-
-    return spatial_dataset_service_engines
+    return [_get_site_engine(site_spatial_dataset_service) for site_spatial_dataset_service in SdsModel.objects.all()]
 
 
 def get_spatial_dataset_engine(name, app_class=None):
@@ -250,24 +235,10 @@ def get_spatial_dataset_engine(name, app_class=None):
                 )
 
     # If the dataset engine cannot be found in the app_class, check database for site-wide dataset engines
-    site_spatial_dataset_services = SdsModel.objects.all()
-
-    if site_spatial_dataset_services:
-        # Search for match
-        for site_spatial_dataset_service in site_spatial_dataset_services:
-
-            # If match is found initiate engine object
-            if site_spatial_dataset_service.name == name:
-                spatial_dataset_object = initialize_engine_object(
-                    engine=site_spatial_dataset_service.engine,
-                    endpoint=site_spatial_dataset_service.endpoint,
-                    apikey=site_spatial_dataset_service.apikey,
-                    username=site_spatial_dataset_service.username,
-                    password=site_spatial_dataset_service.password
-                )
+    site_spatial_dataset_service = SdsModel.objects.filter(name=name).first()
 
-                spatial_dataset_object.public_endpoint = site_spatial_dataset_service.public_endpoint
-                return spatial_dataset_object
+    if site_spatial_dataset_service:
+        return _get_site_engine(site_spatial_dataset_service)
 
     raise NameError('Could not find spatial dataset service with name "{0}". Please check that dataset service with '
                     'that name exists in either the Admin Settings or in your app.py.'.format(name))
@@ -297,17 +268,17 @@ def abstract_is_link(process):
 
 def activate_wps(wps, endpoint, name):
     """
-    Activate a WebProcessingService object by calling getcapabilities() on it and handle errors appropriately.
+    Activate a WebProcessingService object by loading its capabilities and handle errors appropriately. The capabilities document is requested from the server only if it is not in the engine cache.
 
     Args:
       wps (owslib.wps.WebProcessingService): A owslib.wps.WebProcessingService object.
 
     Returns:
       (owslib.wps.WebProcessingService): Returns an activated WebProcessingService object or None if it is invalid.
-    """
+    """  # noqa: E501
     # Initialize the object with get capabilities call
     try:
-        wps.getcapabilities()
+        load_capabilities(wps)
     except HTTPError as e:
         if e.code == 404:
             e.msg = f'The WPS service could not be found at given endpoint "{endpoint}" for site WPS service ' \
@@ -413,25 +384,20 @@ def get_wps_service_engine(name, app_class=None):
                 return activate_wps(wps=wps, endpoint=app_wps_service.endpoint, name=app_wps_service.name)
 
     # If the wps engine cannot be found in the app_class, check database for site-wide wps engines
-    site_wps_services = WpsModel.objects.all()
+    site_wps_service = WpsModel.objects.filter(name=name).first()
 
-    if site_wps_services:
-        # Search for match
-        for site_wps_service in site_wps_services:
-
-            # If match is found initiate engine object
-            if site_wps_service.name == name:
-                # Create OWSLib WebProcessingService engine object
-                wps = WebProcessingService(
-                    site_wps_service.endpoint,
-                    username=site_wps_service.username,
-                    password=site_wps_service.password,
-                    verbose=False,
-                    skip_caps=True
-                )
-
-                # Initialize the object with get capabilities call
-                return activate_wps(wps=wps, endpoint=site_wps_service.endpoint, name=site_wps_service.name)
+    if site_wps_service:
+        # Create OWSLib WebProcessingService engine object
+        wps = WebProcessingService(
+            site_wps_service.endpoint,
+            username=site_wps_service.username,
+            password=site_wps_service.password,
+            verbose=False,
+            skip_caps=True
+        )
+
+        # Initialize the object with the cached or requested capabilities
+        return activate_wps(wps=wps, endpoint=site_wps_service.endpoint, name=site_wps_service.name)
 
     raise NameError('Could not find wps service with name "{0}". Please check that a wps service with that name '
                     'exists in the admin console or in your app.py.'.format(name))